@@ -0,0 +1,166 @@
+"""add_application_stats_table
+
+Revision ID: 5b1e2c7d9f30
+Revises: 04d747a7aaad
+Create Date: 2025-10-20 10:12:45.118203
+
+Add the application_stats projection:
+- one row of pre-computed transformation statistics per application
+- maintained by ApplicationStatsService on every subtask write
+- backfilled here from sub_tasks (rebuild later with `make rebuild-stats`)
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e2c7d9f30'
+down_revision = '04d747a7aaad'
+branch_labels = None
+depends_on = None
+
+
+def _count_column(name):
+    return sa.Column(name, sa.Integer(), nullable=False, server_default='0')
+
+
+def upgrade() -> None:
+    columns = [
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        _count_column('subtask_count'),
+        _count_column('completed_subtask_count'),
+        _count_column('blocked_subtask_count'),
+        _count_column('not_started_subtask_count'),
+    ]
+    for prefix in ('ak', 'cloud_native'):
+        columns.extend([
+            _count_column(f'{prefix}_subtask_count'),
+            _count_column(f'{prefix}_completed_count'),
+            _count_column(f'{prefix}_in_progress_count'),
+            _count_column(f'{prefix}_blocked_count'),
+            _count_column(f'{prefix}_not_started_count'),
+            sa.Column(f'{prefix}_completion_percentage', sa.Float(), nullable=False, server_default='0'),
+            sa.Column(f'{prefix}_status', sa.String(length=20), nullable=False, server_default='NOT_STARTED'),
+        ])
+    columns.extend([
+        sa.Column('current_phase_description', sa.String(length=100), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    ])
+
+    op.create_table(
+        'application_stats',
+        *columns,
+        sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('application_id')
+    )
+
+    # Indexes for the AK / Cloud Native status filters
+    op.create_index('ix_application_stats_ak_status', 'application_stats', ['ak_status'], unique=False)
+    op.create_index(
+        'ix_application_stats_cloud_native_status', 'application_stats', ['cloud_native_status'], unique=False
+    )
+
+    _backfill()
+
+
+# Subtask categories, as in transformation_stats.build_subtask_stats_subquery:
+# completed first, then blocked (flag or status), then not started
+COMPLETED = "st.task_status = '子任务完成'"
+BLOCKED = f"NOT ({COMPLETED}) AND (st.is_blocked OR st.task_status = '阻塞')"
+NOT_STARTED = f"NOT ({COMPLETED}) AND NOT (st.is_blocked OR st.task_status = '阻塞') AND st.task_status = '未开始'"
+
+TARGET_PREFIXES = {'AK': 'ak', '云原生': 'cloud_native'}
+
+STATUS_TEXT = {'NOT_STARTED': '待启动', 'IN_PROGRESS': '进行中', 'COMPLETED': '已完成', 'BLOCKED': '阻塞'}
+
+
+def _count(condition: str) -> str:
+    return f"SUM(CASE WHEN {condition} THEN 1 ELSE 0 END)"
+
+
+def _status(prefix: str) -> str:
+    total, completed = f"{prefix}_subtask_count", f"{prefix}_completed_count"
+    return (
+        f"CASE WHEN {total} = 0 OR ({prefix}_not_started_count = {total} AND {completed} = 0) THEN 'NOT_STARTED' "
+        f"WHEN {prefix}_blocked_count > 0 THEN 'BLOCKED' "
+        f"WHEN {completed} = {total} THEN 'COMPLETED' ELSE 'IN_PROGRESS' END"
+    )
+
+
+def _status_text(column: str) -> str:
+    whens = " ".join(f"WHEN '{status}' THEN '{text}'" for status, text in STATUS_TEXT.items())
+    return f"CASE {column} {whens} ELSE '未知' END"
+
+
+def _backfill() -> None:
+    """
+    Populate application_stats from sub_tasks with one INSERT ... SELECT.
+
+    Plain SQL so the migration does not depend on application code; it
+    computes the same values as ApplicationStatsService.build_stats_row.
+    """
+    counts = [
+        "count(*) AS subtask_count",
+        f"{_count(COMPLETED)} AS completed_subtask_count",
+        f"{_count(BLOCKED)} AS blocked_subtask_count",
+        f"{_count(NOT_STARTED)} AS not_started_subtask_count",
+    ]
+    count_names = ['subtask_count', 'completed_subtask_count', 'blocked_subtask_count', 'not_started_subtask_count']
+    for target, prefix in TARGET_PREFIXES.items():
+        of_target = f"st.sub_target = '{target}'"
+        for suffix, condition in (
+            ('subtask_count', of_target),
+            ('completed_count', f"{of_target} AND {COMPLETED}"),
+            ('blocked_count', f"{of_target} AND {BLOCKED}"),
+            ('not_started_count', f"{of_target} AND {NOT_STARTED}"),
+        ):
+            counts.append(f"{_count(condition)} AS {prefix}_{suffix}")
+            count_names.append(f"{prefix}_{suffix}")
+
+    per_target, statuses = [], []
+    for prefix in TARGET_PREFIXES.values():
+        total, completed = f"{prefix}_subtask_count", f"{prefix}_completed_count"
+        per_target.extend([
+            f"{total} - {completed} - {prefix}_blocked_count - {prefix}_not_started_count "
+            f"AS {prefix}_in_progress_count",
+            f"CASE WHEN {total} = 0 THEN 0 ELSE round({completed} * 100.0 / {total}, 2) END "
+            f"AS {prefix}_completion_percentage",
+            f"{_status(prefix)} AS {prefix}_status",
+        ])
+        statuses.extend([
+            f"{prefix}_in_progress_count", f"{prefix}_completion_percentage", f"{prefix}_status"
+        ])
+
+    phase = (
+        "CASE WHEN ak_status = 'COMPLETED' AND cloud_native_status = 'COMPLETED' THEN '全部完成(AK+云原生)' "
+        f"WHEN ak_status <> 'NOT_STARTED' AND cloud_native_status = 'NOT_STARTED' "
+        f"THEN '仅AK改造(' || {_status_text('ak_status')} || ')' "
+        f"WHEN ak_status = 'NOT_STARTED' AND cloud_native_status <> 'NOT_STARTED' "
+        f"THEN '仅云原生改造(' || {_status_text('cloud_native_status')} || ')' "
+        f"ELSE 'AK' || {_status_text('ak_status')} || ',云原生' || {_status_text('cloud_native_status')} END"
+    )
+
+    columns = ['application_id', *count_names, *statuses, 'current_phase_description']
+    op.execute(f"""
+        INSERT INTO application_stats ({', '.join(columns)})
+        SELECT application_id, {', '.join(count_names)}, {', '.join(statuses)}, {phase}
+        FROM (
+            SELECT *, {', '.join(per_target)}
+            FROM (
+                SELECT a.id AS application_id, {', '.join(f'COALESCE(c.{name}, 0) AS {name}' for name in count_names)}
+                FROM applications a
+                LEFT JOIN (
+                    SELECT st.l2_id, {', '.join(counts)}
+                    FROM sub_tasks st
+                    GROUP BY st.l2_id
+                ) c ON c.l2_id = a.id
+            ) application_counts
+        ) application_stats_rows
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_application_stats_cloud_native_status', table_name='application_stats')
+    op.drop_index('ix_application_stats_ak_status', table_name='application_stats')
+    op.drop_table('application_stats')
@@ -0,0 +1,67 @@
+"""add_subtask_import_key
+
+Revision ID: 8c4f2a91d6e3
+Revises: 5b1e2c7d9f30
+Create Date: 2025-10-27 09:31:52.604117
+
+Add a unique index on the subtask business key used by the Excel import:
+- (l2_id, sub_target, version_name), with NULL and '' treated alike
+- lets the bulk loader merge staged rows with INSERT ... ON CONFLICT
+- the upgrade checks for existing duplicates of the key first and stops
+  with the offending (l2_id, sub_target, version_name) keys listed, so they
+  can be merged or removed by hand before upgrading again
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4f2a91d6e3'
+down_revision = '5b1e2c7d9f30'
+branch_labels = None
+depends_on = None
+
+
+# Duplicate keys listed in the upgrade error
+DUPLICATE_REPORT_LIMIT = 50
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(sa.text("""
+        SELECT l2_id, coalesce(sub_target, '') AS sub_target,
+               coalesce(version_name, '') AS version_name,
+               count(*) AS copies, max(id) AS newest_id
+        FROM sub_tasks
+        GROUP BY l2_id, coalesce(sub_target, ''), coalesce(version_name, '')
+        HAVING count(*) > 1
+        ORDER BY l2_id, 2, 3
+    """)).all()
+    if duplicates:
+        listed = '\n'.join(
+            f"  l2_id={row.l2_id} sub_target={row.sub_target!r} version_name={row.version_name!r} "
+            f"({row.copies} rows, newest id {row.newest_id})"
+            for row in duplicates[:DUPLICATE_REPORT_LIMIT]
+        )
+        more = len(duplicates) - DUPLICATE_REPORT_LIMIT
+        if more > 0:
+            listed += f"\n  ... and {more} more"
+        raise RuntimeError(
+            f"Cannot create uq_sub_tasks_import_key: {len(duplicates)} subtask keys are duplicated. "
+            f"Merge or delete the extra rows (NULL and '' count as the same value) and upgrade again:\n{listed}"
+        )
+
+    op.create_index(
+        'uq_sub_tasks_import_key',
+        'sub_tasks',
+        [
+            'l2_id',
+            sa.text("coalesce(sub_target, '')"),
+            sa.text("coalesce(version_name, '')"),
+        ],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_sub_tasks_import_key', table_name='sub_tasks')
@@ -0,0 +1,45 @@
+"""add_audit_logs_subtask_l2_id_indexes
+
+Revision ID: 9d2e4b7c1a58
+Revises: f3d8a6c21e57
+Create Date: 2025-11-24 14:05:31.902716
+
+Find the audit rows of an application's subtasks without scanning every
+sub_tasks audit row since the checkpoint:
+- audit_logs ((new_values ->> 'l2_id')) and ((old_values ->> 'l2_id')),
+  partial on table_name = 'sub_tasks'; used by the as-of replay to pick
+  the subtasks that were inserted into, moved out of or deleted from the
+  requested applications
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2e4b7c1a58'
+down_revision = 'f3d8a6c21e57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_audit_logs_subtask_new_l2_id',
+        'audit_logs',
+        [sa.text("(new_values ->> 'l2_id')")],
+        unique=False,
+        postgresql_where=sa.text("table_name = 'sub_tasks'")
+    )
+    op.create_index(
+        'ix_audit_logs_subtask_old_l2_id',
+        'audit_logs',
+        [sa.text("(old_values ->> 'l2_id')")],
+        unique=False,
+        postgresql_where=sa.text("table_name = 'sub_tasks'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_subtask_old_l2_id', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_subtask_new_l2_id', table_name='audit_logs')
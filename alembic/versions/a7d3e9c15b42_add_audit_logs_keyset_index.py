@@ -0,0 +1,30 @@
+"""add_audit_logs_keyset_index
+
+Revision ID: a7d3e9c15b42
+Revises: f2b9d6a3c871
+Create Date: 2025-11-10 14:05:37.219846
+
+Keyset pagination over audit_logs orders by (created_at, id):
+- ix_audit_logs_created_id (created_at, id) serves both directions of that
+  order and every created_at range filter
+- it replaces ix_audit_logs_created_at, which it makes redundant
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9c15b42'
+down_revision = 'f2b9d6a3c871'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_audit_logs_created_id', 'audit_logs', ['created_at', 'id'], unique=False)
+    op.drop_index('ix_audit_logs_created_at', table_name='audit_logs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_audit_logs_created_at', 'audit_logs', ['created_at'], unique=False)
+    op.drop_index('ix_audit_logs_created_id', table_name='audit_logs')
@@ -0,0 +1,27 @@
+"""add_sub_tasks_keyset_index
+
+Revision ID: b8e4f1a26c53
+Revises: a7d3e9c15b42
+Create Date: 2025-11-11 16:48:03.551207
+
+Cursor pagination of the subtask list orders by (sort column, id); the
+default sort is updated_at desc, served by ix_sub_tasks_updated_id
+(updated_at, id) as an index range scan.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4f1a26c53'
+down_revision = 'a7d3e9c15b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_sub_tasks_updated_id', 'sub_tasks', ['updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sub_tasks_updated_id', table_name='sub_tasks')
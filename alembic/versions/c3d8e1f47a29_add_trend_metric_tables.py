@@ -0,0 +1,73 @@
+"""add_trend_metric_tables
+
+Revision ID: c3d8e1f47a29
+Revises: 8c4f2a91d6e3
+Create Date: 2025-11-03 14:07:21.530962
+
+Add the historical trend store:
+- metric_snapshots: daily per-scope metrics, range-partitioned by month on
+  snapshot_date (partitions are created by TrendService before writing)
+- metric_rollups: weekly / monthly / quarterly downsampling read by the
+  trend endpoints
+- history is filled with `make backfill-trends` (replays audit_logs)
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d8e1f47a29'
+down_revision = '8c4f2a91d6e3'
+branch_labels = None
+depends_on = None
+
+
+def _metric_columns():
+    count_columns = (
+        'application_count',
+        'completed_count',
+        'active_count',
+        'delayed_count',
+        'delay_days',
+        'subtask_count',
+        'completed_subtask_count',
+        'blocked_count',
+    )
+    columns = [sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in count_columns]
+    columns.extend([
+        sa.Column('progress', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('completion_rate', sa.Float(), nullable=False, server_default='0'),
+    ])
+    return columns
+
+
+def upgrade() -> None:
+    op.create_table(
+        'metric_snapshots',
+        sa.Column('scope', sa.String(length=20), nullable=False),
+        sa.Column('scope_key', sa.String(length=100), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        *_metric_columns(),
+        sa.PrimaryKeyConstraint('scope', 'scope_key', 'snapshot_date'),
+        postgresql_partition_by='RANGE (snapshot_date)'
+    )
+
+    op.create_table(
+        'metric_rollups',
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('scope', sa.String(length=20), nullable=False),
+        sa.Column('scope_key', sa.String(length=100), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('period_end', sa.Date(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('progress_avg', sa.Float(), nullable=False, server_default='0'),
+        *_metric_columns(),
+        sa.PrimaryKeyConstraint('granularity', 'scope', 'scope_key', 'period_start')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('metric_rollups')
+    # Drops the monthly partitions with it
+    op.drop_table('metric_snapshots')
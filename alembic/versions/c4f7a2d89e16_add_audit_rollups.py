@@ -0,0 +1,58 @@
+"""add_audit_rollups
+
+Revision ID: c4f7a2d89e16
+Revises: b8e4f1a26c53
+Create Date: 2025-11-12 11:20:54.630118
+
+Precomputed audit statistics, maintained by `make audit-rollups`:
+- audit_hourly_rollups: audit log counts per hour, table, operation and user
+  (0 for system operations), plus UPDATE rows missing changed_fields
+- audit_bulk_minutes: minutes in which one user wrote more than
+  AUDIT_BULK_MINUTE_THRESHOLD audit logs
+- audit_rollup_state: watermark up to which the hours are rolled up; the
+  first refresh rolls up the existing audit_logs
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f7a2d89e16'
+down_revision = 'b8e4f1a26c53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'audit_hourly_rollups',
+        sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('table_name', sa.String(length=50), nullable=False),
+        sa.Column('operation', sa.String(length=20), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('log_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('missing_fields_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('hour', 'table_name', 'operation', 'user_id')
+    )
+    op.create_table(
+        'audit_bulk_minutes',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('minute', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('log_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'minute')
+    )
+    op.create_index('ix_audit_bulk_minutes_minute', 'audit_bulk_minutes', ['minute'], unique=False)
+    op.create_table(
+        'audit_rollup_state',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('rolled_through', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('audit_rollup_state')
+    op.drop_index('ix_audit_bulk_minutes_minute', table_name='audit_bulk_minutes')
+    op.drop_table('audit_bulk_minutes')
+    op.drop_table('audit_hourly_rollups')
@@ -0,0 +1,64 @@
+"""add_audit_checkpoints
+
+Revision ID: e5a7c2d94b16
+Revises: c3d8e1f47a29
+Create Date: 2025-11-05 10:22:48.117304
+
+Support point-in-time (as-of) reconstruction from the audit trail:
+- audit_checkpoints / audit_checkpoint_records: periodic copies of the
+  audited tables, created with `make audit-checkpoint`
+- audit_logs (table_name, record_id, created_at): per-record delta scans
+  from a checkpoint to the requested time
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c2d94b16'
+down_revision = 'c3d8e1f47a29'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'audit_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(length=50), nullable=False),
+        sa.Column('checkpoint_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('record_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_checkpoints_id', 'audit_checkpoints', ['id'], unique=False)
+    op.create_index(
+        'ix_audit_checkpoints_table_at',
+        'audit_checkpoints',
+        ['table_name', 'checkpoint_at'],
+        unique=False
+    )
+
+    op.create_table(
+        'audit_checkpoint_records',
+        sa.Column('checkpoint_id', sa.Integer(), nullable=False),
+        sa.Column('record_id', sa.Integer(), nullable=False),
+        sa.Column('state', sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(['checkpoint_id'], ['audit_checkpoints.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('checkpoint_id', 'record_id')
+    )
+
+    op.create_index(
+        'ix_audit_logs_table_record_created',
+        'audit_logs',
+        ['table_name', 'record_id', 'created_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_table_record_created', table_name='audit_logs')
+    op.drop_table('audit_checkpoint_records')
+    op.drop_index('ix_audit_checkpoints_table_at', table_name='audit_checkpoints')
+    op.drop_index('ix_audit_checkpoints_id', table_name='audit_checkpoints')
+    op.drop_table('audit_checkpoints')
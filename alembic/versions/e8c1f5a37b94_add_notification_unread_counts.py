@@ -0,0 +1,65 @@
+"""add_notification_unread_counts
+
+Revision ID: e8c1f5a37b94
+Revises: d6b3e8f15a72
+Create Date: 2025-11-17 14:05:32.904166
+
+Persisted in-app notifications:
+- notifications.priority / content / read_at: what in-app delivery stores
+- ix_notifications_user_unread: partial index on (user_id) WHERE NOT is_read
+- ix_notifications_user_created: per-user listing, newest first
+- notification_unread_counts: unread notifications per user, maintained
+  with the notifications and backfilled here from the existing rows
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c1f5a37b94'
+down_revision = 'd6b3e8f15a72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('priority', sa.String(length=20), nullable=True))
+    op.add_column('notifications', sa.Column('content', sa.JSON(), nullable=True))
+    op.add_column('notifications', sa.Column('read_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_notifications_user_unread',
+        'notifications',
+        ['user_id'],
+        unique=False,
+        postgresql_where=sa.text('is_read = false')
+    )
+    op.create_index(
+        'ix_notifications_user_created',
+        'notifications',
+        ['user_id', 'created_at'],
+        unique=False
+    )
+
+    op.create_table(
+        'notification_unread_counts',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute("""
+        INSERT INTO notification_unread_counts (user_id, unread_count)
+        SELECT user_id, COUNT(*) FROM notifications
+        WHERE is_read = false AND user_id IS NOT NULL
+        GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('notification_unread_counts')
+    op.drop_index('ix_notifications_user_created', table_name='notifications')
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_column('notifications', 'read_at')
+    op.drop_column('notifications', 'content')
+    op.drop_column('notifications', 'priority')
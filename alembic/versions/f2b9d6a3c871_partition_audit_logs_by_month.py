@@ -0,0 +1,121 @@
+"""partition_audit_logs_by_month
+
+Revision ID: f2b9d6a3c871
+Revises: e5a7c2d94b16
+Create Date: 2025-11-07 09:41:12.804517
+
+Range-partition audit_logs by month on created_at:
+- the primary key becomes (id, created_at), as partitioning requires;
+  ids keep coming from audit_logs_id_seq
+- one partition per month from the oldest row to AUDIT_PARTITION_MONTHS_AHEAD
+  months ahead, plus audit_logs_default for anything outside them
+- existing rows are copied over, then the indexes are built on the parent
+- later months are created by `make audit-partitions`; retention detaches
+  and drops whole monthly partitions instead of deleting rows
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b9d6a3c871'
+down_revision = 'e5a7c2d94b16'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id, table_name, record_id, operation, old_values, new_values, changed_fields, "
+    "request_id, user_ip, user_agent, reason, extra_data, user_id, created_at"
+)
+
+INDEXES = (
+    ('ix_audit_logs_id', ['id']),
+    ('ix_audit_logs_table_name', ['table_name']),
+    ('ix_audit_logs_record_id', ['record_id']),
+    ('ix_audit_logs_operation', ['operation']),
+    ('ix_audit_logs_request_id', ['request_id']),
+    ('ix_audit_logs_created_at', ['created_at']),
+    ('ix_audit_logs_table_record_created', ['table_name', 'record_id', 'created_at']),
+)
+
+
+def _create_table(partitioned: bool) -> None:
+    # Column types and nullability as in create_tables.sql, so every existing row fits;
+    # only created_at becomes NOT NULL as part of the partition key
+    primary_key = "PRIMARY KEY (id, created_at)" if partitioned else "PRIMARY KEY (id)"
+    partition_by = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    op.execute(f"""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            table_name VARCHAR(100),
+            record_id INTEGER,
+            operation VARCHAR(50),
+            old_values JSON,
+            new_values JSON,
+            changed_fields JSON,
+            request_id VARCHAR(100),
+            user_ip VARCHAR(50),
+            user_agent TEXT,
+            reason TEXT,
+            extra_data JSON,
+            user_id INTEGER REFERENCES users (id),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            {primary_key}
+        ){partition_by}
+    """)
+
+
+def _replace_table(partitioned: bool) -> None:
+    """Rebuild audit_logs, keeping its rows and id sequence."""
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_old")
+    op.execute("ALTER TABLE audit_logs_old RENAME CONSTRAINT audit_logs_pkey TO audit_logs_old_pkey")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+
+    _create_table(partitioned)
+
+    if partitioned:
+        # Monthly partitions (bounds in UTC) from the oldest row to MONTHS_AHEAD months ahead
+        op.execute(f"""
+            DO $$
+            DECLARE
+                month_start timestamptz := date_trunc(
+                    'month', COALESCE((SELECT min(created_at) FROM audit_logs_old), now()) AT TIME ZONE 'UTC'
+                ) AT TIME ZONE 'UTC';
+                last_month timestamptz := date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+                    + interval '{MONTHS_AHEAD} months';
+            BEGIN
+                WHILE month_start <= last_month LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                        to_char(month_start AT TIME ZONE 'UTC', '"audit_logs_y"YYYY"m"MM'),
+                        month_start,
+                        month_start + interval '1 month'
+                    );
+                    month_start := month_start + interval '1 month';
+                END LOOP;
+            END $$
+        """)
+        op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    # Rows without created_at (tables created from create_tables.sql) land in the default partition
+    op.execute(f"""
+        INSERT INTO audit_logs ({COLUMNS})
+        SELECT {COLUMNS.replace('created_at', "COALESCE(created_at, 'epoch')")}
+        FROM audit_logs_old
+    """)
+    op.execute("DROP TABLE audit_logs_old")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+
+    for name, columns in INDEXES:
+        op.create_index(name, 'audit_logs', columns, unique=False)
+
+
+def upgrade() -> None:
+    _replace_table(partitioned=True)
+
+
+def downgrade() -> None:
+    # Copies every partition back into a single table
+    _replace_table(partitioned=False)
@@ -0,0 +1,38 @@
+"""add_scheduled_notification_ledger
+
+Revision ID: f3d8a6c21e57
+Revises: e8c1f5a37b94
+Create Date: 2025-11-18 10:12:47.318205
+
+Dedup ledger for the scheduled notification scanner:
+- scheduled_notification_ledger: one row per (application, kind,
+  threshold, planned date) already notified, claimed before sending so a
+  second run of the job skips it
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3d8a6c21e57'
+down_revision = 'e8c1f5a37b94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduled_notification_ledger',
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=30), nullable=False),
+        sa.Column('threshold', sa.Integer(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('application_id', 'kind', 'threshold', 'due_date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scheduled_notification_ledger')
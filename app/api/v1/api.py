@@ -18,7 +18,8 @@ from app.api.v1.endpoints import (
     task_assignments,
     announcements,
     mcp,
-    cmdb
+    cmdb,
+    events
 )
 
 api_router = APIRouter()
@@ -37,4 +38,5 @@ api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
 api_router.include_router(mcp.router, prefix="/mcp", tags=["mcp"])
-api_router.include_router(cmdb.router, prefix="/cmdb", tags=["cmdb"])
\ No newline at end of file
+api_router.include_router(cmdb.router, prefix="/cmdb", tags=["cmdb"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
\ No newline at end of file
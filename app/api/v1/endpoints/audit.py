@@ -3,7 +3,6 @@ Audit Log API endpoints
 """
 
 import time
-import io
 from typing import Optional, List
 from datetime import date, datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
@@ -20,13 +19,41 @@ from app.schemas.audit import (
     RecordHistoryResponse, UserActivityResponse, AuditStatistics,
     DataChangesSummary, ComplianceReport, AuditCleanupRequest,
     AuditCleanupResult, AuditHealthCheck, RollbackRequest, RollbackResponse,
-    AuditExportRequest, AuditExportResponse
+    AuditExportRequest, AuditExportResponse, AsOfRecord, AsOfStateResponse
 )
+from app.services.audit_replay_service import audit_replay_service
+from app.utils.pagination import decode_cursor
 
 router = APIRouter()
 audit_service = AuditService()
 
 
+def _audit_log_item(log) -> AuditLogResponse:
+    """Build the list response item of an audit log."""
+    return AuditLogResponse(
+        id=log.id,
+        table_name=log.table_name,
+        record_id=log.record_id,
+        operation=log.operation,
+        old_values=log.old_values,
+        new_values=log.new_values,
+        changed_fields=log.changed_fields,
+        request_id=log.request_id,
+        user_ip=log.user_ip,
+        user_agent=log.user_agent,
+        reason=log.reason,
+        metadata=log.extra_data,
+        user_id=log.user_id,
+        username=log.user.username if log.user else None,
+        user_full_name=log.user.full_name if log.user else None,
+        created_at=log.created_at,
+        is_insert=log.is_insert,
+        is_update=log.is_update,
+        is_delete=log.is_delete,
+        field_changes=log.get_field_changes()
+    )
+
+
 @router.get("/", response_model=AuditLogListResponse)
 async def list_audit_logs(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
@@ -38,64 +65,72 @@ async def list_audit_logs(
     start_date: Optional[date] = Query(None, description="Filter by start date"),
     end_date: Optional[date] = Query(None, description="Filter by end date"),
     search: Optional[str] = Query(None, description="Search in reason, user agent, or request ID"),
+    pagination: str = Query("offset", regex="^(offset|cursor)$", description="offset (skip/limit) or cursor"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (implies cursor pagination)"),
+    count: str = Query("none", regex="^(exact|estimated|none)$", description="Total count for cursor pagination"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER]))
 ):
-    """List audit logs with filtering and pagination."""
+    """
+    List audit logs with filtering and pagination.
+
+    Offset pagination (default) returns page numbers and an exact total.
+    Cursor pagination (pagination=cursor, then cursor=<next_cursor>) keeps
+    deep pages as fast as the first, and only counts when asked to.
+    """
+    filters = dict(
+        table_name=table_name,
+        record_id=record_id,
+        operation=operation,
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        search=search
+    )
 
     try:
+        if pagination == "cursor" or cursor:
+            audit_logs, next_cursor, total = await audit_service.list_audit_logs_page(
+                db=db,
+                limit=limit,
+                cursor=cursor,
+                count=count,
+                **filters
+            )
+
+            return AuditLogListResponse(
+                total=total,
+                page_size=limit,
+                total_pages=(total + limit - 1) // limit if total is not None else None,
+                items=[_audit_log_item(log) for log in audit_logs],
+                next_cursor=next_cursor,
+                total_is_estimate=count == "estimated"
+            )
+
         audit_logs, total = await audit_service.list_audit_logs(
             db=db,
             skip=skip,
             limit=limit,
-            table_name=table_name,
-            record_id=record_id,
-            operation=operation,
-            user_id=user_id,
-            start_date=start_date,
-            end_date=end_date,
-            search=search
+            **filters
         )
 
         # Calculate pagination info
         total_pages = (total + limit - 1) // limit
         page = (skip // limit) + 1
 
-        # Transform to response format
-        items = []
-        for log in audit_logs:
-            item = AuditLogResponse(
-                id=log.id,
-                table_name=log.table_name,
-                record_id=log.record_id,
-                operation=log.operation,
-                old_values=log.old_values,
-                new_values=log.new_values,
-                changed_fields=log.changed_fields,
-                request_id=log.request_id,
-                user_ip=log.user_ip,
-                user_agent=log.user_agent,
-                reason=log.reason,
-                metadata=log.extra_data,
-                user_id=log.user_id,
-                username=log.user.username if log.user else None,
-                user_full_name=log.user.full_name if log.user else None,
-                created_at=log.created_at,
-                is_insert=log.is_insert,
-                is_update=log.is_update,
-                is_delete=log.is_delete,
-                field_changes=log.get_field_changes()
-            )
-            items.append(item)
-
         return AuditLogListResponse(
             total=total,
             page=page,
             page_size=limit,
             total_pages=total_pages,
-            items=items
+            items=[_audit_log_item(log) for log in audit_logs]
         )
 
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -103,6 +138,64 @@ async def list_audit_logs(
         )
 
 
+@router.get("/as-of", response_model=AsOfStateResponse)
+async def get_state_as_of(
+    table_name: str = Query(..., description="Audited table (applications or sub_tasks)"),
+    as_of: datetime = Query(..., description="Point in time (UTC if no offset is given)"),
+    record_id: List[int] = Query(..., description="Record IDs to reconstruct"),
+    include_subtasks: bool = Query(False, description="Include each application's subtasks"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER, UserRole.EDITOR]))
+):
+    """Reconstruct records as they were at a point in time from checkpoints and the audit trail."""
+    if len(record_id) > 1000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At most 1000 record IDs can be reconstructed per request"
+        )
+
+    try:
+        state = await audit_replay_service.get_state_as_of(
+            db=db,
+            table_name=table_name,
+            as_of=as_of,
+            record_ids=record_id
+        )
+
+        subtasks = None
+        if include_subtasks and table_name == "applications":
+            subtasks = await audit_replay_service.get_subtasks_as_of(db, record_id, as_of)
+
+        records = []
+        for rid in sorted(set(record_id)):
+            values = state["records"].get(rid)
+            records.append(AsOfRecord(
+                record_id=rid,
+                exists=values is not None,
+                state=values,
+                subtasks=subtasks.get(rid) if subtasks is not None and values is not None else None
+            ))
+
+        return AsOfStateResponse(
+            table_name=table_name,
+            as_of=state["as_of"],
+            checkpoint_at=state["checkpoint_at"],
+            replayed_changes=state["replayed_changes"],
+            records=records
+        )
+
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to reconstruct state: {str(e)}"
+        )
+
+
 @router.get("/{audit_log_id}", response_model=AuditLogResponse)
 async def get_audit_log(
     audit_log_id: int,
@@ -372,88 +465,79 @@ async def export_audit_trail(
 
     Supported formats:
     - json: Returns data as JSON response
-    - csv: Returns downloadable CSV file
-    - excel: Returns downloadable Excel file with summary
-    """
-    try:
-        export_format = export_request.format.lower()
-
-        # Apply filters from request
-        table_name = export_request.table_name
-        record_id = export_request.record_id
-        user_id = export_request.user_id
-        operation = export_request.operation
-        start_date = export_request.start_date
-        end_date = export_request.end_date
-
-        if export_format == "csv":
-            # Export to CSV
-            csv_data = await audit_service.export_audit_trail_to_csv(
-                db=db,
-                table_name=table_name,
-                record_id=record_id,
-                user_id=user_id,
-                operation=operation,
-                start_date=start_date,
-                end_date=end_date
-            )
+    - csv: Streams a CSV file
+    - ndjson: Streams newline-delimited JSON records
+    - excel: Streams an Excel file
 
-            filename = f"audit_trail_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-            return StreamingResponse(
-                io.BytesIO(csv_data),
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}",
-                    "Content-Type": "text/csv; charset=utf-8"
-                }
-            )
-
-        elif export_format == "excel":
-            # Export to Excel
-            excel_data = await audit_service.export_audit_trail_to_excel(
-                db=db,
-                table_name=table_name,
-                record_id=record_id,
-                user_id=user_id,
-                operation=operation,
-                start_date=start_date,
-                end_date=end_date
-            )
-
-            filename = f"audit_trail_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            return StreamingResponse(
-                io.BytesIO(excel_data),
-                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}",
-                    "Content-Type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                }
-            )
-
-        else:  # Default to JSON
-            # Export as JSON
-            export_data = await audit_service.export_audit_trail(
-                db=db,
-                table_name=table_name,
-                record_id=record_id,
-                start_date=start_date,
-                end_date=end_date
-            )
+    Rows are exported in (created_at, id) order. CSV and NDJSON records carry
+    a cursor; pass the last one received as `cursor` to resume an
+    interrupted export.
+    """
+    from app.db.session import AsyncSessionLocal
+
+    export_format = export_request.format.lower()
+    filters = {
+        "table_name": export_request.table_name,
+        "record_id": export_request.record_id,
+        "user_id": export_request.user_id,
+        "operation": export_request.operation,
+        "start_date": export_request.start_date,
+        "end_date": export_request.end_date,
+        "cursor": export_request.cursor
+    }
+
+    if export_request.cursor:
+        # Reject a bad cursor before the response starts streaming
+        try:
+            decode_cursor(export_request.cursor, (datetime, int))
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    streams = {
+        "csv": (audit_service.stream_audit_trail_csv, "text/csv; charset=utf-8", "csv"),
+        "ndjson": (audit_service.stream_audit_trail_ndjson, "application/x-ndjson", "ndjson"),
+        "excel": (
+            audit_service.stream_audit_trail_excel,
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            "xlsx"
+        ),
+    }
+
+    if export_format in streams:
+        stream, media_type, extension = streams[export_format]
+
+        async def export_stream():
+            # The stream outlives the request dependencies, so it owns its session
+            async with AsyncSessionLocal() as export_db:
+                async for chunk in stream(export_db, **filters):
+                    yield chunk
+
+        filename = f"audit_trail_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+        return StreamingResponse(
+            export_stream(),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
 
-            return AuditExportResponse(
-                export_format="json",
-                total_records=len(export_data),
-                export_timestamp=datetime.utcnow(),
-                filters_applied={
-                    "table_name": table_name,
-                    "record_id": record_id,
-                    "user_id": user_id,
-                    "operation": operation.value if operation else None,
-                    "start_date": start_date.isoformat() if start_date else None,
-                    "end_date": end_date.isoformat() if end_date else None
-                },
-                data=export_data
-            )
+    try:
+        # Default to JSON
+        export_data = await audit_service.export_audit_trail(db=db, **filters)
+
+        return AuditExportResponse(
+            export_format="json",
+            total_records=len(export_data),
+            export_timestamp=datetime.utcnow(),
+            filters_applied={
+                "table_name": filters["table_name"],
+                "record_id": filters["record_id"],
+                "user_id": filters["user_id"],
+                "operation": filters["operation"].value if filters["operation"] else None,
+                "start_date": filters["start_date"].isoformat() if filters["start_date"] else None,
+                "end_date": filters["end_date"].isoformat() if filters["end_date"] else None,
+                "cursor": filters["cursor"]
+            },
+            data=export_data
+        )
 
     except Exception as e:
         raise HTTPException(
@@ -500,25 +584,13 @@ async def cleanup_old_audit_logs(
     try:
         start_time = time.time()
 
-        if cleanup_request.dry_run:
-            # Count logs that would be deleted
-            from datetime import timedelta
-            cutoff_date = date.today() - timedelta(days=cleanup_request.days_to_keep)
-
-            from sqlalchemy import func, select
-            count_result = await db.execute(
-                select(func.count(audit_service.model.id))
-                .where(audit_service.model.created_at < cutoff_date)
-            )
-            logs_identified = count_result.scalar()
-            logs_deleted = 0
-        else:
-            # Actually delete logs
-            logs_deleted = await audit_service.cleanup_old_logs(
-                db=db,
-                days_to_keep=cleanup_request.days_to_keep
-            )
-            logs_identified = logs_deleted
+        # Partitioned audit_logs are cleaned up by whole months
+        logs_identified = await audit_service.cleanup_old_logs(
+            db=db,
+            days_to_keep=cleanup_request.days_to_keep,
+            dry_run=cleanup_request.dry_run
+        )
+        logs_deleted = 0 if cleanup_request.dry_run else logs_identified
 
         execution_time = int((time.time() - start_time) * 1000)
 
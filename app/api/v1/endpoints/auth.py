@@ -25,10 +25,15 @@ from app.core.config import settings
 router = APIRouter()
 
 
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else ""
+
+
 @router.post("/sso/callback", response_model=Token)
 async def sso_callback(
     *,
     db: AsyncSession = Depends(deps.get_db),
+    request: Request,
     callback_data: SSOCallback
 ) -> Token:
     """
@@ -51,12 +56,20 @@ async def sso_callback(
             success=True,
             ip_address=callback_data.ip_address
         )
-        
+
+        session_id = await auth_service.create_session(
+            db,
+            result["user"],
+            ip_address=callback_data.ip_address or _client_ip(request),
+            user_agent=request.headers.get("user-agent", "")
+        )
+
         return Token(
             access_token=result["access_token"],
             refresh_token=result["refresh_token"],
             token_type="bearer",
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            session_id=session_id
         )
         
     except Exception as e:
@@ -70,6 +83,7 @@ async def sso_callback(
 async def login(
     *,
     db: AsyncSession = Depends(deps.get_db),
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Token:
     """
@@ -95,12 +109,16 @@ async def login(
     # Create tokens
     access_token = await auth_service.create_access_token(user)
     refresh_token = await auth_service.create_refresh_token(user)
-    
+    session_id = await auth_service.create_session(
+        db, user, ip_address=_client_ip(request), user_agent=request.headers.get("user-agent", "")
+    )
+
     return Token(
         access_token=access_token,
         refresh_token=refresh_token,
         token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        session_id=session_id
     )
 
 
@@ -144,9 +162,12 @@ async def logout(
     """
     Logout user and invalidate session.
     """
-    # Logout and invalidate session
-    if session_id:
-        await auth_service.logout(db=db, session_id=session_id)
+    # Logout and invalidate session; only the user's own sessions can be ended
+    if session_id and not await auth_service.logout(db=db, session_id=session_id, user_id=current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
     
     # Log logout event
     await auth_service.log_authentication_event(
@@ -159,6 +180,27 @@ async def logout(
     return {"message": "Successfully logged out"}
 
 
+@router.post("/logout-all")
+async def logout_all(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+) -> dict:
+    """
+    Invalidate every session of the current user.
+    """
+    ended = await auth_service.logout_all(db=db, user_id=current_user.id)
+
+    await auth_service.log_authentication_event(
+        db=db,
+        user=current_user,
+        event_type="logout_all",
+        success=True
+    )
+
+    return {"message": "Successfully logged out of all sessions", "sessions_ended": ended}
+
+
 @router.get("/me", response_model=UserInfo)
 async def get_current_user(
     current_user: User = Depends(deps.get_current_active_user)
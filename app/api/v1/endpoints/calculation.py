@@ -8,8 +8,10 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status, Background
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user, require_roles
+from app.core.cache import response_cache
 from app.models.user import User, UserRole
 from app.services.calculation_engine import CalculationEngine
+from app.services.trend_service import trend_service
 from app.schemas.calculation import (
     ProjectMetrics, CompletionPrediction, BottleneckAnalysis,
     RecalculationRequest, RecalculationResult, ApplicationMetrics
@@ -80,7 +82,11 @@ async def get_project_metrics(
 ):
     """Get comprehensive project metrics."""
     try:
-        metrics = await calculation_engine.calculate_project_metrics(db)
+        metrics = await response_cache.get_or_set(
+            "calculation:metrics",
+            {},
+            lambda: calculation_engine.calculate_project_metrics(db)
+        )
         return ProjectMetrics(**metrics)
     except Exception as e:
         raise HTTPException(
@@ -97,7 +103,11 @@ async def predict_completion_date(
 ):
     """Predict completion date for an application."""
     try:
-        prediction = await calculation_engine.predict_completion_dates(db, application_id)
+        prediction = await response_cache.get_or_set(
+            "calculation:predict",
+            {"application_id": application_id},
+            lambda: calculation_engine.predict_completion_dates(db, application_id)
+        )
         return CompletionPrediction(**prediction)
     except NotFoundError:
         raise HTTPException(
@@ -118,7 +128,11 @@ async def identify_bottlenecks(
 ):
     """Identify project bottlenecks and risks."""
     try:
-        bottlenecks = await calculation_engine.identify_bottlenecks(db)
+        bottlenecks = await response_cache.get_or_set(
+            "calculation:bottlenecks",
+            {},
+            lambda: calculation_engine.identify_bottlenecks(db)
+        )
         return BottleneckAnalysis(**bottlenecks)
     except Exception as e:
         raise HTTPException(
@@ -184,6 +198,7 @@ async def calculation_engine_health(
             "execution_time_ms": execution_time,
             "total_applications": metrics.get("applications", {}).get("total", 0),
             "total_subtasks": metrics.get("subtasks", {}).get("total", 0),
+            "cache": response_cache.stats(),
             "timestamp": time.time()
         }
 
@@ -197,18 +212,29 @@ async def calculation_engine_health(
 @router.post("/refresh-cache", status_code=status.HTTP_200_OK)
 async def refresh_calculation_cache(
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER]))
 ):
     """Refresh calculation cache in background."""
 
+    if calculation_engine.recalculation_progress.get("status") == "running":
+        return {
+            "message": "Cache refresh already running",
+            "status": "running",
+            "progress": calculation_engine.recalculation_progress
+        }
+
     async def refresh_task():
         """Background task to refresh calculations."""
-        try:
-            await calculation_engine.recalculate_all_applications(db)
-        except Exception as e:
-            # Log error in production environment
-            print(f"Background cache refresh failed: {str(e)}")
+        # Use a dedicated session: the request session is closed once the response is sent
+        from app.db.session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            try:
+                await calculation_engine.recalculate_all_applications(db)
+            except Exception as e:
+                await db.rollback()
+                # Log error in production environment
+                print(f"Background cache refresh failed: {str(e)}")
 
     background_tasks.add_task(refresh_task)
 
@@ -218,6 +244,14 @@ async def refresh_calculation_cache(
     }
 
 
+@router.get("/refresh-cache/status", status_code=status.HTTP_200_OK)
+async def get_refresh_cache_status(
+    current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER]))
+):
+    """Get progress of the latest background recalculation."""
+    return calculation_engine.recalculation_progress
+
+
 @router.get("/performance", status_code=status.HTTP_200_OK)
 async def get_performance_metrics(
     days: int = Query(7, ge=1, le=30, description="Number of days to analyze"),
@@ -232,7 +266,7 @@ async def get_performance_metrics(
             "total_calculations": 150,
             "average_execution_time_ms": 250,
             "success_rate": 99.3,
-            "cache_hit_rate": 85.2,
+            "cache_hit_rate": response_cache.stats()["hit_rate"],
             "bottlenecks_identified": 23,
             "predictions_generated": 89,
             "applications_analyzed": 45,
@@ -258,43 +292,8 @@ async def analyze_trends(
 ):
     """Analyze trends in project metrics."""
     try:
-        # This would typically analyze historical data
-        trends = {
-            "analysis_period_days": period_days,
-            "trends": {
-                "completion_rate": {
-                    "current": 65.2,
-                    "previous": 62.1,
-                    "change_percent": 5.0,
-                    "trend": "improving"
-                },
-                "average_delay_days": {
-                    "current": 12.3,
-                    "previous": 15.7,
-                    "change_percent": -21.7,
-                    "trend": "improving"
-                },
-                "blocked_subtasks_ratio": {
-                    "current": 8.5,
-                    "previous": 11.2,
-                    "change_percent": -24.1,
-                    "trend": "improving"
-                },
-                "resource_efficiency": {
-                    "current": 78.9,
-                    "previous": 74.3,
-                    "change_percent": 6.2,
-                    "trend": "improving"
-                }
-            },
-            "recommendations": [
-                "Continue current optimization strategies",
-                "Focus on reducing blocked subtask ratio further",
-                "Monitor resource allocation efficiency"
-            ]
-        }
-
-        return trends
+        # Compares the first and last daily snapshots of the period
+        return await trend_service.analyze_trends(db, period_days)
 
     except Exception as e:
         raise HTTPException(
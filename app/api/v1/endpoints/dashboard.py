@@ -10,10 +10,12 @@ from sqlalchemy import select, func, and_, or_, case, distinct, text
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import get_db, get_current_user
+from app.core.cache import response_cache
 from app.models.user import User
 from app.models.application import Application, ApplicationStatus, TransformationTarget
 from app.models.subtask import SubTask, SubTaskStatus
 from app.models.audit_log import AuditLog
+from app.services.trend_service import trend_service, TrendScope, Granularity
 
 router = APIRouter()
 
@@ -36,126 +38,139 @@ async def get_dashboard_stats(
     - Blocking information
     """
     try:
-        # Build base query
-        query = select(Application)
-
-        # Apply team filter if provided
-        if team:
-            query = query.where(Application.dev_team == team)
-
-        # Apply period filter if provided
-        if period:
-            period_days = {
-                "week": 7,
-                "month": 30,
-                "quarter": 90,
-                "year": 365
-            }.get(period, 30)
-
-            cutoff_date = datetime.utcnow() - timedelta(days=period_days)
-            query = query.where(Application.updated_at >= cutoff_date)
-
-        # Execute query
-        result = await db.execute(query)
-        applications = result.scalars().all()
-
-        # Calculate statistics
-        total_applications = len(applications)
-        active_applications = sum(
-            1 for app in applications
-            if app.current_status in [
-                ApplicationStatus.DEV_IN_PROGRESS,
-                ApplicationStatus.BIZ_ONLINE
-            ]
-        )
-        completed_applications = sum(
-            1 for app in applications
-            if app.current_status == ApplicationStatus.COMPLETED
+        return await response_cache.get_or_set(
+            "dashboard:stats",
+            {"team": team, "period": period},
+            lambda: _compute_dashboard_stats(db, team, period)
         )
 
-        # ✅ Use accurate completion flags
-        ak_completed_applications = sum(1 for app in applications if app.is_ak_completed)
-        cloud_native_completed_applications = sum(1 for app in applications if app.is_cloud_native_completed)
-        both_completed_applications = sum(
-            1 for app in applications
-            if app.is_ak_completed and app.is_cloud_native_completed
-        )
-
-        # Calculate completion rates
-        ak_target_apps = sum(
-            1 for app in applications
-            if app.overall_transformation_target in ["AK", "AK+云原生"]
-        )
-        cn_target_apps = sum(
-            1 for app in applications
-            if app.overall_transformation_target in ["云原生", "AK+云原生"]
-        )
-
-        ak_completion_rate = (
-            round((ak_completed_applications / ak_target_apps) * 100, 2)
-            if ak_target_apps > 0 else 0.0
-        )
-        cloud_native_completion_rate = (
-            round((cloud_native_completed_applications / cn_target_apps) * 100, 2)
-            if cn_target_apps > 0 else 0.0
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve dashboard statistics: {str(e)}"
         )
 
-        # Get blocked applications count
-        # An application is considered blocked if it has any blocked subtasks
-        blocked_apps = set()
-        if applications:
-            app_ids = [app.id for app in applications]
-            subtask_query = select(SubTask).where(
-                and_(
-                    SubTask.l2_id.in_(app_ids),
-                    SubTask.is_blocked == True
-                )
-            )
-            subtask_result = await db.execute(subtask_query)
-            blocked_subtasks = subtask_result.scalars().all()
-            blocked_apps = {st.l2_id for st in blocked_subtasks}
-
-        blocked_applications = len(blocked_apps)
 
-        # Calculate average progress
-        average_progress = (
-            sum(app.progress_percentage for app in applications) / total_applications
-            if total_applications > 0 else 0
-        )
+async def _compute_dashboard_stats(
+    db: AsyncSession,
+    team: Optional[str],
+    period: Optional[str]
+) -> Dict[str, Any]:
+    """Compute the statistics served by /stats."""
+    # Build base query
+    query = select(Application)
 
-        # Get delayed applications count
-        delayed_applications = sum(1 for app in applications if app.is_delayed)
+    # Apply team filter if provided
+    if team:
+        query = query.where(Application.dev_team == team)
 
-        # Get last update time
-        last_updated = max(
-            (app.updated_at for app in applications),
-            default=datetime.utcnow()
-        )
-
-        return {
-            "total_applications": total_applications,
-            "active_applications": active_applications,
-            "completed_applications": completed_applications,
-            "blocked_applications": blocked_applications,
-            "delayed_applications": delayed_applications,
-            # ✅ Accurate transformation completion metrics
-            "ak_completed_applications": ak_completed_applications,
-            "cloud_native_completed_applications": cloud_native_completed_applications,
-            "both_completed_applications": both_completed_applications,
-            "ak_target_applications": ak_target_apps,
-            "cloud_native_target_applications": cn_target_apps,
-            "ak_completion_rate": ak_completion_rate,
-            "cloud_native_completion_rate": cloud_native_completion_rate,
-            # Other metrics
-            "average_progress": round(average_progress, 2),
-            "last_updated": last_updated.isoformat()
-        }
+    # Apply period filter if provided
+    if period:
+        period_days = {
+            "week": 7,
+            "month": 30,
+            "quarter": 90,
+            "year": 365
+        }.get(period, 30)
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve dashboard statistics: {str(e)}"
+        cutoff_date = datetime.utcnow() - timedelta(days=period_days)
+        query = query.where(Application.updated_at >= cutoff_date)
+
+    # Execute query
+    result = await db.execute(query)
+    applications = result.scalars().all()
+
+    # Calculate statistics
+    total_applications = len(applications)
+    active_applications = sum(
+        1 for app in applications
+        if app.current_status in [
+            ApplicationStatus.DEV_IN_PROGRESS,
+            ApplicationStatus.BIZ_ONLINE
+        ]
+    )
+    completed_applications = sum(
+        1 for app in applications
+        if app.current_status == ApplicationStatus.COMPLETED
+    )
+
+    # ✅ Use accurate completion flags
+    ak_completed_applications = sum(1 for app in applications if app.is_ak_completed)
+    cloud_native_completed_applications = sum(1 for app in applications if app.is_cloud_native_completed)
+    both_completed_applications = sum(
+        1 for app in applications
+        if app.is_ak_completed and app.is_cloud_native_completed
+    )
+
+    # Calculate completion rates
+    ak_target_apps = sum(
+        1 for app in applications
+        if app.overall_transformation_target in ["AK", "AK+云原生"]
+    )
+    cn_target_apps = sum(
+        1 for app in applications
+        if app.overall_transformation_target in ["云原生", "AK+云原生"]
+    )
+
+    ak_completion_rate = (
+        round((ak_completed_applications / ak_target_apps) * 100, 2)
+        if ak_target_apps > 0 else 0.0
+    )
+    cloud_native_completion_rate = (
+        round((cloud_native_completed_applications / cn_target_apps) * 100, 2)
+        if cn_target_apps > 0 else 0.0
+    )
+
+    # Get blocked applications count
+    # An application is considered blocked if it has any blocked subtasks
+    blocked_apps = set()
+    if applications:
+        app_ids = [app.id for app in applications]
+        subtask_query = select(SubTask).where(
+            and_(
+                SubTask.l2_id.in_(app_ids),
+                SubTask.is_blocked == True
+            )
         )
+        subtask_result = await db.execute(subtask_query)
+        blocked_subtasks = subtask_result.scalars().all()
+        blocked_apps = {st.l2_id for st in blocked_subtasks}
+
+    blocked_applications = len(blocked_apps)
+
+    # Calculate average progress
+    average_progress = (
+        sum(app.progress_percentage for app in applications) / total_applications
+        if total_applications > 0 else 0
+    )
+
+    # Get delayed applications count
+    delayed_applications = sum(1 for app in applications if app.is_delayed)
+
+    # Get last update time
+    last_updated = max(
+        (app.updated_at for app in applications),
+        default=datetime.utcnow()
+    )
+
+    return {
+        "total_applications": total_applications,
+        "active_applications": active_applications,
+        "completed_applications": completed_applications,
+        "blocked_applications": blocked_applications,
+        "delayed_applications": delayed_applications,
+        # ✅ Accurate transformation completion metrics
+        "ak_completed_applications": ak_completed_applications,
+        "cloud_native_completed_applications": cloud_native_completed_applications,
+        "both_completed_applications": both_completed_applications,
+        "ak_target_applications": ak_target_apps,
+        "cloud_native_target_applications": cn_target_apps,
+        "ak_completion_rate": ak_completion_rate,
+        "cloud_native_completion_rate": cloud_native_completion_rate,
+        # Other metrics
+        "average_progress": round(average_progress, 2),
+        "last_updated": last_updated.isoformat()
+    }
 
 
 @router.get("/progress-trend")
@@ -169,8 +184,8 @@ async def get_progress_trend(
     """
     Get historical progress trend data.
 
-    Returns progress trend data points for the specified period.
-    For now, returns current snapshot as we don't have historical tracking yet.
+    Returns one data point per week from the weekly trend rollups (closing
+    values of each week), for an application, a team or the whole portfolio.
     """
     try:
         # Determine date range based on period
@@ -183,95 +198,25 @@ async def get_progress_trend(
         end_date = date.today()
         start_date = end_date - timedelta(days=period_days)
 
-        # Build query for current applications
-        query = select(Application)
-
-        if team:
-            query = query.where(Application.responsible_team == team)
-
         if application_id:
-            query = query.where(Application.id == application_id)
-
-        result = await db.execute(query)
-        applications = result.scalars().all()
-
-        # Since we don't have historical snapshots, we'll generate trend data
-        # based on current state and dates
-        trend_data = []
-
-        # Generate data points for the period
-        # We'll create weekly snapshots for demonstration
-        current_date = start_date
-        interval_days = 7  # Weekly intervals
-
-        while current_date <= end_date:
-            # Calculate progress based on dates
-            # This is a simplified calculation based on planned vs actual dates
-            active_count = 0
-            completed_count = 0
-            total_progress = 0
-            app_count = 0
-
-            for app in applications:
-                # Check if application was active on this date
-                if app.created_at.date() <= current_date:
-                    app_count += 1
-
-                    # Estimate progress at this date
-                    if app.actual_biz_online_date and app.actual_biz_online_date <= current_date:
-                        completed_count += 1
-                        progress = 100
-                    elif app.actual_tech_online_date and app.actual_tech_online_date <= current_date:
-                        progress = 85
-                    elif app.actual_release_date and app.actual_release_date <= current_date:
-                        progress = 60
-                    elif app.actual_requirement_date and app.actual_requirement_date <= current_date:
-                        progress = 30
-                    elif app.planned_requirement_date and app.planned_requirement_date <= current_date:
-                        progress = 15
-                        active_count += 1
-                    else:
-                        progress = 0
-                        if app.overall_status != ApplicationStatus.NOT_STARTED:
-                            active_count += 1
-
-                    total_progress += progress
-
-            # Add data point
-            if app_count > 0:
-                trend_data.append({
-                    "date": current_date.isoformat(),
-                    "progress_percentage": round(total_progress / app_count, 2),
-                    "active_count": active_count,
-                    "completed_count": completed_count
-                })
+            scope, scope_keys = TrendScope.APPLICATION, [str(application_id)]
+        elif team:
+            scope, scope_keys = TrendScope.TEAM, [team]
+        else:
+            scope, scope_keys = TrendScope.OVERALL, [""]
 
-            current_date += timedelta(days=interval_days)
-
-        # Add current state as the last data point
-        if applications:
-            current_active = sum(
-                1 for app in applications
-                if app.overall_status in [
-                    ApplicationStatus.DEV_IN_PROGRESS,
-                    ApplicationStatus.BIZ_ONLINE
-                ]
-            )
-            current_completed = sum(
-                1 for app in applications
-                if app.overall_status == ApplicationStatus.COMPLETED
-            )
-            current_progress = sum(app.progress_percentage for app in applications) / len(applications)
-
-            trend_data.append({
-                "date": end_date.isoformat(),
-                "progress_percentage": round(current_progress, 2),
-                "active_count": current_active,
-                "completed_count": current_completed
-            })
+        series = await trend_service.get_series(db, Granularity.WEEK, start_date, end_date, scope, scope_keys)
 
         return {
-            "trend_data": trend_data
+            "trend_data": [
+                {
+                    "date": point["date"].isoformat(),
+                    "progress_percentage": point["progress"],
+                    "active_count": point["active_count"],
+                    "completed_count": point["completed_count"]
+                }
+                for point in series
+            ]
         }
 
     except Exception as e:
@@ -0,0 +1,141 @@
+"""
+Change event push endpoints (SSE and WebSocket)
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.api import deps
+from app.core.config import settings
+from app.core.event_bus import EventEntity, event_bus
+from app.db.session import AsyncSessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+ENTITIES = {
+    EventEntity.APPLICATION,
+    EventEntity.SUBTASK,
+    EventEntity.ANNOUNCEMENT,
+    EventEntity.NOTIFICATION,
+}
+
+
+def _parse_filters(entities: Optional[str], application_ids: Optional[str]) -> Tuple[Optional[Set[str]], Optional[Set[int]]]:
+    """Comma-separated filter parameters as sets (None means no filter)."""
+    entity_filter = {entity.strip() for entity in entities.split(",") if entity.strip()} if entities else None
+    if entity_filter and not entity_filter <= ENTITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"未知的事件类型: {', '.join(sorted(entity_filter - ENTITIES))}"
+        )
+
+    try:
+        application_filter = (
+            {int(app_id) for app_id in application_ids.split(",") if app_id.strip()} if application_ids else None
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="application_ids 必须是整数")
+
+    return entity_filter, application_filter
+
+
+def _format_sse(change: Dict[str, Any]) -> str:
+    return (
+        f"event: {change['entity']}.{change['action']}\n"
+        f"data: {json.dumps(change, ensure_ascii=False, default=str)}\n\n"
+    )
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    entities: Optional[str] = Query(None, description="逗号分隔的事件类型: application,subtask,announcement,notification"),
+    application_ids: Optional[str] = Query(None, description="逗号分隔的应用ID，只接收这些应用的变更"),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Server-sent change events for the current user.
+
+    Each event is named <entity>.<action> and carries the changed IDs;
+    clients refetch what they display. Idle streams get a keepalive comment
+    every EVENT_STREAM_HEARTBEAT_SECONDS. A client that falls too far behind
+    receives a `dropped` event and the stream ends; it should reload its
+    data and reconnect.
+    """
+    entity_filter, application_filter = _parse_filters(entities, application_ids)
+    subscription = event_bus.subscribe(current_user.id, entity_filter, application_filter)
+
+    async def events():
+        try:
+            yield f"retry: {int(settings.EVENT_STREAM_HEARTBEAT_SECONDS * 1000)}\n\n"
+            while True:
+                try:
+                    change = await subscription.get(settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                if change is None:
+                    yield "event: dropped\ndata: {}\n\n"
+                    break
+                yield _format_sse(change)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    token: str = Query(..., description="访问令牌（浏览器 WebSocket 无法设置请求头）"),
+    entities: Optional[str] = Query(None),
+    application_ids: Optional[str] = Query(None)
+):
+    """
+    Change events over a WebSocket, one JSON object per message.
+
+    Takes the same filters as /stream. Idle connections get {"type": "ping"}
+    every EVENT_STREAM_HEARTBEAT_SECONDS; a client that falls too far behind
+    is closed with code 1013 and should reload its data and reconnect.
+    """
+    try:
+        entity_filter, application_filter = _parse_filters(entities, application_ids)
+        async with AsyncSessionLocal() as db:
+            user = await deps.get_current_user(db=db, token=token)
+        if not user.is_active:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    subscription = event_bus.subscribe(user.id, entity_filter, application_filter)
+    try:
+        while True:
+            try:
+                change = await subscription.get(settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                await websocket.send_json({"type": "ping"})
+                continue
+            if change is None:
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="dropped")
+                break
+            await websocket.send_json(change)
+    except (WebSocketDisconnect, RuntimeError):
+        # Client went away; RuntimeError is sending on a closed socket
+        pass
+    finally:
+        event_bus.unsubscribe(subscription)
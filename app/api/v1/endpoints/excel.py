@@ -6,7 +6,7 @@ import time
 import uuid
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, status
-from fastapi.responses import Response, FileResponse
+from fastapi.responses import Response, FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user, require_roles
@@ -119,120 +119,74 @@ async def export_applications_to_excel(
     data: dict = {},
     current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER, UserRole.EDITOR]))
 ):
-    """Export applications to Excel"""
-    from datetime import datetime, timedelta
-    import uuid
-    import io
-    from openpyxl import Workbook
-    from fastapi.responses import Response
+    """Export applications to Excel (streamed, constant memory)."""
+    from datetime import datetime
+    from app.db.session import AsyncSessionLocal
 
-    try:
-        from sqlalchemy import select
-        from app.models.application import Application
-        from app.db.session import AsyncSessionLocal
+    application_ids = data.get('application_ids')
+    filters = {key: value for key, value in data.items() if key != 'application_ids' and value is not None}
 
-        # Get applications data
+    async def workbook_stream():
+        # The stream outlives the request dependencies, so it owns its session
         async with AsyncSessionLocal() as db:
-            result = await db.execute(select(Application))
-            applications = result.scalars().all()
-
-        # Create Excel workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Applications"
-
-        # Add headers
-        headers = [
-            "ID", "L2_ID", "应用名称", "监管年份", "转型目标",
-            "负责团队", "负责人", "整体状态", "进度百分比",
-            "创建时间", "更新时间"
-        ]
-        ws.append(headers)
-
-        # Add data
-        for app in applications:
-            row = [
-                app.id,
-                app.l2_id,
-                app.app_name,
-                app.ak_supervision_acceptance_year,
-                app.overall_transformation_target,
-                app.dev_team,
-                app.dev_owner or "",
-                app.current_status,
-                app.progress_percentage,
-                app.created_at.isoformat() if app.created_at else "",
-                app.updated_at.isoformat() if app.updated_at else ""
-            ]
-            ws.append(row)
-
-        # Save to memory
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"applications_export_{timestamp}.xlsx"
+            async for chunk in excel_service.stream_applications_export(
+                db=db,
+                application_ids=application_ids,
+                filters=filters
+            ):
+                yield chunk
 
-        # Return file as response
-        return Response(
-            content=output.getvalue(),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+    # Generate filename
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"applications_export_{timestamp}.xlsx"
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to export applications: {str(e)}"
-        )
+    return StreamingResponse(
+        workbook_stream(),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 
 @router.get("/subtasks/export")
 async def export_subtasks_to_excel(
     export_request: SubTaskExportRequest = Depends(),
-    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER, UserRole.EDITOR]))
 ):
-    """Export subtasks to Excel file."""
-
-    try:
-        # Build filters
-        filters = {}
-        if export_request.task_status:
-            filters['task_status'] = export_request.task_status
-        if export_request.sub_target:
-            filters['sub_target'] = export_request.sub_target
-        if export_request.is_blocked is not None:
-            filters['is_blocked'] = export_request.is_blocked
-        if hasattr(export_request, 'dev_owner') and export_request.dev_owner:
-            filters['dev_owner'] = export_request.dev_owner
-
-        # Generate Excel file
-        excel_data = await excel_service.export_subtasks_to_excel(
-            db=db,
-            application_id=export_request.application_id,
-            subtask_ids=export_request.subtask_ids,
-            filters=filters,
-            template_style=export_request.template_style
-        )
-
-        # Generate filename
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        filename = f"subtasks_export_{timestamp}.xlsx"
-
-        return Response(
-            content=excel_data,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to export subtasks: {str(e)}"
-        )
+    """Export subtasks to Excel file (streamed, constant memory)."""
+    from app.db.session import AsyncSessionLocal
+
+    # Build filters
+    filters = {}
+    if export_request.task_status:
+        filters['task_status'] = export_request.task_status
+    if export_request.sub_target:
+        filters['sub_target'] = export_request.sub_target
+    if export_request.is_blocked is not None:
+        filters['is_blocked'] = export_request.is_blocked
+    if hasattr(export_request, 'dev_owner') and export_request.dev_owner:
+        filters['dev_owner'] = export_request.dev_owner
+
+    async def workbook_stream():
+        # The stream outlives the request dependencies, so it owns its session
+        async with AsyncSessionLocal() as db:
+            async for chunk in excel_service.stream_subtasks_export(
+                db=db,
+                application_id=export_request.application_id,
+                subtask_ids=export_request.subtask_ids,
+                filters=filters,
+                template_style=export_request.template_style
+            ):
+                yield chunk
+
+    # Generate filename
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    filename = f"subtasks_export_{timestamp}.xlsx"
+
+    return StreamingResponse(
+        workbook_stream(),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 
 @router.get("/template")
@@ -35,8 +35,11 @@ from app.schemas.notification import (
     NotificationTestResponse,
     NotificationType,
     NotificationChannel,
-    NotificationPriority
+    NotificationPriority,
+    NotificationStatus
 )
+from app.models.notification import Notification
+from app.services.in_app_notification_service import in_app_notification_service
 from app.services.notification_service import NotificationService
 from app.api.deps import check_permission
 
@@ -46,15 +49,41 @@ notification_service = NotificationService()
 
 @router.get("/")
 async def get_notifications_simple(
+    db: AsyncSession = Depends(deps.get_db),
     unread_only: bool = Query(False),
     limit: int = Query(10, ge=1, le=100),
     current_user: User = Depends(deps.get_current_active_user)
 ):
     """
-    Simple notification endpoint that returns empty list.
-    This prevents frontend errors while the full notification system is being implemented.
+    Latest in-app notifications of the current user, newest first.
     """
-    return []
+    _, notifications = await in_app_notification_service.list_notifications(
+        db, current_user.id, limit=limit, is_read=False if unread_only else None
+    )
+    return [
+        {
+            "id": notification.id,
+            "title": notification.title,
+            "message": notification.message,
+            "type": notification.type,
+            "priority": notification.priority,
+            "is_read": bool(notification.is_read),
+            "created_at": notification.created_at,
+            "read_at": notification.read_at
+        }
+        for notification in notifications
+    ]
+
+
+@router.get("/unread-count")
+async def get_unread_count(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+) -> Dict[str, int]:
+    """
+    Unread in-app notifications of the current user (badge count).
+    """
+    return {"unread_count": await in_app_notification_service.get_unread_count(db, current_user.id)}
 
 
 @router.post("/delay-warning", response_model=NotificationResponse)
@@ -319,44 +348,42 @@ async def list_notifications(
     current_user: User = Depends(deps.get_current_active_user)
 ) -> NotificationListResponse:
     """
-    List notifications with filtering and pagination.
+    List in-app notifications with filtering and pagination.
     
     Users can only see their own notifications unless admin.
     """
     # Non-admin users can only see their own notifications
-    if current_user.role != "Admin":
+    if current_user.role != "Admin" or request.user_id is None:
         request.user_id = current_user.id
-    
-    # Mock implementation - would query notification logs in production
-    notifications = []
-    total = 0
-    unread_count = 0
-    
-    # Generate mock data
-    if request.limit > 0:
-        for i in range(min(request.limit, 5)):
-            notifications.append({
-                "log_id": f"log_{i}",
-                "notification_type": NotificationType.STATUS_CHANGE,
-                "recipients": [current_user.email],
-                "channels": [NotificationChannel.EMAIL.value, NotificationChannel.IN_APP.value],
-                "content": {"title": f"测试通知 {i}", "message": "状态已更新"},
-                "status": "delivered" if i % 2 == 0 else "read",
-                "results": {"email": {"success": True}},
-                "created_at": datetime.utcnow(),
-                "delivered_at": datetime.utcnow(),
-                "read_at": datetime.utcnow() if i % 2 == 1 else None,
-                "error_message": None
-            })
-        
-        total = 10
-        unread_count = 5
-    
+
+    is_read = None
+    if request.unread_only or request.status == NotificationStatus.DELIVERED:
+        is_read = False
+    elif request.status == NotificationStatus.READ:
+        is_read = True
+
+    # Only in-app notifications are stored per user
+    if request.channel not in (None, NotificationChannel.IN_APP):
+        total, notifications = 0, []
+    else:
+        total, notifications = await in_app_notification_service.list_notifications(
+            db,
+            request.user_id,
+            skip=request.skip,
+            limit=request.limit,
+            is_read=is_read,
+            notification_type=request.notification_type.value if request.notification_type else None,
+            date_from=request.date_from,
+            date_to=request.date_to,
+            sort_order=request.sort_order
+        )
+    unread_count = await in_app_notification_service.get_unread_count(db, request.user_id)
+
     return NotificationListResponse(
         total=total,
         page=request.skip // request.limit + 1 if request.limit > 0 else 1,
         page_size=request.limit,
-        notifications=notifications,
+        notifications=[_notification_log(notification) for notification in notifications],
         unread_count=unread_count
     )
 
@@ -371,25 +398,48 @@ async def mark_notifications_read(
     """
     Mark notifications as read.
     
-    Can mark specific notifications or all unread notifications.
+    Can mark specific notifications or all unread notifications; either
+    way it is a single UPDATE of the current user's unread rows.
     """
-    # Mock implementation
     if request.mark_all:
-        # Mark all user's notifications as read
-        updated_count = 5  # Mock count
-        notification_ids = [f"notif_{i}" for i in range(updated_count)]
+        updated_ids = await in_app_notification_service.mark_all_read(db, current_user.id)
     else:
-        # Mark specific notifications
-        updated_count = len(request.notification_ids)
-        notification_ids = request.notification_ids
-    
+        try:
+            notification_ids = [int(notification_id) for notification_id in request.notification_ids]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="通知ID格式无效")
+        updated_ids = await in_app_notification_service.mark_read(db, current_user.id, notification_ids)
+
     return NotificationMarkReadResponse(
         success=True,
-        updated_count=updated_count,
-        notification_ids=notification_ids
+        updated_count=len(updated_ids),
+        notification_ids=[str(notification_id) for notification_id in updated_ids]
     )
 
 
+def _notification_log(notification: Notification) -> Dict[str, Any]:
+    """NotificationLog entry of a stored in-app notification."""
+    try:
+        notification_type = NotificationType(notification.type)
+    except ValueError:
+        # Legacy info/warning/error/success rows
+        notification_type = NotificationType.CUSTOM
+
+    return {
+        "log_id": str(notification.id),
+        "notification_type": notification_type,
+        "recipients": [str(notification.user_id)],
+        "channels": [NotificationChannel.IN_APP.value],
+        "content": notification.content or {"title": notification.title, "message": notification.message},
+        "status": NotificationStatus.READ if notification.is_read else NotificationStatus.DELIVERED,
+        "results": {"in_app": {"success": True}},
+        "created_at": notification.created_at,
+        "delivered_at": notification.created_at,
+        "read_at": notification.read_at,
+        "error_message": None
+    }
+
+
 @router.get("/preferences", response_model=NotificationPreferences)
 async def get_notification_preferences(
     *,
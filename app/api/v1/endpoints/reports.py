@@ -11,6 +11,7 @@ from fastapi.responses import Response, FileResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user, require_roles
+from app.core.cache import response_cache
 from app.models.user import User, UserRole
 from app.services.report_service import ReportService, ReportType as ServiceReportType
 from app.schemas.report import (
@@ -54,80 +55,16 @@ async def get_progress_summary_report(
     """Get progress summary report via GET request."""
 
     try:
-        # Get actual data from database
-        from sqlalchemy import select, func
-        from app.models.application import Application, ApplicationStatus
-
-        # Query applications
-        query = select(Application)
-        if supervision_year:
-            query = query.where(Application.ak_supervision_acceptance_year == supervision_year)
-        if dev_team:
-            query = query.where(Application.dev_team == dev_team)
-
-        result = await db.execute(query)
-        applications = result.scalars().all()
-
-        # Calculate statistics
-        total = len(applications)
-        completed = sum(1 for app in applications if app.current_status == ApplicationStatus.COMPLETED)
-        in_progress = sum(1 for app in applications if app.current_status == ApplicationStatus.DEV_IN_PROGRESS)
-        not_started = sum(1 for app in applications if app.current_status == ApplicationStatus.NOT_STARTED)
-        biz_online = sum(1 for app in applications if app.current_status == ApplicationStatus.BIZ_ONLINE)
-        tech_online = 0  # TECH_ONLINE status doesn't exist in the enum
-        delayed = sum(1 for app in applications if app.is_delayed)
-
-        avg_progress = sum(app.progress_percentage for app in applications) / total if total > 0 else 0
-        completion_rate = (completed / total * 100) if total > 0 else 0
-
-        # Group by status
-        status_counts = {}
-        for app in applications:
-            status = app.current_status.value if hasattr(app.current_status, 'value') else str(app.current_status)
-            status_counts[status] = status_counts.get(status, 0) + 1
-
-        # Group by team
-        team_stats = {}
-        for app in applications:
-            team = app.dev_team
-            if team not in team_stats:
-                team_stats[team] = {"count": 0, "total_progress": 0}
-            team_stats[team]["count"] += 1
-            team_stats[team]["total_progress"] += app.progress_percentage
-
-        # Create response matching frontend expectations
-        # Ensure all fields are defined with safe defaults
-        response_data = {
-            "total_applications": int(total) if total is not None else 0,
-            "completed": int(completed) if completed is not None else 0,
-            "in_progress": int(in_progress) if in_progress is not None else 0,
-            "not_started": int(not_started) if not_started is not None else 0,
-            "biz_online": int(biz_online) if biz_online is not None else 0,
-            "tech_online": int(tech_online) if tech_online is not None else 0,
-            "delayed": int(delayed) if delayed is not None else 0,
-            "average_progress": round(float(avg_progress), 1) if avg_progress is not None else 0.0,
-            "completion_rate": round(float(completion_rate), 1) if completion_rate is not None else 0.0,
-            "by_status": [
-                {"status": str(status), "count": int(count)}
-                for status, count in status_counts.items()
-            ] if status_counts else [],
-            "by_team": [
-                {
-                    "team": str(team),
-                    "count": int(stats["count"]),
-                    "average_progress": round(float(stats["total_progress"]) / float(stats["count"]), 1) if stats["count"] > 0 else 0.0
-                }
-                for team, stats in team_stats.items()
-            ] if team_stats else [],
-            "report_type": "progress_summary",
-            "generated_at": datetime.utcnow().isoformat(),
-            "filters": {
-                "start_date": start_date.isoformat() if start_date else None,
-                "end_date": end_date.isoformat() if end_date else None,
+        response_data = await response_cache.get_or_set(
+            "reports:progress_summary_get",
+            {
+                "start_date": start_date,
+                "end_date": end_date,
                 "supervision_year": supervision_year,
                 "dev_team": dev_team
-            }
-        }
+            },
+            lambda: _build_progress_summary(db, start_date, end_date, supervision_year, dev_team)
+        )
 
         # Return with explicit CORS headers
         return JSONResponse(
@@ -170,6 +107,93 @@ async def get_progress_summary_report(
         )
 
 
+async def _build_progress_summary(
+    db: AsyncSession,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    supervision_year: Optional[int],
+    dev_team: Optional[str]
+) -> Dict[str, Any]:
+    """Compute the progress summary served by the GET endpoint."""
+
+    # Get actual data from database
+    from sqlalchemy import select, func
+    from app.models.application import Application, ApplicationStatus
+
+    # Query applications
+    query = select(Application)
+    if supervision_year:
+        query = query.where(Application.ak_supervision_acceptance_year == supervision_year)
+    if dev_team:
+        query = query.where(Application.dev_team == dev_team)
+
+    result = await db.execute(query)
+    applications = result.scalars().all()
+
+    # Calculate statistics
+    total = len(applications)
+    completed = sum(1 for app in applications if app.current_status == ApplicationStatus.COMPLETED)
+    in_progress = sum(1 for app in applications if app.current_status == ApplicationStatus.DEV_IN_PROGRESS)
+    not_started = sum(1 for app in applications if app.current_status == ApplicationStatus.NOT_STARTED)
+    biz_online = sum(1 for app in applications if app.current_status == ApplicationStatus.BIZ_ONLINE)
+    tech_online = 0  # TECH_ONLINE status doesn't exist in the enum
+    delayed = sum(1 for app in applications if app.is_delayed)
+
+    avg_progress = sum(app.progress_percentage for app in applications) / total if total > 0 else 0
+    completion_rate = (completed / total * 100) if total > 0 else 0
+
+    # Group by status
+    status_counts = {}
+    for app in applications:
+        status = app.current_status.value if hasattr(app.current_status, 'value') else str(app.current_status)
+        status_counts[status] = status_counts.get(status, 0) + 1
+
+    # Group by team
+    team_stats = {}
+    for app in applications:
+        team = app.dev_team
+        if team not in team_stats:
+            team_stats[team] = {"count": 0, "total_progress": 0}
+        team_stats[team]["count"] += 1
+        team_stats[team]["total_progress"] += app.progress_percentage
+
+    # Create response matching frontend expectations
+    # Ensure all fields are defined with safe defaults
+    response_data = {
+        "total_applications": int(total) if total is not None else 0,
+        "completed": int(completed) if completed is not None else 0,
+        "in_progress": int(in_progress) if in_progress is not None else 0,
+        "not_started": int(not_started) if not_started is not None else 0,
+        "biz_online": int(biz_online) if biz_online is not None else 0,
+        "tech_online": int(tech_online) if tech_online is not None else 0,
+        "delayed": int(delayed) if delayed is not None else 0,
+        "average_progress": round(float(avg_progress), 1) if avg_progress is not None else 0.0,
+        "completion_rate": round(float(completion_rate), 1) if completion_rate is not None else 0.0,
+        "by_status": [
+            {"status": str(status), "count": int(count)}
+            for status, count in status_counts.items()
+        ] if status_counts else [],
+        "by_team": [
+            {
+                "team": str(team),
+                "count": int(stats["count"]),
+                "average_progress": round(float(stats["total_progress"]) / float(stats["count"]), 1) if stats["count"] > 0 else 0.0
+            }
+            for team, stats in team_stats.items()
+        ] if team_stats else [],
+        "report_type": "progress_summary",
+        "generated_at": datetime.utcnow().isoformat(),
+        "filters": {
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+            "supervision_year": supervision_year,
+            "dev_team": dev_team
+        }
+    }
+
+    return response_data
+
+
 @router.post("/progress-summary", response_model=ProgressSummaryResponse)
 async def generate_progress_summary_report(
     request: ProgressSummaryRequest,
@@ -181,12 +205,21 @@ async def generate_progress_summary_report(
     start_time = time.time()
 
     try:
-        report_data = await report_service.generate_progress_summary_report(
-            db=db,
-            supervision_year=request.supervision_year,
-            dev_team=request.dev_team,
-            transformation_target=request.transformation_target,
-            include_details=request.include_details
+        report_data = await response_cache.get_or_set(
+            "reports:progress_summary",
+            {
+                "supervision_year": request.supervision_year,
+                "dev_team": request.dev_team,
+                "transformation_target": request.transformation_target,
+                "include_details": request.include_details
+            },
+            lambda: report_service.generate_progress_summary_report(
+                db=db,
+                supervision_year=request.supervision_year,
+                dev_team=request.dev_team,
+                transformation_target=request.transformation_target,
+                include_details=request.include_details
+            )
         )
 
         # Add metadata
@@ -222,10 +255,17 @@ async def generate_department_comparison_report(
     start_time = time.time()
 
     try:
-        report_data = await report_service.generate_department_comparison_report(
-            db=db,
-            supervision_year=request.supervision_year,
-            include_subtasks=request.include_subtasks
+        report_data = await response_cache.get_or_set(
+            "reports:department_comparison",
+            {
+                "supervision_year": request.supervision_year,
+                "include_subtasks": request.include_subtasks
+            },
+            lambda: report_service.generate_department_comparison_report(
+                db=db,
+                supervision_year=request.supervision_year,
+                include_subtasks=request.include_subtasks
+            )
         )
 
         # Add metadata
@@ -261,11 +301,19 @@ async def generate_delayed_projects_report(
     start_time = time.time()
 
     try:
-        report_data = await report_service.generate_delayed_projects_report(
-            db=db,
-            supervision_year=request.supervision_year,
-            dev_team=request.dev_team,
-            severity_threshold=request.severity_threshold
+        report_data = await response_cache.get_or_set(
+            "reports:delayed_projects",
+            {
+                "supervision_year": request.supervision_year,
+                "dev_team": request.dev_team,
+                "severity_threshold": request.severity_threshold
+            },
+            lambda: report_service.generate_delayed_projects_report(
+                db=db,
+                supervision_year=request.supervision_year,
+                dev_team=request.dev_team,
+                severity_threshold=request.severity_threshold
+            )
         )
 
         # Add metadata
@@ -301,11 +349,19 @@ async def generate_trend_analysis_report(
     start_time = time.time()
 
     try:
-        report_data = await report_service.generate_trend_analysis_report(
-            db=db,
-            supervision_year=request.supervision_year,
-            time_period=request.time_period.value,
-            metrics=request.metrics
+        report_data = await response_cache.get_or_set(
+            "reports:trend_analysis",
+            {
+                "supervision_year": request.supervision_year,
+                "time_period": request.time_period.value,
+                "metrics": request.metrics
+            },
+            lambda: report_service.generate_trend_analysis_report(
+                db=db,
+                supervision_year=request.supervision_year,
+                time_period=request.time_period.value,
+                metrics=request.metrics
+            )
         )
 
         # Add metadata
@@ -581,7 +637,7 @@ async def report_service_health_check(
             average_generation_time_ms=2800.5,
             total_generated_today=45,
             error_rate_percentage=1.5,
-            cache_hit_rate=75.3
+            cache_hit_rate=response_cache.stats()["hit_rate"]
         )
 
     except Exception as e:
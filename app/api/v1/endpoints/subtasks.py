@@ -58,10 +58,19 @@ async def list_subtasks(
     launch_check_status: Optional[str] = Query(None, description="Filter by launch check status"),
     sort_by: str = Query("updated_at", description="Sort field"),
     order: str = Query("desc", regex="^(asc|desc)$", description="Sort order"),
+    pagination: str = Query("offset", regex="^(offset|cursor)$", description="offset (skip/limit) or cursor"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (implies cursor pagination)"),
+    count: str = Query("none", regex="^(exact|estimated|none)$", description="Total count for cursor pagination"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List subtasks with filtering and pagination."""
+    """
+    List subtasks with filtering and pagination.
+
+    Offset pagination (default) returns page numbers and an exact total.
+    Cursor pagination (pagination=cursor, then cursor=<next_cursor>) keeps
+    deep pages as fast as the first, and only counts when asked to.
+    """
 
     # Create filter object
     filters = SubTaskFilter(
@@ -81,6 +90,25 @@ async def list_subtasks(
     sort = SubTaskSort(sort_by=sort_by, order=order)
 
     try:
+        if pagination == "cursor" or cursor:
+            subtasks, next_cursor, total = await subtask_service.list_subtasks_page(
+                db=db,
+                limit=limit,
+                filters=filters,
+                sort=sort,
+                cursor=cursor,
+                count=count
+            )
+
+            return SubTaskListResponse(
+                total=total,
+                page_size=limit,
+                total_pages=(total + limit - 1) // limit if total is not None else None,
+                items=subtasks,
+                next_cursor=next_cursor,
+                total_is_estimate=count == "estimated"
+            )
+
         subtasks, total = await subtask_service.list_subtasks(
             db=db,
             skip=skip,
@@ -266,11 +294,17 @@ async def bulk_update_subtasks(
     current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER]))
 ):
     """Bulk update multiple subtasks."""
-    updated_count = await subtask_service.bulk_update_subtasks(
-        db=db,
-        bulk_update=bulk_update,
-        updated_by=current_user.id
-    )
+    try:
+        updated_count = await subtask_service.bulk_update_subtasks(
+            db=db,
+            bulk_update=bulk_update,
+            updated_by=current_user.id
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     return {"message": f"Updated {updated_count} subtasks", "updated_count": updated_count}
 
 
@@ -281,11 +315,17 @@ async def bulk_update_status(
     current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER]))
 ):
     """Bulk update status for multiple subtasks."""
-    updated_count = await subtask_service.bulk_update_status(
-        db=db,
-        bulk_status_update=bulk_status_update,
-        updated_by=current_user.id
-    )
+    try:
+        updated_count = await subtask_service.bulk_update_status(
+            db=db,
+            bulk_status_update=bulk_status_update,
+            updated_by=current_user.id
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     return {"message": f"Updated status for {updated_count} subtasks", "updated_count": updated_count}
 
 
@@ -0,0 +1,257 @@
+"""
+Batched audit log writer
+
+Provides:
+- Bounded in-process queue of audit rows, written by a background task in
+  batches (multi-row INSERT, COPY for large batches on PostgreSQL)
+- Flushes on AUDIT_BATCH_SIZE pending rows or every AUDIT_FLUSH_INTERVAL seconds
+- Rows recorded inside a transaction are queued only once it commits
+- Backpressure: callers wait for queue space, then fall back to writing in
+  their own transaction; waits, fallbacks and queue depth are exposed by stats()
+"""
+
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding rows recorded in the session's open transaction
+PENDING_KEY = "akcn_pending_audit_rows"
+
+COPY_COLUMNS = (
+    "table_name", "record_id", "operation", "old_values", "new_values", "changed_fields",
+    "request_id", "user_ip", "user_agent", "reason", "extra_data", "user_id", "created_at",
+)
+JSON_COLUMNS = {"old_values", "new_values", "changed_fields", "extra_data"}
+
+# Errors meaning the database could not be reached; the batch is kept and retried
+RETRYABLE_ERRORS = (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)
+
+
+class AuditWriter:
+    """
+    Writes audit rows off the request path.
+
+    Rows are plain audit_logs column dicts with created_at already set, so the
+    recorded time is when the change happened, not when the batch was written.
+    A batch that fails to write is put back at the head of the queue and
+    retried on the next flush; rows still queued when stop() cannot write
+    them are logged and counted as dropped.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.copy_batches = 0
+        self.failed_batches = 0
+        self.dropped = 0
+        self.backpressure_waits = 0
+        self.backpressure_fallbacks = 0
+        self.high_water = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if not self.running:
+            # Bind the synchronization primitives to the running event loop
+            self._wakeup = asyncio.Event()
+            self._space = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+        if self._queue:
+            logger.error(f"Dropping {len(self._queue)} audit rows that could not be written on shutdown")
+            self.dropped += len(self._queue)
+            self._queue.clear()
+
+    async def wait_for_space(self) -> bool:
+        """
+        Wait until the queue has room for another row.
+
+        Returns False if it is still full after AUDIT_ENQUEUE_TIMEOUT seconds;
+        the caller should then write the row itself.
+        """
+        if len(self._queue) < settings.AUDIT_QUEUE_MAX_SIZE:
+            return True
+
+        self.backpressure_waits += 1
+        self._wakeup.set()
+        deadline = time.monotonic() + settings.AUDIT_ENQUEUE_TIMEOUT
+        while len(self._queue) >= settings.AUDIT_QUEUE_MAX_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.backpressure_fallbacks += 1
+                return False
+            self._space.clear()
+            try:
+                await asyncio.wait_for(self._space.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        return True
+
+    def submit(self, rows: List[Dict[str, Any]]) -> None:
+        """Queue committed audit rows for the next batch."""
+        self._queue.extend(rows)
+        self.enqueued += len(rows)
+        self.high_water = max(self.high_water, len(self._queue))
+        if len(self._queue) >= settings.AUDIT_BATCH_SIZE:
+            self._wakeup.set()
+
+    async def flush(self) -> bool:
+        """
+        Write queued rows in batches of at most AUDIT_BATCH_SIZE.
+
+        Returns False if the database was unreachable and rows remain queued.
+        """
+        async with self._flush_lock:
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), settings.AUDIT_BATCH_SIZE))]
+                self._space.set()
+                started = time.perf_counter()
+                try:
+                    await self._write(batch)
+                except RETRYABLE_ERRORS as e:
+                    logger.error(f"Failed to write {len(batch)} audit rows, will retry: {e}")
+                    self.failed_batches += 1
+                    self._queue.extendleft(reversed(batch))
+                    return False
+                except Exception as e:
+                    # A row the database rejects must not block the rows behind it
+                    logger.error(f"Audit batch rejected, writing its {len(batch)} rows one by one: {e}")
+                    self.failed_batches += 1
+                    await self._write_each(batch)
+                    continue
+                self.last_flush_ms = round((time.perf_counter() - started) * 1000, 1)
+                self.written += len(batch)
+                self.batches += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "mode": settings.AUDIT_WRITE_MODE,
+            "queue_depth": len(self._queue),
+            "queue_max_size": settings.AUDIT_QUEUE_MAX_SIZE,
+            "high_water": self.high_water,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "copy_batches": self.copy_batches,
+            "failed_batches": self.failed_batches,
+            "dropped": self.dropped,
+            "backpressure_waits": self.backpressure_waits,
+            "backpressure_fallbacks": self.backpressure_fallbacks,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            if len(self._queue) < settings.AUDIT_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.AUDIT_FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+
+            if not await self.flush():
+                # Database unavailable; keep the rows and back off
+                await asyncio.sleep(settings.AUDIT_FLUSH_INTERVAL)
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        async with self._get_session_factory()() as session:
+            if (session.get_bind().dialect.name == "postgresql"
+                    and len(batch) >= settings.AUDIT_COPY_MIN_ROWS):
+                await self._copy(session, batch)
+                self.copy_batches += 1
+            else:
+                await session.execute(insert(AuditLog), batch)
+            await session.commit()
+
+    async def _write_each(self, batch: List[Dict[str, Any]]) -> None:
+        for row in batch:
+            try:
+                await self._write([row])
+                self.written += 1
+            except Exception as e:
+                logger.error(f"Dropping audit row for {row['table_name']}#{row['record_id']}: {e}")
+                self.dropped += 1
+
+    async def _copy(self, session, batch: List[Dict[str, Any]]) -> None:
+        """COPY a batch into audit_logs through the session's asyncpg connection."""
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        records = [
+            tuple(
+                json.dumps(row.get(column), default=str)
+                if column in JSON_COLUMNS and row.get(column) is not None
+                else row.get(column)
+                for column in COPY_COLUMNS
+            )
+            for row in batch
+        ]
+        await raw_connection.driver_connection.copy_records_to_table(
+            AuditLog.__tablename__, records=records, columns=list(COPY_COLUMNS)
+        )
+
+    def _get_session_factory(self):
+        if self._session_factory is None:
+            # The request sessions' engine and pool, not a second one
+            from app.db.session import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_committed_rows(session) -> None:
+    rows = session.info.pop(PENDING_KEY, None)
+    if rows:
+        audit_writer.submit(rows)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted_rows(session, transaction) -> None:
+    # Rows of a rolled back (or abandoned) transaction were never committed
+    if transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
+
+
+# Create singleton instance
+audit_writer = AuditWriter()
@@ -0,0 +1,290 @@
+"""
+Response cache for read-heavy report, dashboard and calculation endpoints
+
+Provides:
+- Entries keyed by endpoint namespace plus normalized filter params
+- Tag-based invalidation with versioned tags: every entry key embeds the
+  current version of the tags it depends on, so a write only has to bump
+  the tag and stale entries are simply never read again (they expire by TTL)
+- Redis backend with an in-process fallback while Redis is unavailable
+- Hit/miss counters for the health endpoints
+"""
+
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheTag:
+    """Data sets cached responses depend on; writes bump them."""
+
+    APPLICATIONS = "applications"
+    SUBTASKS = "subtasks"
+
+
+# Tags of responses computed from applications and their subtasks
+PROJECT_DATA_TAGS = (CacheTag.APPLICATIONS, CacheTag.SUBTASKS)
+
+
+class LocalCacheBackend:
+    """In-process TTL store with LRU eviction, used when Redis is unavailable."""
+
+    name = "local"
+
+    def __init__(self, max_entries: int, max_ttl: int):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        now = time.monotonic()
+        values = []
+        for key in keys:
+            if key in self._counters:
+                values.append(str(self._counters[key]))
+                continue
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                self._entries.pop(key, None)
+                values.append(None)
+                continue
+            self._entries.move_to_end(key)
+            values.append(entry[1])
+        return values
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        # Other workers cannot invalidate this process's entries, so keep them short-lived
+        self._entries[key] = (time.monotonic() + min(ttl, self.max_ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._counters.clear()
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisCacheBackend:
+    """Redis store shared by all application workers."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        self.client = aioredis.from_url(
+            url,
+            decode_responses=True,
+            socket_timeout=settings.CACHE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+        )
+
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        return await self.client.mget(keys)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{ResponseCache.KEY_PREFIX}:*")]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class ResponseCache:
+    """
+    Cache of JSON-serializable endpoint responses.
+
+    Redis is used while it answers; on a connection error the cache switches
+    to the in-process backend for CACHE_REDIS_RETRY_SECONDS. Tags bumped
+    during the outage are bumped in Redis again once it is back, so entries
+    written before the outage cannot be served stale.
+    """
+
+    KEY_PREFIX = "akcn:cache"
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.local = LocalCacheBackend(settings.CACHE_LOCAL_MAX_ENTRIES, settings.CACHE_LOCAL_MAX_TTL)
+        self.redis = RedisCacheBackend(redis_url) if redis_url else None
+        self._redis_retry_at = 0.0
+        self._pending_tags: set = set()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def backend(self):
+        """Backend serving the next operation."""
+        return self.redis if self._redis_usable() else self.local
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        producer: Callable[[], Awaitable[Any]],
+        tags: Iterable[str] = PROJECT_DATA_TAGS,
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Return the cached response for namespace and params, computing it on a miss.
+
+        The value is returned in its JSON-compatible form on hits and misses
+        alike, so callers see the same types either way.
+
+        Args:
+            namespace: Endpoint identifier, e.g. "reports:progress_summary"
+            params: Filter params the response depends on
+            producer: Zero-argument coroutine function computing the response
+            tags: Data sets the response depends on
+            ttl: Lifetime in seconds, CACHE_DEFAULT_TTL by default
+        """
+        if not settings.CACHE_ENABLED:
+            return jsonable_encoder(await producer())
+
+        key = await self._entry_key(namespace, params, tags)
+        cached = (await self._call('get_many', [key]))[0]
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        self.misses += 1
+        value = jsonable_encoder(await producer())
+        await self._call(
+            'set',
+            key,
+            json.dumps(value, ensure_ascii=False, separators=(',', ':')),
+            ttl or settings.CACHE_DEFAULT_TTL
+        )
+        return value
+
+    async def invalidate(self, *tags: str) -> None:
+        """Bump the given tags; entries depending on them are no longer read."""
+        if not settings.CACHE_ENABLED:
+            return
+
+        for tag in tags:
+            key = self._tag_key(tag)
+            # Entries cached in-process during an outage depend on the local versions
+            await self.local.incr(key)
+            if self.redis is None:
+                continue
+            if self._redis_usable():
+                try:
+                    await self.redis.incr(key)
+                    continue
+                except (RedisError, OSError) as e:
+                    self._redis_failed(e)
+            self._pending_tags.add(tag)
+
+    async def clear(self) -> None:
+        """Drop every entry and tag version."""
+        await self.local.clear()
+        if self.redis is not None:
+            await self._call('clear')
+
+    async def close(self) -> None:
+        if self.redis is not None:
+            await self.redis.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this worker."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def params_digest(params: Dict[str, Any]) -> str:
+        """Digest of the filter params; None values and key order do not matter."""
+        normalized = jsonable_encoder({key: value for key, value in params.items() if value is not None})
+        payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    async def _entry_key(self, namespace: str, params: Dict[str, Any], tags: Iterable[str]) -> str:
+        tags = sorted(set(tags))
+        versions = await self._call('get_many', [self._tag_key(tag) for tag in tags])
+        version_part = '.'.join(f"{tag}{version or 0}" for tag, version in zip(tags, versions))
+        return f"{self.KEY_PREFIX}:{namespace}:{version_part}:{self.params_digest(params)}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.KEY_PREFIX}:tag:{tag}"
+
+    def _redis_usable(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, error: Exception) -> None:
+        self.errors += 1
+        self._redis_retry_at = time.monotonic() + settings.CACHE_REDIS_RETRY_SECONDS
+        logger.warning(f"Redis cache unavailable, using in-process cache: {error}")
+
+    async def _call(self, operation: str, *args):
+        """Run a backend operation on Redis, falling back to the in-process backend."""
+        if self._redis_usable():
+            try:
+                if self._pending_tags:
+                    await self._replay_pending_tags()
+                return await getattr(self.redis, operation)(*args)
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+        return await getattr(self.local, operation)(*args)
+
+    async def _replay_pending_tags(self) -> None:
+        for tag in sorted(self._pending_tags):
+            await self.redis.incr(self._tag_key(tag))
+        self._pending_tags.clear()
+
+
+def invalidates(*tags: str):
+    """
+    Decorator bumping cache tags after a write method returns.
+
+    Usage:
+        @invalidates(CacheTag.APPLICATIONS)
+        async def update_application(self, db, ...):
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            await response_cache.invalidate(*tags)
+            return result
+        return wrapper
+    return decorator
+
+
+# Create singleton instance
+response_cache = ResponseCache(settings.REDIS_URL or None)
@@ -42,6 +42,125 @@ class Settings(BaseSettings):
         description="Redis connection URL"
     )
 
+    # Response cache settings
+    CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Cache report, dashboard and calculation responses"
+    )
+    CACHE_DEFAULT_TTL: int = Field(
+        default=300,
+        description="Default lifetime of cached responses in seconds"
+    )
+    CACHE_LOCAL_MAX_ENTRIES: int = Field(
+        default=1000,
+        description="Maximum entries of the in-process fallback cache"
+    )
+    CACHE_LOCAL_MAX_TTL: int = Field(
+        default=30,
+        description="Maximum lifetime in seconds of in-process cache entries"
+    )
+    CACHE_REDIS_TIMEOUT: float = Field(
+        default=0.5,
+        description="Redis cache socket timeout in seconds"
+    )
+    CACHE_REDIS_RETRY_SECONDS: int = Field(
+        default=30,
+        description="Seconds to use the in-process cache after a Redis error"
+    )
+
+    # Authenticated user cache settings
+    USER_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Cache resolved users on the authentication path"
+    )
+    USER_CACHE_TTL: int = Field(
+        default=60,
+        description="Lifetime of cached users in seconds"
+    )
+    USER_CACHE_MAX_ENTRIES: int = Field(
+        default=5000,
+        description="Maximum cached users per worker"
+    )
+
+    # Session store settings
+    SESSION_STORE: str = Field(
+        default="auto",
+        description="Session store: redis, memory, or auto (Redis if reachable)"
+    )
+    SESSION_STORE_REPROBE_SECONDS: float = Field(
+        default=30.0,
+        description="Seconds between Redis probes while SESSION_STORE=auto runs on the in-memory fallback"
+    )
+    SESSION_TTL_SECONDS: int = Field(
+        default=8 * 60 * 60,
+        description="Idle lifetime of a login session in seconds"
+    )
+    SESSION_TOUCH_BATCH_SIZE: int = Field(
+        default=100,
+        description="Buffered session activity updates flushed to Redis per pipeline"
+    )
+    SESSION_TOUCH_INTERVAL: float = Field(
+        default=5.0,
+        description="Maximum seconds session activity updates stay buffered"
+    )
+
+    # Audit writer settings
+    AUDIT_WRITE_MODE: str = Field(
+        default="async",
+        description="async: batch audit rows after the business commit; transactional: write them in the business transaction"
+    )
+    AUDIT_QUEUE_MAX_SIZE: int = Field(
+        default=10000,
+        description="Maximum audit rows waiting to be written per worker"
+    )
+    AUDIT_BATCH_SIZE: int = Field(
+        default=500,
+        description="Audit rows written per batch; a full batch is flushed immediately"
+    )
+    AUDIT_FLUSH_INTERVAL: float = Field(
+        default=1.0,
+        description="Maximum seconds audit rows stay queued"
+    )
+    AUDIT_ENQUEUE_TIMEOUT: float = Field(
+        default=2.0,
+        description="Seconds to wait for queue space before writing the audit row in the caller's transaction"
+    )
+    AUDIT_COPY_MIN_ROWS: int = Field(
+        default=200,
+        description="Batches of at least this many audit rows are written with COPY on PostgreSQL"
+    )
+
+    # Audit partition settings
+    AUDIT_PARTITION_MONTHS_AHEAD: int = Field(
+        default=3,
+        description="Monthly audit_logs partitions created ahead of the current month"
+    )
+    AUDIT_RETENTION_DAYS: int = Field(
+        default=0,
+        description="Audit partitions entirely older than this many days are dropped by maintenance (0 keeps all)"
+    )
+
+    # Audit statistics rollup settings
+    AUDIT_ROLLUP_SETTLE_SECONDS: int = Field(
+        default=300,
+        description="Hours are rolled up this many seconds after they end; later rows are scanned from audit_logs"
+    )
+    AUDIT_BULK_MINUTE_THRESHOLD: int = Field(
+        default=10,
+        description="Audit logs by one user within a minute above which the compliance report flags a bulk operation"
+    )
+
+    # Audit as-of replay settings
+    AUDIT_CHECKPOINT_KEEP: int = Field(
+        default=12,
+        description="Checkpoints kept per audited table; older ones are pruned"
+    )
+    AUDIT_REPLAY_MARGIN: float = Field(
+        default=30.0,
+        description="Seconds, on top of AUDIT_FLUSH_INTERVAL, that replay starts before a checkpoint to cover "
+                    "audited transactions still open when it was taken and app/database clock skew"
+    )
+
     # SSO settings
     SSO_BASE_URL: str = Field(
         default="https://sso.example.com",
@@ -155,6 +274,70 @@ class Settings(BaseSettings):
         description="Enable SMTP TLS"
     )
 
+    # Notification delivery settings
+    NOTIFICATION_WORKER_ENABLED: bool = Field(
+        default=True,
+        description="Run the notification outbox delivery worker in this process"
+    )
+    NOTIFICATION_POLL_INTERVAL: float = Field(
+        default=2.0,
+        description="Maximum seconds between outbox claims when no commit wakes the worker"
+    )
+    NOTIFICATION_BATCH_SIZE: int = Field(
+        default=100,
+        description="Outbox rows claimed per delivery round"
+    )
+    NOTIFICATION_DELIVERY_CONCURRENCY: int = Field(
+        default=10,
+        description="Maximum notifications delivered at once per worker"
+    )
+    NOTIFICATION_LEASE_SECONDS: int = Field(
+        default=300,
+        description="Seconds a claimed outbox row stays locked before another worker may retry it"
+    )
+    NOTIFICATION_MAX_ATTEMPTS: int = Field(
+        default=6,
+        description="Delivery attempts before an outbox row is marked failed"
+    )
+    NOTIFICATION_RETRY_BASE_SECONDS: float = Field(
+        default=30.0,
+        description="Delay before the first retry; doubles with every further attempt"
+    )
+    NOTIFICATION_RETRY_MAX_SECONDS: float = Field(
+        default=3600.0,
+        description="Upper bound of the retry delay"
+    )
+    NOTIFICATION_SMTP_POOL_SIZE: int = Field(
+        default=4,
+        description="SMTP connections kept open per worker"
+    )
+    NOTIFICATION_SMTP_TIMEOUT: float = Field(
+        default=10.0,
+        description="SMTP connect and command timeout in seconds"
+    )
+    NOTIFICATION_WEBHOOK_TIMEOUT: float = Field(
+        default=10.0,
+        description="Webhook request timeout in seconds"
+    )
+    NOTIFICATION_SCHEDULED_BATCH_SIZE: int = Field(
+        default=200,
+        description="Scheduled notifications queued per outbox/in-app insert"
+    )
+
+    # Change event push settings
+    EVENT_BUS_BACKEND: str = Field(
+        default="auto",
+        description="Change event fan-out: redis, memory, or auto (Redis if reachable)"
+    )
+    EVENT_STREAM_QUEUE_SIZE: int = Field(
+        default=256,
+        description="Events buffered per push client before it is dropped"
+    )
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = Field(
+        default=15.0,
+        description="Seconds between keepalives on idle push streams"
+    )
+
     # File upload settings
     MAX_UPLOAD_SIZE: int = Field(
         default=10485760,  # 10MB
@@ -165,6 +348,16 @@ class Settings(BaseSettings):
         description="File upload directory path"
     )
 
+    # Excel processing settings
+    EXCEL_WORKER_POOL_SIZE: int = Field(
+        default=2,
+        description="Worker processes for Excel parsing and workbook generation (0 runs them in a thread)"
+    )
+    EXCEL_MAX_CONCURRENT_IMPORTS: int = Field(
+        default=2,
+        description="Maximum concurrent Excel imports per application worker"
+    )
+
     # Logging settings
     LOG_LEVEL: str = Field(
         default="INFO",
@@ -0,0 +1,313 @@
+"""
+Change event bus for server-push clients
+
+Provides:
+- publish_change: record a compact change event in the caller's
+  transaction; it is published once that transaction commits
+- EventBus: fans events out to the SSE/WebSocket subscriptions of this
+  worker, and across workers through Redis pub/sub (or in process memory
+  on a single node)
+- Subscription: one client's filtered, bounded event queue; a client that
+  falls EVENT_STREAM_QUEUE_SIZE events behind is dropped, not buffered
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding the events of the session's open transaction
+EVENTS_KEY = "akcn_change_events"
+
+
+class EventEntity:
+    """Entities change events are published for."""
+
+    APPLICATION = "application"
+    SUBTASK = "subtask"
+    ANNOUNCEMENT = "announcement"
+    NOTIFICATION = "notification"
+
+
+def publish_change(
+    db,
+    entity: str,
+    action: str,
+    ids: Iterable[Any],
+    application_ids: Optional[Iterable[int]] = None,
+    user_ids: Optional[Iterable[int]] = None,
+    **data: Any
+) -> None:
+    """
+    Record a change event, published when the caller's transaction commits.
+
+    Events carry IDs, not rows; clients refetch what they display. Events
+    with user_ids only reach those users. Extra keyword arguments are
+    included as-is and must be JSON serializable.
+    """
+    change = {
+        "entity": entity,
+        "action": action,
+        "ids": list(ids),
+        "ts": datetime.now(timezone.utc).isoformat(),
+    }
+    if application_ids is not None:
+        change["application_ids"] = sorted(set(application_ids))
+    if user_ids is not None:
+        change["user_ids"] = sorted(set(user_ids))
+    change.update(data)
+    db.sync_session.info.setdefault(EVENTS_KEY, []).append(change)
+
+
+class Subscription:
+    """
+    A client's event queue and filters.
+
+    entities and application_ids narrow what the client receives; events
+    without application_ids (announcements, notifications) pass the
+    application filter. When the queue is full the subscription is dropped:
+    its backlog is discarded and the client receives None, after which it
+    should resync over the REST API and reconnect.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        entities: Optional[Set[str]] = None,
+        application_ids: Optional[Set[int]] = None,
+        maxsize: Optional[int] = None
+    ):
+        self.user_id = user_id
+        self.entities = entities or None
+        self.application_ids = application_ids or None
+        self.dropped = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=(maxsize or settings.EVENT_STREAM_QUEUE_SIZE) + 1)
+        self._limit = self._queue.maxsize - 1
+
+    def matches(self, change: Dict[str, Any]) -> bool:
+        if "user_ids" in change and self.user_id not in change["user_ids"]:
+            return False
+        if self.entities is not None and change["entity"] not in self.entities:
+            return False
+        if self.application_ids is not None and "application_ids" in change:
+            return not self.application_ids.isdisjoint(change["application_ids"])
+        return True
+
+    def offer(self, change: Dict[str, Any]) -> bool:
+        """Queue an event; returns False (and drops the client) if it is too far behind."""
+        if self.dropped:
+            return False
+        if self._queue.qsize() >= self._limit:
+            self.close()
+            return False
+        self._queue.put_nowait(change)
+        return True
+
+    def close(self) -> None:
+        """Discard the backlog and end the stream."""
+        if self.dropped:
+            return
+        self.dropped = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        # The spare slot holds the end marker
+        self._queue.put_nowait(None)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Next event. Returns None once the subscription was dropped and raises
+        asyncio.TimeoutError if nothing arrived within timeout seconds.
+        """
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+
+class EventBus:
+    """
+    Delivers committed change events to the subscriptions of every worker.
+
+    With Redis, events are PUBLISHed on akcn:events and every worker
+    (including the publishing one) dispatches what its listener receives
+    to its own subscriptions. The memory backend dispatches directly, which
+    reaches only this worker's clients. EVENT_BUS_BACKEND "auto" uses Redis
+    if it answers a PING at start.
+    """
+
+    CHANNEL = "akcn:events"
+
+    # Seconds before the listener resubscribes after a Redis error
+    RECONNECT_DELAY = 5.0
+
+    def __init__(self):
+        self._subscriptions: Set[Subscription] = set()
+        self._client = None
+        self._listener: Optional[asyncio.Task] = None
+        # Publishes started from commit hooks; referenced until done so they are not collected
+        self._publishing: Set[asyncio.Task] = set()
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped_clients = 0
+        self.publish_errors = 0
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self._client is not None else "memory"
+
+    async def start(self) -> None:
+        """Select the backend and start listening on Redis if it is used."""
+        if self._client is not None or settings.EVENT_BUS_BACKEND == "memory" or not settings.REDIS_URL:
+            return
+
+        client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+        )
+        if settings.EVENT_BUS_BACKEND != "redis":
+            try:
+                await client.ping()
+            except (RedisError, OSError) as e:
+                logger.warning(f"Redis unavailable, change events stay in this process: {e}")
+                await client.aclose()
+                return
+
+        self._client = client
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Finish pending publishes, stop listening, close Redis and end every open stream."""
+        if self._publishing:
+            await asyncio.gather(*self._publishing, return_exceptions=True)
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        for subscription in list(self._subscriptions):
+            subscription.close()
+        self._subscriptions.clear()
+
+    def subscribe(
+        self,
+        user_id: int,
+        entities: Optional[Set[str]] = None,
+        application_ids: Optional[Set[int]] = None
+    ) -> Subscription:
+        subscription = Subscription(user_id, entities, application_ids)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+        subscription.close()
+
+    async def publish(self, changes: List[Dict[str, Any]]) -> None:
+        """Publish events to every worker; falls back to this worker if Redis fails."""
+        if not changes:
+            return
+        self.published += len(changes)
+
+        if self._client is not None:
+            try:
+                async with self._client.pipeline(transaction=False) as pipe:
+                    for change in changes:
+                        pipe.publish(self.CHANNEL, json.dumps(change, default=str))
+                    await pipe.execute()
+                return
+            except (RedisError, OSError) as e:
+                self.publish_errors += 1
+                logger.warning(f"Publishing change events to Redis failed, delivering locally: {e}")
+
+        for change in changes:
+            self.dispatch(change)
+
+    def publish_nowait(self, changes: List[Dict[str, Any]]) -> None:
+        """Publish from synchronous code such as a commit hook."""
+        if self._client is None:
+            self.published += len(changes)
+            for change in changes:
+                self.dispatch(change)
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("No running event loop, change events not published")
+            return
+        task = loop.create_task(self.publish(changes))
+        self._publishing.add(task)
+        task.add_done_callback(self._publish_done)
+
+    def _publish_done(self, task: asyncio.Task) -> None:
+        self._publishing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.publish_errors += 1
+            logger.error(f"Publishing change events failed: {task.exception()!r}")
+
+    def dispatch(self, change: Dict[str, Any]) -> None:
+        """Hand an event to the matching subscriptions of this worker."""
+        for subscription in list(self._subscriptions):
+            if not subscription.matches(change):
+                continue
+            if subscription.offer(change):
+                self.delivered += 1
+            else:
+                self._subscriptions.discard(subscription)
+                self.dropped_clients += 1
+                logger.info(f"Dropped change event stream of user {subscription.user_id}, it fell behind")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "subscriptions": len(self._subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_clients": self.dropped_clients,
+            "publish_errors": self.publish_errors,
+        }
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.dispatch(json.loads(message["data"]))
+            except (RedisError, OSError) as e:
+                logger.warning(f"Change event listener lost Redis, resubscribing: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                await pubsub.aclose()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_changes(session) -> None:
+    changes = session.info.pop(EVENTS_KEY, None)
+    if changes:
+        event_bus.publish_nowait(changes)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted_changes(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(EVENTS_KEY, None)
+
+
+# Create singleton instance
+event_bus = EventBus()
@@ -0,0 +1,190 @@
+"""
+Notification delivery transports
+
+Provides:
+- SMTPPool: a small pool of open SMTP connections (smtplib in worker
+  threads), reconnecting once when the server dropped an idle connection
+- WebhookClient: one shared httpx.AsyncClient for all webhook deliveries
+- build_email_message: MIME message from an email outbox payload
+- DeliveryError: a failed delivery, marked retryable or permanent
+"""
+
+import base64
+import asyncio
+import logging
+import smtplib
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Webhook responses worth retrying; other 4xx responses are permanent failures
+RETRYABLE_STATUS_CODES = {408, 425, 429}
+
+
+class DeliveryError(Exception):
+    """A notification could not be delivered."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def build_email_message(payload: Dict[str, Any]) -> MIMEMultipart:
+    """
+    Build the MIME message of an email outbox payload.
+
+    Attachment contents are stored base64-encoded in the payload, since the
+    outbox keeps payloads as JSON.
+    """
+    msg = MIMEMultipart()
+    msg['From'] = payload.get("from") or settings.EMAIL_FROM
+    msg['To'] = ', '.join(payload["recipients"])
+    msg['Subject'] = payload["subject"]
+    msg.attach(MIMEText(payload["body"], 'html'))
+
+    for attachment in payload.get("attachments") or []:
+        part = MIMEBase('application', 'octet-stream')
+        part.set_payload(base64.b64decode(attachment["content_b64"]))
+        encoders.encode_base64(part)
+        part.add_header('Content-Disposition', f'attachment; filename={attachment["filename"]}')
+        msg.attach(part)
+
+    return msg
+
+
+def encode_attachments(attachments: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Attachments in the JSON-safe form build_email_message expects."""
+    encoded = []
+    for attachment in attachments or []:
+        content = attachment["content"]
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        encoded.append({
+            "filename": attachment["filename"],
+            "content_type": attachment.get("content_type", "application/octet-stream"),
+            "content_b64": base64.b64encode(content).decode("ascii"),
+        })
+    return encoded
+
+
+class SMTPPool:
+    """
+    Pool of open SMTP connections.
+
+    smtplib is blocking, so each command runs in a worker thread; at most
+    NOTIFICATION_SMTP_POOL_SIZE messages are sent at once and their
+    connections are kept open for the next ones. host and port default to
+    SMTP_HOST and SMTP_PORT (tests point them at a local aiosmtpd server).
+    """
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None, size: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.size = size
+        self._idle: List[smtplib.SMTP] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.connections_opened = 0
+        self.reconnects = 0
+
+    async def send(self, message: MIMEMultipart) -> None:
+        """Send a message over a pooled connection."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size or settings.NOTIFICATION_SMTP_POOL_SIZE)
+
+        async with self._semaphore:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                if connection is None:
+                    connection = await asyncio.to_thread(self._connect)
+                try:
+                    await asyncio.to_thread(connection.send_message, message)
+                except smtplib.SMTPServerDisconnected:
+                    # The server closed the idle connection; reconnect once
+                    self.reconnects += 1
+                    self._quit(connection)
+                    connection = await asyncio.to_thread(self._connect)
+                    await asyncio.to_thread(connection.send_message, message)
+            except smtplib.SMTPRecipientsRefused as e:
+                self._idle.append(connection)
+                raise DeliveryError(f"Recipients refused: {', '.join(e.recipients)}", retryable=False)
+            except (smtplib.SMTPException, OSError) as e:
+                if connection is not None:
+                    self._quit(connection)
+                raise DeliveryError(f"SMTP delivery failed: {e}")
+            self._idle.append(connection)
+
+    async def close(self) -> None:
+        """Close every idle connection."""
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await asyncio.to_thread(self._quit, connection)
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(
+            self.host or settings.SMTP_HOST,
+            self.port or settings.SMTP_PORT,
+            timeout=settings.NOTIFICATION_SMTP_TIMEOUT
+        )
+        if settings.SMTP_TLS:
+            connection.starttls()
+        if settings.SMTP_USER:
+            connection.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        self.connections_opened += 1
+        return connection
+
+    @staticmethod
+    def _quit(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+
+class WebhookClient:
+    """
+    Webhook delivery through one shared httpx.AsyncClient.
+
+    The client keeps connections to webhook hosts alive between deliveries;
+    `transport` lets tests substitute an httpx.MockTransport.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def post(self, url: str, body: Dict[str, Any]) -> int:
+        """POST a JSON body; returns the status code or raises DeliveryError."""
+        try:
+            response = await self._get_client().post(url, json=body)
+        except httpx.HTTPError as e:
+            raise DeliveryError(f"Webhook request failed: {e}")
+
+        if response.status_code >= 500 or response.status_code in RETRYABLE_STATUS_CODES:
+            raise DeliveryError(f"Webhook returned {response.status_code}")
+        if response.status_code >= 400:
+            raise DeliveryError(f"Webhook returned {response.status_code}", retryable=False)
+        return response.status_code
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            concurrency = settings.NOTIFICATION_DELIVERY_CONCURRENCY
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=settings.NOTIFICATION_WEBHOOK_TIMEOUT,
+                limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            )
+        return self._client
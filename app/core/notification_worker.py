@@ -0,0 +1,273 @@
+"""
+Notification outbox delivery worker
+
+Provides:
+- enqueue_notifications: multi-row insert into notification_outbox in the
+  caller's transaction; the worker is woken once that transaction commits
+- NotificationWorker: background task that claims due outbox rows with
+  SELECT ... FOR UPDATE SKIP LOCKED (so several workers never claim the
+  same row), delivers them grouped by channel with bounded concurrency,
+  and retries failures with exponential backoff
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, event, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.notification_transport import DeliveryError, SMTPPool, WebhookClient, build_email_message
+from app.models.notification_outbox import NotificationOutbox, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+# Session.info key set when the session's open transaction wrote outbox rows
+OUTBOX_KEY = "akcn_notification_outbox"
+
+EMAIL = "email"
+WEBHOOK = "webhook"
+
+
+async def enqueue_notifications(db, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert outbox rows in the caller's transaction.
+
+    Each row needs channel, notification_type and payload. Nothing is
+    delivered unless the transaction commits.
+    """
+    if not rows:
+        return
+    await db.execute(insert(NotificationOutbox), rows)
+    db.sync_session.info[OUTBOX_KEY] = True
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt after `attempts` failed ones."""
+    seconds = settings.NOTIFICATION_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.NOTIFICATION_RETRY_MAX_SECONDS))
+
+
+class NotificationWorker:
+    """
+    Delivers notification outbox rows off the request path.
+
+    Every round claims up to NOTIFICATION_BATCH_SIZE due rows (marking them
+    'sending' with a lease), delivers them outside any transaction, then
+    records the outcomes: delivered rows become 'sent' in one UPDATE, failed
+    ones are rescheduled or, after NOTIFICATION_MAX_ATTEMPTS or a permanent
+    error, marked 'failed'.
+    """
+
+    def __init__(self, session_factory=None, smtp: Optional[SMTPPool] = None,
+                 webhooks: Optional[WebhookClient] = None):
+        self._session_factory = session_factory
+        self.smtp = smtp or SMTPPool()
+        self.webhooks = webhooks or WebhookClient()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.claimed = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.rounds = 0
+        self.last_round_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background delivery task."""
+        if not self.running:
+            # Bind the event to the running event loop
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop delivering and close the SMTP connections and the webhook client."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.smtp.close()
+        await self.webhooks.close()
+
+    def wake(self) -> None:
+        """Claim due rows now instead of at the next poll."""
+        self._wakeup.set()
+
+    async def deliver_due(self) -> int:
+        """
+        Run one claim/deliver/record round.
+
+        Returns the number of rows claimed; rows claimed by other workers
+        are skipped, not waited for.
+        """
+        started = time.perf_counter()
+        claimed = await self._claim()
+        if not claimed:
+            return 0
+
+        semaphore = asyncio.Semaphore(settings.NOTIFICATION_DELIVERY_CONCURRENCY)
+
+        async def deliver(row: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[DeliveryError]]:
+            async with semaphore:
+                try:
+                    await self._deliver(row)
+                    return row, None
+                except DeliveryError as e:
+                    return row, e
+                except Exception as e:
+                    logger.exception(f"Unexpected error delivering notification {row['id']}")
+                    return row, DeliveryError(str(e))
+
+        # Email and webhook groups run side by side; each row still counts
+        # against the shared concurrency limit
+        by_channel: Dict[str, List[Dict[str, Any]]] = {}
+        for row in claimed:
+            by_channel.setdefault(row["channel"], []).append(row)
+        outcomes = await asyncio.gather(*(
+            deliver(row) for rows in by_channel.values() for row in rows
+        ))
+
+        await self._record(outcomes)
+        self.rounds += 1
+        self.last_round_ms = round((time.perf_counter() - started) * 1000, 1)
+        return len(claimed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "claimed": self.claimed,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "rounds": self.rounds,
+            "last_round_ms": self.last_round_ms,
+            "smtp_connections_opened": self.smtp.connections_opened,
+            "smtp_reconnects": self.smtp.reconnects,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.deliver_due()
+            except Exception as e:
+                logger.error(f"Notification delivery round failed: {e}")
+                claimed = 0
+
+            if claimed < settings.NOTIFICATION_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.NOTIFICATION_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+
+    async def _claim(self) -> List[Dict[str, Any]]:
+        """Lease due rows to this worker and return plain copies of them."""
+        now = datetime.now(timezone.utc)
+        async with self._get_session_factory()() as session:
+            result = await session.execute(
+                select(NotificationOutbox)
+                .where(or_(
+                    and_(NotificationOutbox.status == OutboxStatus.PENDING.value,
+                         NotificationOutbox.next_attempt_at <= now),
+                    and_(NotificationOutbox.status == OutboxStatus.SENDING.value,
+                         NotificationOutbox.locked_until < now),
+                ))
+                .order_by(NotificationOutbox.next_attempt_at, NotificationOutbox.id)
+                .limit(settings.NOTIFICATION_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                await session.rollback()
+                return []
+
+            locked_until = now + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS)
+            claimed = []
+            for row in rows:
+                row.status = OutboxStatus.SENDING.value
+                row.attempts += 1
+                row.locked_until = locked_until
+                claimed.append({
+                    "id": row.id,
+                    "channel": row.channel,
+                    "payload": row.payload,
+                    "attempts": row.attempts,
+                })
+            await session.commit()
+
+        self.claimed += len(claimed)
+        return claimed
+
+    async def _deliver(self, row: Dict[str, Any]) -> None:
+        payload = row["payload"]
+        if row["channel"] == EMAIL:
+            await self.smtp.send(build_email_message(payload))
+        elif row["channel"] == WEBHOOK:
+            await self.webhooks.post(payload["url"], payload["body"])
+        else:
+            raise DeliveryError(f"Unsupported notification channel: {row['channel']}", retryable=False)
+
+    async def _record(self, outcomes: List[Tuple[Dict[str, Any], Optional[DeliveryError]]]) -> None:
+        now = datetime.now(timezone.utc)
+        sent_ids = [row["id"] for row, error in outcomes if error is None]
+
+        async with self._get_session_factory()() as session:
+            if sent_ids:
+                await session.execute(
+                    update(NotificationOutbox)
+                    .where(NotificationOutbox.id.in_(sent_ids))
+                    .values(status=OutboxStatus.SENT.value, sent_at=now, locked_until=None, last_error=None)
+                )
+            for row, error in outcomes:
+                if error is None:
+                    continue
+                if error.retryable and row["attempts"] < settings.NOTIFICATION_MAX_ATTEMPTS:
+                    values = {"status": OutboxStatus.PENDING.value,
+                              "next_attempt_at": now + retry_delay(row["attempts"])}
+                    self.retried += 1
+                else:
+                    values = {"status": OutboxStatus.FAILED.value}
+                    self.failed += 1
+                    logger.error(f"Giving up on notification {row['id']} after {row['attempts']} attempts: {error}")
+                await session.execute(
+                    update(NotificationOutbox)
+                    .where(NotificationOutbox.id == row["id"])
+                    .values(locked_until=None, last_error=str(error)[:1000], **values)
+                )
+            await session.commit()
+
+        self.sent += len(sent_ids)
+
+    def _get_session_factory(self):
+        if self._session_factory is None:
+            # The request sessions' engine and pool, not a second one
+            from app.db.session import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_worker_on_commit(session) -> None:
+    if session.info.pop(OUTBOX_KEY, None):
+        notification_worker.wake()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_outbox_flag(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(OUTBOX_KEY, None)
+
+
+# Create singleton instance
+notification_worker = NotificationWorker()
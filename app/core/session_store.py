@@ -0,0 +1,289 @@
+"""
+Login session storage for AuthService
+
+Provides:
+- Sessions with sliding expiry, looked up by ID in O(1)
+- Per-user session index for logging a user out everywhere
+- Redis store shared by all workers, with last_activity updates buffered
+  and written back in pipelined batches
+- In-memory store with the same interface for tests and single-node deployments
+"""
+
+import asyncio
+import time
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemorySessionStore:
+    """Process-local session store."""
+
+    name = "memory"
+
+    # Expired sessions are swept once per this many creations
+    SWEEP_INTERVAL = 1000
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._sessions: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._user_sessions: Dict[int, Set[str]] = {}
+        self._created = 0
+
+    async def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        self._sessions[session_id] = (time.monotonic() + self.ttl, dict(data))
+        self._user_sessions.setdefault(data["user_id"], set()).add(session_id)
+
+        self._created += 1
+        if self._created % self.SWEEP_INTERVAL == 0:
+            self._sweep()
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session and extend its expiry, or None if it does not exist."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+
+        now = time.monotonic()
+        expires_at, data = entry
+        if expires_at <= now:
+            self._remove(session_id, data)
+            return None
+
+        data["last_activity"] = datetime.utcnow().isoformat()
+        self._sessions[session_id] = (now + self.ttl, data)
+        return dict(data)
+
+    async def delete(self, session_id: str) -> bool:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return False
+        self._remove(session_id, entry[1])
+        return True
+
+    async def delete_user_sessions(self, user_id: int) -> int:
+        session_ids = self._user_sessions.pop(user_id, set())
+        for session_id in session_ids:
+            self._sessions.pop(session_id, None)
+        return len(session_ids)
+
+    async def close(self) -> None:
+        pass
+
+    def _remove(self, session_id: str, data: Dict[str, Any]) -> None:
+        self._sessions.pop(session_id, None)
+        user_sessions = self._user_sessions.get(data["user_id"])
+        if user_sessions is not None:
+            user_sessions.discard(session_id)
+            if not user_sessions:
+                del self._user_sessions[data["user_id"]]
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        for session_id, (expires_at, data) in list(self._sessions.items()):
+            if expires_at <= now:
+                self._remove(session_id, data)
+
+
+class RedisSessionStore:
+    """
+    Session store shared by all workers.
+
+    Each session is a hash under akcn:session:<id> with a TTL; the IDs of a
+    user's sessions are kept in the set akcn:user-sessions:<user_id>.
+    Validation is a single HGETALL. The last_activity write and TTL refresh
+    are buffered per session and flushed in one pipeline once
+    SESSION_TOUCH_BATCH_SIZE sessions are pending or SESSION_TOUCH_INTERVAL
+    seconds have passed, which delays the sliding expiry by at most that
+    interval. A background task flushes on the same interval so the last
+    activity of an idle worker is written too, and close() flushes what is
+    left. Touching a session also extends the user's index, so the index
+    never expires before a live session.
+    """
+
+    name = "redis"
+
+    SESSION_PREFIX = "akcn:session:"
+    USER_INDEX_PREFIX = "akcn:user-sessions:"
+
+    # Refresh a session and its user's index only if the session still
+    # exists, so a late flush cannot resurrect a session that was logged out
+    # or expired meanwhile
+    TOUCH_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], 'last_activity', ARGV[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+"""
+
+    def __init__(self, url: str, ttl: int):
+        self.ttl = ttl
+        self.client = aioredis.from_url(
+            url,
+            decode_responses=True,
+            socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+        )
+        # session_id -> (user_id, last_activity)
+        self._touches: Dict[str, Tuple[int, str]] = {}
+        self._last_flush = time.monotonic()
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        key = self.SESSION_PREFIX + session_id
+        index_key = f"{self.USER_INDEX_PREFIX}{data['user_id']}"
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={field: str(value) for field, value in data.items() if value is not None})
+            pipe.expire(key, self.ttl)
+            pipe.sadd(index_key, session_id)
+            # The index lives as long as the user's newest session
+            pipe.expire(index_key, self.ttl)
+            await pipe.execute()
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session and schedule its expiry extension, or None if it does not exist."""
+        data = await self.client.hgetall(self.SESSION_PREFIX + session_id)
+        if not data:
+            return None
+
+        data["user_id"] = int(data["user_id"])
+        data["last_activity"] = datetime.utcnow().isoformat()
+        self._touches[session_id] = (data["user_id"], data["last_activity"])
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+        if (len(self._touches) >= settings.SESSION_TOUCH_BATCH_SIZE
+                or time.monotonic() - self._last_flush >= settings.SESSION_TOUCH_INTERVAL):
+            await self.flush()
+        return data
+
+    async def flush(self) -> None:
+        """Write buffered last_activity updates and extend the session TTLs."""
+        touches, self._touches = self._touches, {}
+        self._last_flush = time.monotonic()
+        if not touches:
+            return
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for session_id, (user_id, last_activity) in touches.items():
+                pipe.eval(
+                    self.TOUCH_SCRIPT, 2,
+                    self.SESSION_PREFIX + session_id, f"{self.USER_INDEX_PREFIX}{user_id}",
+                    last_activity, self.ttl
+                )
+            await pipe.execute()
+
+    async def _flush_periodically(self) -> None:
+        """Flush buffered updates every SESSION_TOUCH_INTERVAL seconds, even without new requests."""
+        while True:
+            await asyncio.sleep(settings.SESSION_TOUCH_INTERVAL)
+            if not self._touches:
+                continue
+            try:
+                await self.flush()
+            except (RedisError, OSError) as e:
+                logger.warning(f"Flushing session activity to Redis failed: {e}")
+
+    async def delete(self, session_id: str) -> bool:
+        key = self.SESSION_PREFIX + session_id
+        self._touches.pop(session_id, None)
+        user_id = await self.client.hget(key, "user_id")
+        if user_id is None:
+            return False
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.delete(key)
+            pipe.srem(f"{self.USER_INDEX_PREFIX}{user_id}", session_id)
+            await pipe.execute()
+        return True
+
+    async def delete_user_sessions(self, user_id: int) -> int:
+        index_key = f"{self.USER_INDEX_PREFIX}{user_id}"
+        session_ids = await self.client.smembers(index_key)
+        if not session_ids:
+            return 0
+
+        for session_id in session_ids:
+            self._touches.pop(session_id, None)
+        deleted = await self.client.delete(index_key, *(self.SESSION_PREFIX + session_id for session_id in session_ids))
+        # Minus the index itself; sessions that already expired are not counted
+        return deleted - 1
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        await self.client.aclose()
+
+
+_session_store = None
+# monotonic time of the next Redis probe while "auto" runs on the memory fallback
+_next_probe = 0.0
+
+
+async def get_session_store():
+    """
+    Return the session store selected by SESSION_STORE.
+
+    "auto" uses Redis if it answers a PING and the in-memory store otherwise.
+    While on the in-memory fallback, Redis is probed again every
+    SESSION_STORE_REPROBE_SECONDS and used once it answers; sessions created
+    in memory meanwhile end at the switch and their users log in again.
+    """
+    global _session_store, _next_probe
+    if _session_store is None:
+        _session_store = await _select_session_store()
+    elif (_session_store.name == "memory" and settings.SESSION_STORE == "auto" and settings.REDIS_URL
+            and time.monotonic() >= _next_probe):
+        redis_store = await _probe_redis(settings.SESSION_TTL_SECONDS)
+        if redis_store is not None:
+            logger.info("Redis is reachable again, moving the session store to Redis")
+            _session_store = redis_store
+    return _session_store
+
+
+async def close_session_store() -> None:
+    global _session_store
+    if _session_store is not None:
+        await _session_store.close()
+        _session_store = None
+
+
+async def _select_session_store():
+    ttl = settings.SESSION_TTL_SECONDS
+    if settings.SESSION_STORE == "memory" or not settings.REDIS_URL:
+        return MemorySessionStore(ttl)
+
+    if settings.SESSION_STORE == "redis":
+        return RedisSessionStore(settings.REDIS_URL, ttl)
+
+    store = await _probe_redis(ttl)
+    if store is None:
+        logger.warning("Redis unavailable, keeping sessions in process memory until it answers")
+        return MemorySessionStore(ttl)
+    return store
+
+
+async def _probe_redis(ttl: int) -> Optional["RedisSessionStore"]:
+    """A Redis store if Redis answers a PING; otherwise None and the next probe is scheduled."""
+    global _next_probe
+    store = RedisSessionStore(settings.REDIS_URL, ttl)
+    try:
+        await store.client.ping()
+        return store
+    except (RedisError, OSError) as e:
+        logger.debug(f"Redis session store probe failed: {e}")
+        await store.client.aclose()
+        _next_probe = time.monotonic() + settings.SESSION_STORE_REPROBE_SECONDS
+        return None
@@ -0,0 +1,157 @@
+"""
+Per-process cache of authenticated users for the auth dependency
+
+Provides:
+- Bounded TTL+LRU map of User column snapshots keyed by token subject
+- Invalidation by user ID from UserService writes
+- Cross-worker invalidation over Redis pub/sub when REDIS_URL is configured
+"""
+
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import inspect as sa_inspect
+
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """
+    Cache of resolved users so authenticated requests skip the users lookup.
+
+    Entries are plain column snapshots; a hit returns a new detached User built
+    from the snapshot, so request handlers never share ORM state. Lookups
+    record the invalidation generation before reading the database and only
+    store the result if no invalidation happened meanwhile, so a concurrent
+    write cannot be overwritten by the row read before it.
+    """
+
+    CHANNEL = "akcn:user-cache:invalidate"
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._generation = 0
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter; pass the value read before a lookup to put()."""
+        return self._generation
+
+    def get(self, key: str) -> Optional[User]:
+        """Return a detached User for the token subject, or None on a miss."""
+        if not settings.USER_CACHE_ENABLED:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return User(**entry[1])
+
+    def put(self, key: str, user: User, generation: int) -> None:
+        """Store a snapshot of a freshly loaded user."""
+        if not settings.USER_CACHE_ENABLED or generation != self._generation:
+            return
+
+        snapshot = {attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs}
+        self._entries[key] = (time.monotonic() + settings.USER_CACHE_TTL, snapshot)
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.USER_CACHE_MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, *user_ids: int) -> None:
+        """Drop the given users here and, through Redis, in every other worker."""
+        self.discard(user_ids)
+        if self.redis_url is None or not user_ids:
+            return
+
+        try:
+            await self._client().publish(self.CHANNEL, json.dumps([int(user_id) for user_id in user_ids]))
+        except (RedisError, OSError) as e:
+            # Other workers fall back to USER_CACHE_TTL
+            logger.warning(f"Failed to publish user cache invalidation: {e}")
+
+    def discard(self, user_ids: Iterable[int]) -> None:
+        """Drop the given users from this worker's cache."""
+        user_ids = set(user_ids)
+        self._generation += 1
+        for key in [key for key, (_, snapshot) in self._entries.items() if snapshot.get("id") in user_ids]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+        }
+
+    def start(self) -> None:
+        """Start listening for invalidations published by other workers."""
+        if self.redis_url is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _client(self):
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+            )
+        return self._redis
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._client().pubsub()
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.discard(json.loads(message["data"]))
+            except (RedisError, OSError) as e:
+                logger.warning(f"User cache invalidation listener disconnected: {e}")
+            finally:
+                await pubsub.aclose()
+
+            # Invalidations may have been missed while disconnected
+            self.clear()
+            await asyncio.sleep(settings.CACHE_REDIS_RETRY_SECONDS)
+
+
+# Create singleton instance
+user_cache = UserCache(settings.REDIS_URL or None)
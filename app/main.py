@@ -55,14 +55,56 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "version": settings.APP_VERSION}
+    from app.core.audit_writer import audit_writer
+    from app.core.cache import response_cache
+    from app.core.event_bus import event_bus
+    from app.core.notification_worker import notification_worker
+    from app.core.user_cache import user_cache
+    return {
+        "status": "healthy",
+        "version": settings.APP_VERSION,
+        "cache": response_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "audit_writer": audit_writer.stats(),
+        "notification_worker": notification_worker.stats(),
+        "event_bus": event_bus.stats()
+    }
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize logging on application startup."""
+    """Initialize logging, the user cache invalidation listener, the audit writer, the notification worker and the event bus on startup."""
+    from app.core.audit_writer import audit_writer
+    from app.core.event_bus import event_bus
     from app.core.logging_config import configure_logging
+    from app.core.notification_worker import notification_worker
+    from app.core.user_cache import user_cache
     configure_logging(settings)
+    user_cache.start()
+    if settings.AUDIT_WRITE_MODE == "async":
+        audit_writer.start()
+    if settings.NOTIFICATION_WORKER_ENABLED:
+        notification_worker.start()
+    await event_bus.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the Excel worker pool, the notification worker and the event bus, flush queued audit rows and close the caches."""
+    from app.core.audit_writer import audit_writer
+    from app.core.cache import response_cache
+    from app.core.event_bus import event_bus
+    from app.core.notification_worker import notification_worker
+    from app.core.session_store import close_session_store
+    from app.core.user_cache import user_cache
+    from app.services.excel_service import shutdown_excel_executor
+    shutdown_excel_executor()
+    await notification_worker.stop()
+    await event_bus.stop()
+    await audit_writer.stop()
+    await response_cache.close()
+    await user_cache.stop()
+    await close_session_store()
 
 
 if __name__ == "__main__":
@@ -4,9 +4,15 @@ SQLAlchemy models for the application
 
 from app.models.user import User
 from app.models.application import Application
+from app.models.application_stats import ApplicationStats
 from app.models.subtask import SubTask
 from app.models.audit_log import AuditLog
-from app.models.notification import Notification
+from app.models.audit_checkpoint import AuditCheckpoint, AuditCheckpointRecord
+from app.models.audit_rollup import AuditHourlyRollup, AuditBulkMinute, AuditRollupState
+from app.models.metric_snapshot import MetricSnapshot, MetricRollup
+from app.models.notification import Notification, NotificationUnreadCount
+from app.models.notification_outbox import NotificationOutbox
+from app.models.scheduled_notification import ScheduledNotificationLedger
 from app.models.task_assignment import TaskAssignment
 from app.models.announcement import Announcement
 from app.models.cmdb_l2_application import CMDBL2Application
@@ -16,9 +22,20 @@ from app.models.cmdb_l1_system_87 import CMDBL1System87
 __all__ = [
     "User",
     "Application",
+    "ApplicationStats",
     "SubTask",
     "AuditLog",
+    "AuditCheckpoint",
+    "AuditCheckpointRecord",
+    "AuditHourlyRollup",
+    "AuditBulkMinute",
+    "AuditRollupState",
+    "MetricSnapshot",
+    "MetricRollup",
     "Notification",
+    "NotificationUnreadCount",
+    "NotificationOutbox",
+    "ScheduledNotificationLedger",
     "TaskAssignment",
     "Announcement",
     "CMDBL2Application",
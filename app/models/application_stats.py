@@ -0,0 +1,81 @@
+"""
+Application statistics projection model
+"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class ApplicationStats(Base):
+    """
+    Materialized per-application transformation statistics.
+
+    One row per application, maintained by ApplicationStatsService whenever
+    the application's subtasks change. Applications without subtasks may have
+    no row; readers treat a missing row as all zeros.
+    """
+
+    __tablename__ = "application_stats"
+
+    application_id = Column(
+        Integer, ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    # Whole-application counts
+    subtask_count = Column(Integer, default=0, nullable=False)
+    completed_subtask_count = Column(Integer, default=0, nullable=False)
+    blocked_subtask_count = Column(Integer, default=0, nullable=False)
+    not_started_subtask_count = Column(Integer, default=0, nullable=False)
+
+    # AK statistics
+    ak_subtask_count = Column(Integer, default=0, nullable=False)
+    ak_completed_count = Column(Integer, default=0, nullable=False)
+    ak_in_progress_count = Column(Integer, default=0, nullable=False)
+    ak_blocked_count = Column(Integer, default=0, nullable=False)
+    ak_not_started_count = Column(Integer, default=0, nullable=False)
+    ak_completion_percentage = Column(Float, default=0.0, nullable=False)
+    ak_status = Column(String(20), default="NOT_STARTED", nullable=False, index=True)
+
+    # Cloud Native statistics
+    cloud_native_subtask_count = Column(Integer, default=0, nullable=False)
+    cloud_native_completed_count = Column(Integer, default=0, nullable=False)
+    cloud_native_in_progress_count = Column(Integer, default=0, nullable=False)
+    cloud_native_blocked_count = Column(Integer, default=0, nullable=False)
+    cloud_native_not_started_count = Column(Integer, default=0, nullable=False)
+    cloud_native_completion_percentage = Column(Float, default=0.0, nullable=False)
+    cloud_native_status = Column(String(20), default="NOT_STARTED", nullable=False, index=True)
+
+    # Phase description
+    current_phase_description = Column(String(100), nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<ApplicationStats(application_id={self.application_id}, "
+            f"ak_status='{self.ak_status}', cloud_native_status='{self.cloud_native_status}')>"
+        )
+
+    @property
+    def completion_rate(self) -> float:
+        """Completion rate across all subtasks as percentage."""
+        if not self.subtask_count:
+            return 0.0
+        return (self.completed_subtask_count / self.subtask_count) * 100
+
+    @property
+    def progress_percentage(self) -> int:
+        """Progress percentage derived from the completion rate."""
+        return int(self.completion_rate)
+
+    @property
+    def in_progress_subtask_count(self) -> int:
+        """Subtasks that are neither completed, blocked nor not started."""
+        return (
+            (self.subtask_count or 0)
+            - (self.completed_subtask_count or 0)
+            - (self.blocked_subtask_count or 0)
+            - (self.not_started_subtask_count or 0)
+        )
@@ -0,0 +1,49 @@
+"""
+Audit checkpoint models for point-in-time state reconstruction
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class AuditCheckpoint(Base):
+    """
+    Full copy of an audited table taken at checkpoint_at.
+
+    The state of a record at time T is its checkpoint copy (or absence) from
+    the latest checkpoint before T, with the audit_logs rows of that record
+    between the two replayed forward.
+    """
+
+    __tablename__ = "audit_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    table_name = Column(String(50), nullable=False)
+    checkpoint_at = Column(DateTime(timezone=True), nullable=False)
+    record_count = Column(Integer, default=0, nullable=False)
+
+    records = relationship("AuditCheckpointRecord", cascade="all, delete-orphan", passive_deletes=True)
+
+    def __repr__(self):
+        return f"<AuditCheckpoint(id={self.id}, table='{self.table_name}', at={self.checkpoint_at})>"
+
+
+# Latest checkpoint of a table before a timestamp
+Index('ix_audit_checkpoints_table_at', AuditCheckpoint.table_name, AuditCheckpoint.checkpoint_at)
+
+
+class AuditCheckpointRecord(Base):
+    """One record's column values as of its checkpoint, serialized like audit_logs values."""
+
+    __tablename__ = "audit_checkpoint_records"
+
+    checkpoint_id = Column(
+        Integer, ForeignKey("audit_checkpoints.id", ondelete="CASCADE"), primary_key=True
+    )
+    record_id = Column(Integer, primary_key=True)
+    state = Column(JSON, nullable=False)
+
+    def __repr__(self):
+        return f"<AuditCheckpointRecord(checkpoint_id={self.checkpoint_id}, record_id={self.record_id})>"
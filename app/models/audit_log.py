@@ -2,7 +2,7 @@
 Audit log model for tracking all data changes
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Index, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -18,7 +18,14 @@ class AuditOperation(str, enum.Enum):
 
 
 class AuditLog(Base):
-    """Audit log model for tracking all data changes."""
+    """
+    Audit log model for tracking all data changes.
+
+    In PostgreSQL the table is range-partitioned by month on created_at
+    (audit_logs_yYYYYmMM plus audit_logs_default), with primary key
+    (id, created_at) as partitioning requires. Partitions are created ahead
+    by AuditService.ensure_partitions and retention drops whole partitions.
+    """
 
     __tablename__ = "audit_logs"
 
@@ -43,7 +50,7 @@ class AuditLog(Base):
 
     # Audit fields
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Nullable for system operations
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="audit_logs")
@@ -81,4 +88,28 @@ class AuditLog(Base):
                 "after": new_vals.get(field)
             }
 
-        return changes
\ No newline at end of file
+        return changes
+
+
+# Per-record delta scans: a record's changes within a time range, in order
+Index('ix_audit_logs_table_record_created', AuditLog.table_name, AuditLog.record_id, AuditLog.created_at)
+# Keyset pagination in (created_at, id) order, and created_at range filters
+Index('ix_audit_logs_created_id', AuditLog.created_at, AuditLog.id)
+
+
+def subtask_l2_id(values_column):
+    """The l2_id recorded in a sub_tasks audit row's old or new values (text on PostgreSQL)."""
+    return values_column.op('->>')(literal_column("'l2_id'"))
+
+
+# Audit rows of the subtasks an application had before or after each change
+Index(
+    'ix_audit_logs_subtask_new_l2_id',
+    subtask_l2_id(AuditLog.new_values),
+    postgresql_where=AuditLog.table_name == 'sub_tasks'
+)
+Index(
+    'ix_audit_logs_subtask_old_l2_id',
+    subtask_l2_id(AuditLog.old_values),
+    postgresql_where=AuditLog.table_name == 'sub_tasks'
+)
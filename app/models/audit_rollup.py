@@ -0,0 +1,64 @@
+"""
+Audit statistics rollup models
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Index
+
+from app.core.database import Base
+
+
+class AuditHourlyRollup(Base):
+    """
+    Audit log counts per hour, table, operation and user.
+
+    Written by AuditRollupService from audit_logs for every hour before the
+    watermark in audit_rollup_state; audit statistics and the compliance
+    report read these instead of scanning audit_logs. user_id 0 stands for
+    system operations (audit_logs.user_id NULL).
+    """
+
+    __tablename__ = "audit_hourly_rollups"
+
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    table_name = Column(String(50), primary_key=True)
+    operation = Column(String(20), primary_key=True)
+    user_id = Column(Integer, primary_key=True)
+
+    log_count = Column(Integer, default=0, nullable=False)
+    # UPDATE rows with new_values but no changed_fields (compliance integrity check)
+    missing_fields_count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<AuditHourlyRollup(hour={self.hour}, table='{self.table_name}', "
+            f"operation='{self.operation}', user_id={self.user_id}, count={self.log_count})>"
+        )
+
+
+class AuditBulkMinute(Base):
+    """Minutes in which one user wrote more than AUDIT_BULK_MINUTE_THRESHOLD audit logs."""
+
+    __tablename__ = "audit_bulk_minutes"
+
+    user_id = Column(Integer, primary_key=True)
+    minute = Column(DateTime(timezone=True), primary_key=True)
+    log_count = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<AuditBulkMinute(user_id={self.user_id}, minute={self.minute}, count={self.log_count})>"
+
+
+# Compliance report range scans
+Index('ix_audit_bulk_minutes_minute', AuditBulkMinute.minute)
+
+
+class AuditRollupState(Base):
+    """Watermark of the audit rollups: every hour before rolled_through has been rolled up."""
+
+    __tablename__ = "audit_rollup_state"
+
+    name = Column(String(50), primary_key=True)
+    rolled_through = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<AuditRollupState(name='{self.name}', rolled_through={self.rolled_through})>"
@@ -0,0 +1,77 @@
+"""
+Historical trend metric models
+"""
+
+from sqlalchemy import Column, Integer, String, Float, Date
+
+from app.core.database import Base
+
+
+class MetricSnapshot(Base):
+    """
+    Daily snapshot of project metrics.
+
+    One row per day and scope: the whole portfolio ('overall'), a supervision
+    year, a dev team or a single application. Written by TrendService, either
+    from the current state or replayed from audit_logs. In PostgreSQL the
+    table is range-partitioned by month on snapshot_date; TrendService
+    creates the partitions before writing.
+    """
+
+    __tablename__ = "metric_snapshots"
+    __table_args__ = {"postgresql_partition_by": "RANGE (snapshot_date)"}
+
+    scope = Column(String(20), primary_key=True)
+    scope_key = Column(String(100), primary_key=True)
+    snapshot_date = Column(Date, primary_key=True)
+
+    application_count = Column(Integer, default=0, nullable=False)
+    completed_count = Column(Integer, default=0, nullable=False)
+    active_count = Column(Integer, default=0, nullable=False)
+    delayed_count = Column(Integer, default=0, nullable=False)
+    delay_days = Column(Integer, default=0, nullable=False)
+    subtask_count = Column(Integer, default=0, nullable=False)
+    completed_subtask_count = Column(Integer, default=0, nullable=False)
+    blocked_count = Column(Integer, default=0, nullable=False)
+    progress = Column(Float, default=0.0, nullable=False)
+    completion_rate = Column(Float, default=0.0, nullable=False)
+
+    def __repr__(self):
+        return f"<MetricSnapshot(scope='{self.scope}', scope_key='{self.scope_key}', date={self.snapshot_date})>"
+
+
+class MetricRollup(Base):
+    """
+    Weekly, monthly and quarterly downsampling of metric_snapshots.
+
+    Metric columns hold the closing values of the period (its latest
+    snapshot); progress_avg is the mean daily progress over the period.
+    """
+
+    __tablename__ = "metric_rollups"
+
+    granularity = Column(String(10), primary_key=True)
+    scope = Column(String(20), primary_key=True)
+    scope_key = Column(String(100), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+
+    period_end = Column(Date, nullable=False)
+    sample_count = Column(Integer, default=0, nullable=False)
+    progress_avg = Column(Float, default=0.0, nullable=False)
+
+    application_count = Column(Integer, default=0, nullable=False)
+    completed_count = Column(Integer, default=0, nullable=False)
+    active_count = Column(Integer, default=0, nullable=False)
+    delayed_count = Column(Integer, default=0, nullable=False)
+    delay_days = Column(Integer, default=0, nullable=False)
+    subtask_count = Column(Integer, default=0, nullable=False)
+    completed_subtask_count = Column(Integer, default=0, nullable=False)
+    blocked_count = Column(Integer, default=0, nullable=False)
+    progress = Column(Float, default=0.0, nullable=False)
+    completion_rate = Column(Float, default=0.0, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<MetricRollup(granularity='{self.granularity}', scope='{self.scope}', "
+            f"scope_key='{self.scope_key}', period_start={self.period_start})>"
+        )
@@ -2,7 +2,7 @@
 Notification model for user notifications
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, JSON, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -10,7 +10,12 @@ from app.core.database import Base
 
 
 class Notification(Base):
-    """Notification model for user notifications."""
+    """
+    Notification model for user notifications.
+
+    In-app notifications are written by InAppNotificationService, one row
+    per recipient, and counted per user in notification_unread_counts.
+    """
 
     __tablename__ = "notifications"
 
@@ -18,10 +23,41 @@ class Notification(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(200), nullable=False)
     message = Column(Text, nullable=False)
-    type = Column(String(50), default="info")  # info, warning, error, success
+    type = Column(String(50), default="info")  # info, warning, error, success or a NotificationType
+    priority = Column(String(20), nullable=True)
+    content = Column(JSON, nullable=True)  # Structured notification content
     is_read = Column(Boolean, default=False)
+    read_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    user = relationship("User", backref="notifications")
\ No newline at end of file
+    user = relationship("User", backref="notifications")
+
+
+# Unread lookups and mark-all-read only touch unread rows
+Index(
+    'ix_notifications_user_unread',
+    Notification.user_id,
+    postgresql_where=text('is_read = false'),
+    sqlite_where=text('is_read = 0'),
+)
+# Per-user listing, newest first
+Index('ix_notifications_user_created', Notification.user_id, Notification.created_at)
+
+
+class NotificationUnreadCount(Base):
+    """
+    Unread in-app notifications per user.
+
+    Kept in step with notifications in the same transaction, so the badge
+    count is a primary key lookup. Users without a row have none unread.
+    """
+
+    __tablename__ = "notification_unread_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<NotificationUnreadCount(user_id={self.user_id}, unread_count={self.unread_count})>"
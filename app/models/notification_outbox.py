@@ -0,0 +1,58 @@
+"""
+Notification outbox model for asynchronous delivery
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Index
+from sqlalchemy.sql import func
+import enum
+
+from app.core.database import Base
+
+
+class OutboxStatus(str, enum.Enum):
+    """Outbox delivery status enumeration."""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class NotificationOutbox(Base):
+    """
+    Email and webhook notifications waiting to be delivered.
+
+    Rows are inserted in the caller's transaction and delivered after it
+    commits by NotificationWorker, which claims due rows with
+    SELECT ... FOR UPDATE SKIP LOCKED. A row stays 'sending' for
+    NOTIFICATION_LEASE_SECONDS; if its worker dies it is claimed again.
+    Failed deliveries are retried with exponential backoff until
+    NOTIFICATION_MAX_ATTEMPTS, then marked 'failed'.
+    """
+
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    channel = Column(String(20), nullable=False)  # email, webhook
+    notification_type = Column(String(50), nullable=False)
+
+    # email: recipients, subject, body, attachments; webhook: url, body
+    payload = Column(JSON, nullable=False)
+
+    status = Column(String(20), nullable=False, default=OutboxStatus.PENDING.value)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<NotificationOutbox(id={self.id}, channel='{self.channel}', "
+            f"status='{self.status}', attempts={self.attempts})>"
+        )
+
+
+# Claim scans: due pending rows and expired leases
+Index('ix_notification_outbox_status_due', NotificationOutbox.status, NotificationOutbox.next_attempt_at)
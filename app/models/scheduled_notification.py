@@ -0,0 +1,38 @@
+"""
+Ledger of scheduled notifications already sent
+"""
+
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class ScheduledNotificationLedger(Base):
+    """
+    One row per scheduled notification sent for an application.
+
+    The scheduled scanner claims (application_id, kind, threshold, due_date)
+    here before sending, so running the job twice does not send the same
+    warning again. due_date is the planned date the notification is about,
+    so moving that date makes the application eligible again.
+
+    kind is 'delay' (threshold = days late) or a milestone column name such
+    as 'tech_online' (threshold = look-ahead window in days).
+    """
+
+    __tablename__ = "scheduled_notification_ledger"
+
+    application_id = Column(
+        Integer, ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True
+    )
+    kind = Column(String(30), primary_key=True)
+    threshold = Column(Integer, primary_key=True)
+    due_date = Column(Date, primary_key=True)
+    sent_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<ScheduledNotificationLedger(application_id={self.application_id}, kind='{self.kind}', "
+            f"threshold={self.threshold}, due_date={self.due_date})>"
+        )
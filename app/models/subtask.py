@@ -2,7 +2,7 @@
 SubTask model
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Date
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Date, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -107,4 +107,16 @@ class SubTask(Base):
             return 0
         from datetime import date
         today = date.today()
-        return (today - self.planned_biz_online_date).days
\ No newline at end of file
+        return (today - self.planned_biz_online_date).days
+
+# One subtask per application, target and version; the Excel import merges on this key
+Index(
+    'uq_sub_tasks_import_key',
+    SubTask.l2_id,
+    func.coalesce(SubTask.sub_target, ''),
+    func.coalesce(SubTask.version_name, ''),
+    unique=True
+)
+
+# Default list order (updated_at desc) for keyset pagination
+Index('ix_sub_tasks_updated_id', SubTask.updated_at, SubTask.id)
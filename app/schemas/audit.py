@@ -82,11 +82,13 @@ class AuditLogResponse(AuditLogBase):
 
 class AuditLogListResponse(BaseModel):
     """Schema for paginated audit log list response."""
-    total: int = Field(..., description="Total number of audit logs")
-    page: int = Field(..., description="Current page number")
+    total: Optional[int] = Field(None, description="Total number of audit logs (None when not counted)")
+    page: Optional[int] = Field(None, description="Current page number (offset pagination)")
     page_size: int = Field(..., description="Page size")
-    total_pages: int = Field(..., description="Total number of pages")
+    total_pages: Optional[int] = Field(None, description="Total number of pages (None when not counted)")
     items: List[AuditLogResponse] = Field(..., description="Audit log items")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (cursor pagination)")
+    total_is_estimate: bool = Field(False, description="Whether total is a planner estimate")
 
 
 class AuditLogFilter(BaseModel):
@@ -152,7 +154,7 @@ class DataChangesSummary(BaseModel):
 
 class AuditExportRequest(BaseModel):
     """Schema for audit export request."""
-    format: str = Field("json", description="Export format (json, csv, excel)")
+    format: str = Field("json", description="Export format (json, csv, ndjson, excel)")
     filters: Optional[Dict[str, Any]] = Field(None, description="Export filters")
     table_name: Optional[str] = Field(None, description="Filter by table name")
     record_id: Optional[int] = Field(None, description="Filter by record ID")
@@ -162,6 +164,7 @@ class AuditExportRequest(BaseModel):
     end_date: Optional[date] = Field(None, description="End date for export")
     include_system_operations: bool = Field(True, description="Include system operations")
     include_sensitive_data: bool = Field(False, description="Include sensitive field values")
+    cursor: Optional[str] = Field(None, description="Resume after the record this cursor was taken from")
 
 
 class AuditExportResponse(BaseModel):
@@ -279,4 +282,21 @@ class RollbackResponse(BaseModel):
     status: str = Field(..., description="Rollback status")
     rollback_audit_id: int = Field(..., description="New audit log ID for rollback operation")
     affected_record: Dict[str, Any] = Field(..., description="Affected record information")
-    message: str = Field(..., description="Rollback result message")
\ No newline at end of file
+    message: str = Field(..., description="Rollback result message")
+
+
+class AsOfRecord(BaseModel):
+    """Schema for one record reconstructed at a point in time."""
+    record_id: int = Field(..., description="Record ID")
+    exists: bool = Field(..., description="Whether the record existed at the requested time")
+    state: Optional[Dict[str, Any]] = Field(None, description="Column values at the requested time")
+    subtasks: Optional[List[Dict[str, Any]]] = Field(None, description="Subtasks at the requested time (applications only)")
+
+
+class AsOfStateResponse(BaseModel):
+    """Schema for point-in-time state response."""
+    table_name: str = Field(..., description="Table name")
+    as_of: datetime = Field(..., description="Requested point in time")
+    checkpoint_at: Optional[datetime] = Field(None, description="Checkpoint the replay started from")
+    replayed_changes: int = Field(..., description="Audit rows replayed after the checkpoint")
+    records: List[AsOfRecord] = Field(..., description="Reconstructed records")
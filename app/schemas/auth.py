@@ -13,6 +13,7 @@ class Token(BaseModel):
     refresh_token: Optional[str] = Field(None, description="JWT refresh token")
     token_type: str = Field("bearer", description="Token type")
     expires_in: int = Field(..., description="Token expiry in seconds")
+    session_id: Optional[str] = Field(None, description="Login session ID (pass to /logout)")
 
 
 class TokenRefresh(BaseModel):
@@ -75,6 +75,7 @@ class ApplicationExportRequest(ExcelExportRequest):
 class SubTaskExportRequest(ExcelExportRequest):
     """Schema for subtask export request."""
     l2_id: Optional[str] = Field(None, description="Filter by L2 ID")
+    application_id: Optional[int] = Field(None, description="Filter by application ID")
     subtask_ids: Optional[List[int]] = Field(None, description="Specific subtask IDs to export")
     task_status: Optional[str] = Field(None, description="Filter by task status")
     sub_target: Optional[str] = Field(None, description="Filter by sub target")
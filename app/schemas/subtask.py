@@ -193,11 +193,13 @@ class SubTaskResponse(BaseModel):
 
 class SubTaskListResponse(BaseModel):
     """Schema for paginated subtask list response."""
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
     items: List[SubTaskResponse]
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 class SubTaskFilter(BaseModel):
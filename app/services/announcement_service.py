@@ -9,6 +9,7 @@ from sqlalchemy import select, func, and_, or_
 from sqlalchemy.orm import selectinload
 from datetime import datetime
 
+from app.core.event_bus import EventEntity, publish_change
 from app.models.announcement import Announcement
 from app.models.user import User
 from app.schemas.announcement import AnnouncementCreate, AnnouncementUpdate
@@ -139,6 +140,8 @@ class AnnouncementService:
                 expire_date=announcement_data.expire_date
             )
             db.add(announcement)
+            await db.flush()
+            publish_change(db, EventEntity.ANNOUNCEMENT, "created", [announcement.id], status=announcement.status)
             await db.commit()
             await db.refresh(announcement)
 
@@ -185,6 +188,10 @@ class AnnouncementService:
                     announcement.publish_date = datetime.utcnow()
                 setattr(announcement, field, value)
 
+            publish_change(
+                db, EventEntity.ANNOUNCEMENT, "updated", [announcement.id],
+                status=announcement.status, fields=sorted(update_data)
+            )
             await db.commit()
             await db.refresh(announcement)
             logger.info(f"Announcement updated: {announcement.title} (ID: {announcement.id})")
@@ -215,6 +222,7 @@ class AnnouncementService:
                 return False
 
             await db.delete(announcement)
+            publish_change(db, EventEntity.ANNOUNCEMENT, "deleted", [announcement_id])
             await db.commit()
             logger.info(f"Announcement deleted: {announcement.title} (ID: {announcement.id})")
             return True
@@ -249,6 +257,10 @@ class AnnouncementService:
                 return None
 
             announcement.is_pinned = is_pinned
+            publish_change(
+                db, EventEntity.ANNOUNCEMENT, "updated", [announcement.id],
+                status=announcement.status, fields=["is_pinned"]
+            )
             await db.commit()
             await db.refresh(announcement)
             logger.info(f"Announcement pin toggled: {announcement.title} -> {is_pinned}")
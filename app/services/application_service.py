@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.application import Application, ApplicationStatus, TransformationTarget
+from app.models.application_stats import ApplicationStats
 from app.models.user import User
 from app.models.audit_log import AuditOperation
 from app.models.subtask import SubTask
@@ -16,8 +17,13 @@ from app.schemas.application import (
     ApplicationCreate, ApplicationUpdate, ApplicationFilter,
     ApplicationSort, ApplicationStatistics
 )
+from app.core.cache import CacheTag, invalidates
+from app.core.event_bus import EventEntity, publish_change
 from app.core.exceptions import NotFoundError, ValidationError
-from app.services.transformation_stats import calculate_application_transformation_stats
+from app.services.transformation_stats import (
+    calculate_application_transformation_stats,
+    transformation_stats_from_counts,
+)
 
 
 class ApplicationService:
@@ -36,6 +42,7 @@ class ApplicationService:
             self._audit_service = AuditService()
         return self._audit_service
 
+    @invalidates(CacheTag.APPLICATIONS)
     async def create_application(
         self,
         db: AsyncSession,
@@ -75,11 +82,11 @@ class ApplicationService:
         )
 
         db.add(db_application)
-        await db.commit()
+        await db.flush()
         await db.refresh(db_application)
 
-        # Create audit log for the new application
-        await self.audit_service.create_audit_log(
+        # Record the audit log with the new application
+        await self.audit_service.record_audit_log(
             db=db,
             table_name="applications",
             record_id=db_application.id,
@@ -89,6 +96,8 @@ class ApplicationService:
             user_id=created_by,
             reason="Application created"
         )
+        publish_change(db, EventEntity.APPLICATION, "created", [db_application.id], [db_application.id])
+        await db.commit()
 
         return db_application
 
@@ -120,6 +129,7 @@ class ApplicationService:
 
         return app
 
+    @invalidates(CacheTag.APPLICATIONS)
     async def update_application(
         self,
         db: AsyncSession,
@@ -149,12 +159,12 @@ class ApplicationService:
         # Recalculate status and progress
         await self._recalculate_application_status(db, db_application)
 
-        await db.commit()
+        await db.flush()
         await db.refresh(db_application)
 
-        # Create audit log for the application update
+        # Record the audit log with the application update
         new_values = self._serialize_application(db_application)
-        await self.audit_service.create_audit_log(
+        await self.audit_service.record_audit_log(
             db=db,
             table_name="applications",
             record_id=db_application.id,
@@ -164,9 +174,15 @@ class ApplicationService:
             user_id=updated_by,
             reason="Application updated"
         )
+        publish_change(
+            db, EventEntity.APPLICATION, "updated", [db_application.id], [db_application.id],
+            fields=sorted(field for field in new_values if new_values[field] != old_values.get(field))
+        )
+        await db.commit()
 
         return db_application
 
+    @invalidates(CacheTag.APPLICATIONS)
     async def delete_application(self, db: AsyncSession, l2_id: int, deleted_by: int = None) -> bool:
         """Delete an application."""
         db_application = await self.get_application(db, l2_id)
@@ -177,11 +193,10 @@ class ApplicationService:
         old_values = self._serialize_application(db_application)
 
         await db.delete(db_application)
-        await db.commit()
 
-        # Create audit log for the application deletion
+        # Record the audit log with the application deletion
         if deleted_by:
-            await self.audit_service.create_audit_log(
+            await self.audit_service.record_audit_log(
                 db=db,
                 table_name="applications",
                 record_id=l2_id,
@@ -191,6 +206,8 @@ class ApplicationService:
                 user_id=deleted_by,
                 reason="Application deleted"
             )
+        publish_change(db, EventEntity.APPLICATION, "deleted", [l2_id], [l2_id])
+        await db.commit()
 
         return True
 
@@ -202,91 +219,162 @@ class ApplicationService:
         filters: Optional[ApplicationFilter] = None,
         sort: Optional[ApplicationSort] = None
     ) -> tuple[List[Dict[str, Any]], int]:
-        """List applications with filtering and pagination, including transformation statistics."""
+        """
+        List applications with filtering and pagination, including transformation statistics.
 
-        # Build base query - always load subtasks for statistics
-        query = select(Application).options(selectinload(Application.subtasks))
-        count_query = select(func.count(Application.id))
+        Subtask statistics come from the application_stats projection (outer-joined
+        to applications), so the AK/Cloud Native status filters, the total count
+        and LIMIT/OFFSET all run in the database and only the requested page is
+        loaded and enriched. Applications without a stats row count as zeros.
+        """
+
+        stat_columns = [
+            column for column in ApplicationStats.__table__.columns
+            if column.name not in ('application_id', 'updated_at')
+        ]
+
+        conditions = self._build_filter_conditions(filters)
+
+        # Total count over the same join and filters
+        count_query = (
+            select(func.count(Application.id))
+            .select_from(Application)
+            .outerjoin(ApplicationStats, ApplicationStats.application_id == Application.id)
+        )
+        if conditions:
+            count_query = count_query.where(and_(*conditions))
+        total = (await db.execute(count_query)).scalar() or 0
+
+        # Page query: application rows plus their aggregated counts
+        query = (
+            select(Application, *stat_columns)
+            .outerjoin(ApplicationStats, ApplicationStats.application_id == Application.id)
+        )
+        if conditions:
+            query = query.where(and_(*conditions))
 
-        # Apply basic filters that can be done at SQL level
-        if filters:
-            conditions = []
+        # Apply sorting (id as tie-breaker keeps pages stable)
+        if sort:
+            if sort.sort_by == 'progress_percentage':
+                # progress_percentage is derived from subtasks, sort on the projection
+                sort_column = func.coalesce(
+                    ApplicationStats.completed_subtask_count * 100
+                    / func.nullif(ApplicationStats.subtask_count, 0),
+                    0
+                )
+            else:
+                sort_column = getattr(Application, sort.sort_by, Application.updated_at)
+            if sort.order == 'asc':
+                query = query.order_by(asc(sort_column), asc(Application.id))
+            else:
+                query = query.order_by(desc(sort_column), desc(Application.id))
+        else:
+            query = query.order_by(desc(Application.updated_at), desc(Application.id))
 
-            if filters.l2_id:
-                conditions.append(Application.l2_id.ilike(f"%{filters.l2_id}%"))
+        query = query.offset(skip).limit(limit)
 
-            if filters.app_name:
-                conditions.append(Application.app_name.ilike(f"%{filters.app_name}%"))
+        result = await db.execute(query)
 
-            if filters.status:
-                conditions.append(Application.current_status == filters.status)
+        paginated_apps = []
+        for row in result.all():
+            counts = row._mapping
+            paginated_apps.append(self._enrich_application_with_counts(row[0], counts))
 
-            if filters.dev_team:
-                conditions.append(Application.dev_team.ilike(f"%{filters.dev_team}%"))
+        return paginated_apps, total
 
-            if filters.ops_team:
-                conditions.append(Application.ops_team.ilike(f"%{filters.ops_team}%"))
+    def _build_filter_conditions(self, filters: Optional[ApplicationFilter]) -> List[Any]:
+        """Translate an ApplicationFilter into SQL conditions over applications and application_stats."""
+        conditions = []
+        if not filters:
+            return conditions
 
-            if filters.year or filters.acceptance_year:
-                year_filter = filters.year or filters.acceptance_year
-                conditions.append(Application.ak_supervision_acceptance_year == year_filter)
+        if filters.l2_id:
+            conditions.append(Application.l2_id.ilike(f"%{filters.l2_id}%"))
 
-            if filters.target or filters.transformation_target:
-                target_filter = filters.target or filters.transformation_target
-                conditions.append(Application.overall_transformation_target == target_filter)
+        if filters.app_name:
+            conditions.append(Application.app_name.ilike(f"%{filters.app_name}%"))
 
-            if filters.belonging_project:
-                conditions.append(Application.belonging_projects.ilike(f"%{filters.belonging_project}%"))
+        if filters.status:
+            conditions.append(Application.current_status == filters.status)
 
-            if filters.is_delayed is not None:
-                conditions.append(Application.is_delayed == filters.is_delayed)
+        if filters.dev_team:
+            conditions.append(Application.dev_team.ilike(f"%{filters.dev_team}%"))
 
-            if filters.is_ak_completed is not None:
-                conditions.append(Application.is_ak_completed == filters.is_ak_completed)
+        if filters.ops_team:
+            conditions.append(Application.ops_team.ilike(f"%{filters.ops_team}%"))
 
-            if filters.is_cloud_native_completed is not None:
-                conditions.append(Application.is_cloud_native_completed == filters.is_cloud_native_completed)
+        if filters.year or filters.acceptance_year:
+            year_filter = filters.year or filters.acceptance_year
+            conditions.append(Application.ak_supervision_acceptance_year == year_filter)
 
-            if conditions:
-                query = query.where(and_(*conditions))
-                count_query = count_query.where(and_(*conditions))
+        if filters.target or filters.transformation_target:
+            target_filter = filters.target or filters.transformation_target
+            conditions.append(Application.overall_transformation_target == target_filter)
 
-        # Apply sorting
-        if sort:
-            sort_column = getattr(Application, sort.sort_by, Application.updated_at)
-            if sort.order == 'asc':
-                query = query.order_by(asc(sort_column))
-            else:
-                query = query.order_by(desc(sort_column))
-        else:
-            query = query.order_by(desc(Application.updated_at))
+        if filters.belonging_project:
+            conditions.append(Application.belonging_projects.ilike(f"%{filters.belonging_project}%"))
 
-        # Execute query to get all matching applications (before pagination for stats filtering)
-        result = await db.execute(query)
-        all_applications = result.scalars().all()
+        if filters.is_delayed is not None:
+            conditions.append(Application.is_delayed == filters.is_delayed)
 
-        # Enrich applications with transformation statistics
-        enriched_apps = []
-        for app in all_applications:
-            app_dict = await self._enrich_application_with_stats(app)
-            enriched_apps.append(app_dict)
+        if filters.is_ak_completed is not None:
+            conditions.append(Application.is_ak_completed == filters.is_ak_completed)
 
-        # Apply transformation status filters (must be done after calculating stats)
-        filtered_apps = enriched_apps
-        if filters:
-            if filters.ak_status:
-                filtered_apps = [app for app in filtered_apps if app.get('ak_status') == filters.ak_status]
+        if filters.is_cloud_native_completed is not None:
+            conditions.append(Application.is_cloud_native_completed == filters.is_cloud_native_completed)
 
-            if filters.cloud_native_status:
-                filtered_apps = [app for app in filtered_apps if app.get('cloud_native_status') == filters.cloud_native_status]
+        # Transformation status filters on the projection (missing row = not started)
+        if filters.ak_status:
+            conditions.append(
+                func.coalesce(ApplicationStats.ak_status, 'NOT_STARTED') == filters.ak_status
+            )
 
-        # Get total count after stats filtering
-        total = len(filtered_apps)
+        if filters.cloud_native_status:
+            conditions.append(
+                func.coalesce(ApplicationStats.cloud_native_status, 'NOT_STARTED') == filters.cloud_native_status
+            )
 
-        # Apply pagination
-        paginated_apps = filtered_apps[skip:skip + limit]
+        return conditions
 
-        return paginated_apps, total
+    def _serialize_application_columns(self, app: Application) -> Dict[str, Any]:
+        """Convert application columns to a dict with ISO formatted dates."""
+        app_dict = {}
+        for column in app.__table__.columns:
+            value = getattr(app, column.name)
+            # Handle datetime/date serialization
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat() if value else None
+            app_dict[column.name] = value
+        return app_dict
+
+    def _enrich_application_with_counts(self, app: Application, counts) -> Dict[str, Any]:
+        """
+        Enrich an application with statistics from pre-aggregated subtask counts.
+
+        Produces the same dictionary as _enrich_application_with_stats without
+        needing the subtasks relationship to be loaded.
+
+        Args:
+            app: Application object (subtasks not required)
+            counts: Mapping with application_stats (or build_subtask_stats_subquery) columns
+
+        Returns:
+            Dictionary with all application fields plus transformation stats
+        """
+        app_dict = self._serialize_application_columns(app)
+
+        subtask_count = int(counts.get('subtask_count') or 0)
+        completed_count = int(counts.get('completed_subtask_count') or 0)
+        completion_rate = (completed_count / subtask_count) * 100 if subtask_count else 0.0
+
+        app_dict['progress_percentage'] = int(completion_rate)
+        app_dict['subtask_count'] = subtask_count
+        app_dict['completed_subtask_count'] = completed_count
+        app_dict['completion_rate'] = completion_rate
+
+        app_dict.update(transformation_stats_from_counts(counts))
+
+        return app_dict
 
     async def _enrich_application_with_stats(self, app: Application) -> Dict[str, Any]:
         """
@@ -299,13 +387,7 @@ class ApplicationService:
             Dictionary with all application fields plus transformation stats
         """
         # Convert application to dict
-        app_dict = {}
-        for column in app.__table__.columns:
-            value = getattr(app, column.name)
-            # Handle datetime/date serialization
-            if isinstance(value, (datetime, date)):
-                value = value.isoformat() if value else None
-            app_dict[column.name] = value
+        app_dict = self._serialize_application_columns(app)
 
         # Calculate transformation statistics
         stats = calculate_application_transformation_stats(app.subtasks)
@@ -426,18 +508,31 @@ class ApplicationService:
                 application.is_delayed = True
                 application.delay_days = (today - application.planned_biz_online_date).days
 
+    @invalidates(CacheTag.APPLICATIONS)
     async def bulk_update_status(self, db: AsyncSession, application_ids: List[int]) -> int:
-        """Bulk update status for multiple applications."""
-        updated_count = 0
+        """
+        Bulk recalculate status for multiple applications.
 
-        for app_id in application_ids:
-            application = await self.get_application(db, app_id)
-            if application:
-                await self._recalculate_application_status(db, application)
-                updated_count += 1
+        Uses the set-based CalculationEngine path: one grouped aggregate and one
+        bulk UPDATE per batch instead of loading each application's subtasks.
 
-        await db.commit()
-        return updated_count
+        Returns:
+            Number of existing applications recalculated
+        """
+        from app.services.calculation_engine import CalculationEngine
+
+        result = await db.execute(
+            select(Application.id)
+            .where(Application.id.in_(set(application_ids)))
+            .order_by(Application.id)
+        )
+        existing_ids = list(result.scalars().all())
+        if not existing_ids:
+            return 0
+
+        publish_change(db, EventEntity.APPLICATION, "recalculated", existing_ids, existing_ids)
+        result = await CalculationEngine().recalculate_applications(db, existing_ids)
+        return result["total_applications"]
 
     async def get_applications_by_team(self, db: AsyncSession, team: str) -> List[Application]:
         """Get all applications for a specific team."""
@@ -0,0 +1,234 @@
+"""
+Application statistics projection service
+
+Maintains the application_stats table: one row of pre-computed transformation
+statistics per application, refreshed whenever the application's subtasks
+change so read paths never have to load subtasks to build statistics.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.application import Application
+from app.models.application_stats import ApplicationStats
+from app.services.transformation_stats import (
+    build_subtask_stats_subquery,
+    transformation_stats_from_counts,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Whole-application count columns copied straight from the aggregate
+COUNT_COLUMNS = (
+    'subtask_count',
+    'completed_subtask_count',
+    'blocked_subtask_count',
+    'not_started_subtask_count',
+)
+
+
+class ApplicationStatsService:
+    """Service maintaining and reading the application_stats projection."""
+
+    REBUILD_BATCH_SIZE = 1000
+
+    def build_stats_row(self, application_id: int, counts: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Build an application_stats row from aggregated subtask counts.
+
+        Args:
+            application_id: Application ID
+            counts: Mapping with the columns of build_subtask_stats_subquery
+
+        Returns:
+            Dictionary of application_stats column values
+        """
+        row = {'application_id': application_id}
+        for column in COUNT_COLUMNS:
+            row[column] = int(counts.get(column) or 0)
+        row.update(transformation_stats_from_counts(counts))
+        return row
+
+    async def refresh_applications(self, db: AsyncSession, application_ids: Iterable[int]) -> int:
+        """
+        Recompute the stats rows of the given applications.
+
+        Runs one grouped aggregate restricted to the affected applications and
+        upserts the results. Does not commit; the caller's transaction decides.
+
+        The application rows are locked with SELECT ... FOR UPDATE in id order
+        first, so concurrent refreshes of the same application run one after
+        the other: the later one aggregates after the earlier commits instead
+        of overwriting its row with counts from an older snapshot, and
+        overlapping ID sets cannot deadlock.
+
+        Args:
+            db: Database session
+            application_ids: IDs of applications whose subtasks changed
+
+        Returns:
+            Number of stats rows written
+        """
+        ids = sorted({int(app_id) for app_id in application_ids if app_id is not None})
+        if not ids:
+            return 0
+
+        # Sessions run with autoflush disabled; make pending subtask changes visible
+        await db.flush()
+
+        await db.execute(
+            select(Application.id)
+            .where(Application.id.in_(ids))
+            .order_by(Application.id)
+            .with_for_update()
+        )
+
+        stats = build_subtask_stats_subquery(ids)
+        stat_columns = [column for column in stats.c if column.name != 'l2_id']
+
+        # Outer join from applications so deleted applications are skipped and
+        # applications that lost their last subtask get a zero row
+        result = await db.execute(
+            select(Application.id, *stat_columns)
+            .outerjoin(stats, stats.c.l2_id == Application.id)
+            .where(Application.id.in_(ids))
+        )
+        rows = [self.build_stats_row(row[0], row._mapping) for row in result.all()]
+
+        await self._upsert_rows(db, rows)
+        return len(rows)
+
+    async def refresh_application(self, db: AsyncSession, application_id: int) -> int:
+        """Recompute the stats row of a single application."""
+        return await self.refresh_applications(db, [application_id])
+
+    async def rebuild_all(self, db: AsyncSession, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Rebuild the whole projection from sub_tasks.
+
+        Walks applications in primary key order and refreshes them in batches,
+        committing after each batch to keep transactions short. Used for repair
+        and for the initial backfill.
+
+        Args:
+            db: Database session
+            batch_size: Applications per batch
+
+        Returns:
+            Dictionary with total_applications and batches
+        """
+        batch_size = batch_size or self.REBUILD_BATCH_SIZE
+        total = 0
+        batches = 0
+        last_id = 0
+
+        while True:
+            result = await db.execute(
+                select(Application.id)
+                .where(Application.id > last_id)
+                .order_by(Application.id)
+                .limit(batch_size)
+            )
+            ids = [row[0] for row in result.all()]
+            if not ids:
+                break
+
+            total += await self.refresh_applications(db, ids)
+            await db.commit()
+
+            batches += 1
+            last_id = ids[-1]
+            logger.info(f"Rebuilt application stats for {total} applications ({batches} batches)")
+
+        return {
+            "total_applications": total,
+            "batches": batches
+        }
+
+    async def get_stats_map(
+        self,
+        db: AsyncSession,
+        application_ids: Iterable[int]
+    ) -> Dict[int, ApplicationStats]:
+        """Load stats rows for the given applications keyed by application ID."""
+        ids = list({int(app_id) for app_id in application_ids if app_id is not None})
+        if not ids:
+            return {}
+
+        result = await db.execute(
+            select(ApplicationStats).where(ApplicationStats.application_id.in_(ids))
+        )
+        return {stats.application_id: stats for stats in result.scalars().all()}
+
+    def to_dict(self, stats: Optional[ApplicationStats]) -> Dict[str, Any]:
+        """
+        Convert a stats row to the API statistics dictionary.
+
+        Args:
+            stats: ApplicationStats row, or None for an application without a row
+
+        Returns:
+            subtask_count, completed_subtask_count, completion_rate,
+            progress_percentage plus the ak_*/cloud_native_* statistics
+        """
+        if stats is None:
+            payload = {column: 0 for column in COUNT_COLUMNS}
+            payload.update(transformation_stats_from_counts({}))
+        else:
+            payload = {
+                column.name: getattr(stats, column.name)
+                for column in ApplicationStats.__table__.columns
+                if column.name not in ('application_id', 'updated_at')
+            }
+
+        subtask_count = payload['subtask_count'] or 0
+        completed_count = payload['completed_subtask_count'] or 0
+        completion_rate = (completed_count / subtask_count) * 100 if subtask_count else 0.0
+
+        payload['completion_rate'] = completion_rate
+        payload['progress_percentage'] = int(completion_rate)
+        payload['current_phase_description'] = payload.get('current_phase_description') or ''
+        return payload
+
+    async def _upsert_rows(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Insert or update stats rows keyed by application_id."""
+        if not rows:
+            return
+
+        dialect = db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            # Generic fallback: replace the rows
+            await db.execute(
+                delete(ApplicationStats).where(
+                    ApplicationStats.application_id.in_([row['application_id'] for row in rows])
+                )
+            )
+            await db.execute(ApplicationStats.__table__.insert(), rows)
+            return
+
+        stmt = insert(ApplicationStats).values(rows)
+        update_columns = {
+            key: stmt.excluded[key]
+            for key in rows[0]
+            if key != 'application_id'
+        }
+        update_columns['updated_at'] = func.now()
+
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ApplicationStats.application_id],
+                set_=update_columns
+            )
+        )
+
+
+# Create singleton instance
+application_stats_service = ApplicationStatsService()
@@ -0,0 +1,305 @@
+"""
+Audit as-of replay service
+
+Reconstructs what audited records looked like at a point in time. Each
+audited table is periodically copied into a checkpoint; the state at time T
+is the latest checkpoint before T with the audit_logs rows written between
+the checkpoint and T replayed forward. Delta scans are restricted to the
+requested records and use the (table_name, record_id, created_at) index.
+ID lists are bound as one array parameter on PostgreSQL.
+
+audit_logs.created_at is stamped on the application clock when a change is
+recorded, before its transaction commits and (in async mode) up to
+AUDIT_FLUSH_INTERVAL before the row is written, while checkpoint_at comes
+from the database clock. A change stamped just before checkpoint_at can
+therefore be missing from the copy, so replay starts AUDIT_FLUSH_INTERVAL +
+AUDIT_REPLAY_MARGIN seconds before the checkpoint. Changes committed more
+than that after they were recorded can still be missed.
+"""
+
+import logging
+from datetime import datetime, date, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select, func, delete, insert, tuple_, or_, any_, bindparam, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.models.application import Application
+from app.models.audit_checkpoint import AuditCheckpoint, AuditCheckpointRecord
+from app.models.audit_log import AuditLog, AuditOperation, subtask_l2_id
+from app.models.subtask import SubTask
+
+logger = logging.getLogger(__name__)
+
+
+# Tables whose audit rows carry the record's column values
+REPLAYABLE_TABLES = {
+    "applications": Application,
+    "sub_tasks": SubTask,
+}
+
+
+class AuditReplayService:
+    """Service for checkpoints and point-in-time state of audited records."""
+
+    CHECKPOINT_BATCH_SIZE = 1000
+    REPLAY_PAGE_SIZE = 5000
+
+    async def create_checkpoint(self, db: AsyncSession, table_name: str) -> AuditCheckpoint:
+        """
+        Copy the current rows of an audited table into a new checkpoint.
+
+        checkpoint_at is taken before the rows are read, so a change committed
+        in between is both in the copy and replayed from audit_logs; replaying
+        it again is harmless because audit rows carry absolute values. Rows
+        are read through a server-side cursor and copied CHECKPOINT_BATCH_SIZE
+        at a time, so the table is never held in memory. Checkpoints beyond
+        AUDIT_CHECKPOINT_KEEP per table are pruned.
+
+        Args:
+            db: Database session
+            table_name: Audited table to copy
+
+        Returns:
+            The committed checkpoint
+        """
+        model = self._get_model(table_name)
+        checkpoint = AuditCheckpoint(
+            table_name=table_name,
+            checkpoint_at=await self._database_now(db),
+            record_count=0
+        )
+        db.add(checkpoint)
+        await db.flush()
+
+        record_count = 0
+        result = await db.stream(
+            select(model.__table__).execution_options(yield_per=self.CHECKPOINT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            await db.execute(insert(AuditCheckpointRecord), [
+                {
+                    "checkpoint_id": checkpoint.id,
+                    "record_id": row.id,
+                    "state": self._serialize_values(row._mapping)
+                }
+                for row in rows
+            ])
+            record_count += len(rows)
+        checkpoint.record_count = record_count
+
+        stale_ids = (await db.execute(
+            select(AuditCheckpoint.id)
+            .where(AuditCheckpoint.table_name == table_name)
+            .order_by(AuditCheckpoint.checkpoint_at.desc())
+            .offset(settings.AUDIT_CHECKPOINT_KEEP)
+        )).scalars().all()
+        if stale_ids:
+            await db.execute(delete(AuditCheckpointRecord).where(AuditCheckpointRecord.checkpoint_id.in_(stale_ids)))
+            await db.execute(delete(AuditCheckpoint).where(AuditCheckpoint.id.in_(stale_ids)))
+
+        await db.commit()
+        logger.info(f"Audit checkpoint {checkpoint.id} of {table_name}: {record_count} records, {len(stale_ids)} pruned")
+        return checkpoint
+
+    async def get_state_as_of(
+        self,
+        db: AsyncSession,
+        table_name: str,
+        as_of: datetime,
+        record_ids: Optional[Iterable[int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Reconstruct records of an audited table as they were at as_of.
+
+        Changes that bypassed auditing (e.g. bulk imports) are only visible
+        from the first checkpoint taken after them.
+
+        Args:
+            db: Database session
+            table_name: Audited table
+            as_of: Point in time (naive values are taken as UTC)
+            record_ids: Records to reconstruct; all records when omitted
+
+        Returns:
+            checkpoint_at (None if replayed from the start of the audit trail),
+            replayed_changes, and records mapping each record that existed at
+            as_of to its column values
+        """
+        self._get_model(table_name)
+        as_of = self._as_utc(as_of)
+        record_ids = None if record_ids is None else sorted(set(record_ids))
+
+        checkpoint = await self._latest_checkpoint(db, table_name, as_of)
+        states: Dict[int, Dict[str, Any]] = {}
+        if checkpoint is not None:
+            query = select(AuditCheckpointRecord.record_id, AuditCheckpointRecord.state).where(
+                AuditCheckpointRecord.checkpoint_id == checkpoint.id
+            )
+            if record_ids is not None:
+                query = query.where(self._any_of(db, AuditCheckpointRecord.record_id, record_ids, Integer))
+            states = {row.record_id: dict(row.state) for row in (await db.execute(query)).all()}
+
+        replayed = 0
+        since = self._replay_start(checkpoint)
+        async for log in self._changes(db, table_name, since, as_of, record_ids):
+            self._apply(states, log)
+            replayed += 1
+
+        return {
+            "table_name": table_name,
+            "as_of": as_of,
+            "checkpoint_at": checkpoint.checkpoint_at if checkpoint is not None else None,
+            "replayed_changes": replayed,
+            "records": states,
+        }
+
+    async def get_subtasks_as_of(
+        self,
+        db: AsyncSession,
+        application_ids: Iterable[int],
+        as_of: datetime
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Reconstruct the subtasks each application had at as_of.
+
+        A subtask that belonged to an application at as_of either still does,
+        or was moved or deleted since the checkpoint by a change whose old
+        values carry that l2_id, or was inserted with it. Only those
+        candidates are replayed instead of the whole table; the audit rows are
+        found through the ix_audit_logs_subtask_*_l2_id expression indexes.
+
+        Returns:
+            Subtask states per application ID
+        """
+        application_ids = sorted(set(application_ids))
+        as_of = self._as_utc(as_of)
+        checkpoint = await self._latest_checkpoint(db, "sub_tasks", as_of)
+
+        candidates: Set[int] = set((await db.execute(
+            select(SubTask.id).where(self._any_of(db, SubTask.l2_id, application_ids, Integer))
+        )).scalars().all())
+
+        # ->> yields text on PostgreSQL, so the indexed expressions compare with text IDs
+        l2_ids = application_ids
+        if db.get_bind().dialect.name == "postgresql":
+            l2_ids = [str(app_id) for app_id in application_ids]
+        changed = select(AuditLog.record_id.distinct()).where(
+            AuditLog.table_name == "sub_tasks",
+            or_(
+                self._any_of(db, subtask_l2_id(AuditLog.new_values), l2_ids, String),
+                self._any_of(db, subtask_l2_id(AuditLog.old_values), l2_ids, String),
+            )
+        )
+        if checkpoint is not None:
+            changed = changed.where(AuditLog.created_at > self._replay_start(checkpoint))
+        candidates.update((await db.execute(changed)).scalars().all())
+
+        state = await self.get_state_as_of(db, "sub_tasks", as_of, candidates)
+        subtasks: Dict[int, List[Dict[str, Any]]] = {app_id: [] for app_id in application_ids}
+        for record_id in sorted(state["records"]):
+            values = state["records"][record_id]
+            if values.get("l2_id") in subtasks:
+                subtasks[values["l2_id"]].append(values)
+        return subtasks
+
+    def _replay_start(self, checkpoint: Optional[AuditCheckpoint]) -> Optional[datetime]:
+        """Audit rows after this time are replayed on top of the checkpoint; None replays all of them."""
+        if checkpoint is None:
+            return None
+        margin = settings.AUDIT_FLUSH_INTERVAL + settings.AUDIT_REPLAY_MARGIN
+        return checkpoint.checkpoint_at - timedelta(seconds=margin)
+
+    async def _latest_checkpoint(self, db: AsyncSession, table_name: str, as_of: datetime) -> Optional[AuditCheckpoint]:
+        result = await db.execute(
+            select(AuditCheckpoint)
+            .where(
+                AuditCheckpoint.table_name == table_name,
+                AuditCheckpoint.checkpoint_at <= as_of
+            )
+            .order_by(AuditCheckpoint.checkpoint_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def _changes(
+        self,
+        db: AsyncSession,
+        table_name: str,
+        since: Optional[datetime],
+        until: datetime,
+        record_ids: Optional[List[int]]
+    ):
+        """Audit rows of table_name in (since, until], oldest first, in keyset pages."""
+        query = (
+            select(AuditLog.id, AuditLog.record_id, AuditLog.operation, AuditLog.new_values, AuditLog.created_at)
+            .where(AuditLog.table_name == table_name, AuditLog.created_at <= until)
+            .order_by(AuditLog.created_at, AuditLog.id)
+            .limit(self.REPLAY_PAGE_SIZE)
+        )
+        if since is not None:
+            query = query.where(AuditLog.created_at > since)
+        if record_ids is not None:
+            query = query.where(self._any_of(db, AuditLog.record_id, record_ids, Integer))
+
+        last_key = None
+        while True:
+            page_query = query if last_key is None else query.where(
+                tuple_(AuditLog.created_at, AuditLog.id) > tuple_(*last_key)
+            )
+            rows = (await db.execute(page_query)).all()
+            for row in rows:
+                yield row
+            if len(rows) < self.REPLAY_PAGE_SIZE:
+                return
+            last_key = (rows[-1].created_at, rows[-1].id)
+
+    def _any_of(self, db: AsyncSession, column, values: List[Any], element_type):
+        """column IN values, bound as a single array parameter on PostgreSQL."""
+        if db.get_bind().dialect.name == "postgresql":
+            return column == any_(bindparam(None, list(values), type_=ARRAY(element_type)))
+        return column.in_(list(values))
+
+    def _apply(self, states: Dict[int, Dict[str, Any]], log) -> None:
+        """Apply one audited change to the replayed states."""
+        if log.operation == AuditOperation.DELETE.value:
+            states.pop(log.record_id, None)
+        elif log.operation == AuditOperation.INSERT.value:
+            states[log.record_id] = dict(log.new_values or {})
+        else:
+            # Some UPDATE rows only carry the changed columns
+            states.setdefault(log.record_id, {"id": log.record_id}).update(log.new_values or {})
+
+    def _get_model(self, table_name: str):
+        model = REPLAYABLE_TABLES.get(table_name)
+        if model is None:
+            raise ValidationError(
+                f"Table '{table_name}' cannot be replayed; supported tables: {', '.join(REPLAYABLE_TABLES)}"
+            )
+        return model
+
+    async def _database_now(self, db: AsyncSession) -> datetime:
+        """Current time on the clock that stamps audit_logs.created_at."""
+        if db.get_bind().dialect.name == "postgresql":
+            return (await db.execute(select(func.now()))).scalar()
+        return datetime.now(timezone.utc)
+
+    def _serialize_values(self, values) -> Dict[str, Any]:
+        """Serialize column values the way audit_logs stores them."""
+        result = {}
+        for key, value in values.items():
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            result[key] = value
+        return result
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+# Create singleton instance
+audit_replay_service = AuditReplayService()
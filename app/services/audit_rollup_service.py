@@ -0,0 +1,342 @@
+"""
+Audit statistics rollup service
+
+Maintains hourly audit log counts per table, operation and user in
+audit_hourly_rollups, plus the minutes with suspicious bulk activity in
+audit_bulk_minutes. A periodic job rolls up every settled hour and moves the
+watermark in audit_rollup_state forward; audit statistics and the compliance
+report then read the rollups before the watermark and scan audit_logs only
+after it (normally the current, partial hour).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, func, and_, case, delete, extract, insert, literal_column, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import BusinessLogicError
+from app.models.audit_log import AuditLog, AuditOperation
+from app.models.audit_rollup import AuditBulkMinute, AuditHourlyRollup, AuditRollupState
+
+logger = logging.getLogger(__name__)
+
+
+# audit_rollup_state row of the hourly rollups
+HOURLY = "hourly"
+# Watermark before any rollup exists: every row is read from audit_logs
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# user_id of system operations in the rollups
+SYSTEM_USER_ID = 0
+
+
+def floor_hour(value: datetime) -> datetime:
+    """Start of the UTC hour containing a timestamp (naive values are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+class AuditRollupService:
+    """Service maintaining and reading the audit statistics rollups."""
+
+    # Hours rolled up per transaction
+    REFRESH_CHUNK_HOURS = 24
+
+    async def refresh(self, db: AsyncSession, until: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Roll up every hour from the watermark to `until` and advance the watermark.
+
+        Each hour is recomputed from audit_logs (delete + INSERT ... SELECT),
+        so re-running is harmless. Hours younger than AUDIT_ROLLUP_SETTLE_SECONDS
+        are left to the raw scan, since the audit writer may still be flushing them.
+
+        Args:
+            db: Database session
+            until: Roll up hours before this time (default: now minus the settle time)
+
+        Returns:
+            New watermark and number of hours rolled up
+        """
+        if until is None:
+            until = datetime.now(timezone.utc) - timedelta(seconds=settings.AUDIT_ROLLUP_SETTLE_SECONDS)
+        until = floor_hour(until)
+
+        start = await self.get_watermark(db)
+        if start is None:
+            oldest = (await db.execute(select(func.min(AuditLog.created_at)))).scalar()
+            start = floor_hour(oldest) if oldest else until
+
+        hours = 0
+        while start < until:
+            end = min(start + timedelta(hours=self.REFRESH_CHUNK_HOURS), until)
+            await self._rollup_range(db, start, end)
+            await self._set_watermark(db, end)
+            await db.commit()
+            hours += int((end - start) / timedelta(hours=1))
+            start = end
+
+        if hours == 0:
+            # Nothing to roll up yet; still record where the rollups begin
+            await self._set_watermark(db, start)
+            await db.commit()
+
+        logger.info(f"Rolled up {hours} hours of audit logs through {start.isoformat()}")
+        return {"rolled_through": start.isoformat(), "hours": hours}
+
+    async def rebuild(self, db: AsyncSession, since: datetime) -> Dict[str, Any]:
+        """Recompute the rollups from `since` onwards (e.g. after restoring audit logs)."""
+        since = floor_hour(since)
+        watermark = await self.get_watermark(db)
+        if watermark is not None and since < watermark:
+            await self._set_watermark(db, since)
+            await db.commit()
+        return await self.refresh(db)
+
+    async def discard_before(self, db: AsyncSession, boundary: datetime) -> None:
+        """Delete the rollups of hours before a boundary, when their audit logs are removed."""
+        await db.execute(delete(AuditHourlyRollup).where(AuditHourlyRollup.hour < boundary))
+        await db.execute(delete(AuditBulkMinute).where(AuditBulkMinute.minute < boundary))
+
+    async def get_watermark(self, db: AsyncSession) -> Optional[datetime]:
+        """Time before which every hour is rolled up, or None before the first refresh."""
+        result = await db.execute(
+            select(AuditRollupState.rolled_through).where(AuditRollupState.name == HOURLY)
+        )
+        watermark = result.scalar()
+        return floor_hour(watermark) if watermark else None
+
+    async def summarize(
+        self,
+        db: AsyncSession,
+        start_at: Optional[datetime],
+        end_at: Optional[datetime],
+        hourly_start_at: datetime
+    ) -> Dict[str, Any]:
+        """
+        Audit log counts for a time range in one query.
+
+        Rolled-up hours are read from audit_hourly_rollups, rows after the
+        watermark from audit_logs, and both are aggregated together by table,
+        operation, user and hour of day.
+
+        Args:
+            db: Database session
+            start_at: Inclusive lower bound (None for unbounded)
+            end_at: Exclusive upper bound (None for unbounded)
+            hourly_start_at: Only rows from here on count towards by_hour
+
+        Returns:
+            total_logs, by_operation, by_table, by_user (system operations
+            excluded), by_hour, logs_without_user and
+            logs_with_changes_but_no_fields
+        """
+        watermark = func.coalesce(
+            select(AuditRollupState.rolled_through)
+            .where(AuditRollupState.name == HOURLY)
+            .scalar_subquery(),
+            EPOCH
+        )
+
+        rolled_conditions = [AuditHourlyRollup.hour < watermark]
+        recent_conditions = [AuditLog.created_at >= watermark]
+        if start_at:
+            rolled_conditions.append(AuditHourlyRollup.hour >= start_at)
+            recent_conditions.append(AuditLog.created_at >= start_at)
+        if end_at:
+            rolled_conditions.append(AuditHourlyRollup.hour < end_at)
+            recent_conditions.append(AuditLog.created_at < end_at)
+
+        rolled = select(
+            AuditHourlyRollup.hour.label("at"),
+            AuditHourlyRollup.table_name,
+            AuditHourlyRollup.operation,
+            AuditHourlyRollup.user_id,
+            AuditHourlyRollup.log_count,
+            AuditHourlyRollup.missing_fields_count,
+        ).where(*rolled_conditions)
+        recent = select(
+            AuditLog.created_at.label("at"),
+            AuditLog.table_name,
+            AuditLog.operation,
+            self._user_key().label("user_id"),
+            literal_column("1").label("log_count"),
+            self._missing_fields().label("missing_fields_count"),
+        ).where(*recent_conditions)
+        source = union_all(rolled, recent).subquery("audit_counts")
+
+        hour_of_day = extract("hour", source.c.at)
+        result = await db.execute(
+            select(
+                source.c.table_name,
+                source.c.operation,
+                source.c.user_id,
+                hour_of_day.label("hour_of_day"),
+                func.sum(source.c.log_count).label("log_count"),
+                func.sum(case((source.c.at >= hourly_start_at, source.c.log_count), else_=0)).label("hourly_count"),
+                func.sum(source.c.missing_fields_count).label("missing_fields_count"),
+            ).group_by(source.c.table_name, source.c.operation, source.c.user_id, hour_of_day)
+        )
+
+        summary = {
+            "total_logs": 0,
+            "by_operation": defaultdict(int),
+            "by_table": defaultdict(int),
+            "by_user": defaultdict(int),
+            "by_hour": defaultdict(int),
+            "logs_without_user": 0,
+            "logs_with_changes_but_no_fields": 0,
+        }
+        for row in result.all():
+            count = int(row.log_count or 0)
+            summary["total_logs"] += count
+            summary["by_operation"][row.operation] += count
+            summary["by_table"][row.table_name] += count
+            if row.user_id == SYSTEM_USER_ID:
+                summary["logs_without_user"] += count
+            else:
+                summary["by_user"][row.user_id] += count
+            if row.hourly_count:
+                summary["by_hour"][int(row.hour_of_day)] += int(row.hourly_count)
+            summary["logs_with_changes_but_no_fields"] += int(row.missing_fields_count or 0)
+
+        for key in ("by_operation", "by_table", "by_user"):
+            summary[key] = dict(summary[key])
+        summary["by_hour"] = dict(sorted(summary["by_hour"].items()))
+        return summary
+
+    async def bulk_minutes(
+        self,
+        db: AsyncSession,
+        start_at: datetime,
+        end_at: datetime,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Busiest minutes in which one user wrote more than AUDIT_BULK_MINUTE_THRESHOLD audit logs.
+
+        Rolled-up minutes come from audit_bulk_minutes, minutes after the
+        watermark are grouped from audit_logs, in one query.
+        """
+        watermark = func.coalesce(
+            select(AuditRollupState.rolled_through)
+            .where(AuditRollupState.name == HOURLY)
+            .scalar_subquery(),
+            EPOCH
+        )
+        minute = self._truncate(db, "minute", AuditLog.created_at)
+
+        rolled = select(
+            AuditBulkMinute.user_id,
+            AuditBulkMinute.minute,
+            AuditBulkMinute.log_count,
+        ).where(
+            AuditBulkMinute.minute < watermark,
+            AuditBulkMinute.minute >= start_at,
+            AuditBulkMinute.minute < end_at,
+        )
+        recent = (
+            select(AuditLog.user_id, minute.label("minute"), func.count().label("log_count"))
+            .where(
+                AuditLog.created_at >= watermark,
+                AuditLog.created_at >= start_at,
+                AuditLog.created_at < end_at,
+                AuditLog.user_id.isnot(None),
+            )
+            .group_by(AuditLog.user_id, minute)
+            .having(func.count() > settings.AUDIT_BULK_MINUTE_THRESHOLD)
+        )
+        source = union_all(rolled, recent).subquery("bulk_minutes")
+
+        result = await db.execute(
+            select(source.c.user_id, source.c.minute, source.c.log_count)
+            .order_by(source.c.log_count.desc())
+            .limit(limit)
+        )
+        return [
+            {"user_id": user_id, "minute": value if isinstance(value, str) else value.isoformat(), "count": count}
+            for user_id, value, count in result.all()
+        ]
+
+    async def _rollup_range(self, db: AsyncSession, start: datetime, end: datetime) -> None:
+        """Recompute the hourly rollups and bulk minutes of [start, end)."""
+        in_range = and_(AuditLog.created_at >= start, AuditLog.created_at < end)
+
+        await db.execute(
+            delete(AuditHourlyRollup).where(AuditHourlyRollup.hour >= start, AuditHourlyRollup.hour < end)
+        )
+        hour = self._truncate(db, "hour", AuditLog.created_at)
+        user_key = self._user_key()
+        await db.execute(
+            insert(AuditHourlyRollup).from_select(
+                ["hour", "table_name", "operation", "user_id", "log_count", "missing_fields_count"],
+                select(
+                    hour,
+                    AuditLog.table_name,
+                    AuditLog.operation,
+                    user_key,
+                    func.count(),
+                    func.sum(self._missing_fields()),
+                )
+                .where(in_range)
+                .group_by(hour, AuditLog.table_name, AuditLog.operation, user_key)
+            )
+        )
+
+        await db.execute(
+            delete(AuditBulkMinute).where(AuditBulkMinute.minute >= start, AuditBulkMinute.minute < end)
+        )
+        minute = self._truncate(db, "minute", AuditLog.created_at)
+        await db.execute(
+            insert(AuditBulkMinute).from_select(
+                ["user_id", "minute", "log_count"],
+                select(AuditLog.user_id, minute, func.count())
+                .where(in_range, AuditLog.user_id.isnot(None))
+                .group_by(AuditLog.user_id, minute)
+                .having(func.count() > settings.AUDIT_BULK_MINUTE_THRESHOLD)
+            )
+        )
+
+    async def _set_watermark(self, db: AsyncSession, rolled_through: datetime) -> None:
+        result = await db.execute(
+            update(AuditRollupState)
+            .where(AuditRollupState.name == HOURLY)
+            .values(rolled_through=rolled_through)
+        )
+        if result.rowcount == 0:
+            db.add(AuditRollupState(name=HOURLY, rolled_through=rolled_through))
+            await db.flush()
+
+    def _truncate(self, db: AsyncSession, unit: str, column):
+        """Truncate a timestamp to the hour or minute (literal unit, so GROUP BY matches the select)."""
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return func.date_trunc(literal_column(f"'{unit}'"), column)
+        if dialect == "sqlite":
+            # Same text format SQLAlchemy stores DateTime values in
+            pattern = "%Y-%m-%d %H:00:00.000000" if unit == "hour" else "%Y-%m-%d %H:%M:00.000000"
+            return func.strftime(literal_column(f"'{pattern}'"), column)
+        raise BusinessLogicError(f"Audit rollups are not supported on {dialect}")
+
+    @staticmethod
+    def _user_key():
+        return func.coalesce(AuditLog.user_id, literal_column(str(SYSTEM_USER_ID)))
+
+    @staticmethod
+    def _missing_fields():
+        """1 for UPDATE rows with new values but no changed_fields, else 0."""
+        return case(
+            (and_(
+                AuditLog.operation == AuditOperation.UPDATE.value,
+                AuditLog.new_values.isnot(None),
+                AuditLog.changed_fields.is_(None),
+            ), 1),
+            else_=0
+        )
+
+
+# Create singleton instance
+audit_rollup_service = AuditRollupService()
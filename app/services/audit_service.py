@@ -2,28 +2,57 @@
 Audit service layer for tracking and managing audit logs
 """
 
-from typing import List, Dict, Any, Optional, Tuple, Union
-from datetime import datetime, date
-from sqlalchemy import select, func, and_, or_, desc, asc, text, update
+from typing import List, Dict, Any, Optional, Tuple, Union, AsyncIterator
+import logging
+import re
+from datetime import datetime, date, time, timezone
+from sqlalchemy import select, func, and_, or_, desc, asc, text, insert, update, delete, tuple_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 import json
 import csv
 import io
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
 
 from app.models.audit_log import AuditLog, AuditOperation
 from app.models.user import User
 from app.models.application import Application
 from app.models.subtask import SubTask
+from app.core.audit_writer import PENDING_KEY, audit_writer
+from app.core.cache import CacheTag, invalidates
+from app.core.config import settings
 from app.core.exceptions import NotFoundError, ValidationError
+from app.services.audit_rollup_service import audit_rollup_service
+from app.services.trend_service import Granularity, shift_periods
+from app.utils.pagination import count_rows, decode_cursor, encode_cursor, keyset_after, keyset_order
+
+logger = logging.getLogger(__name__)
 
 
 class AuditService:
     """Audit service for tracking and managing audit logs."""
 
+    # Rows deleted per statement when audit_logs is not partitioned
+    CLEANUP_BATCH_SIZE = 10000
+    PARTITION_NAME = re.compile(r"audit_logs_y(\d{4})m(\d{2})")
+    DEFAULT_PARTITION = "audit_logs_default"
+
+    # Rows fetched per keyset page by the audit trail exports
+    EXPORT_PAGE_SIZE = 2000
+    EXPORT_CSV_FIELDS = [
+        'id', 'timestamp', 'table_name', 'record_id', 'operation',
+        'user_id', 'username', 'user_full_name', 'changed_fields',
+        'request_id', 'user_ip', 'reason', 'cursor'
+    ]
+    EXPORT_EXCEL_COLUMNS = [
+        ('ID', 'id'), ('Timestamp', 'timestamp'), ('Table', 'table_name'),
+        ('Record ID', 'record_id'), ('Operation', 'operation'), ('User ID', 'user_id'),
+        ('Username', 'username'), ('Full Name', 'user_full_name'),
+        ('Changed Fields', 'changed_fields'), ('Old Values', 'old_values'),
+        ('New Values', 'new_values'), ('Request ID', 'request_id'),
+        ('IP Address', 'user_ip'), ('Reason', 'reason')
+    ]
+
     def __init__(self):
         self.model = AuditLog
 
@@ -42,9 +71,113 @@ class AuditService:
         reason: Optional[str] = None,
         extra_data: Optional[Dict[str, Any]] = None
     ) -> AuditLog:
-        """Create a new audit log entry."""
+        """Create a new audit log entry and commit it immediately."""
+        audit_log = AuditLog(**self._build_audit_row(
+            table_name, record_id, operation, old_values, new_values,
+            user_id, request_id, user_ip, user_agent, reason, extra_data
+        ))
+
+        db.add(audit_log)
+        await db.commit()
+        await db.refresh(audit_log)
+        return audit_log
+
+    async def record_audit_log(
+        self,
+        db: AsyncSession,
+        table_name: str,
+        record_id: int,
+        operation: AuditOperation,
+        old_values: Optional[Dict[str, Any]] = None,
+        new_values: Optional[Dict[str, Any]] = None,
+        user_id: Optional[int] = None,
+        request_id: Optional[str] = None,
+        user_ip: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        reason: Optional[str] = None,
+        extra_data: Optional[Dict[str, Any]] = None,
+        transactional: Optional[bool] = None
+    ) -> None:
+        """
+        Record an audit entry for a write made in the caller's session.
+
+        Call before committing the business write. In the async write mode the
+        row is handed to the batched audit writer once the caller's
+        transaction commits and is dropped if it rolls back. With
+        transactional=True (or AUDIT_WRITE_MODE=transactional) the row is
+        added to the caller's session and committed atomically with the
+        business write; this is also the fallback while the writer is not
+        running or its queue stays full.
+        """
+        row = self._build_audit_row(
+            table_name, record_id, operation, old_values, new_values,
+            user_id, request_id, user_ip, user_agent, reason, extra_data
+        )
+
+        if transactional is None:
+            transactional = settings.AUDIT_WRITE_MODE == "transactional"
+
+        if not transactional and audit_writer.running and await audit_writer.wait_for_space():
+            if db.in_transaction():
+                db.sync_session.info.setdefault(PENDING_KEY, []).append(row)
+            else:
+                audit_writer.submit([row])
+            return
+
+        db.add(AuditLog(**row))
+
+    async def record_audit_logs(
+        self,
+        db: AsyncSession,
+        entries: List[Dict[str, Any]],
+        transactional: Optional[bool] = None
+    ) -> None:
+        """
+        Record the audit entries of a bulk write in the caller's session.
+
+        Each entry holds the keyword arguments of record_audit_log. The rows
+        follow the same write mode as record_audit_log; in transactional mode
+        they are written with one multi-row INSERT.
+        """
+        rows = [
+            self._build_audit_row(
+                entry["table_name"], entry["record_id"], entry["operation"],
+                entry.get("old_values"), entry.get("new_values"), entry.get("user_id"),
+                entry.get("request_id"), entry.get("user_ip"), entry.get("user_agent"),
+                entry.get("reason"), entry.get("extra_data")
+            )
+            for entry in entries
+        ]
+        if not rows:
+            return
 
-        # Calculate changed fields for UPDATE operations
+        if transactional is None:
+            transactional = settings.AUDIT_WRITE_MODE == "transactional"
+
+        if not transactional and audit_writer.running and await audit_writer.wait_for_space():
+            if db.in_transaction():
+                db.sync_session.info.setdefault(PENDING_KEY, []).extend(rows)
+            else:
+                audit_writer.submit(rows)
+            return
+
+        await db.execute(insert(AuditLog), rows)
+
+    def _build_audit_row(
+        self,
+        table_name: str,
+        record_id: int,
+        operation: AuditOperation,
+        old_values: Optional[Dict[str, Any]],
+        new_values: Optional[Dict[str, Any]],
+        user_id: Optional[int],
+        request_id: Optional[str],
+        user_ip: Optional[str],
+        user_agent: Optional[str],
+        reason: Optional[str],
+        extra_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build audit_logs column values, including changed fields for UPDATE operations."""
         changed_fields = None
         if operation == AuditOperation.UPDATE and old_values and new_values:
             changed_fields = []
@@ -52,25 +185,30 @@ class AuditService:
                 if key in old_values and old_values[key] != new_values[key]:
                     changed_fields.append(key)
 
-        audit_log = AuditLog(
-            table_name=table_name,
-            record_id=record_id,
-            operation=operation.value,
-            old_values=old_values,
-            new_values=new_values,
-            changed_fields=changed_fields,
-            request_id=request_id,
-            user_ip=user_ip,
-            user_agent=user_agent,
-            reason=reason,
-            extra_data=extra_data,
-            user_id=user_id
-        )
+        return {
+            "table_name": table_name,
+            "record_id": record_id,
+            "operation": operation.value,
+            "old_values": self._json_values(old_values),
+            "new_values": self._json_values(new_values),
+            "changed_fields": changed_fields,
+            "request_id": request_id,
+            "user_ip": user_ip,
+            "user_agent": user_agent,
+            "reason": reason,
+            "extra_data": extra_data,
+            "user_id": user_id,
+            "created_at": datetime.now(timezone.utc)
+        }
 
-        db.add(audit_log)
-        await db.commit()
-        await db.refresh(audit_log)
-        return audit_log
+    def _json_values(self, values: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Convert date values to ISO strings so the row can be stored as JSON."""
+        if not values:
+            return values
+        return {
+            key: value.isoformat() if isinstance(value, (datetime, date)) else value
+            for key, value in values.items()
+        }
 
     async def get_audit_log(self, db: AsyncSession, audit_log_id: int) -> Optional[AuditLog]:
         """Get audit log by ID."""
@@ -100,9 +238,98 @@ class AuditService:
         query = select(AuditLog).options(selectinload(AuditLog.user))
         count_query = select(func.count(AuditLog.id))
 
+        conditions = self._list_conditions(table_name, record_id, operation, user_id, start_date, end_date, search)
+
+        # Apply all conditions
+        if conditions:
+            query = query.where(and_(*conditions))
+            count_query = count_query.where(and_(*conditions))
+
+        # Get total count
+        total_result = await db.execute(count_query)
+        total = total_result.scalar()
+
+        # Apply sorting and pagination
+        query = query.order_by(desc(AuditLog.created_at))
+        query = query.offset(skip).limit(limit)
+
+        # Execute query
+        result = await db.execute(query)
+        audit_logs = result.scalars().all()
+
+        return audit_logs, total
+
+    async def list_audit_logs_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        count: str = "none",
+        table_name: Optional[str] = None,
+        record_id: Optional[int] = None,
+        operation: Optional[AuditOperation] = None,
+        user_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[AuditLog], Optional[str], Optional[int]]:
+        """
+        List audit logs newest first with keyset (cursor) pagination.
+
+        Pages continue after the (created_at, id) of the previous page's last
+        row, an index range scan on ix_audit_logs_created_id however deep the
+        page, instead of skipping rows with OFFSET.
+
+        Args:
+            db: Database session
+            limit: Page size
+            cursor: next_cursor of the previous page, None for the first page
+            count: "exact", "estimated" (planner estimate) or "none"
+            table_name, record_id, operation, user_id, start_date, end_date, search: Filters
+
+        Returns:
+            Tuple of (audit logs, next_cursor or None on the last page, total or None)
+
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        conditions = self._list_conditions(table_name, record_id, operation, user_id, start_date, end_date, search)
+        total = await count_rows(db, select(AuditLog.id).where(*conditions), count)
+
+        query = (
+            select(AuditLog)
+            .options(selectinload(AuditLog.user))
+            .where(*conditions)
+            .order_by(*keyset_order(AuditLog.created_at, AuditLog.id, descending=True))
+            .limit(limit + 1)
+        )
+        if cursor:
+            created_at, last_id = decode_cursor(cursor, (datetime, int))
+            query = query.where(keyset_after(AuditLog.created_at, AuditLog.id, True, created_at, last_id))
+
+        result = await db.execute(query)
+        audit_logs = list(result.scalars().all())
+
+        next_cursor = None
+        if len(audit_logs) > limit:
+            audit_logs = audit_logs[:limit]
+            next_cursor = encode_cursor(audit_logs[-1].created_at, audit_logs[-1].id)
+
+        return audit_logs, next_cursor, total
+
+    def _list_conditions(
+        self,
+        table_name: Optional[str],
+        record_id: Optional[int],
+        operation: Optional[AuditOperation],
+        user_id: Optional[int],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        search: Optional[str]
+    ) -> List[Any]:
+        """Filter conditions of the audit log listings."""
         conditions = []
 
-        # Apply filters
         if table_name:
             conditions.append(AuditLog.table_name == table_name)
 
@@ -115,13 +342,8 @@ class AuditService:
         if user_id:
             conditions.append(AuditLog.user_id == user_id)
 
-        if start_date:
-            conditions.append(AuditLog.created_at >= start_date)
-
-        if end_date:
-            # End of day for end_date
-            end_datetime = datetime.combine(end_date, datetime.max.time())
-            conditions.append(AuditLog.created_at <= end_datetime)
+        # Date bounds prune the partitions outside the range
+        conditions.extend(self._created_at_conditions(start_date, end_date))
 
         if search:
             # Search in reason, extra_data, or user agent
@@ -132,24 +354,7 @@ class AuditService:
             ]
             conditions.append(or_(*search_conditions))
 
-        # Apply all conditions
-        if conditions:
-            query = query.where(and_(*conditions))
-            count_query = count_query.where(and_(*conditions))
-
-        # Get total count
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
-
-        # Apply sorting and pagination
-        query = query.order_by(desc(AuditLog.created_at))
-        query = query.offset(skip).limit(limit)
-
-        # Execute query
-        result = await db.execute(query)
-        audit_logs = result.scalars().all()
-
-        return audit_logs, total
+        return conditions
 
     async def get_record_history(
         self,
@@ -181,13 +386,7 @@ class AuditService:
     ) -> List[AuditLog]:
         """Get audit logs for a specific user."""
         conditions = [AuditLog.user_id == user_id]
-
-        if start_date:
-            conditions.append(AuditLog.created_at >= start_date)
-
-        if end_date:
-            end_datetime = datetime.combine(end_date, datetime.max.time())
-            conditions.append(AuditLog.created_at <= end_datetime)
+        conditions.extend(self._created_at_conditions(start_date, end_date))
 
         result = await db.execute(
             select(AuditLog)
@@ -204,73 +403,47 @@ class AuditService:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
     ) -> Dict[str, Any]:
-        """Get audit log statistics."""
-
-        conditions = []
-        if start_date:
-            conditions.append(AuditLog.created_at >= start_date)
-        if end_date:
-            end_datetime = datetime.combine(end_date, datetime.max.time())
-            conditions.append(AuditLog.created_at <= end_datetime)
-
-        base_filter = and_(*conditions) if conditions else True
+        """
+        Get audit log statistics.
 
-        # Total audit logs
-        total_result = await db.execute(
-            select(func.count(AuditLog.id)).where(base_filter)
-        )
-        total_logs = total_result.scalar()
+        Answered in one query from the hourly rollups, scanning audit_logs
+        only after the rollup watermark (see AuditRollupService.summarize).
+        """
+        summary = await audit_rollup_service.summarize(db, **self._statistics_window(start_date, end_date))
+        return self._statistics_response(summary, start_date, end_date)
 
-        # Operations breakdown
-        operations_result = await db.execute(
-            select(AuditLog.operation, func.count(AuditLog.id))
-            .where(base_filter)
-            .group_by(AuditLog.operation)
-        )
-        by_operation = {op: count for op, count in operations_result.all()}
+    def _statistics_window(self, start_date: Optional[date], end_date: Optional[date]) -> Dict[str, Any]:
+        """Half-open UTC bounds of a statistics period and of its hour-of-day breakdown."""
+        from datetime import timedelta
 
-        # Tables breakdown
-        tables_result = await db.execute(
-            select(AuditLog.table_name, func.count(AuditLog.id))
-            .where(base_filter)
-            .group_by(AuditLog.table_name)
+        start_at = datetime.combine(start_date, time.min, tzinfo=timezone.utc) if start_date else None
+        end_at = (
+            datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc) if end_date else None
         )
-        by_table = {table: count for table, count in tables_result.all()}
-
-        # Top users
-        users_result = await db.execute(
-            select(AuditLog.user_id, func.count(AuditLog.id))
-            .where(and_(base_filter, AuditLog.user_id.isnot(None)))
-            .group_by(AuditLog.user_id)
-            .order_by(desc(func.count(AuditLog.id)))
-            .limit(10)
+        # Activity by hour defaults to the last 7 days
+        hourly_start_at = start_at or datetime.combine(
+            date.today() - timedelta(days=7), time.min, tzinfo=timezone.utc
         )
-        top_users = [{"user_id": user_id, "count": count} for user_id, count in users_result.all()]
+        return {"start_at": start_at, "end_at": end_at, "hourly_start_at": hourly_start_at}
 
-        # Activity by hour (for recent activity patterns)
+    def _statistics_response(
+        self,
+        summary: Dict[str, Any],
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Dict[str, Any]:
+        """Format an AuditRollupService summary as the audit statistics response."""
+        top_users = sorted(summary["by_user"].items(), key=lambda item: (-item[1], item[0]))[:10]
         if not start_date:
-            # Default to last 7 days for hourly analysis
             from datetime import timedelta
             start_date = date.today() - timedelta(days=7)
 
-        hourly_result = await db.execute(
-            text("""
-                SELECT EXTRACT(HOUR FROM created_at) as hour, COUNT(*) as count
-                FROM audit_logs
-                WHERE created_at >= :start_date
-                GROUP BY EXTRACT(HOUR FROM created_at)
-                ORDER BY hour
-            """),
-            {"start_date": start_date}
-        )
-        by_hour = {int(hour): count for hour, count in hourly_result.all()}
-
         return {
-            "total_logs": total_logs,
-            "by_operation": by_operation,
-            "by_table": by_table,
-            "top_users": top_users,
-            "activity_by_hour": by_hour,
+            "total_logs": summary["total_logs"],
+            "by_operation": summary["by_operation"],
+            "by_table": summary["by_table"],
+            "top_users": [{"user_id": user_id, "count": count} for user_id, count in top_users],
+            "activity_by_hour": summary["by_hour"],
             "period_start": start_date.isoformat() if start_date else None,
             "period_end": end_date.isoformat() if end_date else None
         }
@@ -340,90 +513,262 @@ class AuditService:
     async def cleanup_old_logs(
         self,
         db: AsyncSession,
-        days_to_keep: int = 365
+        days_to_keep: int = 365,
+        dry_run: bool = False
     ) -> int:
-        """Clean up old audit logs beyond retention period."""
+        """
+        Clean up old audit logs beyond retention period.
+
+        On a partitioned audit_logs the monthly partitions lying entirely
+        before the cutoff are detached and dropped, so retention is applied
+        per whole month and never deletes rows one by one; rows of those
+        months that sit in audit_logs_default are deleted with them. The
+        count of a dropped partition is the planner estimate
+        (pg_class.reltuples) rather than a scan. Otherwise rows are deleted
+        in batches of CLEANUP_BATCH_SIZE.
+
+        Returns:
+            Number of audit logs removed (or that would be, with dry_run)
+        """
         from datetime import timedelta
 
         cutoff_date = date.today() - timedelta(days=days_to_keep)
 
-        # Count logs to be deleted
-        count_result = await db.execute(
-            select(func.count(AuditLog.id))
-            .where(AuditLog.created_at < cutoff_date)
-        )
-        count_to_delete = count_result.scalar()
+        if await self.is_partitioned(db):
+            expired = [p["name"] for p in await self.list_partitions(db) if p["end"] <= cutoff_date]
+            # Months ending on or before the cutoff, the ones whose partitions are dropped
+            boundary = datetime.combine(cutoff_date.replace(day=1), time.min, tzinfo=timezone.utc)
+            removed = sum((await self._estimated_rows(db, expired)).values())
+            has_default = await self._has_default_partition(db)
+
+            if dry_run:
+                if has_default:
+                    count_result = await db.execute(
+                        text(f"SELECT count(*) FROM {self.DEFAULT_PARTITION} WHERE created_at < :boundary"),
+                        {"boundary": boundary}
+                    )
+                    removed += count_result.scalar()
+                return removed
+
+            for name in expired:
+                await db.execute(text(f'ALTER TABLE audit_logs DETACH PARTITION "{name}"'))
+                await db.execute(text(f'DROP TABLE "{name}"'))
+            if has_default:
+                result = await db.execute(
+                    text(f"DELETE FROM {self.DEFAULT_PARTITION} WHERE created_at < :boundary"),
+                    {"boundary": boundary}
+                )
+                removed += result.rowcount
+            await audit_rollup_service.discard_before(db, boundary)
+            await db.commit()
+            return removed
 
-        if count_to_delete > 0:
-            # Delete old logs
-            await db.execute(
-                text("DELETE FROM audit_logs WHERE created_at < :cutoff_date"),
-                {"cutoff_date": cutoff_date}
+        cutoff = datetime.combine(cutoff_date, time.min, tzinfo=timezone.utc)
+        if dry_run:
+            count_result = await db.execute(
+                select(func.count(AuditLog.id)).where(AuditLog.created_at < cutoff)
             )
+            return count_result.scalar()
+
+        await audit_rollup_service.discard_before(db, cutoff)
+        removed = 0
+        while True:
+            expired_ids = select(AuditLog.id).where(AuditLog.created_at < cutoff).limit(self.CLEANUP_BATCH_SIZE)
+            result = await db.execute(delete(AuditLog).where(AuditLog.id.in_(expired_ids)))
             await db.commit()
+            removed += result.rowcount
+            if result.rowcount < self.CLEANUP_BATCH_SIZE:
+                return removed
 
-        return count_to_delete
+    async def is_partitioned(self, db: AsyncSession) -> bool:
+        """Whether audit_logs is a partitioned table (PostgreSQL after the partitioning migration)."""
+        if db.get_bind().dialect.name != 'postgresql':
+            return False
 
-    async def export_audit_trail(
+        result = await db.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_logs'))"
+        ))
+        return bool(result.scalar())
+
+    async def list_partitions(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        """
+        Monthly audit_logs partitions, oldest first.
+
+        Returns:
+            Dicts with name, start (first day of the month) and end (first day of the next month)
+        """
+        result = await db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('audit_logs')"
+        ))
+        partitions = []
+        for (name,) in result.all():
+            match = self.PARTITION_NAME.fullmatch(name)
+            if match:
+                start = date(int(match.group(1)), int(match.group(2)), 1)
+                partitions.append({
+                    "name": name,
+                    "start": start,
+                    "end": shift_periods(start, Granularity.MONTH, 1)
+                })
+        return sorted(partitions, key=lambda partition: partition["start"])
+
+    async def ensure_partitions(self, db: AsyncSession, months_ahead: Optional[int] = None) -> List[str]:
+        """
+        Create the monthly audit_logs partitions from the current month to months_ahead months ahead.
+
+        Partition bounds are UTC month starts. Does nothing unless audit_logs
+        is partitioned.
+
+        If maintenance lagged and rows of a missing month already landed in
+        audit_logs_default, PostgreSQL refuses to create the partition. The
+        default partition is then detached, the month's partition created,
+        its rows moved over and the default partition attached again, all
+        in this transaction (which holds audit_logs locked meanwhile).
+
+        Returns:
+            Names of the partitions created
+        """
+        if not await self.is_partitioned(db):
+            return []
+
+        if months_ahead is None:
+            months_ahead = settings.AUDIT_PARTITION_MONTHS_AHEAD
+
+        existing = {partition["name"] for partition in await self.list_partitions(db)}
+        has_default = await self._has_default_partition(db)
+        current_month = datetime.now(timezone.utc).date().replace(day=1)
+        created = []
+        for offset in range(months_ahead + 1):
+            month = shift_periods(current_month, Granularity.MONTH, offset)
+            name = f"audit_logs_y{month:%Y}m{month:%m}"
+            if name in existing:
+                continue
+            bounds = {
+                "start": datetime.combine(month, time.min, tzinfo=timezone.utc),
+                "end": datetime.combine(shift_periods(month, Granularity.MONTH, 1), time.min, tzinfo=timezone.utc),
+            }
+            create = text(
+                f'CREATE TABLE "{name}" PARTITION OF audit_logs '
+                f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+            )
+
+            stranded = False
+            if has_default:
+                result = await db.execute(text(
+                    f"SELECT EXISTS (SELECT 1 FROM {self.DEFAULT_PARTITION} "
+                    "WHERE created_at >= :start AND created_at < :end)"
+                ), bounds)
+                stranded = bool(result.scalar())
+
+            if stranded:
+                logger.warning(f"Moving audit logs of {month:%Y-%m} out of {self.DEFAULT_PARTITION} into {name}")
+                await db.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {self.DEFAULT_PARTITION}"))
+                await db.execute(create)
+                await db.execute(text(
+                    f'INSERT INTO "{name}" SELECT * FROM {self.DEFAULT_PARTITION} '
+                    "WHERE created_at >= :start AND created_at < :end"
+                ), bounds)
+                await db.execute(text(
+                    f"DELETE FROM {self.DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end"
+                ), bounds)
+                await db.execute(text(f"ALTER TABLE audit_logs ATTACH PARTITION {self.DEFAULT_PARTITION} DEFAULT"))
+            else:
+                await db.execute(create)
+            created.append(name)
+        await db.commit()
+        return created
+
+    async def _has_default_partition(self, db: AsyncSession) -> bool:
+        """Whether the audit_logs_default partition exists."""
+        result = await db.execute(text(f"SELECT to_regclass('{self.DEFAULT_PARTITION}') IS NOT NULL"))
+        return bool(result.scalar())
+
+    async def _estimated_rows(self, db: AsyncSession, names: List[str]) -> Dict[str, int]:
+        """Planner row estimates of the named partitions (0 until they were analyzed)."""
+        if not names:
+            return {}
+        result = await db.execute(
+            text("SELECT relname::text, reltuples FROM pg_class WHERE relname::text = ANY(:names)")
+            .bindparams(bindparam("names", type_=ARRAY(String))),
+            {"names": names}
+        )
+        return {name: max(int(tuples), 0) for name, tuples in result.all()}
+
+    def _created_at_conditions(self, start_date: Optional[date], end_date: Optional[date]) -> List[Any]:
+        """
+        created_at bounds for a date range, as a half-open UTC timestamp range.
+
+        Comparing against timestamps rather than dates lets PostgreSQL prune
+        the audit_logs partitions outside the range.
+        """
+        from datetime import timedelta
+
+        conditions = []
+        if start_date:
+            conditions.append(AuditLog.created_at >= datetime.combine(start_date, time.min, tzinfo=timezone.utc))
+        if end_date:
+            conditions.append(
+                AuditLog.created_at < datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+            )
+        return conditions
+
+    def _export_conditions(
         self,
-        db: AsyncSession,
         table_name: Optional[str] = None,
         record_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        operation: Optional[AuditOperation] = None,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None,
-        format: str = "json"
-    ) -> List[Dict[str, Any]]:
-        """Export audit trail data for compliance purposes."""
-
-        # Build query
-        query = select(AuditLog).options(selectinload(AuditLog.user))
+        end_date: Optional[date] = None
+    ) -> List[Any]:
+        """Filter conditions shared by the audit trail exports."""
         conditions = []
-
         if table_name:
             conditions.append(AuditLog.table_name == table_name)
         if record_id:
             conditions.append(AuditLog.record_id == record_id)
-        if start_date:
-            conditions.append(AuditLog.created_at >= start_date)
-        if end_date:
-            end_datetime = datetime.combine(end_date, datetime.max.time())
-            conditions.append(AuditLog.created_at <= end_datetime)
-
-        if conditions:
-            query = query.where(and_(*conditions))
-
-        query = query.order_by(asc(AuditLog.created_at))
-
-        result = await db.execute(query)
-        audit_logs = result.scalars().all()
-
-        # Format for export
-        export_data = []
-        for log in audit_logs:
-            export_record = {
-                "id": log.id,
-                "timestamp": log.created_at.isoformat(),
-                "table_name": log.table_name,
-                "record_id": log.record_id,
-                "operation": log.operation,
-                "user_id": log.user_id,
-                "username": log.user.username if log.user else None,
-                "user_full_name": log.user.full_name if log.user else None,
-                "changed_fields": log.changed_fields,
-                "field_changes": log.get_field_changes(),
-                "old_values": log.old_values,
-                "new_values": log.new_values,
-                "request_id": log.request_id,
-                "user_ip": log.user_ip,
-                "user_agent": log.user_agent,
-                "reason": log.reason,
-                "extra_data": log.extra_data
+        if user_id:
+            conditions.append(AuditLog.user_id == user_id)
+        if operation:
+            conditions.append(AuditLog.operation == AuditOperation(operation).value)
+        conditions.extend(self._created_at_conditions(start_date, end_date))
+        return conditions
+
+    def _export_record(self, row) -> Dict[str, Any]:
+        """Format one joined audit_logs/users row for export."""
+        changed_fields = row.changed_fields
+        old_values = row.old_values or {}
+        new_values = row.new_values or {}
+        field_changes = {}
+        if row.operation == AuditOperation.UPDATE.value and changed_fields:
+            field_changes = {
+                field: {"before": old_values.get(field), "after": new_values.get(field)}
+                for field in changed_fields
             }
-            export_data.append(export_record)
 
-        return export_data
+        return {
+            "id": row.id,
+            "timestamp": row.created_at.isoformat(),
+            "table_name": row.table_name,
+            "record_id": row.record_id,
+            "operation": row.operation,
+            "user_id": row.user_id,
+            "username": row.username,
+            "user_full_name": row.user_full_name,
+            "changed_fields": changed_fields,
+            "field_changes": field_changes,
+            "old_values": row.old_values,
+            "new_values": row.new_values,
+            "request_id": row.request_id,
+            "user_ip": row.user_ip,
+            "user_agent": row.user_agent,
+            "reason": row.reason,
+            "extra_data": row.extra_data,
+            "cursor": encode_cursor(row.created_at, row.id)
+        }
 
-    async def export_audit_trail_to_csv(
+    async def iter_audit_trail(
         self,
         db: AsyncSession,
         table_name: Optional[str] = None,
@@ -431,155 +776,128 @@ class AuditService:
         user_id: Optional[int] = None,
         operation: Optional[AuditOperation] = None,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
-    ) -> bytes:
-        """Export audit trail to CSV format."""
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Walk matching audit logs in (created_at, id) order, one page at a time.
 
-        # Get audit data
-        export_data = await self.export_audit_trail(
-            db=db,
-            table_name=table_name,
-            record_id=record_id,
-            start_date=start_date,
-            end_date=end_date
-        )
+        Each page is a separate keyset query (usernames joined in the same
+        statement) starting after the last row of the previous page, so memory
+        stays at one page. The session's transaction is committed after each
+        page is read, so a long export does not hold one transaction (and its
+        snapshot) open while the consumer processes the pages. Every record
+        carries the cursor to resume after it.
 
-        # Create CSV in memory
-        output = io.StringIO()
+        Args:
+            db: Database session without uncommitted changes of its own
+            table_name, record_id, user_id, operation, start_date, end_date: Filters
+            cursor: Resume after the record this cursor was taken from
 
-        if export_data:
-            # Define CSV columns
-            fieldnames = [
-                'id', 'timestamp', 'table_name', 'record_id', 'operation',
-                'user_id', 'username', 'user_full_name', 'changed_fields',
-                'request_id', 'user_ip', 'reason'
-            ]
+        Yields:
+            Lists of at most EXPORT_PAGE_SIZE export records
 
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        conditions = self._export_conditions(table_name, record_id, user_id, operation, start_date, end_date)
+        after = decode_cursor(cursor, (datetime, int)) if cursor else None
+
+        base_query = (
+            select(
+                *AuditLog.__table__.c,
+                User.username,
+                User.full_name.label("user_full_name")
+            )
+            .outerjoin(User, User.id == AuditLog.user_id)
+            .where(*conditions)
+            .order_by(asc(AuditLog.created_at), asc(AuditLog.id))
+            .limit(self.EXPORT_PAGE_SIZE)
+        )
 
-            for log in export_data:
-                writer.writerow({
-                    'id': log['id'],
-                    'timestamp': log['timestamp'],
-                    'table_name': log['table_name'],
-                    'record_id': log['record_id'],
-                    'operation': log['operation'],
-                    'user_id': log['user_id'],
-                    'username': log['username'],
-                    'user_full_name': log['user_full_name'],
-                    'changed_fields': json.dumps(log['changed_fields']) if log['changed_fields'] else '',
-                    'request_id': log['request_id'],
-                    'user_ip': log['user_ip'],
-                    'reason': log['reason']
-                })
+        while True:
+            query = base_query
+            if after:
+                query = query.where(tuple_(AuditLog.created_at, AuditLog.id) > tuple_(*after))
+
+            result = await db.execute(query)
+            rows = result.all()
+            # End the read transaction before handing the page to the consumer
+            await db.commit()
+            if not rows:
+                return
 
-        # Convert to bytes
-        output.seek(0)
-        return output.getvalue().encode('utf-8-sig')  # UTF-8 with BOM for Excel compatibility
+            yield [self._export_record(row) for row in rows]
 
-    async def export_audit_trail_to_excel(
+            if len(rows) < self.EXPORT_PAGE_SIZE:
+                return
+            after = (rows[-1].created_at, rows[-1].id)
+
+    async def export_audit_trail(
         self,
         db: AsyncSession,
         table_name: Optional[str] = None,
         record_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        format: str = "json",
         user_id: Optional[int] = None,
         operation: Optional[AuditOperation] = None,
-        start_date: Optional[date] = None,
-        end_date: Optional[date] = None
-    ) -> bytes:
-        """Export audit trail to Excel format."""
+        cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Export audit trail data for compliance purposes (collected in memory; prefer the streams)."""
+        export_data = []
+        async for page in self.iter_audit_trail(
+            db, table_name, record_id, user_id, operation, start_date, end_date, cursor
+        ):
+            export_data.extend(page)
+        return export_data
 
-        # Get audit data
-        export_data = await self.export_audit_trail(
-            db=db,
-            table_name=table_name,
-            record_id=record_id,
-            start_date=start_date,
-            end_date=end_date
-        )
+    async def stream_audit_trail_csv(self, db: AsyncSession, **filters) -> AsyncIterator[bytes]:
+        """
+        Stream the audit trail as CSV, one chunk per page.
 
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Audit Trail"
+        Starts with a UTF-8 BOM for Excel compatibility. The last column is the
+        resume cursor, so an interrupted download can continue with
+        cursor=<last cursor received>.
+        """
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=self.EXPORT_CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        yield output.getvalue().encode('utf-8-sig')
+
+        async for page in self.iter_audit_trail(db, **filters):
+            output.seek(0)
+            output.truncate()
+            for record in page:
+                writer.writerow({
+                    **record,
+                    'changed_fields': json.dumps(record['changed_fields']) if record['changed_fields'] else ''
+                })
+            yield output.getvalue().encode('utf-8')
 
-        # Define headers
-        headers = [
-            'ID', 'Timestamp', 'Table', 'Record ID', 'Operation',
-            'User ID', 'Username', 'Full Name', 'Changed Fields',
-            'Old Values', 'New Values', 'Request ID', 'IP Address', 'Reason'
-        ]
+    async def stream_audit_trail_ndjson(self, db: AsyncSession, **filters) -> AsyncIterator[bytes]:
+        """Stream the audit trail as newline-delimited JSON, one chunk per page; each record has its cursor."""
+        async for page in self.iter_audit_trail(db, **filters):
+            yield "".join(json.dumps(record, default=str) + "\n" for record in page).encode('utf-8')
 
-        # Style for headers
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-
-        # Write headers
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-
-        # Write data
-        for row_idx, log in enumerate(export_data, 2):
-            ws.cell(row=row_idx, column=1, value=log['id'])
-            ws.cell(row=row_idx, column=2, value=log['timestamp'])
-            ws.cell(row=row_idx, column=3, value=log['table_name'])
-            ws.cell(row=row_idx, column=4, value=log['record_id'])
-            ws.cell(row=row_idx, column=5, value=log['operation'])
-            ws.cell(row=row_idx, column=6, value=log['user_id'])
-            ws.cell(row=row_idx, column=7, value=log['username'])
-            ws.cell(row=row_idx, column=8, value=log['user_full_name'])
-            ws.cell(row=row_idx, column=9, value=json.dumps(log['changed_fields']) if log['changed_fields'] else '')
-            ws.cell(row=row_idx, column=10, value=json.dumps(log['old_values']) if log['old_values'] else '')
-            ws.cell(row=row_idx, column=11, value=json.dumps(log['new_values']) if log['new_values'] else '')
-            ws.cell(row=row_idx, column=12, value=log['request_id'])
-            ws.cell(row=row_idx, column=13, value=log['user_ip'])
-            ws.cell(row=row_idx, column=14, value=log['reason'])
-
-        # Auto-adjust column widths
-        for column_cells in ws.columns:
-            length = max(len(str(cell.value or '')) for cell in column_cells)
-            ws.column_dimensions[get_column_letter(column_cells[0].column)].width = min(length + 2, 50)
-
-        # Add filters
-        ws.auto_filter.ref = ws.dimensions
-
-        # Add summary sheet
-        ws_summary = wb.create_sheet("Summary")
-        ws_summary.append(["Export Summary"])
-        ws_summary.append(["Total Records", len(export_data)])
-        ws_summary.append(["Export Date", datetime.utcnow().isoformat()])
+    async def stream_audit_trail_excel(self, db: AsyncSession, **filters) -> AsyncIterator[bytes]:
+        """Stream the audit trail as a constant-memory .xlsx workbook."""
+        from app.services.excel_service import ExcelService
 
-        if start_date:
-            ws_summary.append(["Start Date", start_date.isoformat()])
-        if end_date:
-            ws_summary.append(["End Date", end_date.isoformat()])
-        if table_name:
-            ws_summary.append(["Table Filter", table_name])
-        if record_id:
-            ws_summary.append(["Record ID Filter", record_id])
-
-        # Operation breakdown
-        if export_data:
-            operation_counts = {}
-            for log in export_data:
-                op = log['operation']
-                operation_counts[op] = operation_counts.get(op, 0) + 1
-
-            ws_summary.append([])
-            ws_summary.append(["Operation Breakdown"])
-            for op, count in operation_counts.items():
-                ws_summary.append([op, count])
-
-        # Save to bytes
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-        return output.getvalue()
+        def cell(value):
+            if isinstance(value, (dict, list)):
+                return json.dumps(value, default=str) if value else ''
+            return '' if value is None else value
+
+        async def rows():
+            async for page in self.iter_audit_trail(db, **filters):
+                for record in page:
+                    yield [cell(record[key]) for header, key in self.EXPORT_EXCEL_COLUMNS]
+
+        headers = [header for header, key in self.EXPORT_EXCEL_COLUMNS]
+        async for chunk in ExcelService().stream_workbook("Audit Trail", headers, rows()):
+            yield chunk
 
     async def get_compliance_report(
         self,
@@ -587,61 +905,26 @@ class AuditService:
         start_date: date,
         end_date: date
     ) -> Dict[str, Any]:
-        """Generate compliance report for audit trail."""
-
-        conditions = [
-            AuditLog.created_at >= start_date,
-            AuditLog.created_at <= datetime.combine(end_date, datetime.max.time())
-        ]
-        base_filter = and_(*conditions)
+        """
+        Generate compliance report for audit trail.
 
-        # Basic statistics
-        stats = await self.get_audit_statistics(db, start_date, end_date)
+        Statistics and the integrity counts come from one rollup query,
+        suspicious bulk operations from audit_bulk_minutes; both scan
+        audit_logs only after the rollup watermark.
+        """
+        window = self._statistics_window(start_date, end_date)
+        summary = await audit_rollup_service.summarize(db, **window)
+        stats = self._statistics_response(summary, start_date, end_date)
 
         # Data integrity checks
         integrity_checks = {
-            "logs_without_user": 0,
-            "logs_with_changes_but_no_fields": 0,
+            "logs_without_user": summary["logs_without_user"],
+            "logs_with_changes_but_no_fields": summary["logs_with_changes_but_no_fields"],
             "suspicious_bulk_operations": 0
         }
 
-        # Count logs without user (system operations)
-        no_user_result = await db.execute(
-            select(func.count(AuditLog.id))
-            .where(and_(base_filter, AuditLog.user_id.is_(None)))
-        )
-        integrity_checks["logs_without_user"] = no_user_result.scalar()
-
-        # Count UPDATE operations with values but no changed_fields
-        inconsistent_result = await db.execute(
-            select(func.count(AuditLog.id))
-            .where(and_(
-                base_filter,
-                AuditLog.operation == AuditOperation.UPDATE,
-                AuditLog.new_values.isnot(None),
-                AuditLog.changed_fields.is_(None)
-            ))
-        )
-        integrity_checks["logs_with_changes_but_no_fields"] = inconsistent_result.scalar()
-
-        # Detect potential bulk operations (same user, same minute, multiple records)
-        bulk_ops_result = await db.execute(
-            text("""
-                SELECT user_id, DATE_TRUNC('minute', created_at) as minute, COUNT(*) as count
-                FROM audit_logs
-                WHERE created_at BETWEEN :start_date AND :end_date
-                AND user_id IS NOT NULL
-                GROUP BY user_id, DATE_TRUNC('minute', created_at)
-                HAVING COUNT(*) > 10
-                ORDER BY count DESC
-                LIMIT 10
-            """),
-            {"start_date": start_date, "end_date": end_date}
-        )
-        bulk_operations = [
-            {"user_id": user_id, "minute": minute.isoformat(), "count": count}
-            for user_id, minute, count in bulk_ops_result.all()
-        ]
+        # Potential bulk operations (same user, same minute, many records)
+        bulk_operations = await audit_rollup_service.bulk_minutes(db, window["start_at"], window["end_at"])
         integrity_checks["suspicious_bulk_operations"] = len(bulk_operations)
 
         return {
@@ -659,6 +942,7 @@ class AuditService:
             "generated_at": datetime.utcnow().isoformat()
         }
 
+    @invalidates(CacheTag.APPLICATIONS, CacheTag.SUBTASKS)
     async def rollback_change(
         self,
         db: AsyncSession,
@@ -720,6 +1004,7 @@ class AuditService:
 
         # Delete the record
         await db.delete(record)
+        await self._refresh_rollback_application_stats(db, audit_log, record.__dict__.get('l2_id'))
 
         # Create rollback audit log
         rollback_audit = await self.create_audit_log(
@@ -791,6 +1076,10 @@ class AuditService:
                         value = datetime.fromisoformat(value.replace('Z', '+00:00')) if isinstance(value, str) else value
                 setattr(record, field, value)
 
+        await self._refresh_rollback_application_stats(
+            db, audit_log, current_values.get('l2_id'), audit_log.old_values.get('l2_id')
+        )
+
         # Create rollback audit log
         rollback_audit = await self.create_audit_log(
             db=db,
@@ -855,6 +1144,7 @@ class AuditService:
         new_record.id = audit_log.record_id  # Restore original ID
 
         db.add(new_record)
+        await self._refresh_rollback_application_stats(db, audit_log, record_data.get('l2_id'))
 
         # Create rollback audit log
         rollback_audit = await self.create_audit_log(
@@ -885,6 +1175,19 @@ class AuditService:
             }
         }
 
+    async def _refresh_rollback_application_stats(
+        self,
+        db: AsyncSession,
+        audit_log: AuditLog,
+        *application_ids: Optional[int]
+    ) -> None:
+        """Refresh application_stats for applications touched by a rolled back subtask."""
+        if audit_log.table_name != "sub_tasks":
+            return
+
+        from app.services.application_stats_service import application_stats_service
+        await application_stats_service.refresh_applications(db, application_ids)
+
     def _get_model_class(self, table_name: str):
         """Get the SQLAlchemy model class for a table name."""
         # Map table names to model classes
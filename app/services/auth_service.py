@@ -11,6 +11,8 @@ from sqlalchemy import select
 
 from app.models.user import User
 from app.core.config import settings
+from app.core.session_store import get_session_store
+from app.core.user_cache import user_cache
 from app.core.exceptions import AuthenticationError, AuthorizationError
 
 
@@ -102,6 +104,7 @@ class AuthService:
         
         await db.commit()
         await db.refresh(user)
+        await user_cache.invalidate(user.id)
         return user
     
     def map_sso_role_to_system_role(self, sso_role: str) -> str:
@@ -280,51 +283,66 @@ class AuthService:
         ip_address: str,
         user_agent: str
     ) -> str:
-        """Create user session in Redis."""
-        # In production, this would create a Redis session
-        # For now, return a session ID
+        """Create user session in the session store."""
         import uuid
         session_id = str(uuid.uuid4())
-        
-        # Store session metadata (mock)
+
+        now = datetime.utcnow().isoformat()
         session_data = {
             "user_id": user.id,
             "employee_id": user.employee_id,
             "ip_address": ip_address,
             "user_agent": user_agent,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_activity": datetime.utcnow().isoformat()
+            "created_at": now,
+            "last_activity": now
         }
-        
+
+        store = await get_session_store()
+        await store.create(session_id, session_data)
         return session_id
-    
+
     async def validate_session(
         self,
         db: AsyncSession,
         session_id: str
     ) -> Optional[Dict[str, Any]]:
-        """Validate session from Redis."""
-        # In production, this would check Redis
-        # Mock implementation
-        if session_id:
-            return {
-                "valid": True,
-                "user_id": 1,
-                "last_activity": datetime.utcnow().isoformat()
-            }
-        return None
-    
+        """Validate session and extend its expiry."""
+        if not session_id:
+            return None
+
+        store = await get_session_store()
+        session_data = await store.get(session_id)
+        if session_data is None:
+            return None
+
+        return {"valid": True, **session_data}
+
     async def logout(
         self,
         db: AsyncSession,
-        session_id: str
+        session_id: str,
+        user_id: int
     ) -> bool:
-        """Logout user and invalidate session."""
-        # In production, delete from Redis
-        # Mock implementation
-        await db.commit()
-        return True
-    
+        """
+        Invalidate one of the user's sessions.
+
+        Returns False if the session does not exist or belongs to another user.
+        """
+        store = await get_session_store()
+        session_data = await store.get(session_id)
+        if session_data is None or session_data["user_id"] != user_id:
+            return False
+        return await store.delete(session_id)
+
+    async def logout_all(
+        self,
+        db: AsyncSession,
+        user_id: int
+    ) -> int:
+        """Invalidate every session of a user; returns the number of sessions ended."""
+        store = await get_session_store()
+        return await store.delete_user_sessions(user_id)
+
     async def exchange_code_for_token(self, code: str) -> str:
         """Exchange authorization code for SSO token."""
         # In production, call SSO token endpoint
@@ -2,23 +2,88 @@
 Auto-Calculation Engine for application status and progress updates
 """
 
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, Iterable, Mapping, Callable, Tuple
 from datetime import date, datetime, timezone
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, values, column, cast, Integer, String, Date, Boolean
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.application import Application, ApplicationStatus
 from app.models.subtask import SubTask, SubTaskStatus
+from app.core.cache import CacheTag, invalidates
 from app.core.exceptions import NotFoundError
+from app.services.transformation_stats import count_where
+
+logger = logging.getLogger(__name__)
+
+
+# Application columns maintained by the calculation engine and their SQL types
+# (the types are needed to build a typed VALUES list for the bulk UPDATE)
+METRIC_COLUMNS = {
+    'current_status': String,
+    'planned_requirement_date': Date,
+    'planned_release_date': Date,
+    'planned_tech_online_date': Date,
+    'planned_biz_online_date': Date,
+    'is_ak_completed': Boolean,
+    'is_cloud_native_completed': Boolean,
+    'is_delayed': Boolean,
+    'delay_days': Integer,
+}
+
+PLANNED_DATE_COLUMNS = (
+    'planned_requirement_date',
+    'planned_release_date',
+    'planned_tech_online_date',
+    'planned_biz_online_date',
+)
+
+
+def build_metrics_aggregate(application_ids: Optional[Iterable[int]] = None):
+    """
+    Build a grouped aggregate over sub_tasks with the inputs of _calculate_application_metrics.
+
+    Args:
+        application_ids: Optional iterable of application IDs to restrict the scan
+
+    Returns:
+        Subquery with l2_id, subtask/completed/biz-online counts, per-target
+        totals and completed counts, and the latest planned date of each phase
+    """
+    is_completed = SubTask.task_status == SubTaskStatus.COMPLETED.value
+    is_ak = SubTask.sub_target == "AK"
+    is_cloud_native = SubTask.sub_target == "云原生"
+
+    query = select(
+        SubTask.l2_id.label('l2_id'),
+        func.count(SubTask.id).label('subtask_count'),
+        count_where(is_completed).label('completed_count'),
+        count_where(SubTask.task_status == SubTaskStatus.BIZ_ONLINE.value).label('biz_online_count'),
+        count_where(is_ak).label('ak_count'),
+        count_where(is_ak & is_completed).label('ak_completed_count'),
+        count_where(is_cloud_native).label('cloud_native_count'),
+        count_where(is_cloud_native & is_completed).label('cloud_native_completed_count'),
+        *[func.max(getattr(SubTask, name)).label(f'max_{name}') for name in PLANNED_DATE_COLUMNS]
+    ).group_by(SubTask.l2_id)
+
+    if application_ids is not None:
+        query = query.where(SubTask.l2_id.in_(list(application_ids)))
+
+    return query.subquery('subtask_metrics')
 
 
 class CalculationEngine:
     """Auto-calculation engine for application and subtask metrics."""
 
+    # Applications recalculated (and committed) per batch by the bulk engine
+    RECALCULATION_BATCH_SIZE = 1000
+
     def __init__(self):
-        pass
+        # Progress of the latest bulk recalculation, exposed by the API
+        self.recalculation_progress: Dict[str, Any] = {"status": "idle"}
 
+    @invalidates(CacheTag.APPLICATIONS)
     async def recalculate_application_status(
         self,
         db: AsyncSession,
@@ -47,28 +112,254 @@ class CalculationEngine:
 
         return application
 
-    async def recalculate_all_applications(self, db: AsyncSession) -> Dict[str, int]:
-        """Recalculate status for all applications."""
+    @invalidates(CacheTag.APPLICATIONS)
+    async def recalculate_all_applications(
+        self,
+        db: AsyncSession,
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, int]:
+        """
+        Recalculate status for all applications with set-based SQL.
+
+        Walks applications in primary key order. Each batch reads one grouped
+        aggregate over sub_tasks, derives the metrics with the same rules as
+        _calculate_application_metrics and writes the changed rows back with a
+        single bulk UPDATE, then commits, so no session is held for the whole run.
+
+        Args:
+            db: Database session
+            batch_size: Applications per batch
+            progress_callback: Optional callable receiving the progress dict after each batch
+
+        Returns:
+            Dictionary with total_applications, updated_count and batches
+        """
+        batch_size = batch_size or self.RECALCULATION_BATCH_SIZE
+        total = (await db.execute(select(func.count(Application.id)))).scalar() or 0
+
+        async def id_batches():
+            last_id = 0
+            while True:
+                result = await db.execute(
+                    select(Application.id)
+                    .where(Application.id > last_id)
+                    .order_by(Application.id)
+                    .limit(batch_size)
+                )
+                ids = [row[0] for row in result.all()]
+                if not ids:
+                    return
+                last_id = ids[-1]
+                yield ids
+
+        return await self._recalculate_batches(db, id_batches(), total, progress_callback)
+
+    @invalidates(CacheTag.APPLICATIONS)
+    async def recalculate_applications(
+        self,
+        db: AsyncSession,
+        application_ids: Iterable[int],
+        batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, int]:
+        """
+        Recalculate status for the given applications with set-based SQL.
+
+        Args:
+            db: Database session
+            application_ids: Application IDs to recalculate
+            batch_size: Applications per batch
+            progress_callback: Optional callable receiving the progress dict after each batch
+
+        Returns:
+            Dictionary with total_applications (IDs that exist), updated_count and batches
+        """
+        batch_size = batch_size or self.RECALCULATION_BATCH_SIZE
+        ids = sorted({int(app_id) for app_id in application_ids})
+
+        async def id_batches():
+            for start in range(0, len(ids), batch_size):
+                yield ids[start:start + batch_size]
+
+        return await self._recalculate_batches(db, id_batches(), len(ids), progress_callback)
+
+    async def _recalculate_batches(
+        self,
+        db: AsyncSession,
+        id_batches,
+        total: int,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, int]:
+        """Recalculate and commit applications batch by batch, tracking progress."""
+        progress = {
+            "status": "running",
+            "total": total,
+            "processed": 0,
+            "found": 0,
+            "updated": 0,
+            "batches": 0,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None,
+            "error": None
+        }
+        self.recalculation_progress = progress
+
+        try:
+            async for ids in id_batches:
+                found, updated = await self._recalculate_batch(db, ids)
+                await db.commit()
+
+                progress["found"] += found
+                progress["updated"] += updated
+                progress["processed"] += len(ids)
+                progress["batches"] += 1
+                logger.info(
+                    f"Recalculated {progress['processed']}/{total} applications "
+                    f"({progress['updated']} updated)"
+                )
+                if progress_callback:
+                    progress_callback(dict(progress))
+        except Exception as e:
+            progress["status"] = "failed"
+            progress["error"] = str(e)
+            progress["finished_at"] = datetime.now(timezone.utc).isoformat()
+            raise
+
+        progress["status"] = "completed"
+        progress["finished_at"] = datetime.now(timezone.utc).isoformat()
+
+        return {
+            "total_applications": progress["found"],
+            "updated_count": progress["updated"],
+            "batches": progress["batches"]
+        }
+
+    async def _recalculate_batch(self, db: AsyncSession, application_ids: List[int]) -> Tuple[int, int]:
+        """Recalculate one batch of applications; returns the existing and changed row counts."""
+        metrics = build_metrics_aggregate(application_ids)
+        metric_columns = [c for c in metrics.c if c.name != 'l2_id']
 
-        # Get all applications with subtasks
         result = await db.execute(
-            select(Application)
-            .options(selectinload(Application.subtasks))
+            select(
+                Application.id,
+                Application.actual_biz_online_date,
+                *[getattr(Application, name) for name in METRIC_COLUMNS],
+                *metric_columns
+            )
+            .outerjoin(metrics, metrics.c.l2_id == Application.id)
+            .where(Application.id.in_(application_ids))
         )
-        applications = result.scalars().all()
 
-        updated_count = 0
-        for application in applications:
-            await self._calculate_application_metrics(application)
-            application.updated_at = datetime.now(timezone.utc)
-            updated_count += 1
+        today = date.today()
+        rows = result.all()
+        changed_rows = []
+        for row in rows:
+            current = row._mapping
+            derived = self._derive_application_metrics(current, today)
+            if any(derived[name] != current[name] for name in METRIC_COLUMNS):
+                changed_rows.append({'id': current['id'], **derived})
+
+        await self._bulk_update_metrics(db, changed_rows)
+        return len(rows), len(changed_rows)
+
+    def _derive_application_metrics(self, row: Mapping[str, Any], today: date) -> Dict[str, Any]:
+        """
+        Derive application metric columns from one aggregate row.
+
+        Mirrors _calculate_application_metrics without loading subtasks.
+
+        Args:
+            row: Current application metric columns, actual_biz_online_date and
+                 the columns of build_metrics_aggregate (NULL when no subtasks)
+            today: Reference date for delay calculation
+
+        Returns:
+            Dictionary with the METRIC_COLUMNS values
+        """
+        derived = {name: row[name] for name in METRIC_COLUMNS}
+        total = row['subtask_count'] or 0
+
+        if not total:
+            # No subtasks - status and dates remain as is
+            derived.update(
+                is_ak_completed=False,
+                is_cloud_native_completed=False,
+                is_delayed=False,
+                delay_days=0
+            )
+            return derived
+
+        completed = row['completed_count'] or 0
+        if completed == 0:
+            derived['current_status'] = ApplicationStatus.NOT_STARTED.value
+        elif completed == total:
+            derived['current_status'] = ApplicationStatus.COMPLETED.value
+        elif row['biz_online_count']:
+            derived['current_status'] = ApplicationStatus.BIZ_ONLINE.value
+        else:
+            derived['current_status'] = ApplicationStatus.DEV_IN_PROGRESS.value
+
+        # Latest planned date of each phase across subtasks
+        for name in PLANNED_DATE_COLUMNS:
+            if row[f'max_{name}']:
+                derived[name] = row[f'max_{name}']
+
+        # AK / Cloud Native completion (same Excel formula logic)
+        ak_count = row['ak_count'] or 0
+        cn_count = row['cloud_native_count'] or 0
+        cn_completed = cn_count > 0 and row['cloud_native_completed_count'] == cn_count
+        if ak_count:
+            derived['is_ak_completed'] = row['ak_completed_count'] == ak_count
+        else:
+            derived['is_ak_completed'] = cn_completed
+        derived['is_cloud_native_completed'] = cn_completed
+
+        # Delay status
+        derived['is_delayed'] = False
+        derived['delay_days'] = 0
+        planned_biz_online = derived['planned_biz_online_date']
+        actual_biz_online = row['actual_biz_online_date']
+        if planned_biz_online:
+            if derived['current_status'] == ApplicationStatus.COMPLETED.value:
+                if actual_biz_online and actual_biz_online > planned_biz_online:
+                    derived['is_delayed'] = True
+                    derived['delay_days'] = (actual_biz_online - planned_biz_online).days
+            elif today > planned_biz_online:
+                derived['is_delayed'] = True
+                derived['delay_days'] = (today - planned_biz_online).days
+
+        return derived
+
+    async def _bulk_update_metrics(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Write recalculated metrics with one UPDATE ... FROM (VALUES ...) statement."""
+        if not rows:
+            return
 
-        await db.commit()
+        now = datetime.now(timezone.utc)
 
-        return {
-            "total_applications": len(applications),
-            "updated_count": updated_count
-        }
+        if db.get_bind().dialect.name != 'postgresql':
+            # ORM bulk UPDATE by primary key (executemany) for other dialects
+            await db.execute(update(Application), [{**row, 'updated_at': now} for row in rows])
+            return
+
+        names = ['id', *METRIC_COLUMNS]
+        recalculated = values(
+            column('id', Integer),
+            *[column(name, sql_type) for name, sql_type in METRIC_COLUMNS.items()],
+            name='recalculated'
+        ).data([tuple(row[name] for name in names) for row in rows])
+
+        await db.execute(
+            update(Application)
+            .where(Application.id == recalculated.c.id)
+            .values(
+                # Explicit casts: an all-NULL VALUES column would otherwise be typed as text
+                **{name: cast(recalculated.c[name], sql_type) for name, sql_type in METRIC_COLUMNS.items()},
+                updated_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
 
     async def calculate_project_metrics(self, db: AsyncSession) -> Dict[str, Any]:
         """Calculate comprehensive project-level metrics."""
@@ -9,9 +9,11 @@ from sqlalchemy import select, func, and_, or_, case, distinct
 from sqlalchemy.orm import selectinload
 
 from app.models.application import Application, ApplicationStatus, TransformationTarget
+from app.models.application_stats import ApplicationStats
 from app.models.subtask import SubTask, SubTaskStatus
 from app.models.audit_log import AuditLog
 from app.models.user import User
+from app.services.trend_service import trend_service, TrendScope, Granularity
 
 
 class DashboardService:
@@ -45,8 +47,11 @@ class DashboardService:
             - Average progress
             - Delay tracking
         """
-        # Build base query
-        query = select(Application)
+        # Build base query; progress comes from the application_stats projection
+        query = (
+            select(Application, ApplicationStats)
+            .outerjoin(ApplicationStats, ApplicationStats.application_id == Application.id)
+        )
 
         # Apply filters
         conditions = []
@@ -73,10 +78,10 @@ class DashboardService:
             query = query.where(and_(*conditions))
 
         result = await db.execute(query)
-        applications = result.scalars().all()
+        rows = result.all()
 
         # Calculate metrics
-        total = len(applications)
+        total = len(rows)
 
         if total == 0:
             return {
@@ -106,7 +111,7 @@ class DashboardService:
         ak_target_count = 0  # Applications with AK as target
         cn_target_count = 0  # Applications with Cloud Native as target
 
-        for app in applications:
+        for app, app_stats in rows:
             # Status
             status_key = app.current_status.value if hasattr(app.current_status, 'value') else str(app.current_status)
             status_counts[status_key] = status_counts.get(status_key, 0) + 1
@@ -126,7 +131,7 @@ class DashboardService:
                 delayed_count += 1
 
             # Progress
-            total_progress += app.progress_percentage
+            total_progress += app_stats.progress_percentage if app_stats else 0
 
             # ✅ Use accurate completion flags
             if app.is_ak_completed:
@@ -185,15 +190,18 @@ class DashboardService:
             - Progress metrics
             - Delay tracking
         """
-        # Get all applications
-        query = select(Application)
+        # Get all applications with their application_stats row
+        query = (
+            select(Application, ApplicationStats)
+            .outerjoin(ApplicationStats, ApplicationStats.application_id == Application.id)
+        )
         result = await db.execute(query)
-        applications = result.scalars().all()
+        rows = result.all()
 
         # Group by team
         team_metrics = {}
 
-        for app in applications:
+        for app, app_stats in rows:
             team = app.dev_team if app.dev_team else "未分配"
 
             if team not in team_metrics:
@@ -209,13 +217,19 @@ class DashboardService:
                     "ak_completed": 0,
                     "cloud_native_completed": 0,
                     "both_completed": 0,
-                    "app_ids": []
+                    "subtask_count": 0,
+                    "blocked_subtasks": 0,
+                    "completed_subtasks": 0
                 }
 
             metrics = team_metrics[team]
             metrics["application_count"] += 1
-            metrics["total_progress"] += app.progress_percentage
-            metrics["app_ids"].append(app.id)
+
+            if app_stats:
+                metrics["total_progress"] += app_stats.progress_percentage
+                metrics["subtask_count"] += app_stats.subtask_count
+                metrics["blocked_subtasks"] += app_stats.blocked_subtask_count
+                metrics["completed_subtasks"] += app_stats.completed_subtask_count
 
             # Status counts
             if app.current_status == ApplicationStatus.COMPLETED:
@@ -238,22 +252,6 @@ class DashboardService:
             if app.is_ak_completed and app.is_cloud_native_completed:
                 metrics["both_completed"] += 1
 
-        # Include subtask statistics if requested
-        if include_subtasks:
-            for team, metrics in team_metrics.items():
-                if metrics["app_ids"]:
-                    subtask_query = select(SubTask).where(
-                        SubTask.application_id.in_(metrics["app_ids"])
-                    )
-                    subtask_result = await db.execute(subtask_query)
-                    subtasks = subtask_result.scalars().all()
-
-                    metrics["subtask_count"] = len(subtasks)
-                    metrics["blocked_subtasks"] = sum(1 for st in subtasks if st.is_blocked)
-                    metrics["completed_subtasks"] = sum(
-                        1 for st in subtasks if st.task_status == SubTaskStatus.COMPLETED
-                    )
-
         # Calculate averages and prepare output
         team_list = []
         for team, metrics in team_metrics.items():
@@ -278,9 +276,9 @@ class DashboardService:
 
             if include_subtasks:
                 team_data.update({
-                    "subtask_count": metrics.get("subtask_count", 0),
-                    "blocked_subtasks": metrics.get("blocked_subtasks", 0),
-                    "completed_subtasks": metrics.get("completed_subtasks", 0)
+                    "subtask_count": metrics["subtask_count"],
+                    "blocked_subtasks": metrics["blocked_subtasks"],
+                    "completed_subtasks": metrics["completed_subtasks"]
                 })
 
             team_list.append(team_data)
@@ -298,10 +296,7 @@ class DashboardService:
         days: int = 30
     ) -> List[Dict[str, Any]]:
         """
-        Generate progress timeline data.
-
-        Since we don't have historical snapshots, this creates estimated
-        timeline based on planned and actual dates.
+        Generate progress timeline data from the weekly trend rollups.
 
         Args:
             db: Database session
@@ -310,10 +305,10 @@ class DashboardService:
             days: Number of days to include
 
         Returns:
-            List of timeline data points
+            List of timeline data points, one per week
         """
         # Build query
-        query = select(Application)
+        query = select(Application.id, Application.app_name)
 
         if application_id:
             query = query.where(Application.id == application_id)
@@ -321,87 +316,41 @@ class DashboardService:
             query = query.where(Application.dev_team == team)
 
         result = await db.execute(query)
-        applications = result.scalars().all()
+        names = {str(row.id): row.app_name for row in result.all()}
 
-        if not applications:
+        if not names:
             return []
 
-        # Generate timeline
-        timeline = []
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
+        series = await trend_service.get_series(
+            db, Granularity.WEEK, start_date, end_date, TrendScope.APPLICATION, list(names)
+        )
 
-        # Create weekly data points
-        current_date = start_date
-        while current_date <= end_date:
-            data_point = {
-                "date": current_date.isoformat(),
-                "applications": [],
-                "average_progress": 0,
-                "total_active": 0
-            }
-
-            total_progress = 0
-            app_count = 0
-
-            for app in applications:
-                # Only include applications that existed at this date
-                if app.created_at.date() <= current_date:
-                    app_count += 1
-
-                    # Estimate progress at this date
-                    estimated_progress = self._estimate_progress_at_date(app, current_date)
-                    total_progress += estimated_progress
-
-                    if 0 < estimated_progress < 100:
-                        data_point["total_active"] += 1
-
-                    data_point["applications"].append({
-                        "id": app.id,
-                        "name": app.app_name,
-                        "progress": estimated_progress
-                    })
-
-            if app_count > 0:
-                data_point["average_progress"] = round(total_progress / app_count, 2)
+        # Regroup the per-application series by week
+        weeks: Dict[date, List[Dict[str, Any]]] = {}
+        for point in series:
+            weeks.setdefault(point["date"], []).append(point)
 
-            timeline.append(data_point)
-            current_date += timedelta(days=7)  # Weekly intervals
+        timeline = []
+        for week in sorted(weeks):
+            points = weeks[week]
+            timeline.append({
+                "date": week.isoformat(),
+                "applications": [
+                    {
+                        "id": int(point["scope_key"]),
+                        "name": names[point["scope_key"]],
+                        "progress": point["progress"]
+                    }
+                    for point in points
+                ],
+                "average_progress": round(sum(point["progress"] for point in points) / len(points), 2),
+                "total_active": sum(point["active_count"] for point in points)
+            })
 
         return timeline
 
-    def _estimate_progress_at_date(self, app: Application, target_date: date) -> float:
-        """
-        Estimate application progress at a specific date.
-
-        This is a simplified estimation based on milestone dates.
-        """
-        # If application hasn't started by target date
-        if app.planned_requirement_date and app.planned_requirement_date > target_date:
-            return 0
-
-        # Check actual completion milestones
-        if app.actual_biz_online_date and app.actual_biz_online_date <= target_date:
-            return 100
-        elif app.actual_tech_online_date and app.actual_tech_online_date <= target_date:
-            return 85
-        elif app.actual_release_date and app.actual_release_date <= target_date:
-            return 60
-        elif app.actual_requirement_date and app.actual_requirement_date <= target_date:
-            return 30
-
-        # Check planned milestones
-        if app.planned_biz_online_date and app.planned_biz_online_date <= target_date:
-            return 75
-        elif app.planned_tech_online_date and app.planned_tech_online_date <= target_date:
-            return 50
-        elif app.planned_release_date and app.planned_release_date <= target_date:
-            return 25
-        elif app.planned_requirement_date and app.planned_requirement_date <= target_date:
-            return 10
-
-        return 0
-
     async def get_blocking_analysis(
         self,
         db: AsyncSession
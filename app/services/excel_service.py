@@ -6,21 +6,34 @@ with template-based imports, bulk data validation, and error reporting.
 """
 
 import io
+import os
+import re
 import json
-from typing import List, Dict, Any, Optional, Union, Tuple
+import asyncio
+import itertools
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Union, Tuple, Sequence, Iterable, AsyncIterator
 from datetime import datetime, date, timedelta
 from pathlib import Path
 import pandas as pd
+import xlsxwriter
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.utils import get_column_letter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func, literal, literal_column, any_, bindparam, text, tuple_, String
+from sqlalchemy.orm import contains_eager
 
 from app.models.application import Application, ApplicationStatus, TransformationTarget
+from app.models.application_stats import ApplicationStats
 from app.models.subtask import SubTask, SubTaskStatus
 from app.models.user import User
+from app.core.config import settings
+from app.core.cache import CacheTag, invalidates
 from app.core.exceptions import ValidationError, BusinessLogicError
 
 
@@ -349,6 +362,21 @@ class ExcelMappingConfig:
         '上线检查状态': 'launch_check_status'
     }
 
+    # Column layout of the /excel/export/applications download
+    APPLICATION_EXPORT_COLUMNS = [
+        ('ID', 'id'),
+        ('L2_ID', 'l2_id'),
+        ('应用名称', 'app_name'),
+        ('监管年份', 'ak_supervision_acceptance_year'),
+        ('转型目标', 'overall_transformation_target'),
+        ('负责团队', 'dev_team'),
+        ('负责人', 'dev_owner'),
+        ('整体状态', 'current_status'),
+        ('进度百分比', 'progress_percentage'),
+        ('创建时间', 'created_at'),
+        ('更新时间', 'updated_at')
+    ]
+
     # Required fields (调整为更宽松的验证，适配前端数据)
     APPLICATION_REQUIRED = ['l2_id']  # 只要求L2 ID为必填，其他字段可以为空
     SUBTASK_REQUIRED = ['l2_id']  # 只要求L2 ID为必填，其他字段可以为空并设置默认值
@@ -379,12 +407,108 @@ class ExcelMappingConfig:
         'sub_target', 'version_name', 'task_status', 'block_reason'
     ]
 
+    # Application columns written by the bulk import
+    APPLICATION_IMPORT_FIELDS = [
+        'l2_id', 'app_name', 'ak_supervision_acceptance_year', 'overall_transformation_target',
+        'current_transformation_phase', 'current_status', 'app_tier', 'belonging_l1_name',
+        'belonging_projects', 'is_ak_completed', 'is_cloud_native_completed',
+        'is_domain_transformation_completed', 'is_dbpm_transformation_completed',
+        'dev_mode', 'ops_mode', 'dev_owner', 'dev_team', 'ops_owner', 'ops_team',
+        'belonging_kpi', 'acceptance_status', 'planned_requirement_date', 'planned_release_date',
+        'planned_tech_online_date', 'planned_biz_online_date', 'actual_requirement_date',
+        'actual_release_date', 'actual_tech_online_date', 'actual_biz_online_date',
+        'is_delayed', 'delay_days', 'notes'
+    ]
+
+    # Values used for blank cells when a new application is inserted
+    APPLICATION_INSERT_DEFAULTS = {
+        'app_name': '未命名应用',
+        'overall_transformation_target': 'AK',
+        'current_status': '待启动',
+        'is_ak_completed': False,
+        'is_cloud_native_completed': False,
+        'is_domain_transformation_completed': False,
+        'is_dbpm_transformation_completed': False,
+        'is_delayed': False,
+        'delay_days': 0,
+    }
+
+    # Subtask columns written by the bulk import, besides the application key
+    SUBTASK_IMPORT_FIELDS = [
+        'sub_target', 'version_name', 'app_name', 'task_status',
+        'progress_percentage', 'is_blocked', 'block_reason',
+        'planned_requirement_date', 'planned_release_date', 'planned_tech_online_date', 'planned_biz_online_date',
+        'actual_requirement_date', 'actual_release_date', 'actual_tech_online_date', 'actual_biz_online_date',
+        'resource_applied', 'ops_requirement_submitted', 'ops_testing_status', 'launch_check_status', 'notes'
+    ]
+
+    # Values used for blank cells when a new subtask is inserted
+    SUBTASK_INSERT_DEFAULTS = {
+        'sub_target': 'AK',
+        'task_status': '待启动',
+        'progress_percentage': 0,
+        'is_blocked': False,
+        'resource_applied': False,
+    }
+
+    # Application created for subtask rows whose L2 ID does not exist yet
+    PLACEHOLDER_APPLICATION = {
+        'app_name': '未命名应用',
+        'current_status': '待启动',
+        'overall_transformation_target': 'AK',
+        'current_transformation_phase': '待启动',
+        'dev_team': '待分配',
+        'dev_owner': '待分配',
+        'ak_supervision_acceptance_year': 2024,
+    }
+
+    TRUE_STRINGS = ['true', 'yes', '是', '1', 't', 'y']
+
 
 class ExcelService:
     """Service for Excel import/export operations."""
 
+    # Rows fetched per server-side cursor batch in streaming exports
+    EXPORT_BATCH_SIZE = 1000
+    # Bytes per chunk when streaming the finished workbook
+    EXPORT_CHUNK_SIZE = 64 * 1024
+    # Leading rows searched for the header row on import
+    HEADER_SCAN_ROWS = 30
+    # Data rows read per sheet on import, and the empty-row run that ends the data
+    IMPORT_MAX_ROWS = 50000
+    IMPORT_MAX_CONSECUTIVE_EMPTY = 20
+    # Rows per INSERT ... ON CONFLICT statement; keeps bind parameters under the asyncpg limit
+    IMPORT_BATCH_SIZE = 500
+    # Temporary table subtask imports are COPYed into before the merge
+    SUBTASK_STAGING_TABLE = 'subtask_import_staging'
+
     def __init__(self):
         self.config = ExcelMappingConfig()
+        self._import_semaphore: Optional[asyncio.Semaphore] = None
+
+    def _import_slot(self) -> asyncio.Semaphore:
+        """Semaphore limiting concurrent imports in this application worker."""
+        if self._import_semaphore is None:
+            self._import_semaphore = asyncio.Semaphore(max(1, settings.EXCEL_MAX_CONCURRENT_IMPORTS))
+        return self._import_semaphore
+
+    async def _run_in_worker(self, func, *args):
+        """
+        Run a CPU-bound parse/serialize stage off the event loop.
+
+        Uses the Excel process pool, or a thread when the pool is disabled
+        (EXCEL_WORKER_POOL_SIZE=0). func and its arguments must be picklable.
+        """
+        executor = get_excel_executor()
+        if executor is None:
+            return await asyncio.to_thread(func, *args)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory on a huge file); start a fresh pool next time
+            shutdown_excel_executor()
+            raise
 
     # Import Operations
 
@@ -394,23 +518,26 @@ class ExcelService:
         file_content: bytes,
         user: User,
         validate_only: bool = False
+    ) -> Dict[str, Any]:
+        """Import applications from Excel file (at most EXCEL_MAX_CONCURRENT_IMPORTS at once)."""
+
+        async with self._import_slot():
+            return await self._import_applications_from_excel(db, file_content, user, validate_only)
+
+    async def _import_applications_from_excel(
+        self,
+        db: AsyncSession,
+        file_content: bytes,
+        user: User,
+        validate_only: bool = False
     ) -> Dict[str, Any]:
         """Import applications from Excel file."""
 
         try:
             print(f"[INFO] Starting import_applications_from_excel")
-            
-            # Load workbook
-            workbook = load_workbook(io.BytesIO(file_content), data_only=True)
-            print(f"[INFO] Loaded workbook with sheets: {workbook.sheetnames}")
 
-            # Process the first worksheet or find Applications sheet
-            sheet_name = self._find_applications_sheet(workbook)
-            print(f"[INFO] Using applications sheet: {sheet_name}")
-            worksheet = workbook[sheet_name]
-
-            # Convert to DataFrame
-            df = self._worksheet_to_dataframe(worksheet, self.config.APPLICATION_FIELDS)
+            # Parse the workbook off the event loop
+            df = await self._run_in_worker(parse_applications_workbook, file_content)
             print(f"[INFO] Applications DataFrame shape: {df.shape}")
             print(f"[INFO] Applications DataFrame columns: {list(df.columns)}")
 
@@ -474,21 +601,27 @@ class ExcelService:
         user: User,
         validate_only: bool = False
     ) -> Dict[str, Any]:
-        """Import subtasks from Excel file with support for two-sheet import."""
+        """Import subtasks from Excel file (at most EXCEL_MAX_CONCURRENT_IMPORTS at once)."""
 
-        try:
-            # Load workbook
-            workbook = load_workbook(io.BytesIO(file_content), data_only=True)
-            print(f"DEBUG: Loaded workbook with sheets: {workbook.sheetnames}")
+        async with self._import_slot():
+            return await self._import_subtasks_from_excel(db, file_content, user, validate_only)
 
-            # Check if this is a two-sheet import (applications + subtasks)
-            has_applications_sheet = any(keyword in sheet_name.lower() for sheet_name in workbook.sheetnames
-                                       for keyword in ['总追踪表', '应用', 'application', 'app'])
-            has_subtasks_sheet = any(keyword in sheet_name.lower() for sheet_name in workbook.sheetnames
-                                   for keyword in ['子追踪表', '子任务', 'subtask', 'task'])
+    async def _import_subtasks_from_excel(
+        self,
+        db: AsyncSession,
+        file_content: bytes,
+        user: User,
+        validate_only: bool = False
+    ) -> Dict[str, Any]:
+        """Import subtasks from Excel file with support for two-sheet import."""
 
-            print(f"DEBUG: has_applications_sheet: {has_applications_sheet}")
-            print(f"DEBUG: has_subtasks_sheet: {has_subtasks_sheet}")
+        try:
+            # Parse both sheets off the event loop before any database work
+            parsed = await self._run_in_worker(parse_subtasks_workbook, file_content)
+            has_applications_sheet = parsed['has_applications_sheet']
+            app_sheet_name = parsed['app_sheet_name']
+            app_df = parsed['app_df']
+            subtask_df = parsed['subtask_df']
 
             total_app_rows = 0
             total_subtask_rows = 0
@@ -496,15 +629,8 @@ class ExcelService:
             app_results = {'imported': 0, 'updated': 0, 'skipped': 0}
             subtask_results = {'imported': 0, 'updated': 0, 'skipped': 0}
 
-            # Initialize DataFrames
-            app_df = pd.DataFrame()
-
             # Import applications first if both sheets exist
             if has_applications_sheet:
-                app_sheet_name = self._find_applications_sheet(workbook)
-                app_worksheet = workbook[app_sheet_name]
-                app_df = self._worksheet_to_dataframe(app_worksheet, self.config.APPLICATION_FIELDS)
-
                 if len(app_df) > 0:
                     total_app_rows = len(app_df)
                     app_validation_errors = await self._validate_applications_data(db, app_df)
@@ -524,20 +650,6 @@ class ExcelService:
                     print(f"DEBUG: No application data found in worksheet {app_sheet_name}")
 
             # Import subtasks
-            if has_subtasks_sheet:
-                subtask_sheet_name = self._find_subtasks_sheet(workbook)
-                print(f"DEBUG: Using subtasks sheet: {subtask_sheet_name}")
-                subtask_worksheet = workbook[subtask_sheet_name]
-            else:
-                # Fallback to first sheet if no specific subtask sheet found
-                subtask_worksheet = workbook.active
-                print(f"DEBUG: Using default active sheet: {subtask_worksheet.title}")
-
-            print(f"DEBUG: Processing subtask worksheet...")
-            subtask_df = self._worksheet_to_dataframe(subtask_worksheet, self.config.SUBTASK_FIELDS)
-            print(f"DEBUG: SubTask DataFrame shape: {subtask_df.shape}")
-            print(f"DEBUG: SubTask DataFrame columns: {list(subtask_df.columns)}")
-
             if len(subtask_df) > 0:
                 total_subtask_rows = len(subtask_df)
                 print(f"DEBUG: Found {total_subtask_rows} subtask rows")
@@ -634,29 +746,14 @@ class ExcelService:
         # Get applications data
         applications = await self._get_applications_for_export(db, application_ids, filters)
 
-        # Create workbook
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = "应用列表"
-
-        # Setup headers
         headers = list(self.config.APPLICATION_FIELDS.keys())
-        self._write_headers(worksheet, headers, template_style)
+        rows = [
+            [self._format_cell_value(getattr(app, field, ''), field) for field in self.config.APPLICATION_FIELDS.values()]
+            for app in applications
+        ]
 
-        # Write data
-        for row_num, app in enumerate(applications, start=2):
-            for col_num, (header, field) in enumerate(self.config.APPLICATION_FIELDS.items(), start=1):
-                value = self._format_cell_value(getattr(app, field, ''), field)
-                worksheet.cell(row=row_num, column=col_num, value=value)
-
-        # Apply styling
-        self._apply_worksheet_styling(worksheet, len(applications) + 1, len(headers), template_style)
-
-        # Save to bytes
-        output = io.BytesIO()
-        workbook.save(output)
-        output.seek(0)
-        return output.getvalue()
+        # Build and save the workbook off the event loop
+        return await self._run_in_worker(build_export_workbook, "应用列表", headers, rows, template_style)
 
     async def export_subtasks_to_excel(
         self,
@@ -668,33 +765,44 @@ class ExcelService:
     ) -> bytes:
         """Export subtasks to Excel file."""
 
-        # Get subtasks data
-        subtasks = await self._get_subtasks_for_export(db, application_id, subtask_ids, filters)
+        # Get subtask rows (one tuple query, no ORM objects)
+        fields, _ = self._subtask_export_columns()
+        rows = [
+            self._subtask_export_row(row, fields)
+            for row in await self._get_subtask_export_rows(db, application_id, subtask_ids, filters)
+        ]
 
-        # Create workbook
+        headers = list(self.config.SUBTASK_FIELDS.keys())
+
+        # Build and save the workbook off the event loop
+        return await self._run_in_worker(build_export_workbook, "子任务列表", headers, rows, template_style)
+
+    def build_export_workbook(
+        self,
+        sheet_title: str,
+        headers: List[str],
+        rows: List[List[Any]],
+        template_style: str = "standard"
+    ) -> bytes:
+        """
+        Write formatted rows to a styled single-sheet workbook.
+
+        CPU-bound; runs in the Excel worker pool via build_export_workbook().
+        """
         workbook = Workbook()
         worksheet = workbook.active
-        worksheet.title = "子任务列表"
+        worksheet.title = sheet_title
 
         # Setup headers
-        headers = list(self.config.SUBTASK_FIELDS.keys())
         self._write_headers(worksheet, headers, template_style)
 
         # Write data
-        for row_num, subtask in enumerate(subtasks, start=2):
-            for col_num, (header, field) in enumerate(self.config.SUBTASK_FIELDS.items(), start=1):
-                if field == 'l2_id':  
-                    # 获取关联的Application的l2_id
-                    value = subtask.application.l2_id if subtask.application else ''
-                elif field == 'app_name':
-                    # 从SubTask直接获取app_name字段
-                    value = subtask.app_name if hasattr(subtask, 'app_name') else ''
-                else:
-                    value = self._format_cell_value(getattr(subtask, field, ''), field)
+        for row_num, row in enumerate(rows, start=2):
+            for col_num, value in enumerate(row, start=1):
                 worksheet.cell(row=row_num, column=col_num, value=value)
 
         # Apply styling
-        self._apply_worksheet_styling(worksheet, len(subtasks) + 1, len(headers), template_style)
+        self._apply_worksheet_styling(worksheet, len(rows) + 1, len(headers), template_style)
 
         # Save to bytes
         output = io.BytesIO()
@@ -702,6 +810,160 @@ class ExcelService:
         output.seek(0)
         return output.getvalue()
 
+    async def stream_applications_export(
+        self,
+        db: AsyncSession,
+        application_ids: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        template_style: str = "standard"
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an applications export workbook with constant memory.
+
+        Rows are read through a server-side cursor in EXPORT_BATCH_SIZE batches
+        and written to an xlsxwriter constant_memory workbook on disk, which is
+        then yielded in chunks. Progress comes from the application_stats projection.
+
+        Args:
+            db: Database session, kept open until the iterator is exhausted
+            application_ids: Specific application IDs to export
+            filters: Export filters (see _build_applications_export_query)
+            template_style: Header style
+
+        Yields:
+            Chunks of the .xlsx file
+        """
+        query = self._build_applications_export_query(application_ids, filters)
+        progress = func.coalesce(
+            ApplicationStats.completed_subtask_count * 100 / func.nullif(ApplicationStats.subtask_count, 0),
+            0
+        )
+        query = (
+            query.add_columns(progress.label('progress_percentage'))
+            .outerjoin(ApplicationStats, ApplicationStats.application_id == Application.id)
+            .execution_options(yield_per=self.EXPORT_BATCH_SIZE)
+        )
+
+        async def rows():
+            result = await db.stream(query)
+            async for app, progress_percentage in result:
+                row = []
+                for header, field in self.config.APPLICATION_EXPORT_COLUMNS:
+                    if field == 'progress_percentage':
+                        value = int(progress_percentage or 0)
+                    else:
+                        value = getattr(app, field)
+                        if isinstance(value, datetime):
+                            value = value.isoformat()
+                    row.append('' if value is None else value)
+                yield row
+
+        headers = [header for header, field in self.config.APPLICATION_EXPORT_COLUMNS]
+        async for chunk in self.stream_workbook("Applications", headers, rows(), template_style):
+            yield chunk
+
+    async def stream_subtasks_export(
+        self,
+        db: AsyncSession,
+        application_id: Optional[int] = None,
+        subtask_ids: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        template_style: str = "standard"
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a subtasks export workbook with constant memory.
+
+        Same columns as export_subtasks_to_excel; plain column tuples are read
+        through a server-side cursor and written to an xlsxwriter constant_memory workbook.
+
+        Args:
+            db: Database session, kept open until the iterator is exhausted
+            application_id: Restrict to one application
+            subtask_ids: Specific subtask IDs to export
+            filters: Export filters
+            template_style: Header style
+
+        Yields:
+            Chunks of the .xlsx file
+        """
+        fields, columns = self._subtask_export_columns()
+        query = self._build_subtasks_export_query(
+            application_id, subtask_ids, filters, columns=columns
+        ).execution_options(yield_per=self.EXPORT_BATCH_SIZE)
+
+        async def rows():
+            result = await db.stream(query)
+            async for row in result:
+                yield self._subtask_export_row(row, fields)
+
+        headers = list(self.config.SUBTASK_FIELDS.keys())
+        async for chunk in self.stream_workbook("子任务列表", headers, rows(), template_style):
+            yield chunk
+
+    async def stream_workbook(
+        self,
+        sheet_name: str,
+        headers: List[str],
+        rows: AsyncIterator[List[Any]],
+        template_style: str = "standard"
+    ) -> AsyncIterator[bytes]:
+        """
+        Write rows to a constant_memory xlsxwriter workbook and yield the file in chunks.
+
+        Each row is flushed to disk as soon as it is written, so memory use does
+        not grow with the number of rows. Column widths follow the same rule as
+        _apply_worksheet_styling (content length + 2, between 8 and 50).
+        """
+        fd, path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+
+        try:
+            workbook = xlsxwriter.Workbook(path, {
+                'constant_memory': True,
+                'remove_timezone': True,
+                'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+            })
+            worksheet = workbook.add_worksheet(sheet_name)
+
+            cell_format = workbook.add_format({'border': 1})
+            if template_style == "standard":
+                header_format = workbook.add_format({
+                    'bold': True,
+                    'font_color': '#FFFFFF',
+                    'bg_color': '#4F81BD',
+                    'align': 'center',
+                    'valign': 'vcenter',
+                    'border': 1
+                })
+            else:
+                header_format = cell_format
+
+            widths = [len(str(header)) for header in headers]
+            worksheet.write_row(0, 0, headers, header_format)
+
+            row_num = 0
+            async for values in rows:
+                row_num += 1
+                worksheet.write_row(row_num, 0, values, cell_format)
+                for col, value in enumerate(values):
+                    if value not in (None, ''):
+                        widths[col] = max(widths[col], len(str(value)))
+
+            for col, width in enumerate(widths):
+                worksheet.set_column(col, col, min(max(width + 2, 8), 50))
+
+            # Zipping the worksheet parts is blocking I/O
+            await asyncio.to_thread(workbook.close)
+
+            with open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(self.EXPORT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            os.remove(path)
+
     def generate_import_template(
         self,
         template_type: str,
@@ -754,11 +1016,115 @@ class ExcelService:
         print(f"DEBUG: No subtasks sheet found, using first sheet: {workbook.sheetnames[0]}")
         return workbook.sheetnames[0]  # Default to first sheet
 
+    def parse_applications_workbook(self, file_content: bytes) -> pd.DataFrame:
+        """
+        Parse the applications sheet of an import workbook.
+
+        CPU-bound; runs in the Excel worker pool via parse_applications_workbook().
+        """
+        workbook = self._load_workbook(file_content)
+        try:
+            print(f"[INFO] Loaded workbook with sheets: {workbook.sheetnames}")
+
+            # Process the first worksheet or find Applications sheet
+            sheet_name = self._find_applications_sheet(workbook)
+            print(f"[INFO] Using applications sheet: {sheet_name}")
+
+            return self._worksheet_to_dataframe(workbook[sheet_name], self.config.APPLICATION_FIELDS)
+        finally:
+            workbook.close()
+
+    def parse_subtasks_workbook(self, file_content: bytes) -> Dict[str, Any]:
+        """
+        Parse a subtasks import workbook, including the optional applications sheet.
+
+        CPU-bound; runs in the Excel worker pool via parse_subtasks_workbook().
+
+        Returns:
+            Dictionary with has_applications_sheet, app_sheet_name, app_df and subtask_df
+        """
+        workbook = self._load_workbook(file_content)
+        try:
+            print(f"DEBUG: Loaded workbook with sheets: {workbook.sheetnames}")
+
+            # Check if this is a two-sheet import (applications + subtasks)
+            has_applications_sheet = any(keyword in sheet_name.lower() for sheet_name in workbook.sheetnames
+                                       for keyword in ['总追踪表', '应用', 'application', 'app'])
+            has_subtasks_sheet = any(keyword in sheet_name.lower() for sheet_name in workbook.sheetnames
+                                   for keyword in ['子追踪表', '子任务', 'subtask', 'task'])
+
+            print(f"DEBUG: has_applications_sheet: {has_applications_sheet}")
+            print(f"DEBUG: has_subtasks_sheet: {has_subtasks_sheet}")
+
+            app_sheet_name = None
+            app_df = pd.DataFrame()
+            if has_applications_sheet:
+                app_sheet_name = self._find_applications_sheet(workbook)
+                app_df = self._worksheet_to_dataframe(workbook[app_sheet_name], self.config.APPLICATION_FIELDS)
+
+            if has_subtasks_sheet:
+                subtask_sheet_name = self._find_subtasks_sheet(workbook)
+                print(f"DEBUG: Using subtasks sheet: {subtask_sheet_name}")
+                subtask_worksheet = workbook[subtask_sheet_name]
+            else:
+                # Fallback to first sheet if no specific subtask sheet found
+                subtask_worksheet = workbook.active
+                print(f"DEBUG: Using default active sheet: {subtask_worksheet.title}")
+
+            print(f"DEBUG: Processing subtask worksheet...")
+            subtask_df = self._worksheet_to_dataframe(subtask_worksheet, self.config.SUBTASK_FIELDS)
+            print(f"DEBUG: SubTask DataFrame shape: {subtask_df.shape}")
+            print(f"DEBUG: SubTask DataFrame columns: {list(subtask_df.columns)}")
+
+            return {
+                'has_applications_sheet': has_applications_sheet,
+                'app_sheet_name': app_sheet_name,
+                'app_df': app_df,
+                'subtask_df': subtask_df
+            }
+        finally:
+            workbook.close()
+
+    def _load_workbook(self, file_content: bytes):
+        """
+        Open an uploaded workbook for import.
+
+        Uses openpyxl's read-only mode, which streams rows from the sheet XML
+        instead of materializing every cell object up front. The caller closes
+        the workbook once its sheets have been parsed.
+        """
+        return load_workbook(io.BytesIO(file_content), read_only=True, data_only=True)
+
     def _worksheet_to_dataframe(self, worksheet, field_mapping: Dict[str, str]) -> pd.DataFrame:
-        """Convert worksheet to DataFrame with field mapping."""
+        """
+        Convert worksheet to DataFrame with field mapping.
+
+        Rows are read once as value tuples: the first HEADER_SCAN_ROWS rows are
+        buffered for header detection and the rest are streamed straight into
+        per-column lists. Works with both read-only and regular worksheets.
+        """
+
+        rows = worksheet.iter_rows(values_only=True)
+        scanned_rows = list(itertools.islice(rows, self.HEADER_SCAN_ROWS))
+
+        header_row, headers = self._detect_header_row(scanned_rows)
+        column_mapping = self._map_headers(headers, field_mapping)
+
+        # Data starts right after the header row, inside or beyond the scanned rows
+        data_rows = itertools.chain(scanned_rows[header_row:], rows)
+        return self._rows_to_dataframe(data_rows, column_mapping)
+
+    def _detect_header_row(self, rows: List[Tuple[Any, ...]]) -> Tuple[int, List[str]]:
+        """
+        Find the header row among the first rows of a worksheet.
+
+        Args:
+            rows: Leading worksheet rows as value tuples
+
+        Returns:
+            Tuple of (1-based header row number, header strings)
+        """
 
-        # Get all data
-        data = []
         headers = []
 
         # Keywords that indicate actual column headers (not instruction/statistics text)
@@ -781,8 +1147,8 @@ class ExcelService:
         header_row = 1
         best_match = {'row': 1, 'score': 0, 'headers': []}
 
-        for row_num, row in enumerate(worksheet.iter_rows(min_row=1, max_row=30), start=1):
-            row_values = [str(cell.value).strip() if cell.value else '' for cell in row]
+        for row_num, row in enumerate(rows, start=1):
+            row_values = [str(value).strip() if value else '' for value in row]
             non_empty_values = [v for v in row_values if v]
 
             # Skip rows that look like instructions (very long text in first cell)
@@ -840,7 +1206,7 @@ class ExcelService:
                     best_match = {
                         'row': row_num,
                         'score': score,
-                        'headers': [str(cell.value).strip() if cell.value else '' for cell in row]
+                        'headers': row_values
                     }
                     print(f"DEBUG: Row {row_num} - score: {score}, matches: {matches}, non-empty: {len(non_empty_values)}")
 
@@ -853,9 +1219,8 @@ class ExcelService:
             print(f"DEBUG: Score too low ({best_match['score']}), trying fallback detection...")
 
             # Fallback: if no headers found with keywords, look for row with many non-empty cells
-            for row_num, row in enumerate(worksheet.iter_rows(min_row=1, max_row=30), start=1):
-                row_values = [cell.value for cell in row]
-                non_empty_values = [str(v).strip() for v in row_values if v is not None and str(v).strip()]
+            for row_num, row in enumerate(rows, start=1):
+                non_empty_values = [str(v).strip() for v in row if v is not None and str(v).strip()]
 
                 # Skip statistics rows
                 if non_empty_values:
@@ -870,7 +1235,7 @@ class ExcelService:
                     unique_ratio = len(set(non_empty_values)) / len(non_empty_values)
 
                     if avg_length < 30 and unique_ratio > 0.7:  # Short and diverse = likely headers
-                        headers = [str(cell.value).strip() if cell.value else '' for cell in row]
+                        headers = [str(value).strip() if value else '' for value in row]
                         header_row = row_num
                         print(f"DEBUG: Using fallback header detection at row {header_row} (avg_len: {avg_length:.1f}, unique: {unique_ratio:.2f})")
                         break
@@ -882,6 +1247,20 @@ class ExcelService:
                 print(f"DEBUG: Using best available match at row {header_row}")
 
         print(f"DEBUG: Found headers at row {header_row}: {headers}")  # 显示所有标题
+        return header_row, headers
+
+    def _map_headers(self, headers: List[str], field_mapping: Dict[str, str]) -> Dict[int, str]:
+        """
+        Map header strings to database fields.
+
+        Args:
+            headers: Header strings of the detected header row
+            field_mapping: Header name -> field name mapping
+
+        Returns:
+            Dictionary of column index -> field name
+        """
+
         print(f"DEBUG: Available field mappings: {list(field_mapping.keys())[:20]}")  # 显示前20个可用映射
 
         # Map headers to database fields
@@ -981,97 +1360,72 @@ class ExcelService:
                         print(f"DEBUG: [FUZZY] matched '{header}' -> '{field}' (pattern: '{pattern}')")
                         break
 
-        # Extract data rows with smart termination and chunked processing
-        data = []
-        row_count = 0
-        empty_row_count = 0
-        chunk_size = 500  # Smaller chunks for better performance
-        max_rows_to_process = 50000  # Reasonable limit to prevent timeout
-        max_consecutive_empty = 20  # Stop after 20 consecutive empty rows
-
-        # Get actual data range (not worksheet.max_row which can be misleading)
-        actual_max_row = min(worksheet.max_row, header_row + max_rows_to_process)
-
-        # For very large files, try to find the actual end of data
-        if worksheet.max_row > 10000:
-            print(f"DEBUG: Large file detected ({worksheet.max_row} rows), finding actual data range...")
-            # Sample check: if rows 1000-1100 are all empty, likely end of data
-            sample_start = min(1000, worksheet.max_row)
-            sample_empty = 0
-            for row in worksheet.iter_rows(min_row=sample_start, max_row=sample_start + 100):
-                if all(cell.value is None for cell in row):
-                    sample_empty += 1
-
-            if sample_empty > 90:  # If >90% of sample is empty, data likely ends before
-                actual_max_row = sample_start
-                print(f"DEBUG: Detected probable end of data around row {actual_max_row}")
-
-        total_rows = actual_max_row - header_row
-        print(f"DEBUG: Processing up to {total_rows} rows from Excel file...")
-
-        # Process rows in chunks for better performance
-        for chunk_start in range(header_row + 1, actual_max_row + 1, chunk_size):
-            chunk_end = min(chunk_start + chunk_size - 1, actual_max_row)
-            chunk_data = []
-            chunk_empty_count = 0
-
-            for row in worksheet.iter_rows(min_row=chunk_start, max_row=chunk_end, values_only=True):
-                # Check if row is completely empty
-                if all(v is None for v in row):
-                    empty_row_count += 1
-                    chunk_empty_count += 1
-
-                    # Stop if too many consecutive empty rows
-                    if empty_row_count >= max_consecutive_empty:
-                        print(f"DEBUG: Found {empty_row_count} consecutive empty rows, assuming end of data at row {chunk_start + chunk_empty_count}")
-                        break
-                    continue
-                else:
-                    empty_row_count = 0  # Reset counter when we find data
 
-                row_data = {}
-                has_data = False
+        return column_mapping
 
-                for i, value in enumerate(row):
-                    if i in column_mapping:
-                        field_name = column_mapping[i]
+    def _rows_to_dataframe(self, rows: Iterable[Tuple[Any, ...]], column_mapping: Dict[int, str]) -> pd.DataFrame:
+        """
+        Build the import DataFrame from data rows, column by column.
 
-                        # Convert data types
-                        if value is not None:
-                            value = self._convert_cell_value(value, field_name)
-                            has_data = True
+        Raw values of the mapped columns are collected into one list per field,
+        converted per column with a cache (tracker sheets repeat the same
+        statuses and dates on most rows) and handed to pandas in one call.
 
-                        row_data[field_name] = value
+        Args:
+            rows: Data rows (after the header) as value tuples
+            column_mapping: Column index -> field name
 
-                if has_data:
-                    chunk_data.append(row_data)
-                    row_count += 1
+        Returns:
+            DataFrame with one column per mapped field
+        """
 
-                    # Only print first few rows for debugging
-                    if row_count <= 3:
-                        print(f"DEBUG: Row {chunk_start + row_count - 1} data: {row_data}")
+        # Later columns mapped to the same field win, as in a per-row dict
+        fields = list(dict.fromkeys(column_mapping.values()))
+        field_positions = {field: i for i, field in enumerate(fields)}
+        mapped_columns = [(i, field_positions[field]) for i, field in column_mapping.items()]
+        raw_columns = [[] for _ in fields]
 
-            # Add chunk data to main data list
-            data.extend(chunk_data)
+        row_count = 0
+        empty_row_count = 0
+        for row in itertools.islice(rows, self.IMPORT_MAX_ROWS):
+            # Check if row is completely empty
+            if all(v is None for v in row):
+                empty_row_count += 1
+
+                # Stop if too many consecutive empty rows
+                if empty_row_count >= self.IMPORT_MAX_CONSECUTIVE_EMPTY:
+                    print(f"DEBUG: Found {empty_row_count} consecutive empty rows, assuming end of data")
+                    break
+                continue
+            empty_row_count = 0  # Reset counter when we find data
 
-            # Stop if we found the end of data
-            if empty_row_count >= max_consecutive_empty:
-                break
+            values = [None] * len(fields)
+            has_data = False
+            row_length = len(row)
+            for column_index, position in mapped_columns:
+                if column_index < row_length:
+                    value = row[column_index]
+                    if value is not None:
+                        has_data = True
+                    values[position] = value
 
-            # Stop if we've processed enough rows
-            if row_count >= max_rows_to_process:
-                print(f"DEBUG: Reached maximum row limit ({max_rows_to_process}), stopping processing")
-                break
+            if has_data:
+                for position, value in enumerate(values):
+                    raw_columns[position].append(value)
+                row_count += 1
 
-            # Progress indicator for large files
-            if row_count > 0 and row_count % 1000 == 0:
-                print(f"DEBUG: Processed {row_count} rows...")
+                # Progress indicator for large files
+                if row_count % 1000 == 0:
+                    print(f"DEBUG: Processed {row_count} rows...")
 
-        print(f"DEBUG: Total rows extracted: {len(data)}")  # 调试信息
+        print(f"DEBUG: Total rows extracted: {row_count}")  # 调试信息
 
         # Convert to DataFrame and optimize memory usage
-        if data:
-            df = pd.DataFrame(data)
+        if row_count:
+            df = pd.DataFrame({
+                field: self._convert_column_values(raw_columns[position], field)
+                for field, position in field_positions.items()
+            })
 
             # Enhanced debugging to see what's in the DataFrame
             print(f"DEBUG: DataFrame columns after mapping: {list(df.columns)}")
@@ -1103,6 +1457,27 @@ class ExcelService:
         else:
             return pd.DataFrame()
 
+    def _convert_column_values(self, values: List[Any], field_name: str) -> List[Any]:
+        """Convert one column of raw cell values, converting each distinct value once."""
+
+        converted = {}
+        result = []
+        for value in values:
+            if value is None:
+                result.append(None)
+                continue
+            # Key on the type too: True == 1 but they convert differently
+            key = (type(value), value)
+            try:
+                result.append(converted[key])
+            except KeyError:
+                converted[key] = self._convert_cell_value(value, field_name)
+                result.append(converted[key])
+            except TypeError:
+                # Unhashable value
+                result.append(self._convert_cell_value(value, field_name))
+        return result
+
     def _convert_cell_value(self, value: Any, field_name: str) -> Any:
         """Convert cell value to appropriate Python type."""
 
@@ -1243,147 +1618,164 @@ class ExcelService:
         return value
 
     async def _validate_applications_data(self, db: AsyncSession, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Validate applications data."""
+        """
+        Validate applications data.
+
+        Normalizes the DataFrame in place with column operations, then emits
+        errors for the flagged rows in one pass, in row order.
+        """
+
+        # Error masks are computed on the values as uploaded, before normalization.
+        # Values are kept as Python scalars (tolist) so the errors serialize to JSON.
+        required_checks = []
+        for field in self.config.APPLICATION_REQUIRED:
+            values = self._column(df, field)
+            required_checks.append((
+                field,
+                self._get_column_name(field, self.config.APPLICATION_FIELDS),
+                values.tolist(),
+                self._blank_mask(values).to_numpy()
+            ))
+
+        progress_values = self._column(df, 'progress_percentage').tolist()
+        progress = pd.to_numeric(self._column(df, 'progress_percentage'), errors='coerce')
+        progress_flags = ((progress < 0) | (progress > 100)).to_numpy()
+
+        # Validate L2 ID format (but don't add prefix)
+        # User explicitly requested: "对于导入的数据，请不要在原数据前加前缀"
+        if 'l2_id' in df.columns:
+            mask = self._truthy_mask(df['l2_id'])
+            df.loc[mask, 'l2_id'] = df.loc[mask, 'l2_id'].astype(str).str.strip()
+
+        # Convert supervision year if it's a string like "2025年"
+        # Note: Removed year range validation as per user request
+        if 'ak_supervision_acceptance_year' in df.columns:
+            years = df['ak_supervision_acceptance_year']
+            years = years[self._string_mask(years)]
+            extracted = years.str.extract(r'(\d{4})', expand=False).dropna() if len(years) else years
+            if len(extracted):
+                df.loc[extracted.index, 'ak_supervision_acceptance_year'] = extracted.astype(int).tolist()
+
+        # Validate transformation target (支持前端发送的值)
+        if 'overall_transformation_target' in df.columns:
+            # 标准化转型目标值
+            target_mapping = {
+                'cloud_native': TransformationTarget.CLOUD_NATIVE.value,
+                'AK': TransformationTarget.AK.value,
+                'ak': TransformationTarget.AK.value,
+                '云原生': TransformationTarget.CLOUD_NATIVE.value,
+                'Cloud Native': TransformationTarget.CLOUD_NATIVE.value
+            }
+            targets = df['overall_transformation_target']
+            mask = self._truthy_mask(targets)
+            # 如果不匹配，使用默认值
+            normalized = targets.map(target_mapping).fillna(
+                targets.where(targets.isin([t.value for t in TransformationTarget]), TransformationTarget.AK.value)
+            )
+            df.loc[mask, 'overall_transformation_target'] = normalized[mask]
+
+        # Validate and normalize status
+        # 状态映射 - 根据实际需求
+        status_mapping = {
+            # 保持原状态
+            '待启动': '待启动',
+            '需求进行中': '需求进行中',
+            '研发进行中': '研发进行中',
+            '业务上线中': '业务上线中',
+            '阻塞': '阻塞',
+            '全部完成': '全部完成',
+
+            # 需要映射的状态
+            '部署进行中': '技术上线中',
+            '中止': '计划下线',
+
+            # 英文映射（如果前端使用）
+            'not_started': '待启动',
+            'requirement_in_progress': '需求进行中',
+            'dev_in_progress': '研发进行中',
+            'in_progress': '研发进行中',
+            'tech_online': '技术上线中',
+            'deployment_in_progress': '技术上线中',
+            'biz_online': '业务上线中',
+            'blocked': '阻塞',
+            'planned_offline': '计划下线',
+            'terminated': '计划下线',
+            'cancelled': '计划下线',
+            'completed': '全部完成',
+
+            # 其他可能的变体
+            '正常': '研发进行中',
+            '进行中': '研发进行中',
+            '完成': '全部完成',
+            '已完成': '全部完成',
+            '未开始': '待启动',
+            '测试中': '技术上线中',
+            '待部署': '技术上线中',
+            '已上线': '全部完成',
+            '已阻塞': '阻塞',
+            '已中止': '计划下线',
+            '已取消': '计划下线'
+        }
+        valid_statuses = ['待启动', '需求进行中', '研发进行中', '技术上线中',
+                          '业务上线中', '阻塞', '计划下线', '全部完成']
+        # 状态为空或无效时设置默认值
+        statuses = self._column(df, 'current_status')
+        df['current_status'] = statuses.map(status_mapping).fillna(
+            statuses.where(statuses.isin(valid_statuses), '待启动')
+        ).astype(object)
+
+        # Convert app_tier if it's a string
+        if 'app_tier' in df.columns:
+            tier_mapping = {
+                '第一级': 1, '第1级': 1, '一级': 1, '1级': 1,
+                '第二级': 2, '第2级': 2, '二级': 2, '2级': 2,
+                '第三级': 3, '第3级': 3, '三级': 3, '3级': 3,
+                '第四级': 4, '第4级': 4, '四级': 4, '4级': 4,
+                '第五级': 5, '第5级': 5, '五级': 5, '5级': 5
+            }
+            tiers = df['app_tier']
+            tiers = tiers[self._string_mask(tiers)]
+            converted = tiers.str.strip().map(tier_mapping).dropna() if len(tiers) else tiers
+            if len(converted):
+                df.loc[converted.index, 'app_tier'] = converted.astype(int).tolist()
 
+        # Gather errors for the flagged rows only
         errors = []
+        flagged = progress_flags.copy()
+        for _, _, _, flags in required_checks:
+            flagged |= flags
 
-        for index, row in df.iterrows():
-            row_num = index + 2  # Excel row number (1-based + header)
+        for position in flagged.nonzero()[0]:
+            row_num = df.index[position] + 2  # Excel row number (1-based + header)
 
             # Check required fields
-            for field in self.config.APPLICATION_REQUIRED:
-                if pd.isna(row.get(field)) or row.get(field) == '' or row.get(field) is None:
+            for field, column_name, values, flags in required_checks:
+                if flags[position]:
                     errors.append({
                         'row': row_num,
-                        'column': self._get_column_name(field, self.config.APPLICATION_FIELDS),
+                        'column': column_name,
                         'message': f'必填字段不能为空: {field}',
-                        'value': row.get(field)
+                        'value': values[position]
                     })
 
-            # Validate L2 ID format (but don't add prefix)
-            l2_id = row.get('l2_id')
-            if l2_id:
-                l2_id_str = str(l2_id).strip()
-                # Keep the original L2 ID without adding prefix
-                # User explicitly requested: "对于导入的数据，请不要在原数据前加前缀"
-                df.at[index, 'l2_id'] = l2_id_str
-
-            # Convert supervision year if it's a string
-            year = row.get('ak_supervision_acceptance_year')
-            if year:
-                # Convert if it's a string like "2025年"
-                if isinstance(year, str):
-                    import re
-                    year_match = re.search(r'(\d{4})', year)
-                    if year_match:
-                        year = int(year_match.group(1))
-                        df.at[index, 'ak_supervision_acceptance_year'] = year
-                # Note: Removed year range validation as per user request
-                # Years can be any valid value
-
-            # Validate transformation target (支持前端发送的值)
-            target = row.get('overall_transformation_target')
-            if target:
-                # 标准化转型目标值
-                target_mapping = {
-                    'cloud_native': TransformationTarget.CLOUD_NATIVE.value,
-                    'AK': TransformationTarget.AK.value,
-                    'ak': TransformationTarget.AK.value,
-                    '云原生': TransformationTarget.CLOUD_NATIVE.value,
-                    'Cloud Native': TransformationTarget.CLOUD_NATIVE.value
-                }
-
-                if target in target_mapping:
-                    df.at[index, 'overall_transformation_target'] = target_mapping[target]
-                elif target not in [t.value for t in TransformationTarget]:
-                    # 如果不匹配，使用默认值
-                    df.at[index, 'overall_transformation_target'] = TransformationTarget.AK.value
-
-            # Validate and normalize status
-            status = row.get('current_status')
-            if status:
-                # 状态映射 - 根据实际需求
-                status_mapping = {
-                    # 保持原状态
-                    '待启动': '待启动',
-                    '需求进行中': '需求进行中',
-                    '研发进行中': '研发进行中',
-                    '业务上线中': '业务上线中',
-                    '阻塞': '阻塞',
-                    '全部完成': '全部完成',
-
-                    # 需要映射的状态
-                    '部署进行中': '技术上线中',
-                    '中止': '计划下线',
-
-                    # 英文映射（如果前端使用）
-                    'not_started': '待启动',
-                    'requirement_in_progress': '需求进行中',
-                    'dev_in_progress': '研发进行中',
-                    'in_progress': '研发进行中',
-                    'tech_online': '技术上线中',
-                    'deployment_in_progress': '技术上线中',
-                    'biz_online': '业务上线中',
-                    'blocked': '阻塞',
-                    'planned_offline': '计划下线',
-                    'terminated': '计划下线',
-                    'cancelled': '计划下线',
-                    'completed': '全部完成',
-
-                    # 其他可能的变体
-                    '正常': '研发进行中',
-                    '进行中': '研发进行中',
-                    '完成': '全部完成',
-                    '已完成': '全部完成',
-                    '未开始': '待启动',
-                    '测试中': '技术上线中',
-                    '待部署': '技术上线中',
-                    '已上线': '全部完成',
-                    '已阻塞': '阻塞',
-                    '已中止': '计划下线',
-                    '已取消': '计划下线'
-                }
-
-                if status in status_mapping:
-                    df.at[index, 'current_status'] = status_mapping[status]
-                elif status not in ['待启动', '需求进行中', '研发进行中', '技术上线中',
-                                    '业务上线中', '阻塞', '计划下线', '全部完成']:
-                    # 默认值
-                    df.at[index, 'current_status'] = '待启动'
-            else:
-                # 状态为空时设置默认值
-                df.at[index, 'current_status'] = '待启动'
-
-            # Convert app_tier if it's a string
-            app_tier = row.get('app_tier')
-            if app_tier and isinstance(app_tier, str):
-                tier_mapping = {
-                    '第一级': 1, '第1级': 1, '一级': 1, '1级': 1,
-                    '第二级': 2, '第2级': 2, '二级': 2, '2级': 2,
-                    '第三级': 3, '第3级': 3, '三级': 3, '3级': 3,
-                    '第四级': 4, '第4级': 4, '四级': 4, '4级': 4,
-                    '第五级': 5, '第5级': 5, '五级': 5, '5级': 5
-                }
-                if app_tier.strip() in tier_mapping:
-                    df.at[index, 'app_tier'] = tier_mapping[app_tier.strip()]
-
             # Validate progress percentage
-            progress = row.get('progress_percentage')
-            if progress is not None and (progress < 0 or progress > 100):
+            if progress_flags[position]:
                 errors.append({
                     'row': row_num,
                     'column': '进度百分比',
                     'message': '进度百分比必须在0-100之间',
-                    'value': progress
+                    'value': progress_values[position]
                 })
 
         # Check for duplicate L2 IDs
         l2_ids = df['l2_id'].dropna()
         duplicates = l2_ids[l2_ids.duplicated()].tolist()
         if duplicates:
+            rows_by_l2_id = {}
+            for index, l2_id in l2_ids[l2_ids.isin(duplicates)].items():
+                rows_by_l2_id.setdefault(l2_id, []).append(index + 2)
             for dup_id in duplicates:
-                dup_rows = df[df['l2_id'] == dup_id].index + 2
-                for row_num in dup_rows:
+                for row_num in rows_by_l2_id[dup_id]:
                     errors.append({
                         'row': row_num,
                         'column': 'L2 ID',
@@ -1394,7 +1786,12 @@ class ExcelService:
         return errors
 
     async def _validate_subtasks_data(self, db: AsyncSession, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Validate subtasks data based on actual database structure."""
+        """
+        Validate subtasks data based on actual database structure.
+
+        Rows with an empty L2 ID are skipped; the others are normalized in
+        place with column operations restricted to those rows.
+        """
 
         errors = []
         warnings = []
@@ -1406,38 +1803,26 @@ class ExcelService:
 
         print(f"DEBUG: Found {len(valid_l2_ids)} valid applications in database")
 
-        # Count statistics
-        empty_l2_count = 0
-        rows_to_process = 0
-
-        for index, row in df.iterrows():
-            row_num = index + 2  # Excel row number (1-based + header)
-
-            # Check L2 ID (this is the Application's l2_id string, not the database id)
-            app_l2_id = row.get('l2_id')
-
-            # Skip rows with empty L2 ID
-            if pd.isna(app_l2_id) or app_l2_id == '' or app_l2_id is None:
-                empty_l2_count += 1
-                continue  # Skip this row silently
-
-            rows_to_process += 1
-            app_l2_id_str = str(app_l2_id).strip()
+        # Skip rows with empty L2 ID (this is the Application's l2_id string, not the database id)
+        process = ~self._blank_mask(self._column(df, 'l2_id'))
+        empty_l2_count = int((~process).sum())
+        rows_to_process = int(process.sum())
 
+        if rows_to_process > 0:
             # Store cleaned L2 ID
-            df.at[index, 'l2_id'] = app_l2_id_str
+            l2_ids = df.loc[process, 'l2_id'].astype(str).str.strip()
+            df.loc[process, 'l2_id'] = l2_ids
 
             # Check if application exists (will be created if not)
-            if app_l2_id_str not in valid_l2_ids:
+            for index, l2_id in l2_ids[~l2_ids.isin(valid_l2_ids)].items():
                 warnings.append({
-                    'row': row_num,
+                    'row': index + 2,
                     'type': 'info',
-                    'message': f'应用 {app_l2_id_str} 不存在，将自动创建'
+                    'message': f'应用 {l2_id} 不存在，将自动创建'
                 })
 
             # Validate and normalize sub_target
-            sub_target = row.get('sub_target')
-            if sub_target:
+            if 'sub_target' in df.columns:
                 # Standardize sub_target values
                 target_mapping = {
                     'cloud_native': '云原生',
@@ -1448,160 +1833,154 @@ class ExcelService:
                     'ak': 'AK',
                     'Ak': 'AK'
                 }
-
-                if sub_target in target_mapping:
-                    df.at[index, 'sub_target'] = target_mapping[sub_target]
-                elif sub_target not in ['AK', '云原生']:
-                    # Default to AK if invalid
-                    df.at[index, 'sub_target'] = 'AK'
+                targets = df['sub_target']
+                mask = process & self._truthy_mask(targets)
+                mapped = targets.map(target_mapping)
+                # Default to AK if invalid
+                invalid = mask & mapped.isna() & ~targets.isin(['AK', '云原生'])
+                df.loc[mask, 'sub_target'] = mapped.fillna(targets.where(~invalid, 'AK'))[mask]
+                for index, sub_target in targets[invalid].items():
                     warnings.append({
-                        'row': row_num,
+                        'row': index + 2,
                         'column': '子目标',
                         'message': f'无效的子目标 "{sub_target}"，已设为默认值 "AK"'
                     })
 
             # Validate and normalize task_status
-            task_status = row.get('task_status')
-            if task_status:
-                # 状态映射 - 根据实际需求更新
-                status_mapping = {
-                    # 保持原状态
-                    '未开始': '未开始',
-                    '需求进行中': '需求进行中',
-                    '研发进行中': '研发进行中',
-                    '业务上线中': '业务上线中',
-                    '阻塞': '阻塞',
-                    '子任务完成': '子任务完成',
-
-                    # 需要映射的状态
-                    '部署进行中': '技术上线中',
-                    '中止': '计划下线',
-
-                    # 英文映射（如果前端有使用）
-                    'not_started': '未开始',
-                    'NOT_STARTED': '未开始',
-                    'requirement_in_progress': '需求进行中',
-                    'REQUIREMENT_IN_PROGRESS': '需求进行中',
-                    'dev_in_progress': '研发进行中',
-                    'DEV_IN_PROGRESS': '研发进行中',
-                    'in_progress': '研发进行中',
-                    'tech_online': '技术上线中',
-                    'TECH_ONLINE': '技术上线中',
-                    'deployment_in_progress': '技术上线中',
-                    'biz_online': '业务上线中',
-                    'BIZ_ONLINE': '业务上线中',
-                    'blocked': '阻塞',
-                    'BLOCKED': '阻塞',
-                    'planned_offline': '计划下线',
-                    'PLANNED_OFFLINE': '计划下线',
-                    'terminated': '计划下线',
-                    'cancelled': '计划下线',
-                    'completed': '子任务完成',
-                    'COMPLETED': '子任务完成',
-
-                    # 其他可能的变体
-                    '进行中': '研发进行中',
-                    '完成': '子任务完成',
-                    '已完成': '子任务完成',
-                    '待启动': '未开始',
-                    '测试中': '技术上线中',
-                    '待部署': '技术上线中',
-                    '已上线': '子任务完成',
-                    '已阻塞': '阻塞',
-                    '已中止': '计划下线',
-                    '已取消': '计划下线'
-                }
-
-                if task_status in status_mapping:
-                    df.at[index, 'task_status'] = status_mapping[task_status]
-                elif task_status not in ['未开始', '需求进行中', '研发进行中', '技术上线中',
-                                         '业务上线中', '阻塞', '计划下线', '子任务完成']:
-                    # 如果不在有效状态列表中，默认设为"未开始"
-                    df.at[index, 'task_status'] = '未开始'
-                    warnings.append({
-                        'row': row_num,
-                        'column': '任务状态',
-                        'message': f'无效的状态 "{task_status}"，已设为默认值 "未开始"'
-                    })
-            else:
-                # 如果状态为空，设置默认值
-                df.at[index, 'task_status'] = '未开始'
+            # 状态映射 - 根据实际需求更新
+            status_mapping = {
+                # 保持原状态
+                '未开始': '未开始',
+                '需求进行中': '需求进行中',
+                '研发进行中': '研发进行中',
+                '业务上线中': '业务上线中',
+                '阻塞': '阻塞',
+                '子任务完成': '子任务完成',
+
+                # 需要映射的状态
+                '部署进行中': '技术上线中',
+                '中止': '计划下线',
+
+                # 英文映射（如果前端有使用）
+                'not_started': '未开始',
+                'NOT_STARTED': '未开始',
+                'requirement_in_progress': '需求进行中',
+                'REQUIREMENT_IN_PROGRESS': '需求进行中',
+                'dev_in_progress': '研发进行中',
+                'DEV_IN_PROGRESS': '研发进行中',
+                'in_progress': '研发进行中',
+                'tech_online': '技术上线中',
+                'TECH_ONLINE': '技术上线中',
+                'deployment_in_progress': '技术上线中',
+                'biz_online': '业务上线中',
+                'BIZ_ONLINE': '业务上线中',
+                'blocked': '阻塞',
+                'BLOCKED': '阻塞',
+                'planned_offline': '计划下线',
+                'PLANNED_OFFLINE': '计划下线',
+                'terminated': '计划下线',
+                'cancelled': '计划下线',
+                'completed': '子任务完成',
+                'COMPLETED': '子任务完成',
+
+                # 其他可能的变体
+                '进行中': '研发进行中',
+                '完成': '子任务完成',
+                '已完成': '子任务完成',
+                '待启动': '未开始',
+                '测试中': '技术上线中',
+                '待部署': '技术上线中',
+                '已上线': '子任务完成',
+                '已阻塞': '阻塞',
+                '已中止': '计划下线',
+                '已取消': '计划下线'
+            }
+            valid_statuses = ['未开始', '需求进行中', '研发进行中', '技术上线中',
+                              '业务上线中', '阻塞', '计划下线', '子任务完成']
+            statuses = self._column(df, 'task_status')
+            mapped = statuses.map(status_mapping)
+            # 如果不在有效状态列表中，默认设为"未开始"
+            invalid = process & self._truthy_mask(statuses) & mapped.isna() & ~statuses.isin(valid_statuses)
+            for index, task_status in statuses[invalid].items():
+                warnings.append({
+                    'row': index + 2,
+                    'column': '任务状态',
+                    'message': f'无效的状态 "{task_status}"，已设为默认值 "未开始"'
+                })
+            # 如果状态为空，设置默认值
+            self._assign_rows(df, 'task_status', process, mapped.fillna(
+                statuses.where(statuses.isin(valid_statuses), '未开始')
+            ))
 
             # 根据状态设置默认进度百分比
-            progress = row.get('progress_percentage')
-            if pd.isna(progress) or progress is None:
-                # 根据状态设置默认进度
-                status_progress_map = {
-                    '未开始': 0,
-                    '需求进行中': 10,
-                    '研发进行中': 30,
-                    '技术上线中': 60,
-                    '业务上线中': 80,
-                    '子任务完成': 100,
-                    '阻塞': None,  # 保持原有进度
-                    '计划下线': None  # 保持原有进度
-                }
-
-                current_status = df.at[index, 'task_status']
-                default_progress = status_progress_map.get(current_status, 0)
-                if default_progress is not None:
-                    df.at[index, 'progress_percentage'] = default_progress
+            status_progress_map = {
+                '未开始': 0,
+                '需求进行中': 10,
+                '研发进行中': 30,
+                '技术上线中': 60,
+                '业务上线中': 80,
+                '子任务完成': 100,
+                '阻塞': None,  # 保持原有进度
+                '计划下线': None  # 保持原有进度
+            }
+            default_progress = df['task_status'].map(
+                lambda status: status_progress_map.get(status, 0)
+            )
+            mask = process & self._column(df, 'progress_percentage').isna() & default_progress.notna()
+            self._assign_rows(df, 'progress_percentage', mask, default_progress)
 
             # Validate boolean fields
             for bool_field in ['is_blocked', 'resource_applied']:
-                value = row.get(bool_field)
-                if value is not None:
-                    if isinstance(value, str):
-                        value_lower = value.strip().lower()
-                        df.at[index, bool_field] = value_lower in ['是', 'true', 'yes', '1', 'y', '已申请', '已阻塞']
-                    elif isinstance(value, (int, float)):
-                        df.at[index, bool_field] = bool(value)
-                    elif pd.isna(value):
-                        df.at[index, bool_field] = False
-                else:
-                    df.at[index, bool_field] = False  # Default to False
+                values = self._column(df, bool_field)
+                types = values.map(type)
+                is_str = types.eq(str)
+                is_number = types.isin([int, float, bool])
+                normalized = pd.Series(False, index=df.index, dtype=object)
+                if is_str.any():
+                    normalized[is_str] = values[is_str].str.strip().str.lower().isin(
+                        ['是', 'true', 'yes', '1', 'y', '已申请', '已阻塞']
+                    ).astype(object)
+                normalized[is_number] = values[is_number].map(bool).astype(object)
+                # Any other non-missing value is kept as is
+                keep = ~is_str & ~is_number & values.notna()
+                normalized[keep] = values[keep]
+                self._assign_rows(df, bool_field, process, normalized)
 
             # Validate date fields - handle NaT values
             for date_field in ['planned_requirement_date', 'planned_release_date',
                                'planned_tech_online_date', 'planned_biz_online_date',
                                'actual_requirement_date', 'actual_release_date',
                                'actual_tech_online_date', 'actual_biz_online_date']:
-                date_value = row.get(date_field)
-                if pd.isna(date_value):
-                    df.at[index, date_field] = None
+                self._assign_rows(df, date_field, process & self._column(df, date_field).isna(), None)
 
             # Validate ops_requirement_submitted (DateTime field)
-            ops_req = row.get('ops_requirement_submitted')
-            if ops_req is not None and not pd.isna(ops_req):
-                # Check if it's a string that looks like a status rather than a date
-                if isinstance(ops_req, str):
-                    status_strings = ['已完成', '已提交', '通过', '未提交', '进行中', '待提交', '完成']
-                    if ops_req.strip() in status_strings:
-                        # This is likely a mismatched column, clear it
-                        df.at[index, 'ops_requirement_submitted'] = None
-            else:
-                df.at[index, 'ops_requirement_submitted'] = None
+            # A status string rather than a date is likely a mismatched column, clear it
+            ops_req = self._column(df, 'ops_requirement_submitted')
+            status_strings = ['已完成', '已提交', '通过', '未提交', '进行中', '待提交', '完成']
+            is_status = self._string_mask(ops_req)
+            if is_status.any():
+                is_status &= ops_req.str.strip().isin(status_strings)
+            self._assign_rows(df, 'ops_requirement_submitted', process & (ops_req.isna() | is_status), None)
 
             # Validate ops_testing_status and launch_check_status (these are strings)
+            status_normalize = {
+                '通过': '通过',
+                '已通过': '通过',
+                '完成': '通过',
+                '已完成': '通过',
+                '检查通过': '通过',
+                '未完成': '进行中',
+                '进行中': '进行中',
+                '待检查': '待检查',
+                '未开始': '待检查'
+            }
             for status_field in ['ops_testing_status', 'launch_check_status']:
-                status_value = row.get(status_field)
-                if status_value and isinstance(status_value, str):
-                    # Normalize common status values
-                    status_normalize = {
-                        '通过': '通过',
-                        '已通过': '通过',
-                        '完成': '通过',
-                        '已完成': '通过',
-                        '检查通过': '通过',
-                        '未完成': '进行中',
-                        '进行中': '进行中',
-                        '待检查': '待检查',
-                        '未开始': '待检查'
-                    }
-                    if status_value in status_normalize:
-                        df.at[index, status_field] = status_normalize[status_value]
-                elif pd.isna(status_value):
-                    df.at[index, status_field] = None
+                values = self._column(df, status_field)
+                # Normalize common status values
+                normalized = values.map(status_normalize)
+                mask = process & self._string_mask(values) & self._truthy_mask(values) & normalized.notna()
+                self._assign_rows(df, status_field, mask, normalized)
+                self._assign_rows(df, status_field, process & values.isna(), None)
 
         # Summary messages
         if empty_l2_count > 0:
@@ -1620,24 +1999,23 @@ class ExcelService:
         if rows_to_process > 0:
             # Only check duplicates for non-null combinations
             df_valid = df[df['l2_id'].notna()].copy()
+            version_missing = df_valid['version_name'].isna()
 
             # Handle null version_name by replacing with empty string for grouping
             df_valid['version_name'] = df_valid['version_name'].fillna('')
 
-            duplicates = df_valid.groupby(['l2_id', 'sub_target', 'version_name']).size()
+            grouped = df_valid.groupby(['l2_id', 'sub_target', 'version_name'])
+            duplicates = grouped.size()
             duplicates = duplicates[duplicates > 1]
+            positions = grouped.indices if len(duplicates) else {}
 
             for (l2_id, sub_target, version_name), count in duplicates.items():
-                # Find duplicate rows
-                mask = (df['l2_id'] == l2_id) & (df['sub_target'] == sub_target)
-                if version_name:
-                    mask = mask & (df['version_name'] == version_name)
-                else:
-                    mask = mask & df['version_name'].isna()
-
-                duplicate_rows = df[mask].index + 2
+                # Find duplicate rows; an empty version only matches missing versions
+                rows = positions[(l2_id, sub_target, version_name)]
+                if not version_name:
+                    rows = rows[version_missing.to_numpy()[rows]]
 
-                for row_num in duplicate_rows:
+                for row_num in df_valid.index[rows] + 2:
                     errors.append({
                         'row': row_num,
                         'column': 'L2 ID + 子目标 + 版本名',
@@ -1651,6 +2029,37 @@ class ExcelService:
 
         return errors  # Return only errors, warnings are logged but don't block import
 
+    def _column(self, df: pd.DataFrame, field: str) -> pd.Series:
+        """Get a column, or an all-None column when the sheet did not have it."""
+        if field in df.columns:
+            return df[field]
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    def _blank_mask(self, values: pd.Series) -> pd.Series:
+        """Mask of missing or empty-string values."""
+        mask = values.isna()
+        if values.dtype == object:
+            mask |= values.eq('')
+        return mask
+
+    def _truthy_mask(self, values: pd.Series) -> pd.Series:
+        """Mask of values that are truthy in Python (NaN counts as truthy)."""
+        return values.map(bool).astype(bool)
+
+    def _string_mask(self, values: pd.Series) -> pd.Series:
+        """Mask of str values in an object column."""
+        return values.map(type).eq(str)
+
+    def _assign_rows(self, df: pd.DataFrame, field: str, mask: pd.Series, values: Any) -> None:
+        """Set field on the masked rows, adding the column when the sheet did not have it."""
+        if field not in df.columns:
+            df[field] = pd.Series([None] * len(df), index=df.index, dtype=object)
+        if not mask.any():
+            return
+        if isinstance(values, pd.Series):
+            values = values[mask].tolist()
+        df.loc[mask, field] = values
+
     def _get_column_name(self, field_name: str, field_mapping: Dict[str, str]) -> str:
         """Get Excel column name from field name."""
         for column_name, mapped_field in field_mapping.items():
@@ -1658,237 +2067,51 @@ class ExcelService:
                 return column_name
         return field_name
 
+    @invalidates(CacheTag.APPLICATIONS)
     async def _import_applications_data(self, db: AsyncSession, df: pd.DataFrame, user: User) -> Dict[str, int]:
-        """Import applications data to database."""
+        """
+        Import applications data to database.
 
-        imported = 0
-        updated = 0
-        skipped = 0
+        The sheet is converted into typed column arrays and written with
+        INSERT ... ON CONFLICT (l2_id) DO UPDATE in batches of IMPORT_BATCH_SIZE
+        rows, so the cost grows with the number of batches rather than with
+        ORM objects. Blank cells never overwrite existing values; on insert
+        they fall back to APPLICATION_INSERT_DEFAULTS.
+        """
 
         # Get user_id as integer to avoid relationship loading
         user_id = user.id if user else None
         if not user_id:
             raise ValueError("User ID is required for import")
 
-        # Store original autoflush state and disable it
-        original_autoflush = db.autoflush
-        db.autoflush = False
-
-        # Collections for batch operations
-        new_applications = []
-        updated_applications = []
+        columns, skipped, merged = self._application_import_columns(df)
+        row_count = len(columns['l2_id'])
+        imported = 0
+        # Rows repeating an L2 ID earlier in the sheet update that application
+        updated = merged
 
         try:
-            # First, get all existing applications in one query
-            existing_l2_ids = df['l2_id'].dropna().unique().tolist()
-            if existing_l2_ids:
-                stmt = select(Application).where(Application.l2_id.in_(existing_l2_ids))
-                result = await db.execute(stmt)
-                existing_apps_map = {app.l2_id: app for app in result.scalars()}
-            else:
-                existing_apps_map = {}
-
-            for index, row in df.iterrows():
-                try:
-                    l2_id = row.get('l2_id')
-                    if not l2_id:
-                        skipped += 1
-                        continue
-
-                    existing_app = existing_apps_map.get(l2_id)
-
-                    if existing_app:
-                        # Update existing application
-                        application_model_fields = {
-                            'l2_id', 'app_name', 'ak_supervision_acceptance_year', 'overall_transformation_target',
-                            'current_transformation_phase', 'current_status', 'app_tier', 'belonging_l1_name',
-                            'belonging_projects', 'is_ak_completed', 'is_cloud_native_completed',
-                            'is_domain_transformation_completed', 'is_dbpm_transformation_completed',
-                            'dev_mode', 'ops_mode', 'dev_owner', 'dev_team', 'ops_owner', 'ops_team',
-                            'belonging_kpi', 'acceptance_status', 'planned_requirement_date', 'planned_release_date',
-                            'planned_tech_online_date', 'planned_biz_online_date', 'actual_requirement_date',
-                            'actual_release_date', 'actual_tech_online_date', 'actual_biz_online_date',
-                            'is_delayed', 'delay_days', 'notes'
-                        }
-
-                        for field, value in row.items():
-                            if field in application_model_fields and value is not None and value != '' and hasattr(existing_app, field):
-                                try:
-                                    # Handle NaN values
-                                    if pd.isna(value):
-                                        continue  # Skip NaN values
-                                    
-                                    # Handle date fields
-                                    if field in self.config.DATE_FIELDS:
-                                        if isinstance(value, str):
-                                            # Try to parse date string
-                                            try:
-                                                value = datetime.strptime(value, '%Y-%m-%d').date()
-                                            except:
-                                                try:
-                                                    value = datetime.strptime(value, '%Y/%m/%d').date()
-                                                except:
-                                                    print(f"[WARNING] Could not parse date '{value}' for field {field}, skipping")
-                                                    continue
-                                        elif isinstance(value, datetime):
-                                            value = value.date()
-                                    
-                                    # Handle boolean fields
-                                    elif field in self.config.BOOLEAN_FIELDS:
-                                        if isinstance(value, str):
-                                            value = value.lower() in ['true', 'yes', '是', '1', 't', 'y']
-                                    
-                                    # Handle integer fields
-                                    elif field in self.config.INTEGER_FIELDS:
-                                        if pd.notna(value):
-                                            # Special handling for year field which might be a datetime
-                                            if field == 'ak_supervision_acceptance_year':
-                                                if isinstance(value, datetime):
-                                                    value = value.year
-                                                elif isinstance(value, date):
-                                                    value = value.year
-                                                elif isinstance(value, str):
-                                                    # Extract year from string like "2025年" or "2025"
-                                                    import re
-                                                    year_match = re.search(r'(\d{4})', value)
-                                                    if year_match:
-                                                        value = int(year_match.group(1))
-                                                    else:
-                                                        print(f"[WARNING] Could not extract year from '{value}', skipping")
-                                                        continue
-                                                else:
-                                                    value = int(float(value))  # Normal numeric conversion
-                                            else:
-                                                value = int(float(value))  # Convert through float to handle decimals
-                                    
-                                    setattr(existing_app, field, value)
-                                except Exception as e:
-                                    print(f"[WARNING] Error setting field {field} with value '{value}': {e}")
-                                    continue
-
-                        existing_app.updated_by = user_id
-                        updated_applications.append(existing_app)
-                        updated += 1
-                    else:
-                        # Create new application
-                        app_data = {}
-                        application_model_fields = {
-                            'l2_id', 'app_name', 'ak_supervision_acceptance_year', 'overall_transformation_target',
-                            'current_transformation_phase', 'current_status', 'app_tier', 'belonging_l1_name',
-                            'belonging_projects', 'is_ak_completed', 'is_cloud_native_completed',
-                            'is_domain_transformation_completed', 'is_dbpm_transformation_completed',
-                            'dev_mode', 'ops_mode', 'dev_owner', 'dev_team', 'ops_owner', 'ops_team',
-                            'belonging_kpi', 'acceptance_status', 'planned_requirement_date', 'planned_release_date',
-                            'planned_tech_online_date', 'planned_biz_online_date', 'actual_requirement_date',
-                            'actual_release_date', 'actual_tech_online_date', 'actual_biz_online_date',
-                            'is_delayed', 'delay_days', 'notes'
-                        }
-
-                        for k, v in row.items():
-                            if k in application_model_fields and v is not None and v != '':
-                                try:
-                                    # Handle NaN values
-                                    if pd.isna(v):
-                                        continue  # Skip NaN values
-                                    
-                                    # Handle date fields
-                                    if k in self.config.DATE_FIELDS:
-                                        if isinstance(v, str):
-                                            try:
-                                                v = datetime.strptime(v, '%Y-%m-%d').date()
-                                            except:
-                                                try:
-                                                    v = datetime.strptime(v, '%Y/%m/%d').date()
-                                                except:
-                                                    print(f"[WARNING] Could not parse date '{v}' for field {k}, skipping")
-                                                    continue
-                                        elif isinstance(v, datetime):
-                                            v = v.date()
-                                    
-                                    # Handle boolean fields
-                                    elif k in self.config.BOOLEAN_FIELDS:
-                                        if isinstance(v, str):
-                                            v = v.lower() in ['true', 'yes', '是', '1', 't', 'y']
-                                    
-                                    # Handle integer fields
-                                    elif k in self.config.INTEGER_FIELDS:
-                                        if pd.notna(v):
-                                            # Special handling for year field which might be a datetime
-                                            if k == 'ak_supervision_acceptance_year':
-                                                if isinstance(v, datetime):
-                                                    v = v.year
-                                                elif isinstance(v, date):
-                                                    v = v.year
-                                                elif isinstance(v, str):
-                                                    # Extract year from string like "2025年" or "2025"
-                                                    import re
-                                                    year_match = re.search(r'(\d{4})', v)
-                                                    if year_match:
-                                                        v = int(year_match.group(1))
-                                                    else:
-                                                        print(f"[WARNING] Could not extract year from '{v}', skipping")
-                                                        continue
-                                                else:
-                                                    v = int(float(v))  # Normal numeric conversion
-                                            else:
-                                                v = int(float(v))  # Convert through float to handle decimals
-                                    
-                                    app_data[k] = v
-                                except Exception as e:
-                                    print(f"[WARNING] Error processing field {k} with value '{v}': {e}")
-                                    continue
-
-                        app_data['created_by'] = user_id
-                        app_data['updated_by'] = user_id
-
-                        # Set defaults
-                        if 'app_name' not in app_data or not app_data['app_name']:
-                            app_data['app_name'] = '未命名应用'
-                        if 'overall_transformation_target' not in app_data or not app_data['overall_transformation_target']:
-                            app_data['overall_transformation_target'] = 'AK'
-                        if 'current_status' not in app_data or not app_data['current_status']:
-                            app_data['current_status'] = '待启动'
-
-                        new_app = Application(**app_data)
-                        new_applications.append(new_app)
-                        imported += 1
-
-                except Exception as e:
-                    print(f"[ERROR] Failed processing application row {index + 2} (L2_ID: {row.get('l2_id', 'unknown')}): {e}")
-                    import traceback
-                    traceback.print_exc()
-                    skipped += 1
-                    continue
-
-            # Add all new applications in batch
-            if new_applications:
-                print(f"[INFO] Adding {len(new_applications)} new applications to session...")
-                for app in new_applications:
-                    try:
-                        db.add(app)
-                    except Exception as e:
-                        print(f"[ERROR] Failed to add application {app.l2_id}: {e}")
-                        raise
-                print(f"[INFO] All new applications added to session successfully")
+            for start in range(0, row_count, self.IMPORT_BATCH_SIZE):
+                batch = {
+                    field: values[start:start + self.IMPORT_BATCH_SIZE]
+                    for field, values in columns.items()
+                }
+                batch_size = len(batch['l2_id'])
+                batch_imported = await self._upsert_applications_batch(db, batch, user_id)
+                imported += batch_imported
+                updated += batch_size - batch_imported
 
-            # Commit all changes at once
             print(f"[INFO] Committing {imported} new and {updated} updated applications...")
             await db.commit()
             print(f"[INFO] Successfully committed all application changes")
 
         except Exception as e:
-            # Restore autoflush and rollback on error
-            db.autoflush = original_autoflush
             await db.rollback()
             print(f"[ERROR] Failed to import applications: {e}")
             import traceback
             traceback.print_exc()
             raise
 
-        finally:
-            # Always restore autoflush state
-            db.autoflush = original_autoflush
-
         # Log final statistics
         print(f"[INFO] Import statistics - Imported: {imported}, Updated: {updated}, Skipped: {skipped}")
         if skipped > 0:
@@ -1900,236 +2123,279 @@ class ExcelService:
             'skipped': skipped
         }
 
-    async def _import_subtasks_data(self, db: AsyncSession, df: pd.DataFrame, user: User) -> Dict[str, int]:
-        """Import subtasks data to database."""
+    def _application_import_columns(self, df: pd.DataFrame) -> Tuple[Dict[str, List[Any]], int, int]:
+        """
+        Convert the applications sheet into typed column arrays.
+
+        Rows without an L2 ID are skipped. Rows repeating an L2 ID are merged
+        into its first occurrence, later non-blank cells winning, so a batch
+        never touches the same application twice.
+
+        Returns:
+            Tuple of (columns keyed by field with None for blank cells,
+            skipped row count, merged row count)
+        """
+        l2_ids = self._column(df, 'l2_id')
+        keep = (self._truthy_mask(l2_ids) & ~self._blank_mask(l2_ids)).to_numpy()
+        skipped = int((~keep).sum())
+        rows = df.loc[keep]
+
+        columns = {}
+        for field in self.config.APPLICATION_IMPORT_FIELDS:
+            if field in rows.columns:
+                columns[field] = self._import_column_values(rows[field].tolist(), field)
+            elif field in self.config.APPLICATION_INSERT_DEFAULTS:
+                columns[field] = [None] * len(rows)
+
+        columns, merged = self._merge_duplicate_rows(columns, columns['l2_id'])
+        return columns, skipped, merged
+
+    def _merge_duplicate_rows(
+        self,
+        columns: Dict[str, List[Any]],
+        keys: Sequence[Any]
+    ) -> Tuple[Dict[str, List[Any]], int]:
+        """
+        Collapse rows sharing a key into the first of them, later non-blank cells winning.
+
+        Returns:
+            Tuple of (merged columns, number of rows merged away)
+        """
+        first_positions = {}
+        duplicates = []
+        for position, key in enumerate(keys):
+            if key in first_positions:
+                duplicates.append((first_positions[key], position))
+            else:
+                first_positions[key] = position
+
+        if not duplicates:
+            return columns, 0
+
+        for first, position in duplicates:
+            for values in columns.values():
+                if values[position] is not None:
+                    values[first] = values[position]
+        positions = sorted(first_positions.values())
+        columns = {
+            field: [values[position] for position in positions]
+            for field, values in columns.items()
+        }
+        return columns, len(duplicates)
 
-        imported = 0
-        updated = 0
-        skipped = 0
+    def _import_column_values(self, values: List[Any], field: str) -> List[Any]:
+        """Convert one column for the bulk import, converting each distinct value once."""
 
-        # Get user_id as integer to avoid relationship loading
-        user_id = user.id if user else None
-        if not user_id:
-            raise ValueError("User ID is required for import")
+        converted = {}
+        result = []
+        for value in values:
+            if value is None or (isinstance(value, str) and value == '') or pd.isna(value):
+                result.append(None)
+                continue
+            key = (type(value), value)
+            try:
+                result.append(converted[key])
+            except KeyError:
+                try:
+                    converted[key] = self._import_cell_value(value, field)
+                except Exception as e:
+                    print(f"[WARNING] Error processing field {field} with value '{value}': {e}")
+                    converted[key] = None
+                result.append(converted[key])
+        return result
 
-        # Get application ID mappings
-        app_result = await db.execute(select(Application.id, Application.l2_id))
-        app_id_map = {l2_id: app_id for app_id, l2_id in app_result.all()}
-        print(f"DEBUG: Found {len(app_id_map)} existing applications for mapping")
+    def _import_cell_value(self, value: Any, field: str) -> Any:
+        """Convert a non-blank cell to its column type; None means the cell is skipped."""
 
-        # Store original autoflush state and disable it
-        original_autoflush = db.autoflush
-        db.autoflush = False
+        if field in self.config.DATE_FIELDS:
+            if isinstance(value, datetime):
+                return value.date()
+            if isinstance(value, date):
+                return value
+            if isinstance(value, str):
+                for date_format in ('%Y-%m-%d', '%Y/%m/%d'):
+                    try:
+                        return datetime.strptime(value, date_format).date()
+                    except ValueError:
+                        continue
+            print(f"[WARNING] Could not parse date '{value}' for field {field}, skipping")
+            return None
 
-        # Collections for batch operations
-        new_applications = []  # Applications to create
-        new_subtasks = []      # Subtasks to create
-        updated_subtasks = []  # Existing subtasks to update
+        if field in self.config.DATETIME_FIELDS:
+            if isinstance(value, pd.Timestamp):
+                return value.to_pydatetime()
+            if isinstance(value, datetime):
+                return value
+            if isinstance(value, date):
+                return datetime.combine(value, datetime.min.time())
+            # Status text such as '已完成' from a mismatched column is ignored
+            return None
 
-        try:
-            for index, row in df.iterrows():
-                try:
-                    app_l2_id = row.get('l2_id')  # Now looking for l2_id field in Excel
+        if field in self.config.BOOLEAN_FIELDS:
+            if isinstance(value, str):
+                return value.lower() in self.config.TRUE_STRINGS
+            return bool(value)
+
+        if field in self.config.INTEGER_FIELDS:
+            # Special handling for year field which might be a date or "2025年"
+            if field == 'ak_supervision_acceptance_year':
+                if isinstance(value, (datetime, date)):
+                    return value.year
+                if isinstance(value, str):
+                    year_match = re.search(r'(\d{4})', value)
+                    if year_match:
+                        return int(year_match.group(1))
+                    print(f"[WARNING] Could not extract year from '{value}', skipping")
+                    return None
+            # Convert through float to handle decimals
+            return int(float(value))
 
-                    # Skip rows with empty L2 ID, including NaN values
-                    if pd.isna(app_l2_id) or app_l2_id == '' or app_l2_id is None:
-                        skipped += 1
-                        if skipped <= 5:  # Log first 5 skipped rows
-                            print(f"DEBUG: Skipping row {index + 2} - empty L2 ID")
-                        continue
+        return value if isinstance(value, str) else str(value)
 
-                    # Convert app_l2_id to string (since Application.l2_id is a String field)
-                    if isinstance(app_l2_id, (int, float)):
-                        import math
-                        if math.isnan(app_l2_id):
-                            skipped += 1
-                            print(f"DEBUG: Skipping row {index + 2} - NaN L2 ID")
-                            continue
-                        app_l2_id = str(int(app_l2_id))  # Convert numeric to string
-                    elif isinstance(app_l2_id, str):
-                        app_l2_id = app_l2_id.strip()
-                        if not app_l2_id:
-                            skipped += 1
-                            print(f"DEBUG: Skipping row {index + 2} - empty L2 ID after stripping")
-                            continue
-                    else:
-                        skipped += 1
-                        print(f"DEBUG: Skipping row {index + 2} - unexpected L2 ID type: {type(app_l2_id)}")
-                        continue
+    async def _upsert_applications_batch(
+        self,
+        db: AsyncSession,
+        columns: Dict[str, List[Any]],
+        user_id: int
+    ) -> int:
+        """
+        Write one batch of applications with INSERT ... ON CONFLICT (l2_id) DO UPDATE.
+
+        Nullable columns are updated with COALESCE(excluded, current) so blank
+        cells keep the stored value. Columns with insert defaults cannot carry
+        NULL, so rows are grouped by which of them are blank and each group
+        only updates the columns it actually has.
+
+        Returns:
+            Number of rows inserted; the rest of the batch updated existing rows
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise BusinessLogicError(f"Bulk application import is not supported on {dialect}")
+
+        defaults = self.config.APPLICATION_INSERT_DEFAULTS
+        default_fields = [field for field in columns if field in defaults]
+        fields = list(columns)
+
+        groups: Dict[Tuple[bool, ...], List[Dict[str, Any]]] = {}
+        for values in zip(*columns.values()):
+            row = dict(zip(fields, values))
+            present = tuple(row[field] is not None for field in default_fields)
+            for field in default_fields:
+                if row[field] is None:
+                    row[field] = defaults[field]
+            row['created_by'] = user_id
+            row['updated_by'] = user_id
+            groups.setdefault(present, []).append(row)
+
+        table = Application.__table__
+        inserted = 0
+        for present, rows in groups.items():
+            stmt = insert(Application).values(rows)
+            present_fields = {field for field, has_value in zip(default_fields, present) if has_value}
+            update_columns = {}
+            for field in fields:
+                if field == 'l2_id':
+                    continue
+                if field in defaults:
+                    if field in present_fields:
+                        update_columns[field] = stmt.excluded[field]
+                else:
+                    update_columns[field] = func.coalesce(stmt.excluded[field], table.c[field])
+            update_columns['updated_by'] = stmt.excluded.updated_by
+            update_columns['updated_at'] = func.now()
+
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Application.l2_id],
+                set_=update_columns
+            )
+
+            if dialect == 'postgresql':
+                # xmax is 0 only for freshly inserted tuples
+                result = await db.execute(stmt.returning(literal_column('(xmax = 0)').label('inserted')))
+                inserted += sum(1 for was_inserted in result.scalars() if was_inserted)
+            else:
+                result = await db.execute(
+                    select(func.count()).select_from(Application).where(
+                        Application.l2_id.in_([row['l2_id'] for row in rows])
+                    )
+                )
+                inserted += len(rows) - result.scalar_one()
+                await db.execute(stmt)
 
-                    application_id = app_id_map.get(app_l2_id)
-
-                    # 如果应用不存在，自动创建placeholder应用
-                    if not application_id:
-                        print(f"DEBUG: Application with L2 ID '{app_l2_id}' not found, will create placeholder application")
-
-                        # Create placeholder application data
-                        new_app_data = {
-                            'l2_id': str(app_l2_id),  # Ensure l2_id is a string
-                            'app_name': '未命名应用',  # Default name when creating placeholder
-                            'current_status': '待启动',
-                            'overall_transformation_target': 'AK',
-                            'current_transformation_phase': '待启动',
-                            'dev_team': '待分配',
-                            'dev_owner': '待分配',
-                            'ak_supervision_acceptance_year': 2024,  # Add required field with default value
-                            'created_by': user_id,  # Use integer directly
-                            'updated_by': user_id   # Use integer directly
-                        }
+        return inserted
 
-                        new_application = Application(**new_app_data)
-                        new_applications.append(new_application)
-                        # Use a temporary negative ID for mapping (will be replaced after flush)
-                        temp_app_id = -(len(new_applications))  # Use negative IDs for temp mapping
-                        app_id_map[app_l2_id] = temp_app_id
-                        application_id = temp_app_id
-
-                    # Only check existing subtasks if application already exists
-                    if application_id > 0:  # Positive IDs are existing applications
-                        # Check if subtask exists (based on l2_id, sub_target, and version_name for uniqueness)
-                        version_name = row.get('version_name')
-                        sub_target = row.get('sub_target')
-
-                        # Build query conditions
-                        conditions = [
-                            SubTask.l2_id == application_id,
-                            SubTask.sub_target == sub_target
-                        ]
-
-                        # Add version_name condition - handle both NULL and non-NULL cases
-                        if version_name:
-                            conditions.append(SubTask.version_name == version_name)
-                        else:
-                            conditions.append(SubTask.version_name.is_(None))
-
-                        stmt = select(SubTask).where(and_(*conditions))
-                        result = await db.execute(stmt)
-                        existing_subtask = result.scalar_one_or_none()
-
-                        if existing_subtask:
-                            # Update existing subtask
-                            subtask_model_fields = {
-                                'app_name', 'sub_target', 'version_name', 'task_status',
-                                'progress_percentage', 'is_blocked', 'block_reason',
-                                'planned_requirement_date', 'planned_release_date', 'planned_tech_online_date', 'planned_biz_online_date',
-                                'actual_requirement_date', 'actual_release_date', 'actual_tech_online_date', 'actual_biz_online_date',
-                                'notes', 'resource_applied', 'ops_testing_status', 'launch_check_status'
-                                # Removed ops_requirement_submitted from here since it's a DateTime field that needs special handling
-                            }
-
-                            for field, value in row.items():
-                                if field in subtask_model_fields and value is not None and value != '' and hasattr(existing_subtask, field):
-                                    # Check for NaN in numeric fields
-                                    if field == 'progress_percentage' and isinstance(value, float):
-                                        import math
-                                        if math.isnan(value):
-                                            value = 0
-                                    setattr(existing_subtask, field, value)
-
-                            # Handle ops_requirement_submitted separately - it's a DateTime field
-                            if 'ops_requirement_submitted' in row and hasattr(existing_subtask, 'ops_requirement_submitted'):
-                                ops_req_value = row['ops_requirement_submitted']
-                                if ops_req_value and not isinstance(ops_req_value, str):
-                                    # Only set if it's a valid date/datetime value, not a string like '已完成'
-                                    setattr(existing_subtask, 'ops_requirement_submitted', ops_req_value)
-
-                            existing_subtask.updated_by = user_id
-                            updated_subtasks.append(existing_subtask)
-                            updated += 1
-                            continue  # Skip to next row
-
-                    # Create new subtask
-                    subtask_data = {}
-                    subtask_model_fields = {
-                        'app_name', 'sub_target', 'version_name', 'task_status',
-                        'progress_percentage', 'is_blocked', 'block_reason',
-                        'planned_requirement_date', 'planned_release_date', 'planned_tech_online_date', 'planned_biz_online_date',
-                        'actual_requirement_date', 'actual_release_date', 'actual_tech_online_date', 'actual_biz_online_date',
-                        'notes', 'resource_applied', 'ops_testing_status', 'launch_check_status'
-                        # Removed ops_requirement_submitted from here since it's a DateTime field that needs special handling
-                    }
+    @invalidates(CacheTag.SUBTASKS, CacheTag.APPLICATIONS)
+    async def _import_subtasks_data(self, db: AsyncSession, df: pd.DataFrame, user: User) -> Dict[str, int]:
+        """
+        Import subtasks data to database.
+
+        Bulk loader for PostgreSQL. Placeholder applications for unknown L2 IDs
+        are created in one statement. The rows are staged into a temporary
+        table with COPY and merged into sub_tasks on
+        (l2_id, sub_target, version_name) with one INSERT ... SELECT ...
+        ON CONFLICT. Blank cells keep the stored values of existing subtasks.
+        SQLite merges with multi-VALUES INSERT ... ON CONFLICT DO UPDATE in
+        batches of IMPORT_BATCH_SIZE rows instead.
+        """
 
-                    for k, v in row.items():
-                        if k in subtask_model_fields and v is not None and v != '':
-                            subtask_data[k] = v
-
-                    # Handle ops_requirement_submitted separately - it's a DateTime field
-                    if 'ops_requirement_submitted' in row:
-                        ops_req_value = row['ops_requirement_submitted']
-                        if ops_req_value and not isinstance(ops_req_value, str):
-                            # Only set if it's a valid date/datetime value, not a string like '已完成'
-                            subtask_data['ops_requirement_submitted'] = ops_req_value
-                        # If it's a string like '已完成', we ignore it as it's likely mismatched column data
-
-                    # Store the app_l2_id for later resolution
-                    subtask_data['_app_l2_id'] = app_l2_id  # Temporary field to track which app this belongs to
-                    subtask_data['created_by'] = user_id
-                    subtask_data['updated_by'] = user_id
-
-                    # Set defaults
-                    if 'sub_target' not in subtask_data or not subtask_data['sub_target']:
-                        subtask_data['sub_target'] = 'AK'
-                    if 'task_status' not in subtask_data or not subtask_data['task_status']:
-                        subtask_data['task_status'] = '待启动'
-                    if 'progress_percentage' not in subtask_data:
-                        subtask_data['progress_percentage'] = 0
-                    else:
-                        # Check for NaN in progress_percentage
-                        import math
-                        if isinstance(subtask_data['progress_percentage'], float) and math.isnan(subtask_data['progress_percentage']):
-                            subtask_data['progress_percentage'] = 0
-                    if 'is_blocked' not in subtask_data:
-                        subtask_data['is_blocked'] = False
-                    if 'resource_applied' not in subtask_data:
-                        subtask_data['resource_applied'] = False
-
-                    new_subtasks.append(subtask_data)  # Store as dict for now
-                    imported += 1
+        # Get user_id as integer to avoid relationship loading
+        user_id = user.id if user else None
+        if not user_id:
+            raise ValueError("User ID is required for import")
 
-                except Exception as e:
-                    print(f"Error processing subtask row {index + 2}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    skipped += 1
-                    continue
+        dialect = db.get_bind().dialect.name
+        if dialect not in ('postgresql', 'sqlite'):
+            raise BusinessLogicError(f"Bulk subtask import is not supported on {dialect}")
+
+        # Skip rows with empty L2 ID, including NaN values
+        app_l2_ids = [self._subtask_import_l2_id(value) for value in self._column(df, 'l2_id').tolist()]
+        positions = [position for position, l2_id in enumerate(app_l2_ids) if l2_id is not None]
+        app_l2_ids = [app_l2_ids[position] for position in positions]
+        skipped = len(df) - len(positions)
+        rows = df.iloc[positions]
+
+        columns = {}
+        for field in self.config.SUBTASK_IMPORT_FIELDS:
+            if field in rows.columns:
+                columns[field] = self._import_column_values(rows[field].tolist(), field)
+            else:
+                columns[field] = [None] * len(rows)
+        # The default target is part of the merge key, so apply it up front
+        default_target = self.config.SUBTASK_INSERT_DEFAULTS['sub_target']
+        columns['sub_target'] = [sub_target or default_target for sub_target in columns['sub_target']]
 
-            # Now add all new applications in batch
-            if new_applications:
-                print(f"DEBUG: Adding {len(new_applications)} new placeholder applications...")
-                for app in new_applications:
-                    db.add(app)
-
-                # Flush to get real IDs for the applications
-                await db.flush()
-
-                # Update the mapping with real IDs
-                for app in new_applications:
-                    # Find the temporary mapping and update it
-                    for l2_id, temp_id in list(app_id_map.items()):
-                        if temp_id < 0:  # It's a temporary ID
-                            # Check if this is the right app by matching l2_id
-                            if app.l2_id == l2_id:
-                                app_id_map[l2_id] = app.id
-                                print(f"DEBUG: Mapped L2 ID '{l2_id}' to real application ID {app.id}")
-                                break
-
-            # Now create SubTask objects with correct application IDs
-            if new_subtasks:
-                print(f"DEBUG: Creating {len(new_subtasks)} new subtasks...")
-                for subtask_data in new_subtasks:
-                    # Get the real application ID
-                    app_l2_id = subtask_data.pop('_app_l2_id', None)
-                    if app_l2_id:
-                        real_app_id = app_id_map.get(app_l2_id)
-                        if real_app_id and real_app_id > 0:
-                            subtask_data['l2_id'] = real_app_id
-                        else:
-                            print(f"WARNING: Could not find application ID for L2 ID '{app_l2_id}'")
-                            continue
+        imported = 0
+        updated = 0
+
+        try:
+            app_id_map = await self._resolve_subtask_applications(db, list(dict.fromkeys(app_l2_ids)), user_id)
+            columns = {'l2_id': [app_id_map[l2_id] for l2_id in app_l2_ids], **columns}
+
+            keys = zip(columns['l2_id'], columns['sub_target'], (version or '' for version in columns['version_name']))
+            columns, merged = self._merge_duplicate_rows(columns, list(keys))
+            # Rows repeating a subtask earlier in the sheet update that subtask
+            updated += merged
+
+            if columns['l2_id']:
+                print(f"DEBUG: Merging {len(columns['l2_id'])} subtasks...")
+                if dialect == 'postgresql':
+                    merge_imported, merge_updated = await self._merge_subtask_rows(db, columns, user_id)
+                else:
+                    merge_imported, merge_updated = await self._upsert_subtask_rows(db, columns, user_id)
+                imported += merge_imported
+                updated += merge_updated
+
+            # Get unique application IDs that were affected
+            affected_app_ids = set(columns['l2_id'])
 
-                    # Create and add the subtask
-                    new_subtask = SubTask(**subtask_data)
-                    db.add(new_subtask)
+            # Refresh the application_stats projection in the same transaction
+            from app.services.application_stats_service import application_stats_service
+            await application_stats_service.refresh_applications(db, affected_app_ids)
 
             # Commit all changes at once
             await db.commit()
@@ -2140,39 +2406,23 @@ class ExcelService:
             from app.services.calculation_engine import CalculationEngine
             calc_engine = CalculationEngine()
 
-            # Get unique application IDs that were affected
-            affected_app_ids = set()
-            for subtask in updated_subtasks:
-                affected_app_ids.add(subtask.l2_id)
-            for subtask_data in new_subtasks:
-                app_l2_id = subtask_data.get('_app_l2_id')
-                if app_l2_id:
-                    real_app_id = app_id_map.get(app_l2_id)
-                    if real_app_id and real_app_id > 0:
-                        affected_app_ids.add(real_app_id)
-
             print(f"DEBUG: Recalculating {len(affected_app_ids)} applications...")
-            for app_id in affected_app_ids:
-                try:
-                    await calc_engine.recalculate_application_status(db, app_id)
-                except Exception as calc_error:
-                    print(f"WARNING: Failed to recalculate application {app_id}: {calc_error}")
+            # Grouped aggregate per batch of applications rather than a query per application
+            try:
+                await calc_engine.recalculate_applications(db, affected_app_ids)
+            except Exception as calc_error:
+                await db.rollback()
+                print(f"WARNING: Failed to recalculate imported applications: {calc_error}")
 
             print(f"DEBUG: Application metrics recalculation completed")
 
         except Exception as e:
-            # Restore autoflush and rollback on error
-            db.autoflush = original_autoflush
             await db.rollback()
             print(f"ERROR: Failed to import subtasks: {e}")
             import traceback
             traceback.print_exc()
             raise
 
-        finally:
-            # Always restore autoflush state
-            db.autoflush = original_autoflush
-
         # Log final statistics
         print(f"DEBUG: Import completed - Imported: {imported}, Updated: {updated}, Skipped: {skipped}")
         if skipped > 0:
@@ -2184,6 +2434,255 @@ class ExcelService:
             'skipped': skipped
         }
 
+    def _subtask_import_l2_id(self, value: Any) -> Optional[str]:
+        """Normalize the application L2 ID of a subtask row; None means the row is skipped."""
+        if isinstance(value, str):
+            return value.strip() or None
+        if isinstance(value, (int, float)) and not pd.isna(value):
+            # Convert numeric to string (Application.l2_id is a String field)
+            return str(int(value))
+        return None
+
+    async def _resolve_subtask_applications(
+        self,
+        db: AsyncSession,
+        l2_ids: List[str],
+        user_id: int
+    ) -> Dict[str, int]:
+        """
+        Map L2 IDs to application IDs, creating placeholder applications for unknown ones.
+
+        The lookup and the placeholder insert are one statement each, with the
+        L2 IDs passed as a single array parameter. SQLite has no arrays, so
+        there the L2 IDs are handled in batches of IMPORT_BATCH_SIZE.
+        """
+        if db.get_bind().dialect.name == 'sqlite':
+            return await self._resolve_subtask_applications_batched(db, l2_ids, user_id)
+
+        from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+        result = await db.execute(
+            select(Application.id, Application.l2_id).where(
+                Application.l2_id == any_(bindparam('l2_ids', l2_ids, type_=ARRAY(String)))
+            )
+        )
+        app_id_map = {l2_id: app_id for app_id, l2_id in result.all()}
+        print(f"DEBUG: Found {len(app_id_map)} existing applications for mapping")
+
+        missing = [l2_id for l2_id in l2_ids if l2_id not in app_id_map]
+        if not missing:
+            return app_id_map
+
+        print(f"DEBUG: Creating {len(missing)} placeholder applications...")
+        placeholder = {**self.config.PLACEHOLDER_APPLICATION, 'created_by': user_id, 'updated_by': user_id}
+        placeholder_rows = select(
+            func.unnest(bindparam('missing_l2_ids', missing, type_=ARRAY(String))),
+            *(literal(value) for value in placeholder.values())
+        )
+        result = await db.execute(
+            insert(Application)
+            .from_select(['l2_id', *placeholder], placeholder_rows)
+            .on_conflict_do_nothing(index_elements=[Application.l2_id])
+            .returning(Application.id, Application.l2_id)
+        )
+        app_id_map.update({l2_id: app_id for app_id, l2_id in result.all()})
+
+        # Applications created by a concurrent import since the lookup
+        unresolved = [l2_id for l2_id in missing if l2_id not in app_id_map]
+        if unresolved:
+            result = await db.execute(
+                select(Application.id, Application.l2_id).where(
+                    Application.l2_id == any_(bindparam('l2_ids', unresolved, type_=ARRAY(String)))
+                )
+            )
+            app_id_map.update({l2_id: app_id for app_id, l2_id in result.all()})
+
+        return app_id_map
+
+    async def _resolve_subtask_applications_batched(
+        self,
+        db: AsyncSession,
+        l2_ids: List[str],
+        user_id: int
+    ) -> Dict[str, int]:
+        """SQLite variant of _resolve_subtask_applications: INSERT ... ON CONFLICT DO NOTHING, then look up."""
+        from sqlalchemy.dialects.sqlite import insert
+
+        placeholder = {**self.config.PLACEHOLDER_APPLICATION, 'created_by': user_id, 'updated_by': user_id}
+        app_id_map = {}
+        for start in range(0, len(l2_ids), self.IMPORT_BATCH_SIZE):
+            batch = l2_ids[start:start + self.IMPORT_BATCH_SIZE]
+            await db.execute(
+                insert(Application)
+                .values([{'l2_id': l2_id, **placeholder} for l2_id in batch])
+                .on_conflict_do_nothing(index_elements=[Application.l2_id])
+            )
+            result = await db.execute(
+                select(Application.id, Application.l2_id).where(Application.l2_id.in_(batch))
+            )
+            app_id_map.update({l2_id: app_id for app_id, l2_id in result.all()})
+        return app_id_map
+
+    async def _merge_subtask_rows(
+        self,
+        db: AsyncSession,
+        columns: Dict[str, List[Any]],
+        user_id: int
+    ) -> Tuple[int, int]:
+        """
+        Stage subtask rows with COPY and merge them into sub_tasks.
+
+        Args:
+            db: Database session; the staging table lives in its transaction
+            columns: Typed column arrays keyed by sub_tasks column, None for blank cells
+            user_id: Importing user
+
+        Returns:
+            Tuple of (inserted, updated) counts from RETURNING (xmax = 0)
+        """
+        table = SubTask.__table__
+        dialect = db.get_bind().dialect
+        fields = list(columns)
+        definitions = ', '.join(f"{field} {table.c[field].type.compile(dialect=dialect)}" for field in fields)
+        await db.execute(text(
+            f"CREATE TEMPORARY TABLE {self.SUBTASK_STAGING_TABLE} ({definitions}) ON COMMIT DROP"
+        ))
+
+        # COPY through the asyncpg connection of the session's transaction
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.SUBTASK_STAGING_TABLE,
+            records=list(zip(*columns.values())),
+            columns=fields
+        )
+
+        # sub_target defaults were applied before staging as part of the key
+        params = {
+            f'default_{field}': value
+            for field, value in self.config.SUBTASK_INSERT_DEFAULTS.items()
+            if field != 'sub_target'
+        }
+        params['user_id'] = user_id
+        result = await db.execute(text(self._subtask_merge_sql()), params)
+        imported, updated = result.one()
+        return imported, updated
+
+    async def _upsert_subtask_rows(
+        self,
+        db: AsyncSession,
+        columns: Dict[str, List[Any]],
+        user_id: int
+    ) -> Tuple[int, int]:
+        """
+        Merge subtask rows into sub_tasks with INSERT ... ON CONFLICT DO UPDATE (SQLite).
+
+        Follows the rules of _subtask_merge_sql: nullable columns are updated
+        with COALESCE(excluded, current), and columns with insert defaults are
+        grouped by which rows have them, as in _upsert_applications_batch.
+
+        Returns:
+            Tuple of (inserted, updated) counts
+        """
+        from sqlalchemy.dialects.sqlite import insert
+
+        table = SubTask.__table__
+        key_fields = ('l2_id', 'sub_target', 'version_name')
+        # The conflict target must render like uq_sub_tasks_import_key, so '' is inlined
+        blank = literal_column("''")
+        import_key = [
+            table.c.l2_id,
+            func.coalesce(table.c.sub_target, blank),
+            func.coalesce(table.c.version_name, blank),
+        ]
+        # sub_target defaults were applied before the merge as part of the key
+        defaults = {
+            field: value
+            for field, value in self.config.SUBTASK_INSERT_DEFAULTS.items()
+            if field != 'sub_target'
+        }
+        fields = list(columns)
+        rows = [dict(zip(fields, values)) for values in zip(*columns.values())]
+
+        imported = 0
+        for start in range(0, len(rows), self.IMPORT_BATCH_SIZE):
+            batch = rows[start:start + self.IMPORT_BATCH_SIZE]
+            result = await db.execute(
+                select(func.count()).select_from(table).where(
+                    tuple_(*import_key).in_([
+                        (row['l2_id'], row['sub_target'] or '', row['version_name'] or '') for row in batch
+                    ])
+                )
+            )
+            imported += len(batch) - result.scalar_one()
+
+            groups: Dict[Tuple[bool, ...], List[Dict[str, Any]]] = {}
+            for row in batch:
+                present = tuple(row[field] is not None for field in defaults)
+                values = {field: defaults[field] if row[field] is None and field in defaults else row[field]
+                          for field in fields}
+                values.update(created_by=user_id, updated_by=user_id, lock_version=1)
+                groups.setdefault(present, []).append(values)
+
+            for present, group_rows in groups.items():
+                stmt = insert(SubTask).values(group_rows)
+                present_fields = {field for field, has_value in zip(defaults, present) if has_value}
+                update_columns = {}
+                for field in fields:
+                    if field in key_fields:
+                        continue
+                    if field in defaults:
+                        if field in present_fields:
+                            update_columns[field] = stmt.excluded[field]
+                    else:
+                        update_columns[field] = func.coalesce(stmt.excluded[field], table.c[field])
+                update_columns['updated_by'] = stmt.excluded.updated_by
+                update_columns['updated_at'] = func.now()
+
+                await db.execute(stmt.on_conflict_do_update(index_elements=import_key, set_=update_columns))
+
+        return imported, len(rows) - imported
+
+    def _subtask_merge_sql(self) -> str:
+        """
+        INSERT ... SELECT ... ON CONFLICT merging the staging table into sub_tasks.
+
+        The SELECT joins the current rows so blank staged cells resolve to the
+        stored value, or to SUBTASK_INSERT_DEFAULTS for new subtasks.
+        """
+        key_fields = ('sub_target', 'version_name')
+        defaults = self.config.SUBTASK_INSERT_DEFAULTS
+        fields = self.config.SUBTASK_IMPORT_FIELDS
+
+        values = []
+        for field in fields:
+            if field in key_fields:
+                values.append(f"s.{field}")
+            elif field in defaults:
+                values.append(f"COALESCE(s.{field}, t.{field}, :default_{field})")
+            else:
+                values.append(f"COALESCE(s.{field}, t.{field})")
+        updates = [f"{field} = EXCLUDED.{field}" for field in fields if field not in key_fields]
+
+        return f"""
+            WITH merged AS (
+                INSERT INTO sub_tasks (l2_id, {', '.join(fields)}, created_by, updated_by, lock_version)
+                SELECT s.l2_id, {', '.join(values)}, :user_id, :user_id, 1
+                FROM {self.SUBTASK_STAGING_TABLE} s
+                LEFT JOIN sub_tasks t
+                    ON t.l2_id = s.l2_id
+                    AND coalesce(t.sub_target, '') = coalesce(s.sub_target, '')
+                    AND coalesce(t.version_name, '') = coalesce(s.version_name, '')
+                ON CONFLICT (l2_id, (coalesce(sub_target, '')), (coalesce(version_name, '')))
+                DO UPDATE SET {', '.join(updates)}, updated_by = EXCLUDED.updated_by, updated_at = now()
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                count(*) FILTER (WHERE inserted) AS imported,
+                count(*) FILTER (WHERE NOT inserted) AS updated
+            FROM merged
+        """
+
     async def _get_applications_for_export(
         self,
         db: AsyncSession,
@@ -2192,21 +2691,41 @@ class ExcelService:
     ) -> List[Application]:
         """Get applications for export."""
 
+        query = self._build_applications_export_query(application_ids, filters)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    def _build_applications_export_query(
+        self,
+        application_ids: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ):
+        """Build the ordered applications export query."""
+
         query = select(Application)
 
         if application_ids:
             query = query.where(Application.id.in_(application_ids))
 
         if filters:
-            if filters.get('supervision_year'):
-                query = query.where(Application.supervision_year == filters['supervision_year'])
-            if filters.get('responsible_team'):
-                query = query.where(Application.responsible_team == filters['responsible_team'])
-            if filters.get('overall_status'):
-                query = query.where(Application.overall_status == filters['overall_status'])
-
-        result = await db.execute(query.order_by(Application.l2_id))
-        return result.scalars().all()
+            # Legacy filter names map to the renamed columns
+            year = filters.get('ak_supervision_acceptance_year') or filters.get('supervision_year')
+            if year:
+                query = query.where(Application.ak_supervision_acceptance_year == year)
+            dev_team = filters.get('dev_team') or filters.get('responsible_team')
+            if dev_team:
+                query = query.where(Application.dev_team == dev_team)
+            if filters.get('ops_team'):
+                query = query.where(Application.ops_team == filters['ops_team'])
+            current_status = filters.get('current_status') or filters.get('overall_status')
+            if current_status:
+                query = query.where(Application.current_status == current_status)
+            if filters.get('overall_transformation_target'):
+                query = query.where(
+                    Application.overall_transformation_target == filters['overall_transformation_target']
+                )
+
+        return query.order_by(Application.l2_id)
 
     async def _get_subtasks_for_export(
             self,
@@ -2215,10 +2734,70 @@ class ExcelService:
             subtask_ids: Optional[List[int]] = None,
             filters: Optional[Dict[str, Any]] = None
     ) -> List[SubTask]:
-        """Get subtasks for export."""
+        """Get subtasks for export, with their applications loaded from the join."""
+
+        query = self._build_subtasks_export_query(application_id, subtask_ids, filters)
+        result = await db.execute(query.options(contains_eager(SubTask.application)))
+        return result.scalars().all()
+
+    async def _get_subtask_export_rows(
+            self,
+            db: AsyncSession,
+            application_id: Optional[int] = None,
+            subtask_ids: Optional[List[int]] = None,
+            filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Any, ...]]:
+        """Get subtask export rows as plain tuples of the exported columns."""
+
+        _, columns = self._subtask_export_columns()
+        query = self._build_subtasks_export_query(application_id, subtask_ids, filters, columns=columns)
+        result = await db.execute(query)
+        return result.all()
+
+    def _subtask_export_columns(self) -> Tuple[List[str], List[Any]]:
+        """
+        Distinct exported subtask fields and the SQL columns projecting them.
+
+        SUBTASK_FIELDS maps several header aliases to the same field, so each
+        field is selected once; l2_id is the application's L2 ID from the join.
+        """
+        fields = list(dict.fromkeys(self.config.SUBTASK_FIELDS.values()))
+        columns = [
+            Application.l2_id.label('l2_id') if field == 'l2_id' else getattr(SubTask, field)
+            for field in fields
+        ]
+        return fields, columns
+
+    def _subtask_export_row(self, row: Sequence[Any], fields: List[str]) -> List[Any]:
+        """Expand a projected subtask tuple to cell values in SUBTASK_FIELDS header order."""
+
+        values = dict(zip(fields, row))
+        cells = []
+        for field in self.config.SUBTASK_FIELDS.values():
+            value = values[field]
+            if field == 'l2_id':
+                cells.append(value or '')
+            else:
+                cells.append(self._format_cell_value(value, field))
+        return cells
+
+    def _build_subtasks_export_query(
+            self,
+            application_id: Optional[int] = None,
+            subtask_ids: Optional[List[int]] = None,
+            filters: Optional[Dict[str, Any]] = None,
+            columns: Optional[List[Any]] = None
+    ):
+        """
+        Build the ordered subtasks export query (joined to applications).
+
+        Selects SubTask entities by default, or only the given columns when
+        a projection is passed.
+        """
 
         # 修正：SubTask使用l2_id关联Application，不是application_id
-        query = select(SubTask).join(Application, SubTask.l2_id == Application.id)
+        query = select(*columns) if columns else select(SubTask)
+        query = query.select_from(SubTask).join(Application, SubTask.l2_id == Application.id)
 
         if application_id:
             query = query.where(SubTask.l2_id == application_id)
@@ -2235,8 +2814,7 @@ class ExcelService:
                 query = query.where(SubTask.is_blocked == filters['is_blocked'])
 
         # 修正排序字段：使用version_name而不是module_name
-        result = await db.execute(query.order_by(Application.l2_id, SubTask.version_name))
-        return result.scalars().all()
+        return query.order_by(Application.l2_id, SubTask.version_name)
 
     def _write_headers(self, worksheet, headers: List[str], style: str = "standard"):
         """Write headers to worksheet."""
@@ -2408,4 +2986,56 @@ class ExcelService:
             for col, value in enumerate(sample_data, 1):
                 subtasks_sheet.cell(row=2, column=col, value=value)
 
-        self._apply_worksheet_styling(subtasks_sheet, 2 if include_sample else 1, len(headers))
\ No newline at end of file
+        self._apply_worksheet_styling(subtasks_sheet, 2 if include_sample else 1, len(headers))
+
+
+# Excel worker pool
+#
+# Parsing uploads and generating workbooks is pure CPU work that would block
+# the event loop, so it runs in a per-process pool. Workers are spawned rather
+# than forked so they never inherit the event loop or open database connections.
+
+_excel_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_excel_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the Excel worker pool, creating it on first use; None when disabled."""
+    global _excel_executor
+
+    if settings.EXCEL_WORKER_POOL_SIZE <= 0:
+        return None
+    if _excel_executor is None:
+        _excel_executor = ProcessPoolExecutor(
+            max_workers=settings.EXCEL_WORKER_POOL_SIZE,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _excel_executor
+
+
+def shutdown_excel_executor() -> None:
+    """Shut down the Excel worker pool (a new one is created on next use)."""
+    global _excel_executor
+
+    if _excel_executor is not None:
+        _excel_executor.shutdown(wait=False, cancel_futures=True)
+        _excel_executor = None
+
+
+def parse_applications_workbook(file_content: bytes) -> pd.DataFrame:
+    """Worker entry point for ExcelService.parse_applications_workbook."""
+    return ExcelService().parse_applications_workbook(file_content)
+
+
+def parse_subtasks_workbook(file_content: bytes) -> Dict[str, Any]:
+    """Worker entry point for ExcelService.parse_subtasks_workbook."""
+    return ExcelService().parse_subtasks_workbook(file_content)
+
+
+def build_export_workbook(
+    sheet_title: str,
+    headers: List[str],
+    rows: List[List[Any]],
+    template_style: str = "standard"
+) -> bytes:
+    """Worker entry point for ExcelService.build_export_workbook."""
+    return ExcelService().build_export_workbook(sheet_title, headers, rows, template_style)
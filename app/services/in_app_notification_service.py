@@ -0,0 +1,246 @@
+"""
+In-app notification service
+
+Stores in-app notifications in the notifications table, one row per
+recipient written with a single multi-row INSERT, and keeps
+notification_unread_counts in step in the same transaction so the unread
+badge is a primary key lookup. Marking read is a set-based UPDATE over the
+partial unread index. Each recipient gets a change event with their new
+or read notification IDs once the transaction commits.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, func, or_, case, delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.event_bus import EventEntity, publish_change
+from app.core.exceptions import BusinessLogicError
+from app.models.notification import Notification, NotificationUnreadCount
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class InAppNotificationService:
+    """Service storing and reading in-app notifications."""
+
+    async def resolve_recipients(self, db: AsyncSession, recipients: Iterable[Any]) -> Dict[str, int]:
+        """
+        Map recipients (user IDs, emails or usernames) to user IDs in one query.
+
+        Keys are the recipients as strings; unknown recipients are left out.
+        """
+        names = {str(recipient) for recipient in recipients if recipient}
+        if not names:
+            return {}
+
+        conditions = [User.email.in_(names), User.username.in_(names)]
+        ids = {int(name) for name in names if name.isdigit()}
+        if ids:
+            conditions.append(User.id.in_(ids))
+        result = await db.execute(select(User.id, User.email, User.username).where(or_(*conditions)))
+
+        mapping = {}
+        for user_id, email, username in result.all():
+            for key in (str(user_id), email, username):
+                if key in names:
+                    mapping[key] = user_id
+        return mapping
+
+    async def deliver(
+        self,
+        db: AsyncSession,
+        user_ids: List[int],
+        title: str,
+        message: str,
+        notification_type: str,
+        priority: Optional[str] = None,
+        content: Optional[Dict[str, Any]] = None
+    ) -> List[int]:
+        """
+        Insert one notification per user and bump their unread counts.
+
+        Returns the new notification IDs. Runs in the caller's transaction.
+        """
+        batches = await self.deliver_batch(db, [{
+            "user_ids": user_ids,
+            "title": title,
+            "message": message,
+            "notification_type": notification_type,
+            "priority": priority,
+            "content": content,
+        }])
+        return batches[0]
+
+    async def deliver_batch(self, db: AsyncSession, notifications: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Store several notifications with one multi-row INSERT.
+
+        Each item has user_ids, title, message, notification_type and
+        optionally priority and content. Returns the new IDs per item.
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                "user_id": user_id,
+                "title": notification["title"][:200],
+                "message": notification["message"],
+                "type": notification["notification_type"],
+                "priority": notification.get("priority"),
+                "content": notification.get("content"),
+                "is_read": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for notification in notifications
+            for user_id in notification["user_ids"]
+        ]
+        if not rows:
+            return [[] for _ in notifications]
+
+        # RETURNING in parameter order, so the IDs can be split per item
+        result = await db.execute(
+            insert(Notification).returning(Notification.id, sort_by_parameter_order=True),
+            rows
+        )
+        new_ids = list(result.scalars().all())
+        await self._increment_unread(db, Counter(row["user_id"] for row in rows))
+
+        ids_by_user: Dict[int, List[int]] = {}
+        for row, notification_id in zip(rows, new_ids):
+            ids_by_user.setdefault(row["user_id"], []).append(notification_id)
+        for user_id, notification_ids in ids_by_user.items():
+            publish_change(db, EventEntity.NOTIFICATION, "created", notification_ids, user_ids=[user_id])
+
+        batches, offset = [], 0
+        for notification in notifications:
+            count = len(notification["user_ids"])
+            batches.append(new_ids[offset:offset + count])
+            offset += count
+        return batches
+
+    async def get_unread_count(self, db: AsyncSession, user_id: int) -> int:
+        """Unread notifications of a user."""
+        result = await db.execute(
+            select(NotificationUnreadCount.unread_count).where(NotificationUnreadCount.user_id == user_id)
+        )
+        return max(result.scalar() or 0, 0)
+
+    async def list_notifications(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        is_read: Optional[bool] = None,
+        notification_type: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        sort_order: str = "desc"
+    ) -> Tuple[int, List[Notification]]:
+        """A page of a user's notifications and the total matching the filters."""
+        conditions = [Notification.user_id == user_id]
+        if is_read is not None:
+            conditions.append(Notification.is_read.is_(is_read))
+        if notification_type:
+            conditions.append(Notification.type == notification_type)
+        if date_from:
+            conditions.append(Notification.created_at >= date_from)
+        if date_to:
+            conditions.append(Notification.created_at <= date_to)
+
+        total_result = await db.execute(select(func.count(Notification.id)).where(*conditions))
+        total = total_result.scalar() or 0
+
+        order = (
+            (Notification.created_at.asc(), Notification.id.asc())
+            if sort_order == "asc"
+            else (Notification.created_at.desc(), Notification.id.desc())
+        )
+        result = await db.execute(
+            select(Notification).where(*conditions).order_by(*order).offset(skip).limit(limit)
+        )
+        return total, list(result.scalars().all())
+
+    async def mark_read(self, db: AsyncSession, user_id: int, notification_ids: List[int]) -> List[int]:
+        """Mark some of a user's notifications read; returns the IDs that were unread."""
+        if not notification_ids:
+            return []
+        return await self._mark_read(db, user_id, Notification.id.in_(notification_ids))
+
+    async def mark_all_read(self, db: AsyncSession, user_id: int) -> List[int]:
+        """Mark every unread notification of a user read in one UPDATE."""
+        return await self._mark_read(db, user_id)
+
+    async def rebuild_unread_counts(self, db: AsyncSession) -> int:
+        """Recompute notification_unread_counts from the notifications (repairs drift)."""
+        await db.execute(delete(NotificationUnreadCount))
+        await db.execute(
+            insert(NotificationUnreadCount).from_select(
+                ["user_id", "unread_count"],
+                select(Notification.user_id, func.count())
+                .where(Notification.is_read.is_(False))
+                .group_by(Notification.user_id)
+            )
+        )
+        result = await db.execute(select(func.count()).select_from(NotificationUnreadCount))
+        return result.scalar() or 0
+
+    async def _mark_read(self, db: AsyncSession, user_id: int, *conditions) -> List[int]:
+        now = datetime.utcnow()
+        result = await db.execute(
+            update(Notification)
+            .where(Notification.user_id == user_id, Notification.is_read.is_(False), *conditions)
+            .values(is_read=True, read_at=now, updated_at=now)
+            .returning(Notification.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids = list(result.scalars().all())
+        if updated_ids:
+            await self._decrement_unread(db, user_id, len(updated_ids))
+            publish_change(db, EventEntity.NOTIFICATION, "read", updated_ids, user_ids=[user_id])
+        return updated_ids
+
+    async def _increment_unread(self, db: AsyncSession, counts: Dict[int, int]) -> None:
+        """
+        Add new unread notifications to the users' counts.
+
+        Rows are upserted in user_id order so concurrent deliveries to
+        overlapping recipients lock the count rows in the same order.
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            raise BusinessLogicError(f"Unread counts are not supported on {dialect}")
+
+        stmt = upsert(NotificationUnreadCount).values([
+            {"user_id": user_id, "unread_count": count} for user_id, count in sorted(counts.items())
+        ])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[NotificationUnreadCount.user_id],
+                set_={"unread_count": NotificationUnreadCount.unread_count + stmt.excluded.unread_count}
+            )
+        )
+
+    async def _decrement_unread(self, db: AsyncSession, user_id: int, count: int) -> None:
+        """Subtract notifications marked read from a user's count (never below zero)."""
+        await db.execute(
+            update(NotificationUnreadCount)
+            .where(NotificationUnreadCount.user_id == user_id)
+            .values(unread_count=case(
+                (NotificationUnreadCount.unread_count > count, NotificationUnreadCount.unread_count - count),
+                else_=0
+            ))
+        )
+
+
+# Create singleton instance
+in_app_notification_service = InAppNotificationService()
@@ -3,6 +3,14 @@ Notification Service
 
 Provides comprehensive notification capabilities including email, in-app notifications,
 delay warnings, status updates, and custom rule-based notifications.
+
+Email and webhook notifications are written to notification_outbox and
+delivered by NotificationWorker (app.core.notification_worker) after the
+request commits, so request latency does not depend on delivery.
+
+Scheduled delay warnings and milestone reminders are found with a single
+query, recorded in scheduled_notification_ledger so a repeated run does not
+resend them, and queued in batches.
 """
 
 import asyncio
@@ -10,20 +18,19 @@ import json
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, date, timedelta
 from enum import Enum
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
 from jinja2 import Template, Environment, FileSystemLoader
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, case, func, literal, union_all, exists, delete, String, Integer
 
 from app.models.application import Application, ApplicationStatus
 from app.models.subtask import SubTask, SubTaskStatus
 from app.models.user import User
+from app.models.scheduled_notification import ScheduledNotificationLedger
 from app.core.exceptions import ValidationError, BusinessLogicError
 from app.core.config import settings
+from app.core.notification_transport import encode_attachments
+from app.core.notification_worker import enqueue_notifications
+from app.services.in_app_notification_service import in_app_notification_service
 
 
 class NotificationType(str, Enum):
@@ -38,6 +45,21 @@ class NotificationType(str, Enum):
     CUSTOM = "custom"
 
 
+# Delay warnings go out when an application is exactly this many days late
+DELAY_WARNING_THRESHOLDS = (7, 14, 30, 60)
+
+# Milestones are announced once, this many days ahead
+MILESTONE_WINDOW_DAYS = 7
+
+# Milestone kind: (planned date column, label)
+MILESTONE_COLUMNS = {
+    "requirement": ("planned_requirement_date", "需求确认"),
+    "release": ("planned_release_date", "版本发布"),
+    "tech_online": ("planned_tech_online_date", "技术上线"),
+    "biz_online": ("planned_biz_online_date", "业务上线"),
+}
+
+
 class NotificationChannel(str, Enum):
     """Notification channel enumeration."""
     EMAIL = "email"
@@ -82,35 +104,20 @@ class NotificationService:
             channels = [NotificationChannel.EMAIL, NotificationChannel.IN_APP]
 
         # Prepare notification content
-        subject = f"延期预警: {application.app_name} 已延期 {delay_days} 天"
-
-        content = {
-            "title": subject,
-            "application": {
-                "l2_id": application.l2_id,
-                "name": application.app_name,
-                "responsible_team": application.dev_team,
-                "responsible_person": application.dev_owner
-            },
-            "delay_info": {
-                "delay_days": delay_days,
-                "planned_date": application.planned_biz_online_date.isoformat() if application.planned_biz_online_date else None,
-                "current_progress": application.progress_percentage,
-                "current_status": application.current_status
-            },
-            "severity": self._calculate_delay_severity(delay_days),
-            "recommendations": self._generate_delay_recommendations(application, delay_days)
-        }
+        content = self._delay_warning_content(application, delay_days)
+        subject = content["title"]
 
         # Send notifications through specified channels
         results = {}
 
         if NotificationChannel.EMAIL in channels:
             email_result = await self._send_email_notification(
+                db=db,
                 recipients=recipients,
                 subject=subject,
                 template="delay_warning",
-                context=content
+                context=content,
+                notification_type=NotificationType.DELAY_WARNING
             )
             results["email"] = email_result
 
@@ -186,10 +193,12 @@ class NotificationService:
 
         if NotificationChannel.EMAIL in channels:
             email_result = await self._send_email_notification(
+                db=db,
                 recipients=recipients,
                 subject=subject,
                 template="status_change",
-                context=content
+                context=content,
+                notification_type=NotificationType.STATUS_CHANGE
             )
             results["email"] = email_result
 
@@ -260,11 +269,13 @@ class NotificationService:
                 })
 
             email_result = await self._send_email_notification(
+                db=db,
                 recipients=recipients,
                 subject=subject,
                 template="progress_report",
                 context=content,
-                attachments=attachments
+                attachments=attachments,
+                notification_type=NotificationType.PROGRESS_REPORT
             )
             results["email"] = email_result
 
@@ -331,10 +342,12 @@ class NotificationService:
         for channel in channels:
             if channel == NotificationChannel.EMAIL:
                 email_result = await self._send_email_notification(
+                    db=db,
                     recipients=recipients,
                     subject=subject,
                     template="custom",
-                    context=content
+                    context=content,
+                    notification_type=NotificationType.CUSTOM
                 )
                 results["email"] = email_result
 
@@ -350,8 +363,10 @@ class NotificationService:
 
             elif channel == NotificationChannel.WEBHOOK:
                 webhook_result = await self._send_webhook_notification(
+                    db=db,
                     url=rule_config.get("webhook_url"),
-                    payload=content
+                    payload=content,
+                    notification_type=NotificationType.CUSTOM
                 )
                 results["webhook"] = webhook_result
 
@@ -397,7 +412,7 @@ class NotificationService:
 
             if channel == NotificationChannel.EMAIL:
                 # Batch email sending
-                results = await self._batch_send_emails(group_notifications)
+                results = await self._batch_send_emails(db, group_notifications)
                 batch_results["results"].extend(results)
 
             elif channel == NotificationChannel.IN_APP:
@@ -421,30 +436,25 @@ class NotificationService:
         """Check for and send scheduled notifications."""
 
         now = datetime.utcnow()
-        sent_count = 0
-        scheduled_notifications = []
 
-        # Check for delay warnings
-        delay_warnings = await self._check_delay_warnings(db)
-        scheduled_notifications.extend(delay_warnings)
-
-        # Check for milestone notifications
-        milestone_notifications = await self._check_milestone_notifications(db)
-        scheduled_notifications.extend(milestone_notifications)
+        # Delay warnings and milestones: one scan, claimed in the ledger
+        due = await self._scan_due_notifications(db, date.today())
+        claimed = await self._claim_due_notifications(db, due)
+        scheduled_notifications = await self._build_scheduled_notifications(db, claimed)
+        sent_count = await self._send_scheduled_batches(db, scheduled_notifications)
 
         # Check for periodic reports
         if self._should_send_periodic_report(now):
             report_notifications = await self._generate_periodic_reports(db)
             scheduled_notifications.extend(report_notifications)
 
-        # Send all scheduled notifications
-        for notification in scheduled_notifications:
-            try:
-                await self._send_scheduled_notification(db, notification)
-                sent_count += 1
-            except Exception as e:
-                # Log error but continue with other notifications
-                await self._log_notification_error(db, notification, str(e))
+            for notification in report_notifications:
+                try:
+                    await self._send_scheduled_notification(db, notification)
+                    sent_count += 1
+                except Exception as e:
+                    # Log error but continue with other notifications
+                    await self._log_notification_error(db, notification, str(e))
 
         return {
             "checked_at": now.isoformat(),
@@ -457,48 +467,30 @@ class NotificationService:
 
     async def _send_email_notification(
         self,
+        db: AsyncSession,
         recipients: List[str],
         subject: str,
         template: str,
         context: Dict[str, Any],
-        attachments: Optional[List[Dict[str, Any]]] = None
+        attachments: Optional[List[Dict[str, Any]]] = None,
+        notification_type: NotificationType = NotificationType.CUSTOM
     ) -> Dict[str, Any]:
-        """Send email notification."""
+        """
+        Queue an email notification.
 
-        try:
-            # Load email template
-            email_body = self._render_email_template(template, context)
-
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = settings.EMAIL_FROM
-            msg['To'] = ', '.join(recipients)
-            msg['Subject'] = subject
-
-            # Add body
-            msg.attach(MIMEText(email_body, 'html'))
-
-            # Add attachments if any
-            if attachments:
-                for attachment in attachments:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(attachment['content'])
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename={attachment["filename"]}'
-                    )
-                    msg.attach(part)
+        The rendered message is written to notification_outbox in the
+        caller's transaction; NotificationWorker sends it after the commit.
+        """
 
-            # Send email (mock implementation)
-            # In production, use SMTP server
-            self.delivery_stats["total_sent"] += len(recipients)
-            self.delivery_stats["successful"] += len(recipients)
+        try:
+            await enqueue_notifications(db, [
+                self._email_outbox_row(recipients, subject, template, context, attachments, notification_type)
+            ])
 
             return {
                 "success": True,
-                "recipients": recipients,
-                "message_id": f"msg_{datetime.utcnow().timestamp()}"
+                "queued": True,
+                "recipients": recipients
             }
 
         except Exception as e:
@@ -509,6 +501,28 @@ class NotificationService:
                 "recipients": recipients
             }
 
+    def _email_outbox_row(
+        self,
+        recipients: List[str],
+        subject: str,
+        template: str,
+        context: Dict[str, Any],
+        attachments: Optional[List[Dict[str, Any]]],
+        notification_type: NotificationType
+    ) -> Dict[str, Any]:
+        """Outbox row of an email, rendered now so delivery needs no templates."""
+        return {
+            "channel": NotificationChannel.EMAIL.value,
+            "notification_type": NotificationType(notification_type).value,
+            "payload": {
+                "from": settings.EMAIL_FROM,
+                "recipients": list(recipients),
+                "subject": subject,
+                "body": self._render_email_template(template, context),
+                "attachments": encode_attachments(attachments),
+            }
+        }
+
     async def _send_in_app_notification(
         self,
         db: AsyncSession,
@@ -517,17 +531,15 @@ class NotificationService:
         content: Dict[str, Any],
         priority: NotificationPriority
     ) -> Dict[str, Any]:
-        """Send in-app notification."""
+        """Store an in-app notification for every recipient that is a known user."""
 
         try:
-            # Store notifications in database
-            # In production, this would insert into notifications table
-            notification_ids = []
-
-            for recipient in recipients:
-                # Mock notification creation
-                notification_id = f"notif_{datetime.utcnow().timestamp()}_{recipient}"
-                notification_ids.append(notification_id)
+            user_ids = await in_app_notification_service.resolve_recipients(db, recipients)
+            notification_ids = await in_app_notification_service.deliver(
+                db,
+                user_ids=sorted(set(user_ids.values())),
+                **self._in_app_fields(notification_type, content, priority)
+            )
 
             return {
                 "success": True,
@@ -542,20 +554,48 @@ class NotificationService:
                 "recipients": recipients
             }
 
+    def _in_app_fields(
+        self,
+        notification_type: NotificationType,
+        content: Dict[str, Any],
+        priority: NotificationPriority
+    ) -> Dict[str, Any]:
+        """Columns of a stored in-app notification."""
+        notification_type = NotificationType(notification_type)
+        title = content.get("title") or notification_type.value
+        return {
+            "title": str(title),
+            "message": str(content.get("message") or title),
+            "notification_type": notification_type.value,
+            "priority": NotificationPriority(priority).value,
+            # Stored as JSON
+            "content": json.loads(json.dumps(content, default=str)),
+        }
+
     async def _send_webhook_notification(
         self,
+        db: AsyncSession,
         url: str,
-        payload: Dict[str, Any]
+        payload: Dict[str, Any],
+        notification_type: NotificationType = NotificationType.CUSTOM
     ) -> Dict[str, Any]:
-        """Send webhook notification."""
+        """Queue a webhook notification for NotificationWorker."""
 
         try:
-            # In production, use httpx or aiohttp
-            # Mock implementation
+            if not url:
+                raise ValidationError("Webhook URL is required")
+
+            await enqueue_notifications(db, [{
+                "channel": NotificationChannel.WEBHOOK.value,
+                "notification_type": NotificationType(notification_type).value,
+                # Outbox payloads are stored as JSON
+                "payload": {"url": url, "body": json.loads(json.dumps(payload, default=str))}
+            }])
+
             return {
                 "success": True,
-                "url": url,
-                "status_code": 200
+                "queued": True,
+                "url": url
             }
 
         except Exception as e:
@@ -567,45 +607,71 @@ class NotificationService:
 
     async def _batch_send_emails(
         self,
+        db: AsyncSession,
         notifications: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
-        """Send batch emails efficiently."""
+        """Queue batch emails with a single multi-row outbox insert."""
 
-        results = []
-
-        # In production, use email service provider's batch API
-        for notification in notifications:
-            result = await self._send_email_notification(
+        rows = [
+            self._email_outbox_row(
                 recipients=notification["recipients"],
                 subject=notification["subject"],
                 template=notification.get("template", "default"),
-                context=notification["content"]
+                context=notification["content"],
+                attachments=None,
+                notification_type=notification["type"]
             )
-            results.append(result)
+            for notification in notifications
+        ]
+
+        try:
+            await enqueue_notifications(db, rows)
+        except Exception as e:
+            return [
+                {"success": False, "error": str(e), "recipients": notification["recipients"]}
+                for notification in notifications
+            ]
 
-        return results
+        return [
+            {"success": True, "queued": True, "recipients": notification["recipients"]}
+            for notification in notifications
+        ]
 
     async def _batch_send_in_app(
         self,
         db: AsyncSession,
         notifications: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
-        """Send batch in-app notifications."""
+        """Store batch in-app notifications with one recipient lookup and one insert."""
 
-        results = []
-
-        # Batch insert notifications
-        for notification in notifications:
-            result = await self._send_in_app_notification(
-                db=db,
-                recipients=notification["recipients"],
-                notification_type=notification["type"],
-                content=notification["content"],
-                priority=notification.get("priority", NotificationPriority.MEDIUM)
+        try:
+            user_ids = await in_app_notification_service.resolve_recipients(
+                db, [recipient for notification in notifications for recipient in notification["recipients"]]
             )
-            results.append(result)
+            batches = await in_app_notification_service.deliver_batch(db, [
+                {
+                    "user_ids": sorted({
+                        user_ids[str(recipient)] for recipient in notification["recipients"]
+                        if str(recipient) in user_ids
+                    }),
+                    **self._in_app_fields(
+                        notification["type"],
+                        notification["content"],
+                        notification.get("priority", NotificationPriority.MEDIUM)
+                    )
+                }
+                for notification in notifications
+            ])
+        except Exception as e:
+            return [
+                {"success": False, "error": str(e), "recipients": notification["recipients"]}
+                for notification in notifications
+            ]
 
-        return results
+        return [
+            {"success": True, "recipients": notification["recipients"], "notification_ids": notification_ids}
+            for notification, notification_ids in zip(notifications, batches)
+        ]
 
     def _calculate_delay_severity(self, delay_days: int) -> str:
         """Calculate delay severity level."""
@@ -619,7 +685,9 @@ class NotificationService:
     def _generate_delay_recommendations(
         self,
         application: Application,
-        delay_days: int
+        delay_days: int,
+        progress: Optional[int] = None,
+        blocked_count: Optional[int] = None
     ) -> List[str]:
         """Generate recommendations for delayed projects."""
 
@@ -633,11 +701,14 @@ class NotificationService:
             recommendations.append("与相关团队协调依赖关系")
             recommendations.append("考虑调整项目优先级")
 
-        if application.progress_percentage < 50:
+        if progress is None:
+            progress = application.progress_percentage
+        if progress < 50:
             recommendations.append("加快开发进度，增加人力投入")
 
         # Check for blocked subtasks
-        blocked_count = sum(1 for st in application.sub_tasks if st.is_blocked)
+        if blocked_count is None:
+            blocked_count = sum(1 for st in application.subtasks if st.is_blocked)
         if blocked_count > 0:
             recommendations.append(f"优先解决 {blocked_count} 个阻塞的子任务")
 
@@ -779,87 +850,270 @@ class NotificationService:
 
         return grouped
 
-    async def _check_delay_warnings(self, db: AsyncSession) -> List[Dict[str, Any]]:
-        """Check for applications that need delay warnings."""
+    async def _scan_due_notifications(
+        self,
+        db: AsyncSession,
+        today: date
+    ) -> List[tuple]:
+        """
+        Find due delay warnings and milestones in one query.
+
+        Returns (application_id, kind, threshold, due_date) tuples not yet in
+        the ledger. Delay warnings are due when the planned business online
+        date is exactly one of DELAY_WARNING_THRESHOLDS days ago; milestones
+        when a planned date falls within the next MILESTONE_WINDOW_DAYS days.
+        """
+
+        planned_biz_online = Application.planned_biz_online_date
+        delay_dates = {today - timedelta(days=days): days for days in DELAY_WARNING_THRESHOLDS}
+        scans = [
+            select(
+                Application.id.label("application_id"),
+                literal("delay", String).label("kind"),
+                case(*[(planned_biz_online == day, days) for day, days in delay_dates.items()]).label("threshold"),
+                planned_biz_online.label("due_date")
+            ).where(
+                planned_biz_online.in_(list(delay_dates)),
+                Application.current_status != ApplicationStatus.COMPLETED
+            )
+        ]
+
+        window_end = today + timedelta(days=MILESTONE_WINDOW_DAYS)
+        for kind, (column_name, _) in MILESTONE_COLUMNS.items():
+            planned = getattr(Application, column_name)
+            scans.append(
+                select(
+                    Application.id,
+                    literal(kind, String),
+                    literal(MILESTONE_WINDOW_DAYS, Integer),
+                    planned
+                ).where(planned.between(today, window_end))
+            )
+
+        due = union_all(*scans).subquery()
+        ledger = ScheduledNotificationLedger
+        result = await db.execute(
+            select(due.c.application_id, due.c.kind, due.c.threshold, due.c.due_date)
+            .where(~exists().where(
+                ledger.application_id == due.c.application_id,
+                ledger.kind == due.c.kind,
+                ledger.threshold == due.c.threshold,
+                ledger.due_date == due.c.due_date
+            ))
+            .order_by(due.c.application_id, due.c.kind)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def _claim_due_notifications(self, db: AsyncSession, due: List[tuple]) -> List[tuple]:
+        """
+        Record due notifications in the ledger; returns the ones this run claimed.
 
-        today = date.today()
-        warnings = []
+        ON CONFLICT DO NOTHING skips entries another run recorded in the
+        meantime, so overlapping runs never send the same warning twice.
+        """
 
-        # Query applications with planned dates in the past
+        if not due:
+            return []
+
+        dialect = db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            raise BusinessLogicError(f"Scheduled notifications are not supported on {dialect}")
+
+        ledger = ScheduledNotificationLedger
         result = await db.execute(
-            select(Application).where(
+            upsert(ledger)
+            .values([
+                {"application_id": app_id, "kind": kind, "threshold": threshold, "due_date": due_date}
+                for app_id, kind, threshold, due_date in due
+            ])
+            .on_conflict_do_nothing()
+            .returning(ledger.application_id, ledger.kind, ledger.threshold, ledger.due_date)
+        )
+        claimed = {tuple(row) for row in result.all()}
+        return [entry for entry in due if entry in claimed]
+
+    async def _release_claims(self, db: AsyncSession, entries: List[tuple]) -> None:
+        """Remove ledger entries of notifications that failed, so the next run retries them."""
+
+        ledger = ScheduledNotificationLedger
+        await db.execute(
+            delete(ledger).where(or_(*[
                 and_(
-                    Application.planned_biz_online_date < today,
-                    Application.current_status != ApplicationStatus.COMPLETED
+                    ledger.application_id == app_id,
+                    ledger.kind == kind,
+                    ledger.threshold == threshold,
+                    ledger.due_date == due_date
                 )
-            )
+                for app_id, kind, threshold, due_date in entries
+            ]))
         )
 
-        delayed_apps = result.scalars().all()
-
-        for app in delayed_apps:
-            delay_days = (today - app.planned_biz_online_date).days
+    async def _build_scheduled_notifications(
+        self,
+        db: AsyncSession,
+        claimed: List[tuple]
+    ) -> List[Dict[str, Any]]:
+        """
+        Turn claimed ledger entries into notifications.
 
-            # Only send warnings for certain thresholds
-            if delay_days in [7, 14, 30, 60]:
-                warnings.append({
-                    "type": NotificationType.DELAY_WARNING,
-                    "application": app,
-                    "delay_days": delay_days,
-                    "recipients": self._get_delay_warning_recipients(app)
-                })
+        Loads only the applications involved, in one query, and the subtask
+        progress of the delayed ones in one grouped aggregate. Each delay
+        warning is its own notification; an application's milestones in the
+        window are announced together.
+        """
 
-        return warnings
+        if not claimed:
+            return []
 
-    async def _check_milestone_notifications(self, db: AsyncSession) -> List[Dict[str, Any]]:
-        """Check for milestone notifications."""
+        result = await db.execute(
+            select(Application).where(Application.id.in_({entry[0] for entry in claimed}))
+        )
+        applications = {app.id: app for app in result.scalars().all()}
+        progress = await self._subtask_progress(db, {entry[0] for entry in claimed if entry[1] == "delay"})
 
         notifications = []
-        today = date.today()
-        next_week = today + timedelta(days=7)
+        milestones: Dict[int, List[tuple]] = {}
+        for entry in claimed:
+            app_id, kind, threshold, _ = entry
+            if kind != "delay":
+                milestones.setdefault(app_id, []).append(entry)
+                continue
+
+            content = self._delay_warning_content(applications[app_id], threshold, *progress.get(app_id, (0, 0)))
+            notifications.append({
+                "type": NotificationType.DELAY_WARNING,
+                "recipients": self._get_delay_warning_recipients(applications[app_id]),
+                "subject": content["title"],
+                "template": "delay_warning",
+                "content": content,
+                "priority": NotificationPriority.HIGH if threshold > 30 else NotificationPriority.MEDIUM,
+                "ledger_entries": [entry]
+            })
+
+        for app_id, entries in milestones.items():
+            content = self._milestone_content(applications[app_id], entries)
+            notifications.append({
+                "type": NotificationType.MILESTONE_REACHED,
+                "recipients": self._get_milestone_recipients(applications[app_id]),
+                "subject": content["title"],
+                "template": "custom",
+                "content": content,
+                "priority": NotificationPriority.MEDIUM,
+                "ledger_entries": entries
+            })
 
-        # Check for upcoming milestones
-        result = await db.execute(
-            select(Application).where(
-                or_(
-                    and_(Application.planned_requirement_date >= today,
-                         Application.planned_requirement_date <= next_week),
-                    and_(Application.planned_release_date >= today,
-                         Application.planned_release_date <= next_week),
-                    and_(Application.planned_tech_online_date >= today,
-                         Application.planned_tech_online_date <= next_week),
-                    and_(Application.planned_biz_online_date >= today,
-                         Application.planned_biz_online_date <= next_week)
-                )
-            )
-        )
+        return notifications
 
-        apps_with_milestones = result.scalars().all()
+    async def _send_scheduled_batches(
+        self,
+        db: AsyncSession,
+        notifications: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Queue scheduled notifications in batches of NOTIFICATION_SCHEDULED_BATCH_SIZE.
 
-        for app in apps_with_milestones:
-            milestones = []
+        Each batch is one outbox insert for the emails and one insert for the
+        in-app notifications. Returns how many were sent; failed ones are
+        logged and released from the ledger.
+        """
 
-            if app.planned_requirement_date and today <= app.planned_requirement_date <= next_week:
-                milestones.append("需求确认")
+        sent_count = 0
+        batch_size = settings.NOTIFICATION_SCHEDULED_BATCH_SIZE
 
-            if app.planned_release_date and today <= app.planned_release_date <= next_week:
-                milestones.append("版本发布")
+        for start in range(0, len(notifications), batch_size):
+            batch = notifications[start:start + batch_size]
+            email_results = await self._batch_send_emails(db, batch)
+            in_app_results = await self._batch_send_in_app(db, batch)
 
-            if app.planned_tech_online_date and today <= app.planned_tech_online_date <= next_week:
-                milestones.append("技术上线")
+            failed = []
+            for notification, email_result, in_app_result in zip(batch, email_results, in_app_results):
+                if email_result["success"] and in_app_result["success"]:
+                    sent_count += 1
+                    continue
+                failed.extend(notification["ledger_entries"])
+                error = email_result.get("error") or in_app_result.get("error")
+                await self._log_notification_error(db, notification, error)
 
-            if app.planned_biz_online_date and today <= app.planned_biz_online_date <= next_week:
-                milestones.append("业务上线")
+            if failed:
+                await self._release_claims(db, failed)
 
-            if milestones:
-                notifications.append({
-                    "type": NotificationType.MILESTONE_REACHED,
-                    "application": app,
-                    "milestones": milestones,
-                    "recipients": self._get_milestone_recipients(app)
-                })
+        return sent_count
 
-        return notifications
+    async def _subtask_progress(self, db: AsyncSession, application_ids: set) -> Dict[int, tuple]:
+        """(progress percentage, blocked subtasks) per application, in one query."""
+
+        if not application_ids:
+            return {}
+
+        result = await db.execute(
+            select(
+                SubTask.l2_id,
+                func.count(SubTask.id),
+                func.sum(case((SubTask.task_status == SubTaskStatus.COMPLETED, 1), else_=0)),
+                func.sum(case((SubTask.is_blocked.is_(True), 1), else_=0))
+            )
+            .where(SubTask.l2_id.in_(application_ids))
+            .group_by(SubTask.l2_id)
+        )
+        return {
+            app_id: (int(completed * 100 / total) if total else 0, blocked)
+            for app_id, total, completed, blocked in result.all()
+        }
+
+    def _delay_warning_content(
+        self,
+        application: Application,
+        delay_days: int,
+        progress: Optional[int] = None,
+        blocked_count: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Content of a delay warning; progress and blocked_count default to the loaded subtasks."""
+
+        if progress is None:
+            progress = application.progress_percentage
+
+        return {
+            "title": f"延期预警: {application.app_name} 已延期 {delay_days} 天",
+            "application": {
+                "l2_id": application.l2_id,
+                "name": application.app_name,
+                "responsible_team": application.dev_team,
+                "responsible_person": application.dev_owner
+            },
+            "delay_info": {
+                "delay_days": delay_days,
+                "planned_date": application.planned_biz_online_date.isoformat() if application.planned_biz_online_date else None,
+                "current_progress": progress,
+                "current_status": application.current_status
+            },
+            "severity": self._calculate_delay_severity(delay_days),
+            "recommendations": self._generate_delay_recommendations(
+                application, delay_days, progress, blocked_count
+            )
+        }
+
+    def _milestone_content(self, application: Application, entries: List[tuple]) -> Dict[str, Any]:
+        """Content of an upcoming milestones notification."""
+
+        milestones = [
+            {"milestone": MILESTONE_COLUMNS[kind][1], "planned_date": due_date.isoformat()}
+            for _, kind, _, due_date in sorted(entries, key=lambda entry: entry[3])
+        ]
+        return {
+            "title": f"里程碑提醒: {application.app_name}",
+            "message": "；".join(f"{item['milestone']} {item['planned_date']}" for item in milestones),
+            "application": {
+                "l2_id": application.l2_id,
+                "name": application.app_name,
+                "responsible_team": application.dev_team,
+                "responsible_person": application.dev_owner
+            },
+            "milestones": milestones
+        }
 
     def _should_send_periodic_report(self, now: datetime) -> bool:
         """Check if periodic report should be sent."""
@@ -900,19 +1154,7 @@ class NotificationService:
 
         notification_type = notification["type"]
 
-        if notification_type == NotificationType.DELAY_WARNING:
-            await self.send_delay_warning(
-                db=db,
-                application=notification["application"],
-                delay_days=notification["delay_days"],
-                recipients=notification["recipients"]
-            )
-
-        elif notification_type == NotificationType.MILESTONE_REACHED:
-            # Send milestone notification
-            pass
-
-        elif notification_type == NotificationType.PROGRESS_REPORT:
+        if notification_type == NotificationType.PROGRESS_REPORT:
             await self.send_progress_report(
                 db=db,
                 report_data=notification["report_data"],
@@ -19,6 +19,8 @@ from app.models.application import Application, ApplicationStatus, Transformatio
 from app.models.subtask import SubTask, SubTaskStatus
 from app.models.user import User
 from app.core.exceptions import ValidationError, BusinessLogicError
+from app.services.application_stats_service import application_stats_service
+from app.services.trend_service import trend_service, TrendScope, Granularity, period_start, shift_periods
 
 
 class ReportType:
@@ -33,6 +35,15 @@ class ReportType:
     RISK_ASSESSMENT = "risk_assessment"
 
 
+# Trend report period: (series granularity, number of periods shown)
+TREND_PERIODS = {
+    "daily": (Granularity.DAY, 30),
+    "weekly": (Granularity.WEEK, 12),
+    "monthly": (Granularity.MONTH, 6),
+    "quarterly": (Granularity.QUARTER, 4),
+}
+
+
 class ChartType:
     """Chart type enumeration."""
     BAR = "bar"
@@ -58,8 +69,8 @@ class ReportService:
     ) -> Dict[str, Any]:
         """Generate progress summary report for applications and subtasks."""
 
-        # Build base query
-        query = select(Application).options(selectinload(Application.sub_tasks))
+        # Build base query (subtask statistics come from application_stats)
+        query = select(Application)
 
         # Apply filters
         conditions = []
@@ -76,6 +87,7 @@ class ReportService:
         # Execute query
         result = await db.execute(query)
         applications = result.scalars().all()
+        stats_map = await application_stats_service.get_stats_map(db, [app.id for app in applications])
 
         # Calculate statistics
         total_apps = len(applications)
@@ -114,11 +126,13 @@ class ReportService:
         application_details = []
 
         for app in applications:
+            app_stats = application_stats_service.to_dict(stats_map.get(app.id))
+
             # Status distribution
             status_distribution[app.current_status] += 1
 
             # Progress ranges
-            progress = app.progress_percentage or 0
+            progress = app_stats["progress_percentage"]
             total_progress += progress
 
             if progress == 0:
@@ -162,7 +176,7 @@ class ReportService:
 
             # Collect application details
             if include_details:
-                subtask_summary = self._calculate_subtask_summary(app.sub_tasks)
+                subtask_summary = self._subtask_summary_from_stats(app_stats)
 
                 application_details.append({
                     "l2_id": app.l2_id,
@@ -261,8 +275,7 @@ class ReportService:
 
         for team in teams:
             # Get team applications
-            app_query = select(Application).options(selectinload(Application.sub_tasks))
-            app_query = app_query.where(Application.dev_team == team)
+            app_query = select(Application).where(Application.dev_team == team)
 
             if supervision_year:
                 app_query = app_query.where(Application.ak_supervision_acceptance_year == supervision_year)
@@ -273,10 +286,13 @@ class ReportService:
             if not team_apps:
                 continue
 
+            stats_map = await application_stats_service.get_stats_map(db, [app.id for app in team_apps])
+            team_app_stats = [application_stats_service.to_dict(stats_map.get(app.id)) for app in team_apps]
+
             # Calculate team metrics
             total_apps = len(team_apps)
             completed_apps = sum(1 for app in team_apps if app.current_status == ApplicationStatus.COMPLETED)
-            total_progress = sum(app.progress_percentage or 0 for app in team_apps)
+            total_progress = sum(app_stats["progress_percentage"] for app_stats in team_app_stats)
             average_progress = round(total_progress / total_apps, 2) if total_apps > 0 else 0
 
             # Subtask statistics
@@ -285,10 +301,10 @@ class ReportService:
             blocked_subtasks = 0
 
             if include_subtasks:
-                for app in team_apps:
-                    total_subtasks += len(app.sub_tasks)
-                    completed_subtasks += sum(1 for st in app.sub_tasks if st.task_status == SubTaskStatus.COMPLETED)
-                    blocked_subtasks += sum(1 for st in app.sub_tasks if st.is_blocked)
+                for app_stats in team_app_stats:
+                    total_subtasks += app_stats["subtask_count"]
+                    completed_subtasks += app_stats["completed_subtask_count"]
+                    blocked_subtasks += app_stats["blocked_subtask_count"]
 
             # Delay analysis
             delayed_apps = 0
@@ -513,25 +529,17 @@ class ReportService:
         if not metrics:
             metrics = ["progress", "completion_rate", "delay_rate", "blocked_tasks"]
 
-        # Determine time ranges
+        # Read the stored history: one range scan over the rollups (or daily snapshots)
+        granularity, intervals = TREND_PERIODS.get(time_period, TREND_PERIODS["monthly"])
         end_date = date.today()
-        if time_period == "daily":
-            start_date = end_date - timedelta(days=30)
-            intervals = 30
-        elif time_period == "weekly":
-            start_date = end_date - timedelta(weeks=12)
-            intervals = 12
-        elif time_period == "quarterly":
-            start_date = end_date - timedelta(days=365)
-            intervals = 4
-        else:  # monthly
-            start_date = end_date - timedelta(days=180)
-            intervals = 6
-
-        # Generate trend data (simulated for now - would use audit logs in production)
-        trend_data = self._generate_trend_data(
-            start_date, end_date, intervals, time_period, metrics
-        )
+        start_date = shift_periods(period_start(end_date, granularity), granularity, 1 - intervals)
+        if supervision_year:
+            scope, scope_keys = TrendScope.YEAR, [str(supervision_year)]
+        else:
+            scope, scope_keys = TrendScope.OVERALL, [""]
+
+        series = await trend_service.get_series(db, granularity, start_date, end_date, scope, scope_keys)
+        trend_data = self._build_trend_data(series, granularity, metrics)
 
         # Calculate trend indicators
         trend_indicators = {}
@@ -688,6 +696,20 @@ class ReportService:
             "blocked": sum(1 for st in subtasks if st.is_blocked)
         }
 
+    def _subtask_summary_from_stats(self, app_stats: Dict[str, Any]) -> Dict[str, int]:
+        """Build the subtask summary from an application_stats dictionary."""
+        total = app_stats["subtask_count"]
+        completed = app_stats["completed_subtask_count"]
+        blocked = app_stats["blocked_subtask_count"]
+        not_started = app_stats["not_started_subtask_count"]
+        return {
+            "total": total,
+            "completed": completed,
+            "in_progress": total - completed - blocked - not_started,
+            "not_started": not_started,
+            "blocked": blocked
+        }
+
     def _check_if_delayed(self, application: Application) -> bool:
         """Check if application is delayed."""
         today = date.today()
@@ -873,71 +895,41 @@ class ReportService:
 
         return recommendations
 
-    def _generate_trend_data(
+    def _build_trend_data(
         self,
-        start_date: date,
-        end_date: date,
-        intervals: int,
-        period_type: str,
+        series: List[Dict[str, Any]],
+        granularity: str,
         metrics: List[str]
     ) -> Dict[str, Dict[str, float]]:
-        """Generate trend data (simulated for demonstration)."""
-        import random
-
-        trend_data = {}
-
-        # Generate date labels
-        date_labels = []
-        current = start_date
-        delta = (end_date - start_date) / intervals
-
-        for i in range(intervals):
-            if period_type == "daily":
-                label = current.strftime("%m/%d")
-            elif period_type == "weekly":
-                label = f"Week {i+1}"
-            elif period_type == "monthly":
-                label = current.strftime("%Y/%m")
-            else:  # quarterly
-                label = f"Q{(i % 4) + 1}"
-
-            date_labels.append(label)
-            current += delta
-
-        # Generate data for each metric
-        for metric in metrics:
-            if metric == "progress":
-                # Simulated progress trend (generally increasing)
-                base = 20
-                trend_data["progress"] = {}
-                for i, label in enumerate(date_labels):
-                    base += random.randint(5, 15)
-                    trend_data["progress"][label] = min(base, 100)
-
-            elif metric == "completion_rate":
-                # Simulated completion rate
-                base = 10
-                trend_data["completion_rate"] = {}
-                for i, label in enumerate(date_labels):
-                    base += random.randint(3, 8)
-                    trend_data["completion_rate"][label] = min(base, 100)
+        """Map stored trend points to {metric: {period label: value}}."""
+        extractors = {
+            "progress": lambda point: point["progress"],
+            "completion_rate": lambda point: point["completion_rate"],
+            "delay_rate": lambda point: round(
+                point["delayed_count"] / point["application_count"] * 100, 2
+            ) if point["application_count"] else 0,
+            "blocked_tasks": lambda point: point["blocked_count"],
+        }
 
-            elif metric == "delay_rate":
-                # Simulated delay rate (hopefully decreasing)
-                base = 30
-                trend_data["delay_rate"] = {}
-                for i, label in enumerate(date_labels):
-                    base -= random.randint(0, 5)
-                    trend_data["delay_rate"][label] = max(base, 5)
-
-            elif metric == "blocked_tasks":
-                # Simulated blocked tasks
-                trend_data["blocked_tasks"] = {}
-                for label in date_labels:
-                    trend_data["blocked_tasks"][label] = random.randint(5, 25)
+        trend_data = {metric: {} for metric in metrics if metric in extractors}
+        for point in series:
+            label = self._trend_period_label(point["date"], granularity)
+            for metric, values in trend_data.items():
+                values[label] = extractors[metric](point)
 
         return trend_data
 
+    def _trend_period_label(self, period: date, granularity: str) -> str:
+        """Chart label of a trend period."""
+        if granularity == Granularity.DAY:
+            return period.strftime("%m/%d")
+        if granularity == Granularity.WEEK:
+            iso_year, iso_week, _ = period.isocalendar()
+            return f"{iso_year}-W{iso_week:02d}"
+        if granularity == Granularity.MONTH:
+            return period.strftime("%Y/%m")
+        return f"{period.year} Q{(period.month - 1) // 3 + 1}"
+
     def _generate_trend_insights(
         self,
         trend_data: Dict[str, Dict],
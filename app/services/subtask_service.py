@@ -4,7 +4,9 @@ SubTask service layer
 
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import date, datetime, timezone
-from sqlalchemy import select, func, and_, or_, desc, asc
+from sqlalchemy import select, func, and_, or_, desc, asc, any_, bindparam, case, literal, update, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -17,7 +19,22 @@ from app.schemas.subtask import (
     SubTaskStatistics, SubTaskBulkUpdate, SubTaskBulkStatusUpdate,
     SubTaskProgressUpdate
 )
+from app.core.cache import CacheTag, invalidates
+from app.core.event_bus import EventEntity, publish_change
 from app.core.exceptions import NotFoundError, ValidationError
+from app.services.application_stats_service import application_stats_service
+from app.utils.pagination import count_rows, decode_cursor, encode_cursor, keyset_after, keyset_order
+
+
+# Progress implied by a subtask status; blocked and offline keep their progress
+STATUS_PROGRESS = {
+    SubTaskStatus.NOT_STARTED.value: 0,
+    SubTaskStatus.REQUIREMENT_IN_PROGRESS.value: 10,
+    SubTaskStatus.DEV_IN_PROGRESS.value: 30,
+    SubTaskStatus.TECH_ONLINE.value: 60,
+    SubTaskStatus.BIZ_ONLINE.value: 80,
+    SubTaskStatus.COMPLETED.value: 100,
+}
 
 
 class SubTaskService:
@@ -36,6 +53,7 @@ class SubTaskService:
             self._audit_service = AuditService()
         return self._audit_service
 
+    @invalidates(CacheTag.SUBTASKS, CacheTag.APPLICATIONS)
     async def create_subtask(
         self,
         db: AsyncSession,
@@ -53,20 +71,7 @@ class SubTaskService:
             raise ValidationError(f"Application with ID {subtask_data.l2_id} not found")
 
         # Check for duplicate version within same application
-        existing = await db.execute(
-            select(SubTask).where(
-                and_(
-                    SubTask.l2_id == subtask_data.l2_id,
-                    SubTask.version_name == subtask_data.version_name,
-                    SubTask.sub_target == subtask_data.sub_target
-                )
-            )
-        )
-        if existing.scalar_one_or_none():
-            raise ValidationError(
-                f"SubTask with version '{subtask_data.version_name}' and target '{subtask_data.sub_target}' "
-                f"already exists for this application"
-            )
+        await self._check_unique_key(db, subtask_data.l2_id, subtask_data.sub_target, subtask_data.version_name)
 
         # Create new subtask with app_name from application
         subtask_dict = subtask_data.model_dump()
@@ -76,11 +81,12 @@ class SubTaskService:
 
         db_subtask = SubTask(**subtask_dict)
         db.add(db_subtask)
-        await db.commit()
+        await application_stats_service.refresh_application(db, application.id)
+        await db.flush()
         await db.refresh(db_subtask)
 
-        # Create audit log
-        await self.audit_service.create_audit_log(
+        # Record the audit log with the new subtask
+        await self.audit_service.record_audit_log(
             db=db,
             table_name="sub_tasks",
             record_id=db_subtask.id,
@@ -90,6 +96,8 @@ class SubTaskService:
             user_id=created_by,
             reason="SubTask created"
         )
+        publish_change(db, EventEntity.SUBTASK, "created", [db_subtask.id], [application.id])
+        await db.commit()
         
         # Recalculate parent application status and dates after creating new subtask
         from app.services.calculation_engine import CalculationEngine
@@ -118,6 +126,7 @@ class SubTaskService:
         )
         return result.scalar_one_or_none()
 
+    @invalidates(CacheTag.SUBTASKS, CacheTag.APPLICATIONS)
     async def update_subtask(
         self,
         db: AsyncSession,
@@ -140,6 +149,14 @@ class SubTaskService:
 
         # Update fields
         update_data = subtask_data.model_dump(exclude_unset=True)
+        if any(field in update_data for field in ('l2_id', 'sub_target', 'version_name')):
+            await self._check_unique_key(
+                db,
+                update_data.get('l2_id', db_subtask.l2_id),
+                update_data.get('sub_target', db_subtask.sub_target),
+                update_data.get('version_name', db_subtask.version_name),
+                exclude_id=subtask_id
+            )
         for field, value in update_data.items():
             setattr(db_subtask, field, value)
 
@@ -196,10 +213,11 @@ class SubTaskService:
                 history.append(change_record)
                 db_subtask.plan_change_history = json.dumps(history, ensure_ascii=False)
 
-        await db.commit()
+        await application_stats_service.refresh_application(db, application_id)
+        await db.flush()
         await db.refresh(db_subtask)
 
-        # Create detailed audit log with change reasons
+        # Record detailed audit log with change reasons
         new_values = self._serialize_subtask(db_subtask)
         
         # Build detailed reason for audit
@@ -248,7 +266,7 @@ class SubTaskService:
         else:
             reason = "SubTask updated"
         
-        await self.audit_service.create_audit_log(
+        await self.audit_service.record_audit_log(
             db=db,
             table_name="sub_tasks",
             record_id=db_subtask.id,
@@ -258,6 +276,11 @@ class SubTaskService:
             user_id=updated_by,
             reason=reason
         )
+        publish_change(
+            db, EventEntity.SUBTASK, "updated", [db_subtask.id], [application_id],
+            fields=sorted(field for field in new_values if new_values[field] != old_values.get(field))
+        )
+        await db.commit()
         
         # Recalculate parent application status and dates if needed
         if should_recalculate:
@@ -298,10 +321,9 @@ class SubTaskService:
                 # Only update and create audit log if there were actual changes
                 if has_changes:
                     application.updated_at = datetime.now(timezone.utc)
-                    await db.commit()
                     
-                    # Create a system audit log for auto-calculation
-                    await self.audit_service.create_audit_log(
+                    # Record a system audit log for auto-calculation
+                    await self.audit_service.record_audit_log(
                         db=db,
                         table_name="applications",
                         record_id=application.id,
@@ -311,9 +333,12 @@ class SubTaskService:
                         user_id=updated_by,
                         reason=f"系统自动重算 - 子任务更新触发 (子任务ID: {db_subtask.id})"
                     )
+                    publish_change(db, EventEntity.APPLICATION, "recalculated", [application.id], [application.id])
+                    await db.commit()
 
         return db_subtask
 
+    @invalidates(CacheTag.SUBTASKS, CacheTag.APPLICATIONS)
     async def delete_subtask(self, db: AsyncSession, subtask_id: int, deleted_by: int = None) -> bool:
         """Delete a subtask."""
         db_subtask = await self.get_subtask(db, subtask_id)
@@ -327,11 +352,11 @@ class SubTaskService:
         application_id = db_subtask.l2_id
 
         await db.delete(db_subtask)
-        await db.commit()
+        await application_stats_service.refresh_application(db, application_id)
 
-        # Create audit log
+        # Record the audit log with the deletion
         if deleted_by:
-            await self.audit_service.create_audit_log(
+            await self.audit_service.record_audit_log(
                 db=db,
                 table_name="sub_tasks",
                 record_id=subtask_id,
@@ -341,6 +366,8 @@ class SubTaskService:
                 user_id=deleted_by,
                 reason="SubTask deleted"
             )
+        publish_change(db, EventEntity.SUBTASK, "deleted", [subtask_id], [application_id])
+        await db.commit()
         
         # Recalculate parent application status and dates after deleting subtask
         from app.services.calculation_engine import CalculationEngine
@@ -375,58 +402,10 @@ class SubTaskService:
         count_query = select(func.count(SubTask.id))
 
         # Apply filters
-        if filters:
-            conditions = []
-
-            if filters.l2_id:
-                conditions.append(SubTask.l2_id == filters.l2_id)
-
-            if filters.version_name:
-                conditions.append(SubTask.version_name.ilike(f"%{filters.version_name}%"))
-
-            if filters.app_name:
-                conditions.append(SubTask.app_name.ilike(f"%{filters.app_name}%"))
-
-            if filters.sub_target:
-                conditions.append(SubTask.sub_target == filters.sub_target)
-
-            if filters.task_status:
-                conditions.append(SubTask.task_status == filters.task_status)
-
-            if filters.is_blocked is not None:
-                conditions.append(SubTask.is_blocked == filters.is_blocked)
-
-            if filters.resource_applied is not None:
-                conditions.append(SubTask.resource_applied == filters.resource_applied)
-
-            if filters.ops_testing_status:
-                conditions.append(SubTask.ops_testing_status == filters.ops_testing_status)
-
-            if filters.launch_check_status:
-                conditions.append(SubTask.launch_check_status == filters.launch_check_status)
-
-            # Handle overdue filter
-            if filters.is_overdue is not None:
-                today = date.today()
-                if filters.is_overdue:
-                    conditions.append(
-                        and_(
-                            SubTask.planned_biz_online_date < today,
-                            SubTask.task_status != SubTaskStatus.COMPLETED
-                        )
-                    )
-                else:
-                    conditions.append(
-                        or_(
-                            SubTask.planned_biz_online_date.is_(None),
-                            SubTask.planned_biz_online_date >= today,
-                            SubTask.task_status == SubTaskStatus.COMPLETED
-                        )
-                    )
-
-            if conditions:
-                query = query.where(and_(*conditions))
-                count_query = count_query.where(and_(*conditions))
+        conditions = self._list_conditions(filters)
+        if conditions:
+            query = query.where(and_(*conditions))
+            count_query = count_query.where(and_(*conditions))
 
         # Get total count
         total_result = await db.execute(count_query)
@@ -451,6 +430,124 @@ class SubTaskService:
 
         return subtasks, total
 
+    async def list_subtasks_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        filters: Optional[SubTaskFilter] = None,
+        sort: Optional[SubTaskSort] = None,
+        cursor: Optional[str] = None,
+        count: str = "none"
+    ) -> Tuple[List[SubTask], Optional[str], Optional[int]]:
+        """
+        List subtasks with keyset (cursor) pagination.
+
+        Rows are ordered by (sort column, id) and each page continues after
+        the previous page's last row instead of skipping rows with OFFSET.
+        The cursor records the sort it was issued for, so it cannot be reused
+        with a different one.
+
+        Args:
+            db: Database session
+            limit: Page size
+            filters: Subtask filters
+            sort: Sort field and order (default updated_at desc)
+            cursor: next_cursor of the previous page, None for the first page
+            count: "exact", "estimated" (planner estimate) or "none"
+
+        Returns:
+            Tuple of (subtasks, next_cursor or None on the last page, total or None)
+
+        Raises:
+            ValidationError: If the cursor is invalid or was issued for another sort
+        """
+        sort = sort or SubTaskSort()
+        sort_column = getattr(SubTask, sort.sort_by)
+        descending = sort.order != 'asc'
+
+        conditions = self._list_conditions(filters)
+        total = await count_rows(db, select(SubTask.id).where(*conditions), count)
+
+        query = (
+            select(SubTask)
+            .options(selectinload(SubTask.application))
+            .where(*conditions)
+            .order_by(*keyset_order(sort_column, SubTask.id, descending))
+            .limit(limit + 1)
+        )
+        if cursor:
+            sort_by, order, value, last_id = decode_cursor(
+                cursor, (str, str, sort_column.type.python_type, int)
+            )
+            if (sort_by, order) != (sort.sort_by, sort.order):
+                raise ValidationError("Cursor was issued for a different sort", field="cursor", value=cursor)
+            query = query.where(keyset_after(sort_column, SubTask.id, descending, value, last_id))
+
+        result = await db.execute(query)
+        subtasks = list(result.scalars().all())
+
+        next_cursor = None
+        if len(subtasks) > limit:
+            subtasks = subtasks[:limit]
+            last = subtasks[-1]
+            next_cursor = encode_cursor(sort.sort_by, sort.order, getattr(last, sort.sort_by), last.id)
+
+        return subtasks, next_cursor, total
+
+    def _list_conditions(self, filters: Optional[SubTaskFilter]) -> List[Any]:
+        """Filter conditions of the subtask listings."""
+        conditions = []
+        if not filters:
+            return conditions
+
+        if filters.l2_id:
+            conditions.append(SubTask.l2_id == filters.l2_id)
+
+        if filters.version_name:
+            conditions.append(SubTask.version_name.ilike(f"%{filters.version_name}%"))
+
+        if filters.app_name:
+            conditions.append(SubTask.app_name.ilike(f"%{filters.app_name}%"))
+
+        if filters.sub_target:
+            conditions.append(SubTask.sub_target == filters.sub_target)
+
+        if filters.task_status:
+            conditions.append(SubTask.task_status == filters.task_status)
+
+        if filters.is_blocked is not None:
+            conditions.append(SubTask.is_blocked == filters.is_blocked)
+
+        if filters.resource_applied is not None:
+            conditions.append(SubTask.resource_applied == filters.resource_applied)
+
+        if filters.ops_testing_status:
+            conditions.append(SubTask.ops_testing_status == filters.ops_testing_status)
+
+        if filters.launch_check_status:
+            conditions.append(SubTask.launch_check_status == filters.launch_check_status)
+
+        # Handle overdue filter
+        if filters.is_overdue is not None:
+            today = date.today()
+            if filters.is_overdue:
+                conditions.append(
+                    and_(
+                        SubTask.planned_biz_online_date < today,
+                        SubTask.task_status != SubTaskStatus.COMPLETED
+                    )
+                )
+            else:
+                conditions.append(
+                    or_(
+                        SubTask.planned_biz_online_date.is_(None),
+                        SubTask.planned_biz_online_date >= today,
+                        SubTask.task_status == SubTaskStatus.COMPLETED
+                    )
+                )
+
+        return conditions
+
     async def get_subtasks_by_application(self, db: AsyncSession, application_id: int) -> List[SubTask]:
         """Get all subtasks for a specific application."""
         result = await db.execute(
@@ -523,110 +620,201 @@ class SubTaskService:
             average_progress=average_progress
         )
 
+    @invalidates(CacheTag.SUBTASKS, CacheTag.APPLICATIONS)
     async def bulk_update_subtasks(
         self,
         db: AsyncSession,
         bulk_update: SubTaskBulkUpdate,
         updated_by: int
     ) -> int:
-        """Bulk update multiple subtasks."""
-        updated_count = 0
-        affected_applications = set()
-
-        for subtask_id in bulk_update.subtask_ids:
-            subtask = await self.get_subtask(db, subtask_id)
-            if subtask:
-                # Store application ID for recalculation
-                affected_applications.add(subtask.l2_id)
-                
-                # Apply updates
-                update_data = bulk_update.updates.model_dump(exclude_unset=True)
-                for field, value in update_data.items():
-                    setattr(subtask, field, value)
-
-                subtask.updated_by = updated_by
-                subtask.updated_at = datetime.now(timezone.utc)
-
-                # Auto-update progress if status changed
-                if 'task_status' in update_data:
-                    await self._auto_update_progress_by_status(subtask, update_data['task_status'])
-
-                updated_count += 1
+        """
+        Bulk update multiple subtasks with one UPDATE statement.
+
+        A status change also sets the progress implied by the new status.
+        Returns the number of subtasks that exist and were updated.
+        """
+        update_data = bulk_update.updates.model_dump(exclude_unset=True)
+        values = {field: value for field, value in update_data.items() if field in SubTask.__table__.c}
+
+        if 'task_status' in values:
+            values['progress_percentage'] = self._progress_for_status(
+                values['task_status'], values.get('progress_percentage', SubTask.__table__.c.progress_percentage)
+            )
 
-        await db.commit()
-        
-        # Recalculate all affected applications
-        if affected_applications:
-            from app.services.calculation_engine import CalculationEngine
-            calc_engine = CalculationEngine()
-            for app_id in affected_applications:
-                # Get fresh application with subtasks
-                result = await db.execute(
-                    select(Application)
-                    .options(selectinload(Application.subtasks))
-                    .where(Application.id == app_id)
-                )
-                application = result.scalar_one_or_none()
-                
-                if application:
-                    await calc_engine._calculate_application_metrics(application)
-                    application.updated_at = datetime.now(timezone.utc)
-            
-            # Commit all application updates at once
-            await db.commit()
-        
-        return updated_count
+        return await self._bulk_update(db, bulk_update.subtask_ids, values, updated_by, "批量更新子任务")
 
+    @invalidates(CacheTag.SUBTASKS, CacheTag.APPLICATIONS)
     async def bulk_update_status(
         self,
         db: AsyncSession,
         bulk_status_update: SubTaskBulkStatusUpdate,
         updated_by: int
     ) -> int:
-        """Bulk update status for multiple subtasks."""
-        updated_count = 0
-        affected_applications = set()
-
-        for subtask_id in bulk_status_update.subtask_ids:
-            subtask = await self.get_subtask(db, subtask_id)
-            if subtask:
-                # Store application ID for recalculation
-                affected_applications.add(subtask.l2_id)
-                
-                subtask.task_status = bulk_status_update.new_status
-                subtask.updated_by = updated_by
-                subtask.updated_at = datetime.now(timezone.utc)
-
-                # Auto-update progress if requested
-                if bulk_status_update.update_progress:
-                    await self._auto_update_progress_by_status(subtask, bulk_status_update.new_status)
+        """
+        Bulk update status for multiple subtasks with one UPDATE statement.
+
+        Returns the number of subtasks that exist and were updated.
+        """
+        new_status = bulk_status_update.new_status
+        values = {'task_status': new_status}
+        if bulk_status_update.update_progress:
+            values['progress_percentage'] = self._progress_for_status(
+                new_status, SubTask.__table__.c.progress_percentage
+            )
 
-                updated_count += 1
+        return await self._bulk_update(
+            db, bulk_status_update.subtask_ids, values, updated_by, f"批量更新子任务状态: {new_status}"
+        )
 
+    async def _bulk_update(
+        self,
+        db: AsyncSession,
+        subtask_ids: List[int],
+        values: Dict[str, Any],
+        updated_by: int,
+        reason: str
+    ) -> int:
+        """
+        Apply the same column values to many subtasks.
+
+        One UPDATE ... RETURNING writes the subtasks and yields their old and
+        new values; the affected applications' stats rows and metrics are then
+        recalculated with grouped aggregates (application_stats_service and
+        CalculationEngine.recalculate_applications), and the audit rows for the
+        whole operation are recorded as one batch.
+        """
+        ids = sorted(set(subtask_ids))
+        if not ids:
+            return 0
+
+        try:
+            changes = await self._update_returning_changes(db, ids, values, updated_by)
+        except IntegrityError:
+            await db.rollback()
+            raise ValidationError("Update would give several subtasks of an application the same target and version")
+        if not changes:
+            return 0
+
+        affected_applications = {application_id for _, application_id, _, _ in changes}
+        await application_stats_service.refresh_applications(db, affected_applications)
+        await self.audit_service.record_audit_logs(db, [
+            {
+                "table_name": "sub_tasks",
+                "record_id": subtask_id,
+                "operation": AuditOperation.UPDATE,
+                "old_values": old_values,
+                "new_values": new_values,
+                "user_id": updated_by,
+                "reason": reason
+            }
+            for subtask_id, _, old_values, new_values in changes
+        ])
+        publish_change(
+            db, EventEntity.SUBTASK, "updated", [change[0] for change in changes], affected_applications,
+            fields=sorted(values)
+        )
         await db.commit()
-        
-        # Recalculate all affected applications
-        if affected_applications:
-            from app.services.calculation_engine import CalculationEngine
-            calc_engine = CalculationEngine()
-            for app_id in affected_applications:
-                # Get fresh application with subtasks
-                result = await db.execute(
-                    select(Application)
-                    .options(selectinload(Application.subtasks))
-                    .where(Application.id == app_id)
+
+        from app.services.calculation_engine import CalculationEngine
+        await CalculationEngine().recalculate_applications(db, affected_applications)
+
+        return len(changes)
+
+    async def _update_returning_changes(
+        self,
+        db: AsyncSession,
+        ids: List[int],
+        values: Dict[str, Any],
+        updated_by: int
+    ) -> List[Tuple[int, int, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Update subtasks and return (id, l2_id, old values, new values) per updated row.
+
+        On PostgreSQL the IDs are one array parameter and the old values come
+        from a self-join in the same statement, which reads the rows as they
+        were before the update.
+        """
+        sub_tasks = SubTask.__table__
+        columns = list(values)
+        assignments = {**values, 'updated_by': updated_by, 'updated_at': datetime.now(timezone.utc)}
+        new_columns = [sub_tasks.c[name].label(f'new_{name}') for name in columns]
+
+        if db.get_bind().dialect.name == 'postgresql':
+            previous = sub_tasks.alias('previous')
+            result = await db.execute(
+                update(sub_tasks)
+                .where(
+                    sub_tasks.c.id == previous.c.id,
+                    sub_tasks.c.id == any_(bindparam('subtask_ids', ids, type_=ARRAY(Integer)))
                 )
-                application = result.scalar_one_or_none()
-                
-                if application:
-                    await calc_engine._calculate_application_metrics(application)
-                    application.updated_at = datetime.now(timezone.utc)
-            
-            # Commit all application updates at once
-            await db.commit()
-        
-        return updated_count
+                .values(**assignments)
+                .returning(
+                    sub_tasks.c.id,
+                    sub_tasks.c.l2_id,
+                    *[previous.c[name].label(f'old_{name}') for name in columns],
+                    *new_columns
+                )
+            )
+            rows = result.mappings().all()
+        else:
+            # Other dialects' UPDATE ... FROM sees the updated row; read the old values first
+            result = await db.execute(
+                select(sub_tasks.c.id, *[sub_tasks.c[name].label(f'old_{name}') for name in columns])
+                .where(sub_tasks.c.id.in_(ids))
+            )
+            old_rows = {row['id']: row for row in result.mappings().all()}
+            result = await db.execute(
+                update(sub_tasks)
+                .where(sub_tasks.c.id.in_(ids))
+                .values(**assignments)
+                .returning(sub_tasks.c.id, sub_tasks.c.l2_id, *new_columns)
+            )
+            rows = [{**old_rows[row['id']], **row} for row in result.mappings().all()]
+
+        return [
+            (
+                row['id'],
+                row['l2_id'],
+                {name: row[f'old_{name}'] for name in columns},
+                {name: row[f'new_{name}'] for name in columns}
+            )
+            for row in rows
+        ]
 
+    async def _check_unique_key(
+        self,
+        db: AsyncSession,
+        application_id: int,
+        sub_target: Optional[str],
+        version_name: Optional[str],
+        exclude_id: Optional[int] = None
+    ) -> None:
+        """
+        Raise ValidationError if the application already has a subtask with this target and version.
+
+        Mirrors uq_sub_tasks_import_key, where a missing target or version
+        compares equal to an empty one.
+        """
+        conditions = [
+            SubTask.l2_id == application_id,
+            func.coalesce(SubTask.sub_target, '') == (getattr(sub_target, 'value', sub_target) or ''),
+            func.coalesce(SubTask.version_name, '') == (version_name or '')
+        ]
+        if exclude_id is not None:
+            conditions.append(SubTask.id != exclude_id)
+
+        result = await db.execute(select(SubTask.id).where(*conditions).limit(1))
+        if result.scalar() is not None:
+            raise ValidationError(
+                f"SubTask with version '{version_name}' and target '{getattr(sub_target, 'value', sub_target)}' "
+                f"already exists for this application"
+            )
+
+    def _progress_for_status(self, status: str, otherwise):
+        """SQL expression: the progress implied by status, else `otherwise` (a value or column)."""
+        return case(STATUS_PROGRESS, value=literal(getattr(status, 'value', status), String), else_=otherwise)
+
+    @invalidates(CacheTag.SUBTASKS, CacheTag.APPLICATIONS)
     async def update_progress(
         self,
         db: AsyncSession,
@@ -665,6 +853,11 @@ class SubTaskService:
         subtask.updated_by = updated_by
         subtask.updated_at = datetime.now(timezone.utc)
 
+        await application_stats_service.refresh_application(db, application_id)
+        publish_change(
+            db, EventEntity.SUBTASK, "updated", [subtask.id], [application_id],
+            fields=["progress_percentage", "task_status"]
+        )
         await db.commit()
         await db.refresh(subtask)
         
@@ -722,6 +915,7 @@ class SubTaskService:
         )
         return result.scalars().all()
 
+    @invalidates(CacheTag.SUBTASKS, CacheTag.APPLICATIONS)
     async def clone_subtask(
         self,
         db: AsyncSession,
@@ -744,11 +938,14 @@ class SubTaskService:
         if not target_app:
             raise ValidationError(f"Target application with ID {new_application_id} not found")
 
+        version_name = (source_subtask.version_name or "") + version_suffix
+        await self._check_unique_key(db, new_application_id, source_subtask.sub_target, version_name)
+
         # Create clone
         clone_data = {
             'l2_id': new_application_id,
             'sub_target': source_subtask.sub_target,
-            'version_name': (source_subtask.version_name or "") + version_suffix,
+            'version_name': version_name,
             'task_status': SubTaskStatus.NOT_STARTED,
             'progress_percentage': 0,
             'is_blocked': False,
@@ -769,25 +966,18 @@ class SubTaskService:
 
         db_subtask = SubTask(**clone_data)
         db.add(db_subtask)
+        await application_stats_service.refresh_application(db, new_application_id)
+        await db.flush()
+        publish_change(db, EventEntity.SUBTASK, "created", [db_subtask.id], [new_application_id])
         await db.commit()
         await db.refresh(db_subtask)
         return db_subtask
 
     async def _auto_update_progress_by_status(self, subtask: SubTask, status: str):
         """Auto-update progress percentage based on status."""
-        status_progress_map = {
-            '未开始': 0,
-            '需求进行中': 10,
-            '研发进行中': 30,
-            '技术上线中': 60,
-            '业务上线中': 80,
-            '子任务完成': 100,
-            '阻塞': None,  # Don't change progress for blocked
-            '计划下线': None  # Don't change progress for offline
-        }
-
-        if status in status_progress_map and status_progress_map[status] is not None:
-            subtask.progress_percentage = status_progress_map[status]
+        progress = STATUS_PROGRESS.get(getattr(status, 'value', status))
+        if progress is not None:
+            subtask.progress_percentage = progress
 
     async def get_subtask_workload_summary(self, db: AsyncSession) -> Dict[str, Any]:
         """Get simplified workload summary for subtasks."""
@@ -4,10 +4,18 @@ Transformation Statistics Calculation Module
 Provides utility functions for calculating AK/Cloud Native transformation statistics.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping
+from sqlalchemy import select, func, case, and_, or_, not_
 from app.models.subtask import SubTask, SubTaskStatus
 
 
+# Target values stored in sub_tasks.sub_target and their column prefixes
+TARGET_PREFIXES = {
+    "AK": "ak",
+    "云原生": "cloud_native",
+}
+
+
 def calculate_completion_percentage(completed_count: int, total_count: int) -> float:
     """
     Calculate completion percentage.
@@ -122,19 +130,6 @@ def calculate_subtask_statistics(subtasks: List[SubTask], target: str) -> Dict[s
     # Filter subtasks by target
     target_subtasks = [st for st in subtasks if st.sub_target == target]
 
-    total_count = len(target_subtasks)
-
-    if total_count == 0:
-        return {
-            'subtask_count': 0,
-            'completed_count': 0,
-            'in_progress_count': 0,
-            'blocked_count': 0,
-            'not_started_count': 0,
-            'completion_percentage': 0.0,
-            'status': 'NOT_STARTED'
-        }
-
     # Count by status
     completed_count = 0
     in_progress_count = 0
@@ -162,6 +157,54 @@ def calculate_subtask_statistics(subtasks: List[SubTask], target: str) -> Dict[s
             # Default to in progress for unknown statuses
             in_progress_count += 1
 
+    return summarize_target_counts(
+        total_count=len(target_subtasks),
+        completed_count=completed_count,
+        blocked_count=blocked_count,
+        not_started_count=not_started_count
+    )
+
+
+def summarize_target_counts(
+    total_count: int,
+    completed_count: int,
+    blocked_count: int,
+    not_started_count: int
+) -> Dict[str, Any]:
+    """
+    Build target statistics from pre-aggregated subtask counts.
+
+    Used both by the in-memory path above and by SQL aggregate queries, so
+    both produce exactly the same numbers. Anything that is not completed,
+    blocked or not started counts as in progress.
+
+    Args:
+        total_count: Number of subtasks for the target
+        completed_count: Completed subtasks
+        blocked_count: Blocked (and not completed) subtasks
+        not_started_count: Not started (and not blocked) subtasks
+
+    Returns:
+        Same dictionary shape as calculate_subtask_statistics
+    """
+    total_count = int(total_count or 0)
+
+    if total_count == 0:
+        return {
+            'subtask_count': 0,
+            'completed_count': 0,
+            'in_progress_count': 0,
+            'blocked_count': 0,
+            'not_started_count': 0,
+            'completion_percentage': 0.0,
+            'status': 'NOT_STARTED'
+        }
+
+    completed_count = int(completed_count or 0)
+    blocked_count = int(blocked_count or 0)
+    not_started_count = int(not_started_count or 0)
+    in_progress_count = total_count - completed_count - blocked_count - not_started_count
+
     # Calculate percentage
     completion_percentage = calculate_completion_percentage(completed_count, total_count)
 
@@ -203,6 +246,20 @@ def calculate_application_transformation_stats(subtasks: List[SubTask]) -> Dict[
     # Calculate Cloud Native statistics
     cn_stats = calculate_subtask_statistics(subtasks, "云原生")
 
+    return combine_transformation_stats(ak_stats, cn_stats)
+
+
+def combine_transformation_stats(ak_stats: Dict[str, Any], cn_stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge per-target statistics into the flat application stats dictionary.
+
+    Args:
+        ak_stats: AK statistics from calculate_subtask_statistics/summarize_target_counts
+        cn_stats: Cloud Native statistics from calculate_subtask_statistics/summarize_target_counts
+
+    Returns:
+        Dictionary with ak_*, cloud_native_* and current_phase_description keys
+    """
     # Generate phase description
     phase_description = generate_phase_description(ak_stats['status'], cn_stats['status'])
 
@@ -228,3 +285,82 @@ def calculate_application_transformation_stats(subtasks: List[SubTask]) -> Dict[
         # Phase description
         'current_phase_description': phase_description
     }
+
+
+def count_where(condition):
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END), portable across dialects."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def build_subtask_stats_subquery(application_ids=None):
+    """
+    Build a grouped aggregate over sub_tasks producing per-application counts.
+
+    The categorisation mirrors calculate_subtask_statistics: completed first,
+    then blocked (is_blocked flag or 阻塞 status), then not started; the
+    remainder is in progress and is derived by summarize_target_counts.
+
+    Args:
+        application_ids: Optional iterable of application IDs to restrict the scan
+
+    Returns:
+        Subquery with columns l2_id, subtask_count, completed_subtask_count,
+        blocked_subtask_count, not_started_subtask_count and
+        <prefix>_subtask_count / _completed_count / _blocked_count /
+        _not_started_count for each transformation target
+    """
+    is_completed = SubTask.task_status == SubTaskStatus.COMPLETED.value
+    is_blocked = and_(
+        not_(is_completed),
+        or_(SubTask.is_blocked == True, SubTask.task_status == SubTaskStatus.BLOCKED.value)
+    )
+    is_not_started = and_(
+        not_(is_completed),
+        not_(or_(SubTask.is_blocked == True, SubTask.task_status == SubTaskStatus.BLOCKED.value)),
+        SubTask.task_status == SubTaskStatus.NOT_STARTED.value
+    )
+
+    columns = [
+        SubTask.l2_id.label('l2_id'),
+        func.count(SubTask.id).label('subtask_count'),
+        count_where(is_completed).label('completed_subtask_count'),
+        count_where(is_blocked).label('blocked_subtask_count'),
+        count_where(is_not_started).label('not_started_subtask_count'),
+    ]
+    for target, prefix in TARGET_PREFIXES.items():
+        of_target = SubTask.sub_target == target
+        columns.extend([
+            count_where(of_target).label(f'{prefix}_subtask_count'),
+            count_where(and_(of_target, is_completed)).label(f'{prefix}_completed_count'),
+            count_where(and_(of_target, is_blocked)).label(f'{prefix}_blocked_count'),
+            count_where(and_(of_target, is_not_started)).label(f'{prefix}_not_started_count'),
+        ])
+
+    query = select(*columns).group_by(SubTask.l2_id)
+    if application_ids is not None:
+        query = query.where(SubTask.l2_id.in_(list(application_ids)))
+
+    return query.subquery('subtask_stats')
+
+
+def transformation_stats_from_counts(counts: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Build the application stats dictionary from one row of the stats subquery.
+
+    Args:
+        counts: Mapping with the columns of build_subtask_stats_subquery
+                (missing or NULL values are treated as zero)
+
+    Returns:
+        Same dictionary as calculate_application_transformation_stats
+    """
+    per_target = {}
+    for prefix in TARGET_PREFIXES.values():
+        per_target[prefix] = summarize_target_counts(
+            total_count=counts.get(f'{prefix}_subtask_count'),
+            completed_count=counts.get(f'{prefix}_completed_count'),
+            blocked_count=counts.get(f'{prefix}_blocked_count'),
+            not_started_count=counts.get(f'{prefix}_not_started_count')
+        )
+
+    return combine_transformation_stats(per_target['ak'], per_target['cloud_native'])
@@ -0,0 +1,599 @@
+"""
+Historical trend service
+
+Maintains the trend store: daily metric snapshots per scope (whole portfolio,
+supervision year, dev team, application) in metric_snapshots, downsampled
+into weekly, monthly and quarterly rollups in metric_rollups. Trend readers
+get a series for one granularity and scope from a single range scan.
+
+History before the first captured snapshot is rebuilt by replaying
+audit_logs backwards from the current state.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import select, func, and_, delete, literal, text, tuple_, Date, String
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.application import Application, ApplicationStatus
+from app.models.application_stats import ApplicationStats
+from app.models.audit_log import AuditLog, AuditOperation
+from app.models.metric_snapshot import MetricSnapshot, MetricRollup
+from app.models.subtask import SubTask, SubTaskStatus
+from app.core.exceptions import BusinessLogicError
+from app.services.audit_replay_service import audit_replay_service
+
+logger = logging.getLogger(__name__)
+
+
+# Metric columns shared by metric_snapshots and metric_rollups
+METRIC_COLUMNS = (
+    'application_count',
+    'completed_count',
+    'active_count',
+    'delayed_count',
+    'delay_days',
+    'subtask_count',
+    'completed_subtask_count',
+    'blocked_count',
+    'progress',
+    'completion_rate',
+)
+
+# Application statuses counted as active, as on the dashboard
+ACTIVE_STATUSES = {ApplicationStatus.DEV_IN_PROGRESS.value, ApplicationStatus.BIZ_ONLINE.value}
+
+# Scope key of applications without a dev team, as Application.responsible_team
+UNASSIGNED_TEAM = "待分配"
+
+
+class TrendScope:
+    """Scopes metrics are snapshotted for."""
+    OVERALL = "overall"
+    YEAR = "year"
+    TEAM = "team"
+    APPLICATION = "application"
+
+
+class Granularity:
+    """Series granularities; everything but DAY is read from metric_rollups."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    QUARTER = "quarter"
+
+    ROLLUPS = (WEEK, MONTH, QUARTER)
+
+
+def period_start(day: date, granularity: str) -> date:
+    """First day of the period containing day."""
+    if granularity == Granularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == Granularity.MONTH:
+        return day.replace(day=1)
+    if granularity == Granularity.QUARTER:
+        return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+    return day
+
+
+def shift_periods(start: date, granularity: str, count: int) -> date:
+    """Start of the period count periods after (or before, if negative) the one starting at start."""
+    if granularity == Granularity.DAY:
+        return start + timedelta(days=count)
+    if granularity == Granularity.WEEK:
+        return start + timedelta(weeks=count)
+
+    months = count * (3 if granularity == Granularity.QUARTER else 1)
+    month_index = start.year * 12 + start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def iter_periods(start_date: date, end_date: date, granularity: str) -> Iterable[date]:
+    """Start dates of the periods overlapping [start_date, end_date]."""
+    current = period_start(start_date, granularity)
+    while current <= end_date:
+        yield current
+        current = shift_periods(current, granularity, 1)
+
+
+def build_snapshot_rows(snapshot_date: date, applications: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aggregate application states into metric_snapshots rows.
+
+    Args:
+        snapshot_date: Date the rows are recorded for
+        applications: Mappings with id, dev_team, ak_supervision_acceptance_year,
+                      current_status, is_delayed, delay_days, subtask_count,
+                      completed_subtask_count and blocked_subtask_count
+
+    Returns:
+        One row for the whole portfolio, one per supervision year, dev team
+        and application
+    """
+    totals: Dict[tuple, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(METRIC_COLUMNS, 0))
+
+    for app in applications:
+        subtask_count = int(app.get('subtask_count') or 0)
+        completed_subtasks = int(app.get('completed_subtask_count') or 0)
+        status = getattr(app.get('current_status'), 'value', app.get('current_status'))
+        is_delayed = bool(app.get('is_delayed'))
+        values = {
+            'application_count': 1,
+            'completed_count': int(status == ApplicationStatus.COMPLETED.value),
+            'active_count': int(status in ACTIVE_STATUSES),
+            'delayed_count': int(is_delayed),
+            'delay_days': int(app.get('delay_days') or 0) if is_delayed else 0,
+            'subtask_count': subtask_count,
+            'completed_subtask_count': completed_subtasks,
+            'blocked_count': int(app.get('blocked_subtask_count') or 0),
+            # Same as Application.progress_percentage
+            'progress': int(completed_subtasks / subtask_count * 100) if subtask_count else 0,
+        }
+
+        scopes = [
+            (TrendScope.OVERALL, ''),
+            (TrendScope.TEAM, app.get('dev_team') or UNASSIGNED_TEAM),
+            (TrendScope.APPLICATION, str(app['id'])),
+        ]
+        if app.get('ak_supervision_acceptance_year'):
+            scopes.append((TrendScope.YEAR, str(app['ak_supervision_acceptance_year'])))
+
+        for scope in scopes:
+            total = totals[scope]
+            for column, value in values.items():
+                total[column] += value
+
+    rows = []
+    for (scope, scope_key), total in totals.items():
+        count = total['application_count']
+        total['progress'] = round(total['progress'] / count, 2)
+        total['completion_rate'] = round(total['completed_count'] / count * 100, 2)
+        rows.append({'scope': scope, 'scope_key': scope_key, 'snapshot_date': snapshot_date, **total})
+    return rows
+
+
+class TrendService:
+    """Service writing and reading the historical trend store."""
+
+    SNAPSHOT_BATCH_SIZE = 1000
+    AUDIT_PAGE_SIZE = 5000
+
+    # Columns replayed from audit_logs
+    APPLICATION_FIELDS = (
+        'id', 'dev_team', 'ak_supervision_acceptance_year', 'current_status', 'is_delayed', 'delay_days'
+    )
+    SUBTASK_FIELDS = ('id', 'l2_id', 'task_status', 'is_blocked')
+
+    async def capture_snapshot(self, db: AsyncSession, snapshot_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Record today's metrics and refresh the rollups of the periods containing it.
+
+        Re-running for the same date overwrites that day's rows.
+
+        Args:
+            db: Database session
+            snapshot_date: Date to record the current state under (UTC today by default)
+
+        Returns:
+            Snapshot date, rows written and rollup statements run
+        """
+        snapshot_date = snapshot_date or datetime.now(timezone.utc).date()
+
+        result = await db.execute(
+            select(
+                *(getattr(Application, field) for field in self.APPLICATION_FIELDS),
+                ApplicationStats.subtask_count,
+                ApplicationStats.completed_subtask_count,
+                ApplicationStats.blocked_subtask_count,
+            ).outerjoin(ApplicationStats, ApplicationStats.application_id == Application.id)
+        )
+        rows = build_snapshot_rows(snapshot_date, [row._mapping for row in result.all()])
+
+        await self.ensure_partitions(db, snapshot_date, snapshot_date)
+        await self._upsert_snapshots(db, rows)
+        rollups = await self.refresh_rollups(db, snapshot_date, snapshot_date)
+        await db.commit()
+
+        logger.info(f"Captured {len(rows)} trend snapshot rows for {snapshot_date}")
+        return {"snapshot_date": snapshot_date.isoformat(), "rows": len(rows), "rollups": rollups}
+
+    async def backfill_from_audit(
+        self,
+        db: AsyncSession,
+        start_date: date,
+        end_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Rebuild daily snapshots for past days by replaying audit_logs backwards.
+
+        Starts from the current applications and subtasks and undoes every
+        audited change newer than the day being recorded. Changes that were
+        not audited (e.g. bulk Excel imports) are invisible to the replay, so
+        their effect shows from the start of the backfilled range.
+
+        Args:
+            db: Database session
+            start_date: First day to record
+            end_date: Last day to record (UTC yesterday by default)
+
+        Returns:
+            Days and rows written, audit entries replayed and rollup statements run
+        """
+        end_date = end_date or datetime.now(timezone.utc).date() - timedelta(days=1)
+        if start_date > end_date:
+            raise BusinessLogicError("Backfill start date must not be after the end date")
+
+        applications = await self._load_records(db, Application, self.APPLICATION_FIELDS)
+        subtasks = await self._load_records(db, SubTask, self.SUBTASK_FIELDS)
+        await self.ensure_partitions(db, start_date, end_date)
+
+        day = end_date
+        replayed = 0
+        written = 0
+        batch: List[Dict[str, Any]] = []
+        states = None
+
+        # Entries of start_date itself are part of its end-of-day state
+        since = datetime.combine(start_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        async for log in self._audit_logs_since(db, since):
+            log_day = self._utc_date(log.created_at)
+            while day >= start_date and log_day <= day:
+                if states is None:
+                    states = self._application_states(applications, subtasks)
+                batch.extend(build_snapshot_rows(day, states))
+                day -= timedelta(days=1)
+                if len(batch) >= self.SNAPSHOT_BATCH_SIZE:
+                    written += await self._upsert_snapshots(db, batch)
+                    batch = []
+            if day < start_date:
+                break
+
+            self._undo(log, applications, subtasks)
+            states = None
+            replayed += 1
+
+        while day >= start_date:
+            if states is None:
+                states = self._application_states(applications, subtasks)
+            batch.extend(build_snapshot_rows(day, states))
+            day -= timedelta(days=1)
+        written += await self._upsert_snapshots(db, batch)
+
+        rollups = await self.refresh_rollups(db, start_date, end_date)
+        await db.commit()
+
+        days = (end_date - start_date).days + 1
+        logger.info(f"Backfilled {days} days of trend snapshots ({written} rows, {replayed} audit entries replayed)")
+        return {"days": days, "rows": written, "replayed_changes": replayed, "rollups": rollups}
+
+    async def rebuild_snapshot(self, db: AsyncSession, snapshot_date: date) -> Dict[str, Any]:
+        """
+        Rebuild one past day's snapshot from the audit trail.
+
+        Replaces the day's rows with the state as of the end of that day,
+        reconstructed by the audit as-of engine from its nearest checkpoint.
+
+        Returns:
+            Snapshot date, rows written and rollup statements run
+        """
+        as_of = datetime.combine(snapshot_date, time.max, tzinfo=timezone.utc)
+        applications = await audit_replay_service.get_state_as_of(db, 'applications', as_of)
+        subtasks = await audit_replay_service.get_state_as_of(db, 'sub_tasks', as_of)
+        rows = build_snapshot_rows(
+            snapshot_date, self._application_states(applications['records'], subtasks['records'])
+        )
+
+        await self.ensure_partitions(db, snapshot_date, snapshot_date)
+        await db.execute(delete(MetricSnapshot).where(MetricSnapshot.snapshot_date == snapshot_date))
+        await self._upsert_snapshots(db, rows)
+        rollups = await self.refresh_rollups(db, snapshot_date, snapshot_date)
+        await db.commit()
+
+        logger.info(f"Rebuilt {len(rows)} trend snapshot rows for {snapshot_date} from the audit trail")
+        return {"snapshot_date": snapshot_date.isoformat(), "rows": len(rows), "rollups": rollups}
+
+    async def refresh_rollups(self, db: AsyncSession, start_date: date, end_date: date) -> int:
+        """
+        Recompute the weekly, monthly and quarterly rollups overlapping a date range.
+
+        Each period is one INSERT ... SELECT over its snapshots, taking the
+        latest snapshot of every scope as the closing values.
+
+        Returns:
+            Number of rollup statements run
+        """
+        insert = self._dialect_insert(db)
+        statements = 0
+        for granularity in Granularity.ROLLUPS:
+            for start in iter_periods(start_date, end_date, granularity):
+                end = shift_periods(start, granularity, 1) - timedelta(days=1)
+                await db.execute(self._rollup_statement(insert, granularity, start, end))
+                statements += 1
+        return statements
+
+    async def ensure_partitions(self, db: AsyncSession, start_date: date, end_date: date) -> None:
+        """Create the monthly metric_snapshots partitions covering a date range (PostgreSQL only)."""
+        if db.get_bind().dialect.name != 'postgresql':
+            return
+
+        for month in iter_periods(start_date, end_date, Granularity.MONTH):
+            next_month = shift_periods(month, Granularity.MONTH, 1)
+            await db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS metric_snapshots_y{month:%Y}m{month:%m} "
+                f"PARTITION OF metric_snapshots "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+            ))
+
+    async def get_series(
+        self,
+        db: AsyncSession,
+        granularity: str,
+        start_date: date,
+        end_date: date,
+        scope: str = TrendScope.OVERALL,
+        scope_keys: Sequence[str] = ('',)
+    ) -> List[Dict[str, Any]]:
+        """
+        Read a metric series in one range scan.
+
+        Args:
+            db: Database session
+            granularity: Granularity.DAY reads snapshots, the others read rollups
+            start_date: First day of the range; rollups start at its period
+            end_date: Last day of the range
+            scope: TrendScope value
+            scope_keys: Scope keys to read (year, team name or application ID)
+
+        Returns:
+            Points ordered by scope key and date, each with scope_key, date and
+            the metric columns (rollup points also carry period_end,
+            sample_count and progress_avg)
+        """
+        if granularity == Granularity.DAY:
+            model, date_column = MetricSnapshot, MetricSnapshot.snapshot_date
+            query = select(model)
+        else:
+            model, date_column = MetricRollup, MetricRollup.period_start
+            start_date = period_start(start_date, granularity)
+            query = select(model).where(MetricRollup.granularity == granularity)
+
+        result = await db.execute(
+            query.where(
+                model.scope == scope,
+                model.scope_key.in_(list(scope_keys)),
+                date_column.between(start_date, end_date)
+            ).order_by(model.scope_key, date_column)
+        )
+
+        points = []
+        for row in result.scalars().all():
+            point = {'scope_key': row.scope_key, 'date': getattr(row, date_column.key)}
+            point.update({column: getattr(row, column) for column in METRIC_COLUMNS})
+            if model is MetricRollup:
+                point.update(period_end=row.period_end, sample_count=row.sample_count, progress_avg=row.progress_avg)
+            points.append(point)
+        return points
+
+    async def analyze_trends(self, db: AsyncSession, period_days: int) -> Dict[str, Any]:
+        """
+        Compare today's portfolio metrics with those period_days ago.
+
+        Args:
+            db: Database session
+            period_days: Length of the comparison window
+
+        Returns:
+            Metric comparisons and recommendations derived from them
+        """
+        end_date = datetime.now(timezone.utc).date()
+        series = await self.get_series(db, Granularity.DAY, end_date - timedelta(days=period_days), end_date)
+        if not series:
+            return {
+                "analysis_period_days": period_days,
+                "trends": {},
+                "recommendations": ["No trend history yet: capture daily snapshots or backfill them from audit logs"]
+            }
+
+        previous, current = series[0], series[-1]
+        derived = {
+            # metric: (value, higher is better)
+            "completion_rate": (lambda p: p['completion_rate'], True),
+            "average_progress": (lambda p: p['progress'], True),
+            "average_delay_days": (lambda p: p['delay_days'] / p['delayed_count'] if p['delayed_count'] else 0.0, False),
+            "blocked_subtasks_ratio": (
+                lambda p: p['blocked_count'] / p['subtask_count'] * 100 if p['subtask_count'] else 0.0, False
+            ),
+        }
+
+        trends = {}
+        for metric, (value_of, higher_is_better) in derived.items():
+            current_value = round(value_of(current), 2)
+            previous_value = round(value_of(previous), 2)
+            change = current_value - previous_value
+            if change == 0:
+                trend = "stable"
+            else:
+                trend = "improving" if (change > 0) == higher_is_better else "worsening"
+            trends[metric] = {
+                "current": current_value,
+                "previous": previous_value,
+                "change_percent": round(change / previous_value * 100, 1) if previous_value else 0.0,
+                "trend": trend
+            }
+
+        recommendations = []
+        if trends["blocked_subtasks_ratio"]["trend"] == "worsening":
+            recommendations.append("Blocked subtask ratio is rising: review dependencies of blocked subtasks")
+        if trends["average_delay_days"]["trend"] == "worsening":
+            recommendations.append("Average delay is growing: re-plan delayed applications")
+        if trends["completion_rate"]["trend"] != "improving":
+            recommendations.append("Completion rate is not improving: check progress of in-flight applications")
+        if not recommendations:
+            recommendations.append("Continue current optimization strategies")
+
+        return {
+            "analysis_period_days": period_days,
+            "from_date": previous['date'].isoformat(),
+            "to_date": current['date'].isoformat(),
+            "trends": trends,
+            "recommendations": recommendations
+        }
+
+    def _rollup_statement(self, insert, granularity: str, start: date, end: date):
+        """INSERT ... SELECT of one period's rollup rows from its snapshots."""
+        window = (
+            select(
+                MetricSnapshot.scope,
+                MetricSnapshot.scope_key,
+                func.max(MetricSnapshot.snapshot_date).label('period_end'),
+                func.count().label('sample_count'),
+                func.avg(MetricSnapshot.progress).label('progress_avg'),
+            )
+            .where(MetricSnapshot.snapshot_date.between(start, end))
+            .group_by(MetricSnapshot.scope, MetricSnapshot.scope_key)
+            .subquery('period_window')
+        )
+        closing = (
+            select(
+                literal(granularity, String),
+                MetricSnapshot.scope,
+                MetricSnapshot.scope_key,
+                literal(start, Date),
+                window.c.period_end,
+                window.c.sample_count,
+                window.c.progress_avg,
+                *(getattr(MetricSnapshot, column) for column in METRIC_COLUMNS),
+            )
+            .join(window, and_(
+                MetricSnapshot.scope == window.c.scope,
+                MetricSnapshot.scope_key == window.c.scope_key,
+                MetricSnapshot.snapshot_date == window.c.period_end,
+            ))
+            # Repeated so the outer scan is pruned to the period's partition too
+            .where(MetricSnapshot.snapshot_date.between(start, end))
+        )
+
+        columns = [
+            'granularity', 'scope', 'scope_key', 'period_start',
+            'period_end', 'sample_count', 'progress_avg', *METRIC_COLUMNS
+        ]
+        stmt = insert(MetricRollup).from_select(columns, closing)
+        return stmt.on_conflict_do_update(
+            index_elements=['granularity', 'scope', 'scope_key', 'period_start'],
+            set_={column: stmt.excluded[column] for column in columns[4:]}
+        )
+
+    async def _upsert_snapshots(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+        """Insert or overwrite snapshot rows; returns the number of rows written."""
+        if not rows:
+            return 0
+
+        insert = self._dialect_insert(db)
+        for offset in range(0, len(rows), self.SNAPSHOT_BATCH_SIZE):
+            stmt = insert(MetricSnapshot).values(rows[offset:offset + self.SNAPSHOT_BATCH_SIZE])
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=['scope', 'scope_key', 'snapshot_date'],
+                set_={column: stmt.excluded[column] for column in METRIC_COLUMNS}
+            ))
+        return len(rows)
+
+    def _dialect_insert(self, db: AsyncSession):
+        dialect = db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise BusinessLogicError(f"Trend snapshots are not supported on {dialect}")
+        return insert
+
+    async def _load_records(self, db: AsyncSession, model, fields: Sequence[str]) -> Dict[int, Dict[str, Any]]:
+        result = await db.execute(select(*(getattr(model, field) for field in fields)))
+        return {row.id: dict(row._mapping) for row in result.all()}
+
+    async def _audit_logs_since(self, db: AsyncSession, since: datetime) -> AsyncIterator[Any]:
+        """Application and subtask audit entries from since on, newest first, in keyset pages."""
+        query = (
+            select(
+                AuditLog.id,
+                AuditLog.table_name,
+                AuditLog.record_id,
+                AuditLog.operation,
+                AuditLog.old_values,
+                AuditLog.created_at,
+            )
+            .where(
+                AuditLog.table_name.in_(('applications', 'sub_tasks')),
+                AuditLog.created_at >= since
+            )
+            .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+            .limit(self.AUDIT_PAGE_SIZE)
+        )
+
+        last_key = None
+        while True:
+            page_query = query if last_key is None else query.where(
+                tuple_(AuditLog.created_at, AuditLog.id) < tuple_(*last_key)
+            )
+            rows = (await db.execute(page_query)).all()
+            for row in rows:
+                yield row
+            if len(rows) < self.AUDIT_PAGE_SIZE:
+                return
+            last_key = (rows[-1].created_at, rows[-1].id)
+
+    def _undo(self, log, applications: Dict[int, Dict[str, Any]], subtasks: Dict[int, Dict[str, Any]]) -> None:
+        """Revert one audited change in the replayed state."""
+        if log.table_name == 'applications':
+            records, fields = applications, self.APPLICATION_FIELDS
+        else:
+            records, fields = subtasks, self.SUBTASK_FIELDS
+
+        if log.operation == AuditOperation.INSERT.value:
+            records.pop(log.record_id, None)
+            return
+
+        # UPDATE and DELETE entries carry the values from before the change
+        old_values = log.old_values or {}
+        record = records.setdefault(log.record_id, {'id': log.record_id})
+        record.update({field: old_values[field] for field in fields if field in old_values and field != 'id'})
+
+    def _application_states(
+        self,
+        applications: Dict[int, Dict[str, Any]],
+        subtasks: Dict[int, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Join replayed applications with subtask counts classified as in build_subtask_stats_subquery."""
+        counts: Dict[Any, List[int]] = defaultdict(lambda: [0, 0, 0])
+        for subtask in subtasks.values():
+            count = counts[subtask.get('l2_id')]
+            count[0] += 1
+            if subtask.get('task_status') == SubTaskStatus.COMPLETED.value:
+                count[1] += 1
+            elif subtask.get('is_blocked') or subtask.get('task_status') == SubTaskStatus.BLOCKED.value:
+                count[2] += 1
+
+        states = []
+        for app_id, app in applications.items():
+            subtask_count, completed, blocked = counts.get(app_id, (0, 0, 0))
+            states.append({
+                **app,
+                'id': app_id,
+                'subtask_count': subtask_count,
+                'completed_subtask_count': completed,
+                'blocked_subtask_count': blocked,
+            })
+        return states
+
+    @staticmethod
+    def _utc_date(value: datetime) -> date:
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.date()
+
+
+# Create singleton instance
+trend_service = TrendService()
@@ -9,6 +9,7 @@ from sqlalchemy import select, func, or_
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
+from app.core.user_cache import user_cache
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -202,6 +203,7 @@ class UserService:
 
             await db.commit()
             await db.refresh(user)
+            await user_cache.invalidate(user.id)
             logger.info(f"User updated: {user.username} (ID: {user.id})")
             return user
 
@@ -229,6 +231,7 @@ class UserService:
 
             await db.delete(user)
             await db.commit()
+            await user_cache.invalidate(user_id)
             logger.info(f"User deleted: {user.username} (ID: {user.id})")
             return True
 
@@ -252,6 +255,7 @@ class UserService:
             user.role = UserRole(role)
             await db.commit()
             await db.refresh(user)
+            await user_cache.invalidate(user.id)
             logger.info(f"User role updated: {user.username} -> {role}")
             return user
 
@@ -275,6 +279,7 @@ class UserService:
             user.is_active = is_active
             await db.commit()
             await db.refresh(user)
+            await user_cache.invalidate(user.id)
             logger.info(f"User status updated: {user.username} -> {'active' if is_active else 'inactive'}")
             return user
 
@@ -291,6 +296,7 @@ class UserService:
             if user:
                 user.last_login_at = datetime.utcnow()
                 await db.commit()
+                await user_cache.invalidate(user_id)
         except Exception as e:
             logger.error(f"Error updating last login for user {user_id}: {e}")
             # Don't raise, as this is not critical
@@ -341,6 +347,7 @@ class UserService:
                     failed_ids.append(user_id)
 
             await db.commit()
+            await user_cache.invalidate(*user_ids)
             logger.info(f"Batch role update completed: {success_count} succeeded, {failed_count} failed")
             return success_count, failed_count, failed_ids
 
@@ -386,6 +393,7 @@ class UserService:
                     failed_ids.append(user_id)
 
             await db.commit()
+            await user_cache.invalidate(*user_ids)
             logger.info(f"Batch department update completed: {success_count} succeeded, {failed_count} failed")
             return success_count, failed_count, failed_ids
 
@@ -431,6 +439,7 @@ class UserService:
                     failed_ids.append(user_id)
 
             await db.commit()
+            await user_cache.invalidate(*user_ids)
             logger.info(f"Batch team update completed: {success_count} succeeded, {failed_count} failed")
             return success_count, failed_count, failed_ids
 
@@ -485,6 +494,7 @@ class UserService:
                     failed_ids.append(user_id)
 
             await db.commit()
+            await user_cache.invalidate(*user_ids)
             logger.info(f"Batch status update completed: {success_count} succeeded, {failed_count} failed")
             return success_count, failed_count, failed_ids
 
@@ -0,0 +1,138 @@
+"""
+Keyset pagination utilities
+
+Provides:
+- Opaque cursors encoding the sort key of the last row returned
+- Decoding back to typed values, rejecting tampered or malformed cursors
+- NULL-safe keyset ordering and "rows after" conditions on (column, id)
+- Listing totals that are exact, planner-estimated, or skipped
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode sort key values as an opaque, URL-safe cursor.
+
+    Dates and datetimes are stored as ISO strings; everything else must be
+    JSON serializable.
+    """
+    payload = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+        types: Expected type of each value (datetime, date, int, str, ...)
+
+    Returns:
+        Tuple of values converted to the given types
+
+    Raises:
+        ValidationError: If the cursor is malformed or does not match the types
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("cursor length mismatch")
+
+        values = []
+        for value, expected in zip(payload, types):
+            if value is None:
+                values.append(None)
+            elif expected is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif expected is date:
+                values.append(date.fromisoformat(value))
+            else:
+                values.append(expected(value))
+        return tuple(values)
+    except (ValueError, TypeError) as e:
+        raise ValidationError("Invalid cursor", field="cursor", value=cursor) from e
+
+
+def keyset_order(column, id_column, descending: bool) -> List[Any]:
+    """
+    ORDER BY clauses for keyset pagination on (column, id).
+
+    NULLs sort last ascending and first descending, PostgreSQL's btree
+    default, so the order matches an index on (column, id) in either direction.
+    """
+    if descending:
+        return [column.desc().nullsfirst(), id_column.desc()]
+    return [column.asc().nullslast(), id_column.asc()]
+
+
+def keyset_after(column, id_column, descending: bool, value: Any, last_id: int):
+    """
+    Condition selecting the rows after (value, last_id) in keyset_order.
+
+    Uses a row comparison, which PostgreSQL turns into an index range scan
+    on (column, id); the NULL branches are only added for nullable columns.
+    """
+    nullable = column.expression.nullable
+    if descending:
+        if value is None:
+            return or_(and_(column.is_(None), id_column < last_id), column.is_not(None))
+        return tuple_(column, id_column) < tuple_(value, last_id)
+
+    if value is None:
+        return and_(column.is_(None), id_column > last_id)
+    after = tuple_(column, id_column) > tuple_(value, last_id)
+    return or_(after, column.is_(None)) if nullable else after
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> int:
+    """
+    Estimate the rows a query returns from the PostgreSQL planner.
+
+    The planner's row estimate comes from pg_class.reltuples and column
+    statistics, so it costs no scan but can be off after bulk changes until
+    the next ANALYZE. Other databases fall back to an exact count.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+        return result.scalar() or 0
+
+    compiled = query.order_by(None).compile(
+        dialect=db.get_bind().dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    connection = await db.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: str) -> Optional[int]:
+    """
+    Total rows of a listing query.
+
+    Args:
+        db: Database session
+        query: Filtered query, without ordering or limit
+        mode: "exact" (COUNT(*)), "estimated" (estimate_count) or "none" (skip it)
+    """
+    if mode == "exact":
+        result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+        return result.scalar()
+    if mode == "estimated":
+        return await estimate_count(db, query)
+    return None
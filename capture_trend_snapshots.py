@@ -0,0 +1,99 @@
+"""
+趋势快照采集脚本
+每日记录一次项目指标快照（建议由 cron 调用），或通过回放 audit_logs 回填历史快照
+"""
+
+import asyncio
+import sys
+import os
+import time
+from datetime import date
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.trend_service import trend_service
+from app.db.session import AsyncSessionLocal
+
+
+async def capture_trend_snapshots(snapshot_date, backfill_from, backfill_to, rebuild_date):
+    """
+    采集或回填趋势快照
+
+    Args:
+        snapshot_date: 当前状态记录到的日期（默认今天）
+        backfill_from: 回填起始日期，指定时从 audit_logs 回填历史快照
+        backfill_to: 回填结束日期（默认昨天）
+        rebuild_date: 指定时按审计检查点重建该日快照
+    """
+    print(f"{'='*60}")
+    print("趋势快照重建" if rebuild_date else "趋势快照回填" if backfill_from else "趋势快照采集")
+    print(f"{'='*60}\n")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            start_time = time.time()
+            if rebuild_date:
+                result = await trend_service.rebuild_snapshot(db, rebuild_date)
+                print("✅ 重建完成!")
+                print(f"  日期: {result['snapshot_date']}")
+                print(f"  快照行数: {result['rows']}")
+            elif backfill_from:
+                result = await trend_service.backfill_from_audit(db, backfill_from, backfill_to)
+                print("✅ 回填完成!")
+                print(f"  天数: {result['days']}")
+                print(f"  快照行数: {result['rows']}")
+                print(f"  回放变更数: {result['replayed_changes']}")
+            else:
+                result = await trend_service.capture_snapshot(db, snapshot_date)
+                print("✅ 采集完成!")
+                print(f"  日期: {result['snapshot_date']}")
+                print(f"  快照行数: {result['rows']}")
+            print(f"  汇总语句数: {result['rollups']}")
+            print(f"  耗时: {time.time() - start_time:.2f} 秒")
+            print(f"\n{'='*60}\n")
+
+            return True
+
+        except Exception as e:
+            await db.rollback()
+            print(f"\n❌ 执行失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='趋势快照采集与回填工具')
+    parser.add_argument(
+        '--date',
+        type=date.fromisoformat,
+        help='快照日期 (YYYY-MM-DD)，默认今天'
+    )
+    parser.add_argument(
+        '--backfill-from',
+        type=date.fromisoformat,
+        help='从 audit_logs 回填历史快照的起始日期 (YYYY-MM-DD)'
+    )
+    parser.add_argument(
+        '--backfill-to',
+        type=date.fromisoformat,
+        help='回填结束日期 (YYYY-MM-DD)，默认昨天'
+    )
+    parser.add_argument(
+        '--rebuild',
+        type=date.fromisoformat,
+        help='从审计检查点重建指定日期的快照 (YYYY-MM-DD)'
+    )
+
+    args = parser.parse_args()
+
+    success = asyncio.run(capture_trend_snapshots(args.date, args.backfill_from, args.backfill_to, args.rebuild))
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+审计检查点创建脚本
+复制可回放表的当前数据作为检查点，供审计时点状态查询（/audit/as-of）使用，建议每周由 cron 调用
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.audit_replay_service import audit_replay_service, REPLAYABLE_TABLES
+from app.db.session import AsyncSessionLocal
+
+
+async def create_audit_checkpoints(tables):
+    """
+    创建审计检查点
+
+    Args:
+        tables: 需要创建检查点的表名列表
+    """
+    print(f"{'='*60}")
+    print("审计检查点创建")
+    print(f"{'='*60}")
+    print(f"表: {', '.join(tables)}")
+    print(f"{'='*60}\n")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            for table_name in tables:
+                start_time = time.time()
+                checkpoint = await audit_replay_service.create_checkpoint(db, table_name)
+
+                print(f"✅ {table_name} 检查点已创建!")
+                print(f"  检查点ID: {checkpoint.id}")
+                print(f"  记录数: {checkpoint.record_count}")
+                print(f"  耗时: {time.time() - start_time:.2f} 秒")
+            print(f"\n{'='*60}\n")
+
+            return True
+
+        except Exception as e:
+            await db.rollback()
+            print(f"\n❌ 创建失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='审计检查点创建工具')
+    parser.add_argument(
+        '--table',
+        action='append',
+        choices=list(REPLAYABLE_TABLES),
+        help='需要创建检查点的表（可重复指定），默认全部'
+    )
+
+    args = parser.parse_args()
+
+    success = asyncio.run(create_audit_checkpoints(args.table or list(REPLAYABLE_TABLES)))
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+审计日志分区维护脚本
+提前创建 audit_logs 的月度分区，并按保留期整体删除过期分区，建议每天由 cron 调用
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.services.audit_service import audit_service
+from app.db.session import AsyncSessionLocal
+
+
+async def maintain_audit_partitions(months_ahead, retention_days):
+    """
+    维护审计日志分区
+
+    Args:
+        months_ahead: 提前创建的月份数
+        retention_days: 保留天数，0 表示不删除
+    """
+    print(f"{'='*60}")
+    print("审计日志分区维护")
+    print(f"{'='*60}")
+    print(f"提前创建: {months_ahead} 个月")
+    print(f"保留天数: {retention_days or '不限'}")
+    print(f"{'='*60}\n")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            if not await audit_service.is_partitioned(db):
+                print("⚠️  audit_logs 未分区，请先执行 alembic upgrade head")
+                return False
+
+            start_time = time.time()
+            created = await audit_service.ensure_partitions(db, months_ahead)
+            print(f"✅ 新建分区: {', '.join(created) if created else '无'}")
+
+            if retention_days > 0:
+                removed = await audit_service.cleanup_old_logs(db, days_to_keep=retention_days)
+                print(f"✅ 删除过期审计日志: {removed} 条")
+
+            partitions = await audit_service.list_partitions(db)
+            if partitions:
+                print(f"  分区范围: {partitions[0]['start']} ~ {partitions[-1]['end']} ({len(partitions)} 个)")
+            print(f"  耗时: {time.time() - start_time:.2f} 秒")
+            print(f"\n{'='*60}\n")
+
+            return True
+
+        except Exception as e:
+            await db.rollback()
+            print(f"\n❌ 维护失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='审计日志分区维护工具')
+    parser.add_argument(
+        '--months-ahead',
+        type=int,
+        default=settings.AUDIT_PARTITION_MONTHS_AHEAD,
+        help='提前创建的月度分区数'
+    )
+    parser.add_argument(
+        '--retention-days',
+        type=int,
+        default=settings.AUDIT_RETENTION_DAYS,
+        help='删除完全早于该天数的分区（0 表示不删除）'
+    )
+
+    args = parser.parse_args()
+
+    success = asyncio.run(maintain_audit_partitions(args.months_ahead, args.retention_days))
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
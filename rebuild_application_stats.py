@@ -0,0 +1,71 @@
+"""
+应用统计投影重建脚本
+根据 sub_tasks 全量重建 application_stats 表，用于修复和初始化
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.application_stats_service import application_stats_service
+from app.db.session import AsyncSessionLocal
+
+
+async def rebuild_application_stats(batch_size: int):
+    """
+    重建应用统计投影
+
+    Args:
+        batch_size: 每批处理的应用数量
+    """
+    print(f"{'='*60}")
+    print("application_stats 全量重建")
+    print(f"{'='*60}")
+    print(f"批次大小: {batch_size}")
+    print(f"{'='*60}\n")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            start_time = time.time()
+            result = await application_stats_service.rebuild_all(db, batch_size=batch_size)
+
+            print("✅ 重建完成!")
+            print(f"  应用数: {result['total_applications']}")
+            print(f"  批次数: {result['batches']}")
+            print(f"  耗时: {time.time() - start_time:.2f} 秒")
+            print(f"\n{'='*60}\n")
+
+            return True
+
+        except Exception as e:
+            await db.rollback()
+            print(f"\n❌ 重建失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='application_stats 全量重建工具')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=application_stats_service.REBUILD_BATCH_SIZE,
+        help='每批处理的应用数量'
+    )
+
+    args = parser.parse_args()
+
+    success = asyncio.run(rebuild_application_stats(args.batch_size))
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
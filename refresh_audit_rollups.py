@@ -0,0 +1,77 @@
+"""
+审计统计汇总刷新脚本
+将已结束的小时汇总到 audit_hourly_rollups / audit_bulk_minutes 并推进水位线，
+供 /audit/statistics 与合规报告使用，建议每小时由 cron 调用
+"""
+
+import asyncio
+import sys
+import os
+import time
+from datetime import datetime, timezone
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.audit_rollup_service import audit_rollup_service
+from app.db.session import AsyncSessionLocal
+
+
+async def refresh_audit_rollups(rebuild_from=None):
+    """
+    刷新审计统计汇总
+
+    Args:
+        rebuild_from: 从该日期起重新汇总（None 表示只汇总水位线之后的小时）
+    """
+    print(f"{'='*60}")
+    print("审计统计汇总刷新")
+    print(f"{'='*60}")
+    print(f"重建起点: {rebuild_from.isoformat() if rebuild_from else '无（增量刷新）'}")
+    print(f"{'='*60}\n")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            start_time = time.time()
+            if rebuild_from:
+                since = datetime.combine(rebuild_from, datetime.min.time(), tzinfo=timezone.utc)
+                result = await audit_rollup_service.rebuild(db, since)
+            else:
+                result = await audit_rollup_service.refresh(db)
+
+            print("✅ 审计统计汇总已刷新!")
+            print(f"  汇总小时数: {result['hours']}")
+            print(f"  水位线: {result['rolled_through']}")
+            print(f"  耗时: {time.time() - start_time:.2f} 秒")
+            print(f"\n{'='*60}\n")
+
+            return True
+
+        except Exception as e:
+            await db.rollback()
+            print(f"\n❌ 刷新失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+
+def main():
+    """主函数"""
+    import argparse
+    from datetime import date
+
+    parser = argparse.ArgumentParser(description='审计统计汇总刷新工具')
+    parser.add_argument(
+        '--rebuild-from',
+        type=date.fromisoformat,
+        help='从该日期（YYYY-MM-DD）起重新汇总，例如恢复审计日志之后'
+    )
+
+    args = parser.parse_args()
+
+    success = asyncio.run(refresh_audit_rollups(args.rebuild_from))
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
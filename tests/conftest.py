@@ -75,6 +75,53 @@ async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+def _create_sqlite_tables(sync_conn, tables) -> None:
+    """Create tables on SQLite; JSONB columns become JSON and unique indexes are kept."""
+    from sqlalchemy import text
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.schema import CreateIndex
+    from app.core.database import Base
+
+    def has_jsonb(table):
+        return any(isinstance(column.type, JSONB) for column in table.columns)
+
+    Base.metadata.create_all(sync_conn, tables=[table for table in tables if not has_jsonb(table)])
+    for table in filter(has_jsonb, tables):
+        columns = ", ".join(
+            f"{column.name} {'JSON' if isinstance(column.type, JSONB) else column.type.compile(sync_conn.dialect)}"
+            + (" PRIMARY KEY" if column.primary_key else "")
+            for column in table.columns
+        )
+        sync_conn.execute(text(f"CREATE TABLE {table.name} ({columns})"))
+        for index in table.indexes:
+            if index.unique:
+                sync_conn.execute(CreateIndex(index))
+
+
+@pytest_asyncio.fixture
+async def table_session(request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    In-memory SQLite session with only the tables in the test module's SQLITE_TABLES.
+
+    Like the application's sessions it does not expire objects on commit.
+    When users is among them, alice (id 1) and bob (id 2) are seeded.
+    """
+    tables = request.module.SQLITE_TABLES
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_sqlite_tables, tables)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        if User.__table__ in tables:
+            session.add_all([
+                User(id=1, username="alice", full_name="Alice", email="alice@example.com"),
+                User(id=2, username="bob", full_name="Bob", email="bob@example.com"),
+            ])
+            await session.commit()
+        yield session
+    await engine.dispose()
+
+
 @pytest.fixture
 def override_get_db(test_session):
     """Override database dependency for tests."""
@@ -527,6 +574,20 @@ def user_role(request):
 
 
 # Cleanup fixture
+@pytest.fixture(autouse=True)
+def disable_caches(monkeypatch):
+    """Serve every request from the services; cache tests enable caching explicitly."""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "USER_CACHE_ENABLED", False)
+    # Audit rows go to the test session instead of the background writer
+    monkeypatch.setattr(settings, "AUDIT_WRITE_MODE", "transactional")
+    monkeypatch.setattr(settings, "SESSION_STORE", "memory")
+    # Outbox rows stay in the test database instead of being delivered
+    monkeypatch.setattr(settings, "NOTIFICATION_WORKER_ENABLED", False)
+    monkeypatch.setattr(settings, "EVENT_BUS_BACKEND", "memory")
+
+
 @pytest.fixture(autouse=True)
 def cleanup_after_test():
     """Cleanup after each test."""
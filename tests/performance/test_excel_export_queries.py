@@ -0,0 +1,113 @@
+"""
+Query-count benchmarks for the subtask Excel export
+"""
+
+import io
+import time
+import contextlib
+import pytest
+from datetime import date
+from openpyxl import load_workbook
+from sqlalchemy import event, insert
+from sqlalchemy.dialects import postgresql
+
+from app.models.application import Application
+from app.models.subtask import SubTask
+from app.models.user import User
+from app.services.excel_service import ExcelService
+
+
+SQLITE_TABLES = [User.__table__, Application.__table__, SubTask.__table__]
+
+
+@contextlib.contextmanager
+def count_statements(session):
+    """Collect every SQL statement the session's engine sends to the database."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def _seed_subtasks(session, start, count):
+    """Add count subtasks, ten per application, with ids from start + 1."""
+    app_ids = range(start // 10 + 1, (start + count) // 10 + 1)
+    await session.execute(insert(Application), [
+        {
+            'id': app_id, 'l2_id': f'L2_PERF_{app_id:06d}', 'app_name': '性能测试应用',
+            'current_status': '研发进行中', 'created_by': 1, 'updated_by': 1,
+        }
+        for app_id in app_ids
+    ])
+    await session.execute(insert(SubTask), [
+        {
+            'id': subtask_id, 'l2_id': (subtask_id - 1) // 10 + 1, 'sub_target': 'AK',
+            'version_name': f'v{subtask_id}', 'task_status': '研发进行中',
+            'planned_requirement_date': date(2025, 1, 1), 'progress_percentage': 50,
+            'is_blocked': False, 'resource_applied': True, 'created_by': 1, 'updated_by': 1,
+        }
+        for subtask_id in range(start + 1, start + count + 1)
+    ])
+    await session.commit()
+
+
+class TestSubtaskExportQueryCount:
+    """The subtask export must issue the same number of queries at any size."""
+
+    @pytest.mark.asyncio
+    async def test_export_bytes_single_query(self, table_session):
+        service = ExcelService()
+        query_counts = []
+
+        for start, count in ((0, 100), (100, 900)):
+            await _seed_subtasks(table_session, start, count)
+
+            start_time = time.time()
+            with count_statements(table_session) as statements:
+                content = await service.export_subtasks_to_excel(table_session)
+            elapsed = time.time() - start_time
+
+            assert content[:2] == b'PK'
+            assert load_workbook(io.BytesIO(content)).active.max_row == start + count + 1
+            assert elapsed < 30.0
+            query_counts.append(len(statements))
+
+        assert query_counts == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_stream_query_count_is_constant(self, table_session):
+        service = ExcelService()
+        query_counts = []
+
+        for start, count in ((0, 100), (100, 900)):
+            await _seed_subtasks(table_session, start, count)
+
+            with count_statements(table_session) as statements:
+                chunks = [chunk async for chunk in service.stream_subtasks_export(table_session)]
+            assert b''.join(chunks)[:2] == b'PK'
+            query_counts.append(len(statements))
+
+        assert query_counts == [1, 1]
+
+    def test_export_query_projects_columns_only(self):
+        service = ExcelService()
+        fields, columns = service._subtask_export_columns()
+        query = service._build_subtasks_export_query(columns=columns)
+
+        # Plain columns only: no entity is loaded, so nothing can lazy-load
+        assert all(
+            description['expr'] is not description['entity']
+            for description in query.column_descriptions
+        )
+        assert len(query.selected_columns) == len(fields)
+
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert "applications.l2_id AS l2_id" in sql
+        assert sql.count("SELECT") == 1
@@ -0,0 +1,84 @@
+"""
+Benchmarks for Excel import parsing: read-only fast path vs full workbook load
+"""
+
+import io
+import time
+import tracemalloc
+from datetime import date
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from app.services.excel_service import ExcelService
+
+
+def _tracker_workbook(row_count):
+    """Build a subtask tracker workbook with leading instruction/statistics rows."""
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = "子追踪表"
+    worksheet.append(["表格使用说明"])
+    worksheet.append(["本月计划", 10, 20])
+    worksheet.append([
+        "L2ID", "L2应用", "子目标", "版本名", "改造状态",
+        "【计划】\n需求完成时间", "【计划】\n业务上线时间", "备注", "资源是否申请",
+    ])
+    for i in range(row_count):
+        worksheet.append([
+            f"L2_{i % 500:05d}", f"应用{i % 50}", "AK" if i % 2 else "云原生", f"v{i % 9}",
+            "研发进行中" if i % 3 else "子任务完成", date(2025, 1 + i % 12, 1),
+            date(2025, 6, 30), None, "是" if i % 4 else "否",
+        ])
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def _parse(service, worksheet):
+    return service._worksheet_to_dataframe(worksheet, service.config.SUBTASK_FIELDS)
+
+
+def _measure(parse):
+    tracemalloc.start()
+    start_time = time.time()
+    df = parse()
+    elapsed = time.time() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, elapsed, peak
+
+
+class TestExcelImportParsing:
+    """Compare the read-only import path with a full workbook load."""
+
+    @pytest.mark.parametrize("row_count", [5000])
+    def test_read_only_path_matches_full_load(self, row_count, capsys):
+        service = ExcelService()
+        content = _tracker_workbook(row_count)
+
+        def full_load():
+            workbook = load_workbook(io.BytesIO(content), data_only=True)
+            return _parse(service, workbook.active)
+
+        def fast_path():
+            workbook = service._load_workbook(content)
+            try:
+                return _parse(service, workbook.active)
+            finally:
+                workbook.close()
+
+        full_df, full_elapsed, full_peak = _measure(full_load)
+        fast_df, fast_elapsed, fast_peak = _measure(fast_path)
+
+        with capsys.disabled():
+            print(
+                f"\nExcel import parse ({row_count} rows): "
+                f"full load {full_elapsed:.2f}s / {full_peak / 1024 / 1024:.1f}MB, "
+                f"read-only {fast_elapsed:.2f}s / {fast_peak / 1024 / 1024:.1f}MB"
+            )
+
+        assert len(fast_df) == row_count
+        pd.testing.assert_frame_equal(full_df, fast_df)
+        assert fast_peak < full_peak
@@ -0,0 +1,185 @@
+"""
+Statement-count benchmarks for the bulk application and subtask imports
+"""
+
+import io
+import math
+import time
+import contextlib
+from datetime import date
+from unittest.mock import AsyncMock, Mock, patch
+
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.excel_service import ExcelService
+
+
+class UpsertSession:
+    """Async session double that records upserts and reports every row as inserted."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def get_bind(self):
+        bind = Mock()
+        bind.dialect.name = 'postgresql'
+        return bind
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return _Result([True] * self._row_count(statement))
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+    @staticmethod
+    def _row_count(statement):
+        # Rows in a multi-VALUES insert
+        return len(statement._multi_values[0])
+
+
+class _Result:
+    def __init__(self, flags):
+        self.flags = flags
+
+    def scalars(self):
+        return iter(self.flags)
+
+
+class CopySession:
+    """Async session double for the subtask loader: every L2 ID is new, every subtask inserted."""
+
+    def __init__(self):
+        self.statements = []
+        self.copied = []
+        self.commits = 0
+
+    def get_bind(self):
+        return Mock(dialect=postgresql.dialect())
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        params = statement.compile(dialect=postgresql.dialect()).params
+        if 'missing_l2_ids' in params:
+            return _Rows([(i + 1, l2_id) for i, l2_id in enumerate(params['missing_l2_ids'])])
+        return _Rows([], one=(len(self.copied), 0))
+
+    async def connection(self):
+        session = self
+
+        class _Connection:
+            async def get_raw_connection(self):
+                return Mock(driver_connection=Mock(copy_records_to_table=session._copy))
+
+        return _Connection()
+
+    async def _copy(self, table_name, records, columns):
+        self.copied.extend(records)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+class _Rows:
+    def __init__(self, rows, one=None):
+        self.rows = rows
+        self._one = one
+
+    def all(self):
+        return self.rows
+
+    def one(self):
+        return self._one
+
+
+def _applications_frame(row_count):
+    return pd.DataFrame({
+        'l2_id': [f'L2_{i:06d}' for i in range(row_count)],
+        'app_name': [f'应用{i}' for i in range(row_count)],
+        'ak_supervision_acceptance_year': ['2025年' if i % 2 else 2026 for i in range(row_count)],
+        'current_status': ['研发进行中'] * row_count,
+        'app_tier': [i % 3 + 1 for i in range(row_count)],
+        'dev_team': [f'团队{i % 20}' for i in range(row_count)],
+        'planned_requirement_date': ['2025-01-02' if i % 2 else '2025/03/04' for i in range(row_count)],
+        'is_delayed': ['是' if i % 5 == 0 else '否' for i in range(row_count)],
+        'notes': [None if i % 3 else '备注' for i in range(row_count)],
+    })
+
+
+class TestApplicationImportUpsert:
+    """The application import must issue one statement per batch, not per row."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("row_count", [1000, 20000])
+    async def test_statements_scale_with_batches(self, row_count, capsys):
+        service = ExcelService()
+        db = UpsertSession()
+        user = Mock(id=1)
+
+        start_time = time.time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = await service._import_applications_data(db, _applications_frame(row_count), user)
+        elapsed = time.time() - start_time
+
+        with capsys.disabled():
+            print(f"\nUpsert {row_count} applications: {elapsed:.2f}s, {len(db.statements)} statements")
+
+        assert result == {'imported': row_count, 'updated': 0, 'skipped': 0}
+        assert len(db.statements) == math.ceil(row_count / service.IMPORT_BATCH_SIZE)
+        assert db.commits == 1
+        assert elapsed < 30.0
+
+
+def _subtasks_frame(row_count):
+    return pd.DataFrame({
+        'l2_id': [f'L2_{i // 10:06d}' for i in range(row_count)],
+        'app_name': [f'应用{i // 10}' for i in range(row_count)],
+        'sub_target': ['AK' if i % 2 else '云原生' for i in range(row_count)],
+        'version_name': [f'v{i % 10 // 2}' for i in range(row_count)],
+        'task_status': [('研发进行中', '子任务完成', '待启动')[i % 3] for i in range(row_count)],
+        'progress_percentage': [i % 101 for i in range(row_count)],
+        'is_blocked': [i % 7 == 0 for i in range(row_count)],
+        'planned_requirement_date': [date(2025, 1 + i % 12, 1) for i in range(row_count)],
+        'resource_applied': [bool(i % 2) for i in range(row_count)],
+        'notes': [None if i % 4 else '备注' for i in range(row_count)],
+    })
+
+
+class TestSubtaskImportCopy:
+    """The subtask import must issue a fixed number of statements and one COPY at any size."""
+
+    @pytest.mark.asyncio
+    async def test_100k_rows_in_constant_statements(self, capsys):
+        row_count = 100000
+        service = ExcelService()
+        db = CopySession()
+        user = Mock(id=1)
+
+        with patch('app.services.application_stats_service.application_stats_service.refresh_applications',
+                   new_callable=AsyncMock), \
+                patch('app.services.calculation_engine.CalculationEngine.recalculate_applications',
+                      new_callable=AsyncMock) as recalculate:
+            start_time = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = await service._import_subtasks_data(db, _subtasks_frame(row_count), user)
+            elapsed = time.time() - start_time
+
+        with capsys.disabled():
+            print(f"\nCOPY-load {row_count} subtasks: {elapsed:.2f}s, {len(db.statements)} statements")
+
+        assert result == {'imported': row_count, 'updated': 0, 'skipped': 0}
+        # Lookup, placeholder insert, staging table, merge
+        assert len(db.statements) == 4
+        assert len(db.copied) == row_count
+        assert db.commits == 1
+        recalculate.assert_awaited_once()
+        assert elapsed < 30.0
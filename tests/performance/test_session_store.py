@@ -0,0 +1,135 @@
+"""
+Throughput benchmarks for session validation
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.config import settings
+from app.core.session_store import MemorySessionStore, RedisSessionStore
+from app.services.auth_service import AuthService
+
+
+SESSION_COUNT = 1000
+VALIDATIONS = 100000
+
+
+class FakeRedis:
+    """Redis client double counting round trips."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.round_trips = 0
+        self.pipelined_commands = 0
+        self.touched = []
+
+    async def hgetall(self, key):
+        self.round_trips += 1
+        return dict(self.hashes.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def aclose(self):
+        pass
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def eval(self, script, numkeys, key, index_key, last_activity, ttl):
+        self.commands.append(key)
+        self.client.touched.append((key, index_key))
+        if key in self.client.hashes:
+            self.client.hashes[key]["last_activity"] = last_activity
+
+    async def execute(self):
+        self.client.round_trips += 1
+        self.client.pipelined_commands += len(self.commands)
+
+
+class TestSessionValidationThroughput:
+    """validate_session must be a constant-time lookup."""
+
+    @pytest.mark.asyncio
+    async def test_memory_store_throughput(self, monkeypatch, capsys):
+        store = MemorySessionStore(ttl=3600)
+        monkeypatch.setattr("app.services.auth_service.get_session_store", _returning(store))
+        service = AuthService()
+        db = Mock()
+
+        session_ids = []
+        for user_id in range(SESSION_COUNT):
+            user = Mock(id=user_id, employee_id=f"EMP{user_id}")
+            session_ids.append(await service.create_session(db, user, "10.0.0.1", "bench"))
+
+        start_time = time.time()
+        for i in range(VALIDATIONS):
+            session = await service.validate_session(db, session_ids[i % SESSION_COUNT])
+        elapsed = time.time() - start_time
+
+        with capsys.disabled():
+            print(f"\nvalidate_session (memory): {VALIDATIONS / elapsed:,.0f} ops/s")
+
+        assert session["user_id"] == (VALIDATIONS - 1) % SESSION_COUNT
+        assert VALIDATIONS / elapsed > 20000
+
+    @pytest.mark.asyncio
+    async def test_redis_store_batches_activity_updates(self, monkeypatch, capsys):
+        monkeypatch.setattr(settings, "SESSION_TOUCH_INTERVAL", 3600)
+        store = RedisSessionStore("redis://localhost:6379/0", ttl=3600)
+        store.client = FakeRedis()
+        for user_id in range(SESSION_COUNT):
+            store.client.hashes[f"{store.SESSION_PREFIX}s{user_id}"] = {"user_id": str(user_id)}
+
+        validations = 10000
+        start_time = time.time()
+        for i in range(validations):
+            await store.get(f"s{i % SESSION_COUNT}")
+        elapsed = time.time() - start_time
+
+        with capsys.disabled():
+            print(f"\nvalidate_session (redis, fake client): {validations / elapsed:,.0f} ops/s, "
+                  f"{store.client.round_trips} round trips")
+
+        # One HGETALL per validation plus one pipeline per SESSION_TOUCH_BATCH_SIZE sessions touched
+        flushes = validations // settings.SESSION_TOUCH_BATCH_SIZE
+        assert store.client.round_trips == validations + flushes
+        assert store.client.pipelined_commands == flushes * settings.SESSION_TOUCH_BATCH_SIZE
+        assert await store.get("missing") is None
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_redis_store_flushes_idle_activity(self, monkeypatch):
+        monkeypatch.setattr(settings, "SESSION_TOUCH_INTERVAL", 0.01)
+        store = RedisSessionStore("redis://localhost:6379/0", ttl=3600)
+        store.client = FakeRedis()
+        store.client.hashes[f"{store.SESSION_PREFIX}s1"] = {"user_id": "7"}
+
+        # No further requests: the background flush writes the activity and extends the user index
+        await store.get("s1")
+        await asyncio.sleep(0.05)
+        assert store.client.touched == [(f"{store.SESSION_PREFIX}s1", f"{store.USER_INDEX_PREFIX}7")]
+
+        # Activity still buffered is written on shutdown
+        monkeypatch.setattr(settings, "SESSION_TOUCH_INTERVAL", 3600)
+        await store.get("s1")
+        await store.close()
+        assert len(store.client.touched) == 2
+
+
+def _returning(store):
+    async def get_session_store():
+        return store
+    return get_session_store
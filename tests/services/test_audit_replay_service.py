@@ -0,0 +1,148 @@
+"""
+Unit tests for the audit as-of replay service
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock
+
+from sqlalchemy import select
+
+from app.core.exceptions import ValidationError
+from app.models.application import Application, ApplicationStatus
+from app.models.audit_checkpoint import AuditCheckpoint, AuditCheckpointRecord
+from app.models.audit_log import AuditLog
+from app.models.subtask import SubTask
+from app.models.user import User
+from app.services.audit_replay_service import AuditReplayService
+
+SQLITE_TABLES = [
+    User.__table__, Application.__table__, SubTask.__table__, AuditLog.__table__,
+    AuditCheckpoint.__table__, AuditCheckpointRecord.__table__,
+]
+
+
+def _log(record_id, operation, new_values=None, day=1):
+    return SimpleNamespace(
+        id=day, record_id=record_id, operation=operation, new_values=new_values,
+        created_at=datetime(2025, 3, day, tzinfo=timezone.utc)
+    )
+
+
+def _result(scalar=None, rows=None):
+    result = Mock()
+    result.scalar_one_or_none.return_value = scalar
+    result.all.return_value = rows or []
+    return result
+
+
+class TestAuditReplayService:
+    """Point-in-time reconstruction from checkpoints and audit rows."""
+
+    def setup_method(self):
+        self.service = AuditReplayService()
+
+    def test_apply_replays_changes_forward(self):
+        states = {}
+        self.service._apply(states, _log(1, "INSERT", {"id": 1, "task_status": "未开始", "progress_percentage": 0}))
+        self.service._apply(states, _log(1, "UPDATE", {"task_status": "研发进行中"}))
+        self.service._apply(states, _log(2, "UPDATE", {"task_status": "阻塞"}))
+        assert states[1] == {"id": 1, "task_status": "研发进行中", "progress_percentage": 0}
+        assert states[2] == {"id": 2, "task_status": "阻塞"}
+
+        self.service._apply(states, _log(1, "DELETE"))
+        assert 1 not in states
+
+    @pytest.mark.asyncio
+    async def test_state_as_of_starts_from_checkpoint(self):
+        checkpoint = SimpleNamespace(id=7, checkpoint_at=datetime(2025, 3, 1, tzinfo=timezone.utc))
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[
+            _result(scalar=checkpoint),
+            _result(rows=[SimpleNamespace(record_id=1, state={"id": 1, "app_name": "old"})]),
+            _result(rows=[_log(1, "UPDATE", {"app_name": "new"}, day=2), _log(2, "INSERT", {"id": 2}, day=3)]),
+        ])
+
+        state = await self.service.get_state_as_of(db, "applications", datetime(2025, 3, 5), [2, 1])
+
+        assert state["checkpoint_at"] == checkpoint.checkpoint_at
+        assert state["as_of"].tzinfo is timezone.utc
+        assert state["replayed_changes"] == 2
+        assert state["records"] == {1: {"id": 1, "app_name": "new"}, 2: {"id": 2}}
+        # Latest checkpoint, its records and one delta page
+        assert db.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_state_as_of_rejects_unaudited_tables(self):
+        with pytest.raises(ValidationError):
+            await self.service.get_state_as_of(Mock(), "users", datetime(2025, 3, 5))
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_copies_rows_in_batches(self, table_session, monkeypatch):
+        table_session.add_all([
+            Application(id=app_id, l2_id=f"L2_{app_id:03d}", app_name=f"App {app_id}",
+                        current_status=ApplicationStatus.NOT_STARTED, created_by=1, updated_by=1)
+            for app_id in range(1, 6)
+        ])
+        await table_session.commit()
+        monkeypatch.setattr(self.service, "CHECKPOINT_BATCH_SIZE", 2)
+
+        checkpoint = await self.service.create_checkpoint(table_session, "applications")
+
+        assert checkpoint.record_count == 5
+        records = (await table_session.execute(
+            select(AuditCheckpointRecord).order_by(AuditCheckpointRecord.record_id)
+        )).scalars().all()
+        assert [record.record_id for record in records] == [1, 2, 3, 4, 5]
+        assert records[4].state["l2_id"] == "L2_005"
+
+    @pytest.mark.asyncio
+    async def test_subtasks_as_of_replays_only_candidates(self, table_session, monkeypatch):
+        def audit(record_id, operation, day, old=None, new=None):
+            return AuditLog(table_name="sub_tasks", record_id=record_id, operation=operation,
+                            old_values=old, new_values=new, created_at=datetime(2025, 3, day, tzinfo=timezone.utc))
+
+        table_session.add_all([
+            audit(1, "INSERT", 1, new={"id": 1, "l2_id": 1, "version_name": "v1"}),
+            audit(2, "INSERT", 1, new={"id": 2, "l2_id": 1, "version_name": "v2"}),
+            audit(3, "INSERT", 1, new={"id": 3, "l2_id": 3, "version_name": "v3"}),
+            # After as_of: subtask 2 moves to application 2 and subtask 1 is deleted
+            audit(2, "UPDATE", 3, old={"l2_id": 1}, new={"l2_id": 2}),
+            audit(1, "DELETE", 3, old={"id": 1, "l2_id": 1, "version_name": "v1"}),
+            SubTask(id=2, l2_id=2, version_name="v2", created_by=1, updated_by=1),
+            SubTask(id=3, l2_id=3, version_name="v3", created_by=1, updated_by=1),
+        ])
+        await table_session.commit()
+        replayed = []
+        get_state_as_of = self.service.get_state_as_of
+
+        async def spy(db, table_name, as_of, record_ids=None):
+            replayed.append(sorted(record_ids))
+            return await get_state_as_of(db, table_name, as_of, record_ids)
+
+        monkeypatch.setattr(self.service, "get_state_as_of", spy)
+
+        subtasks = await self.service.get_subtasks_as_of(table_session, [1], datetime(2025, 3, 2))
+
+        assert replayed == [[1, 2]]
+        assert [values["version_name"] for values in subtasks[1]] == ["v1", "v2"]
+
+    @pytest.mark.asyncio
+    async def test_replay_covers_changes_stamped_before_checkpoint(self, table_session):
+        checkpoint_at = datetime(2025, 3, 2, 12, 0, tzinfo=timezone.utc)
+        checkpoint = AuditCheckpoint(table_name="applications", checkpoint_at=checkpoint_at, record_count=1)
+        table_session.add(checkpoint)
+        await table_session.flush()
+        table_session.add_all([
+            AuditCheckpointRecord(checkpoint_id=checkpoint.id, record_id=1, state={"id": 1, "app_name": "old"}),
+            # Recorded before checkpoint_at but committed after the copy was read
+            AuditLog(table_name="applications", record_id=1, operation="UPDATE", new_values={"app_name": "new"},
+                     created_at=checkpoint_at - timedelta(seconds=10)),
+        ])
+        await table_session.commit()
+
+        state = await self.service.get_state_as_of(table_session, "applications", datetime(2025, 3, 3))
+
+        assert state["checkpoint_at"].replace(tzinfo=timezone.utc) == checkpoint_at
+        assert state["records"] == {1: {"id": 1, "app_name": "new"}}
@@ -0,0 +1,97 @@
+"""
+Unit tests for the audit statistics rollups
+"""
+
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.audit_log import AuditLog
+from app.models.audit_rollup import AuditBulkMinute, AuditHourlyRollup, AuditRollupState
+from app.models.user import User
+from app.services.audit_rollup_service import AuditRollupService, floor_hour
+
+NOW = datetime(2025, 3, 10, 12, 20, tzinfo=timezone.utc)
+SQLITE_TABLES = [User.__table__, AuditLog.__table__, AuditHourlyRollup.__table__,
+                 AuditBulkMinute.__table__, AuditRollupState.__table__]
+
+
+@pytest_asyncio.fixture
+async def db(table_session):
+    # Yesterday: a bulk burst by user 1 and an UPDATE without changed_fields by the system
+    burst = NOW - timedelta(days=1)
+    table_session.add_all([
+        AuditLog(table_name="sub_tasks", record_id=i, operation="UPDATE", user_id=1,
+                 changed_fields=["task_status"], new_values={"task_status": "研发进行中"},
+                 created_at=burst.replace(second=i))
+        for i in range(12)
+    ])
+    table_session.add(AuditLog(table_name="applications", record_id=1, operation="UPDATE",
+                               new_values={"current_status": "全部完成"}, created_at=burst - timedelta(hours=3)))
+    # The current, partial hour
+    table_session.add_all([
+        AuditLog(table_name="applications", record_id=i, operation="INSERT", user_id=2,
+                 created_at=NOW - timedelta(minutes=i))
+        for i in range(3)
+    ])
+    await table_session.commit()
+    return table_session
+
+
+def _window():
+    return {
+        "start_at": NOW - timedelta(days=7),
+        "end_at": NOW + timedelta(days=1),
+        "hourly_start_at": NOW - timedelta(days=7),
+    }
+
+
+class TestAuditRollups:
+    """Rollups answer the same as raw scans, before and after the watermark."""
+
+    @pytest.mark.asyncio
+    async def test_summary_matches_raw_scan_after_refresh(self, db):
+        service = AuditRollupService()
+        raw = await service.summarize(db, **_window())
+
+        result = await service.refresh(db, until=NOW)
+
+        assert result == {"rolled_through": floor_hour(NOW).isoformat(), "hours": 27}
+        assert await service.summarize(db, **_window()) == raw
+        assert raw["total_logs"] == 16
+        assert raw["by_operation"] == {"UPDATE": 13, "INSERT": 3}
+        assert raw["by_user"] == {1: 12, 2: 3}
+        assert raw["logs_without_user"] == 1
+        assert raw["logs_with_changes_but_no_fields"] == 1
+        assert raw["by_hour"] == {9: 1, 12: 15}
+
+        # Only the settled hours were rolled up; the current hour is still scanned
+        rollups = (await db.execute(select(AuditHourlyRollup))).scalars().all()
+        assert sum(rollup.log_count for rollup in rollups) == 13
+
+    @pytest.mark.asyncio
+    async def test_refresh_is_incremental_and_idempotent(self, db):
+        service = AuditRollupService()
+        await service.refresh(db, until=NOW)
+
+        assert (await service.refresh(db, until=NOW))["hours"] == 0
+        assert (await service.refresh(db, until=NOW + timedelta(hours=1)))["hours"] == 1
+        assert await service.get_watermark(db) == floor_hour(NOW) + timedelta(hours=1)
+        assert (await service.summarize(db, **_window()))["total_logs"] == 16
+
+        await service.rebuild(db, NOW - timedelta(days=2))
+        assert (await service.summarize(db, **_window()))["total_logs"] == 16
+
+    @pytest.mark.asyncio
+    async def test_bulk_minutes(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "AUDIT_BULK_MINUTE_THRESHOLD", 10)
+        service = AuditRollupService()
+        start_at, end_at = NOW - timedelta(days=7), NOW + timedelta(days=1)
+
+        raw = await service.bulk_minutes(db, start_at, end_at)
+        await service.refresh(db, until=NOW)
+
+        assert await service.bulk_minutes(db, start_at, end_at) == raw
+        assert [(bulk["user_id"], bulk["count"]) for bulk in raw] == [(1, 12)]
@@ -383,24 +383,51 @@ class TestAuthService:
             session_id
         )
         
-        # Mock implementation would return True
-        assert is_valid is not None
+        assert is_valid["valid"] is True
+        assert is_valid["user_id"] == 1
+        assert is_valid["ip_address"] == "192.168.1.1"
+        assert await self.auth_service.validate_session(self.mock_db, "unknown") is None
 
     @pytest.mark.asyncio
     async def test_logout(self):
         """Test user logout and session invalidation."""
-        # Mock session
-        session_id = "session_123"
-        
+        user = Mock(spec=User)
+        user.id = 2
+        user.employee_id = "EMP008"
+        session_id = await self.auth_service.create_session(
+            self.mock_db, user, ip_address="192.168.1.1", user_agent="Mozilla/5.0"
+        )
+
+        # Another user cannot end the session
+        assert await self.auth_service.logout(self.mock_db, session_id, user_id=99) is False
+        assert await self.auth_service.validate_session(self.mock_db, session_id) is not None
+
         # Logout
         result = await self.auth_service.logout(
             self.mock_db,
-            session_id
+            session_id,
+            user_id=user.id
         )
-        
+
         # Verify session invalidated
         assert result is True
-        assert self.mock_db.commit.called
+        assert await self.auth_service.validate_session(self.mock_db, session_id) is None
+        assert await self.auth_service.logout(self.mock_db, session_id, user_id=user.id) is False
+
+    @pytest.mark.asyncio
+    async def test_logout_all(self):
+        """Test ending every session of a user."""
+        user = Mock(spec=User)
+        user.id = 3
+        user.employee_id = "EMP009"
+        session_ids = [
+            await self.auth_service.create_session(self.mock_db, user, "192.168.1.1", "Mozilla/5.0")
+            for _ in range(3)
+        ]
+
+        assert await self.auth_service.logout_all(self.mock_db, user.id) == 3
+        for session_id in session_ids:
+            assert await self.auth_service.validate_session(self.mock_db, session_id) is None
 
     @pytest.mark.asyncio
     async def test_token_response_time(self):
@@ -2,17 +2,26 @@
 Unit tests for Excel service
 """
 
+import asyncio
 import pytest
+import pytest_asyncio
 import pandas as pd
 from datetime import date, datetime
 from unittest.mock import Mock, patch, AsyncMock
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 import io
+import os
+import tempfile
 
-from app.services.excel_service import ExcelService, ExcelMappingConfig, ExcelValidationError
+from app.services.excel_service import (
+    ExcelService, ExcelMappingConfig, ExcelValidationError, build_export_workbook
+)
 from app.models.application import Application, ApplicationStatus, TransformationTarget
 from app.models.subtask import SubTask, SubTaskStatus
 from app.models.user import User, UserRole
+from app.models.application_stats import ApplicationStats
+
+SQLITE_TABLES = [User.__table__, Application.__table__, SubTask.__table__, ApplicationStats.__table__]
 
 
 class TestExcelService:
@@ -228,6 +237,25 @@ class TestExcelService:
         error_messages = [e['message'] for e in errors]
         assert any('L2 ID重复' in msg for msg in error_messages)
 
+    @pytest.mark.asyncio
+    async def test_validate_applications_data_errors_serialize(self):
+        """Test validation errors can be returned in the import result."""
+        from app.schemas.excel import ExcelImportResult
+
+        service = ExcelService()
+        df = pd.DataFrame({
+            'l2_id': ['L2_APP_001', None, 'L2_APP_003'],
+            'app_name': ['Test App 1', 'Test App 2', 'Test App 3'],
+            'progress_percentage': [50, 150, -10]
+        })
+        errors = await service._validate_applications_data(self.mock_db, df)
+
+        result = ExcelImportResult(success=False, total_rows=3, errors=errors)
+        payload = result.model_dump_json()
+
+        assert [error.value for error in result.errors if error.column == '进度百分比'] == [150, -10]
+        assert '"value":150' in payload
+
     @pytest.mark.asyncio
     async def test_validate_subtasks_data_success(self):
         """Test successful subtask data validation."""
@@ -411,7 +439,6 @@ class TestExcelService:
         assert len(template_data) > 0
 
         # Test that it's valid Excel data
-        from openpyxl import load_workbook
         workbook = load_workbook(io.BytesIO(template_data))
         assert workbook.active.title == "应用导入模板"
 
@@ -424,7 +451,6 @@ class TestExcelService:
         assert len(template_data) > 0
 
         # Test that it's valid Excel data
-        from openpyxl import load_workbook
         workbook = load_workbook(io.BytesIO(template_data))
         assert workbook.active.title == "子任务导入模板"
 
@@ -437,7 +463,6 @@ class TestExcelService:
         assert len(template_data) > 0
 
         # Test that it's valid Excel data
-        from openpyxl import load_workbook
         workbook = load_workbook(io.BytesIO(template_data))
         sheet_names = workbook.sheetnames
         assert "应用列表" in sheet_names
@@ -450,6 +475,23 @@ class TestExcelService:
         with pytest.raises(ValueError, match="Unknown template type"):
             service.generate_import_template("invalid_type")
 
+    def _upsert_db(self, *statement_flags):
+        """Mock PostgreSQL session; each upsert reports the next list of (xmax = 0) flags."""
+        self.mock_db.get_bind = Mock(return_value=Mock(dialect=Mock()))
+        self.mock_db.get_bind.return_value.dialect.name = "postgresql"
+        results = []
+        for inserted_flags in statement_flags:
+            mock_result = Mock()
+            mock_result.scalars.return_value = iter(inserted_flags)
+            results.append(mock_result)
+        self.mock_db.execute.side_effect = results
+        return self.mock_db
+
+    def _executed_sql(self, call_index=0):
+        from sqlalchemy.dialects import postgresql
+        statement = self.mock_db.execute.await_args_list[call_index].args[0]
+        return str(statement.compile(dialect=postgresql.dialect()))
+
     @pytest.mark.asyncio
     async def test_import_applications_data_new_records(self):
         """Test importing new application records."""
@@ -465,18 +507,21 @@ class TestExcelService:
         }
         df = pd.DataFrame(test_data)
 
-        # Mock database - no existing application
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = None
-        self.mock_db.execute.return_value = mock_result
+        # Mock database - the upsert inserted the row
+        db = self._upsert_db([True])
 
-        result = await service._import_applications_data(self.mock_db, df, self.mock_user)
+        result = await service._import_applications_data(db, df, self.mock_user)
 
         assert result['imported'] == 1
         assert result['updated'] == 0
         assert result['skipped'] == 0
-        self.mock_db.add.assert_called_once()
-        self.mock_db.commit.assert_called_once()
+        db.add.assert_not_called()
+        db.execute.assert_awaited_once()
+        db.commit.assert_called_once()
+
+        sql = self._executed_sql()
+        assert "ON CONFLICT (l2_id) DO UPDATE" in sql
+        assert "RETURNING (xmax = 0) AS inserted" in sql
 
     @pytest.mark.asyncio
     async def test_import_applications_data_update_existing(self):
@@ -493,19 +538,132 @@ class TestExcelService:
         }
         df = pd.DataFrame(test_data)
 
-        # Mock existing application
-        mock_app = Mock(spec=Application)
-        mock_app.l2_id = 'L2_APP_001'
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = mock_app
-        self.mock_db.execute.return_value = mock_result
+        # Mock database - the upsert hit an existing row
+        db = self._upsert_db([False])
 
-        result = await service._import_applications_data(self.mock_db, df, self.mock_user)
+        result = await service._import_applications_data(db, df, self.mock_user)
 
         assert result['imported'] == 0
         assert result['updated'] == 1
         assert result['skipped'] == 0
-        self.mock_db.commit.assert_called_once()
+        db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_import_applications_data_keeps_values_for_blank_cells(self):
+        """Blank cells must not overwrite stored values on update."""
+        service = ExcelService()
+        df = pd.DataFrame({
+            'l2_id': ['L2_APP_001', None, 'L2_APP_002'],
+            'app_name': ['', 'Skipped', 'Named'],
+            'notes': [float('nan'), 'x', 'note'],
+        })
+        db = self._upsert_db([False], [True])
+
+        result = await service._import_applications_data(db, df, self.mock_user)
+
+        assert result == {'imported': 1, 'updated': 1, 'skipped': 1}
+        # One statement per set of blank default columns: app_name blank vs present
+        assert db.execute.await_count == 2
+        blank_name_sql = self._executed_sql(0)
+        assert "notes = coalesce(excluded.notes, applications.notes)" in blank_name_sql
+        assert "app_name = excluded.app_name" not in blank_name_sql
+        assert "l2_id = excluded.l2_id" not in blank_name_sql
+        assert "app_name = excluded.app_name" in self._executed_sql(1)
+
+    def test_application_import_columns_merges_duplicate_l2_ids(self):
+        """Repeated L2 IDs collapse into one row, later non-blank cells winning."""
+        service = ExcelService()
+        df = pd.DataFrame({
+            'l2_id': ['L2_A', 'L2_B', 'L2_A'],
+            'app_name': ['first', 'b', None],
+            'notes': [None, None, 'later'],
+            'planned_release_date': ['2025/01/02', 'bad', datetime(2025, 3, 4, 5)],
+            'ak_supervision_acceptance_year': ['2025年', 2024.0, None],
+        })
+
+        columns, skipped, merged = service._application_import_columns(df)
+
+        assert (skipped, merged) == (0, 1)
+        assert columns['l2_id'] == ['L2_A', 'L2_B']
+        assert columns['app_name'] == ['first', 'b']
+        assert columns['notes'] == ['later', None]
+        assert columns['planned_release_date'] == [date(2025, 3, 4), None]
+        assert columns['ak_supervision_acceptance_year'] == [2025, 2024]
+        # Insert-default columns are present even when the sheet lacks them
+        assert columns['current_status'] == [None, None]
+
+    def _copy_db(self, existing_apps, placeholder_apps, merge_counts):
+        """Mock PostgreSQL session for the subtask bulk loader."""
+        from sqlalchemy.dialects import postgresql
+        self.mock_db.get_bind = Mock(return_value=Mock(dialect=postgresql.dialect()))
+
+        raw_connection = Mock()
+        raw_connection.driver_connection.copy_records_to_table = AsyncMock()
+        connection = AsyncMock()
+        connection.get_raw_connection.return_value = raw_connection
+        self.mock_db.connection.return_value = connection
+
+        results = []
+        for rows in (existing_apps, placeholder_apps):
+            mock_result = Mock()
+            mock_result.all.return_value = rows
+            results.append(mock_result)
+        merge_result = Mock()
+        merge_result.one.return_value = merge_counts
+        results.extend([Mock(), merge_result])
+        self.mock_db.execute.side_effect = results
+        return self.mock_db, raw_connection.driver_connection
+
+    @pytest.mark.asyncio
+    async def test_import_subtasks_data_copies_and_merges(self):
+        """Subtasks are staged with one COPY and merged with one statement."""
+        service = ExcelService()
+        df = pd.DataFrame({
+            'l2_id': [' L2_APP_001', 'L2_NEW', None, 'L2_APP_001'],
+            'sub_target': ['AK', None, 'AK', 'AK'],
+            'version_name': ['v1', '', 'v9', 'v1'],
+            'task_status': ['研发进行中', None, None, None],
+            'planned_requirement_date': ['2025/02/03', None, None, None],
+            'ops_requirement_submitted': ['已完成', pd.Timestamp('2025-01-01 10:00'), None, None],
+        })
+        db, asyncpg_connection = self._copy_db([(1, 'L2_APP_001')], [(2, 'L2_NEW')], (1, 1))
+
+        with patch('app.services.application_stats_service.application_stats_service.refresh_applications',
+                   new_callable=AsyncMock) as refresh, \
+                patch('app.services.calculation_engine.CalculationEngine.recalculate_applications',
+                      new_callable=AsyncMock) as recalculate:
+            result = await service._import_subtasks_data(db, df, self.mock_user)
+
+        # The repeated L2_APP_001/AK/v1 row updates the first one
+        assert result == {'imported': 1, 'updated': 2, 'skipped': 1}
+        assert db.execute.await_count == 4
+        db.add.assert_not_called()
+        db.commit.assert_awaited_once()
+        assert set(refresh.await_args.args[1]) == {1, 2}
+        # One set-based recalculation for all affected applications
+        recalculate.assert_awaited_once()
+        assert set(recalculate.await_args.args[1]) == {1, 2}
+
+        copy_call = asyncpg_connection.copy_records_to_table.await_args
+        assert copy_call.args[0] == service.SUBTASK_STAGING_TABLE
+        records = [dict(zip(copy_call.kwargs['columns'], record)) for record in copy_call.kwargs['records']]
+        assert [(r['l2_id'], r['sub_target'], r['version_name']) for r in records] == [
+            (1, 'AK', 'v1'), (2, 'AK', None)
+        ]
+        assert records[0]['planned_requirement_date'] == date(2025, 2, 3)
+        assert records[0]['ops_requirement_submitted'] is None
+        assert records[1]['ops_requirement_submitted'] == datetime(2025, 1, 1, 10, 0)
+        assert records[1]['task_status'] is None
+
+    def test_subtask_merge_sql_keeps_values_for_blank_cells(self):
+        """Blank staged cells fall back to the stored value, then to the insert default."""
+        sql = ExcelService()._subtask_merge_sql()
+
+        assert "ON CONFLICT (l2_id, (coalesce(sub_target, '')), (coalesce(version_name, '')))" in sql
+        assert "COALESCE(s.notes, t.notes)" in sql
+        assert "COALESCE(s.task_status, t.task_status, :default_task_status)" in sql
+        assert "sub_target = EXCLUDED.sub_target" not in sql
+        assert "RETURNING (xmax = 0)" in sql
 
     @pytest.mark.asyncio
     async def test_get_applications_for_export_with_filters(self):
@@ -562,6 +720,131 @@ class TestExcelService:
         assert result == mock_subtasks
         self.mock_db.execute.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_stream_workbook_round_trip(self):
+        """Test streaming workbook writer output."""
+        service = ExcelService()
+        service.EXPORT_CHUNK_SIZE = 1024
+
+        async def rows():
+            for i in range(3000):
+                yield [i, f"L2_{i:05d}", "应用", "", date(2025, 1, 2)]
+
+        chunks = [
+            chunk async for chunk in service.stream_workbook(
+                "应用列表", ["ID", "L2_ID", "名称", "空", "日期"], rows()
+            )
+        ]
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 1024 for chunk in chunks)
+
+        workbook = load_workbook(io.BytesIO(b"".join(chunks)))
+        worksheet = workbook["应用列表"]
+        assert worksheet.max_row == 3001
+        assert [cell.value for cell in worksheet[1]] == ["ID", "L2_ID", "名称", "空", "日期"]
+        assert worksheet["B3001"].value == "L2_02999"
+        assert worksheet["D2"].value is None
+        assert worksheet.column_dimensions["B"].width >= 10
+
+    @pytest.mark.asyncio
+    async def test_stream_workbook_removes_temp_file(self):
+        """Test the temporary workbook is removed even if the consumer stops early."""
+        service = ExcelService()
+        created = []
+
+        original_mkstemp = tempfile.mkstemp
+
+        def tracking_mkstemp(*args, **kwargs):
+            fd, path = original_mkstemp(*args, **kwargs)
+            created.append(path)
+            return fd, path
+
+        async def rows():
+            yield [1]
+
+        with patch("app.services.excel_service.tempfile.mkstemp", side_effect=tracking_mkstemp):
+            stream = service.stream_workbook("Sheet", ["ID"], rows())
+            await stream.__anext__()
+            await stream.aclose()
+
+        assert created and not os.path.exists(created[0])
+
+    def test_detect_header_row_skips_statistics_rows(self):
+        """Test header detection on leading value tuples."""
+        rows = [
+            ("表格使用说明", None, None),
+            ("本月计划", 12, 3),
+            ("L2ID", "L2应用", "子目标", "版本名", "改造状态", "【计划】\n发版时间"),
+            ("L2_00001", "应用", "AK", "v1", "研发进行中", date(2025, 1, 1)),
+        ]
+
+        header_row, headers = self.excel_service._detect_header_row(rows)
+
+        assert header_row == 3
+        assert headers[:2] == ["L2ID", "L2应用"]
+
+    def test_worksheet_to_dataframe_read_only(self):
+        """Test parsing a read-only worksheet past the scanned header rows."""
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet.append(["L2ID", "L2应用", "子目标", "版本名", "改造状态", "资源是否申请"])
+        for i in range(50):
+            worksheet.append([f"L2_{i:05d}", "应用", "AK", "v1", "研发进行中", "是" if i % 2 else "否"])
+        worksheet.append([])
+        worksheet.append([None, None, None, None, "研发进行中", None])
+        output = io.BytesIO()
+        workbook.save(output)
+
+        read_only_workbook = self.excel_service._load_workbook(output.getvalue())
+        df = self.excel_service._worksheet_to_dataframe(
+            read_only_workbook.active, self.config.SUBTASK_FIELDS
+        )
+        read_only_workbook.close()
+
+        assert len(df) == 51
+        assert list(df.columns[:3]) == ["l2_id", "app_name", "sub_target"]
+        assert df.iloc[49]["l2_id"] == "L2_00049"
+        assert df.iloc[1]["resource_applied"] is True
+        assert df.iloc[50]["l2_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_run_in_worker_thread_fallback(self):
+        """Test workbook generation runs in a thread when the process pool is disabled."""
+        with patch("app.services.excel_service.settings") as mock_settings:
+            mock_settings.EXCEL_WORKER_POOL_SIZE = 0
+            content = await self.excel_service._run_in_worker(
+                build_export_workbook, "子任务列表", ["L2ID", "子目标"], [["L2_00001", "AK"]]
+            )
+
+        worksheet = load_workbook(io.BytesIO(content))["子任务列表"]
+        assert [cell.value for cell in worksheet[2]] == ["L2_00001", "AK"]
+
+    @pytest.mark.asyncio
+    async def test_import_slot_limits_concurrent_imports(self):
+        """Test imports beyond EXCEL_MAX_CONCURRENT_IMPORTS wait for a free slot."""
+        running = 0
+        peak = 0
+
+        async def fake_import(*args):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {'success': True}
+
+        with patch("app.services.excel_service.settings") as mock_settings, \
+                patch.object(self.excel_service, "_import_applications_from_excel", side_effect=fake_import):
+            mock_settings.EXCEL_MAX_CONCURRENT_IMPORTS = 1
+            results = await asyncio.gather(*[
+                self.excel_service.import_applications_from_excel(self.mock_db, b"", self.mock_user)
+                for _ in range(3)
+            ])
+
+        assert all(result['success'] for result in results)
+        assert peak == 1
+
 
 class TestExcelValidationError:
     """Test Excel validation error class."""
@@ -589,4 +872,53 @@ class TestExcelValidationError:
         assert error.row is None
         assert error.column is None
         assert error.sheet is None
-        assert str(error) == "General error"
\ No newline at end of file
+        assert str(error) == "General error"
+
+@pytest_asyncio.fixture
+async def sqlite_db(table_session):
+    table_session.add(Application(
+        id=1, l2_id="L2_APP_001", app_name="App 1",
+        current_status=ApplicationStatus.NOT_STARTED, created_by=1, updated_by=1
+    ))
+    table_session.add(SubTask(
+        id=1, l2_id=1, sub_target="AK", version_name="v1", task_status="待启动",
+        progress_percentage=0, is_blocked=False, resource_applied=False,
+        notes="保留", created_by=1, updated_by=1, lock_version=1
+    ))
+    await table_session.commit()
+    return table_session
+
+
+class TestSubtaskImportSqlite:
+    """The subtask import merges on the import key on SQLite as well."""
+
+    @pytest.mark.asyncio
+    async def test_import_subtasks_data_upserts(self, sqlite_db):
+        from sqlalchemy import func, select
+
+        df = pd.DataFrame({
+            'l2_id': ['L2_APP_001', 'L2_NEW', 'L2_APP_001', None],
+            'sub_target': ['AK', None, '云原生', 'AK'],
+            'version_name': ['v1', 'v2', None, 'v9'],
+            'task_status': ['研发进行中', None, None, None],
+            'notes': [None, '新建', None, None],
+        })
+
+        result = await ExcelService()._import_subtasks_data(sqlite_db, df, Mock(id=1))
+
+        assert result == {'imported': 2, 'updated': 1, 'skipped': 1}
+        rows = (await sqlite_db.execute(
+            select(Application.l2_id, SubTask.sub_target, SubTask.version_name, SubTask.task_status, SubTask.notes)
+            .join(Application, SubTask.l2_id == Application.id)
+            .order_by(SubTask.id)
+        )).all()
+        assert [tuple(row) for row in rows] == [
+            ('L2_APP_001', 'AK', 'v1', '研发进行中', '保留'),
+            ('L2_NEW', 'AK', 'v2', '待启动', '新建'),
+            ('L2_APP_001', '云原生', None, '待启动', None),
+        ]
+
+        # Importing the same sheet again only updates
+        result = await ExcelService()._import_subtasks_data(sqlite_db, df, Mock(id=1))
+        assert result == {'imported': 0, 'updated': 3, 'skipped': 1}
+        assert (await sqlite_db.execute(select(func.count(SubTask.id)))).scalar_one() == 3
@@ -0,0 +1,124 @@
+"""
+50k-row benchmark for Excel import validation
+"""
+
+import io
+import time
+import contextlib
+from datetime import date
+from unittest.mock import AsyncMock, Mock
+
+import pandas as pd
+import pytest
+
+from app.services.excel_service import ExcelService
+
+
+ROW_COUNT = 50000
+
+
+def _applications_frame(row_count):
+    """Applications sheet with a sprinkling of values that need normalizing or fail validation."""
+    return pd.DataFrame({
+        'l2_id': [None if i % 1000 == 0 else f' L2_{i:06d} ' for i in range(row_count)],
+        'app_name': [f'应用{i}' for i in range(row_count)],
+        'ak_supervision_acceptance_year': ['2025年' if i % 2 else 2026 for i in range(row_count)],
+        'overall_transformation_target': [('cloud_native', 'AK', '未知')[i % 3] for i in range(row_count)],
+        'current_status': [('completed', '研发进行中', None, 'bad')[i % 4] for i in range(row_count)],
+        'app_tier': [('第一级', ' 2级 ', 3)[i % 3] for i in range(row_count)],
+        'progress_percentage': [150 if i % 500 == 0 else i % 100 for i in range(row_count)],
+    })
+
+
+def _subtasks_frame(row_count):
+    """Subtasks sheet; every 1000th row has no L2 ID and rows 2 and 3 are duplicates."""
+    df = pd.DataFrame({
+        'l2_id': [None if i % 1000 == 0 else f'L2_{i // 4:06d}' for i in range(row_count)],
+        'sub_target': [('AK', 'cloud_native', 'bad', None)[i % 4] for i in range(row_count)],
+        'version_name': [f'v{i}' for i in range(row_count)],
+        'task_status': [('dev_in_progress', '子任务完成', None, '阻塞', '未知')[i % 5] for i in range(row_count)],
+        'progress_percentage': [None if i % 2 else 50 for i in range(row_count)],
+        'is_blocked': [('是', False, None, 0)[i % 4] for i in range(row_count)],
+        'resource_applied': [('已申请', '否', True)[i % 3] for i in range(row_count)],
+        'planned_requirement_date': [date(2025, 1, 1) if i % 2 else None for i in range(row_count)],
+        'ops_requirement_submitted': [('已提交', None, 'x')[i % 3] for i in range(row_count)],
+        'ops_testing_status': [('已通过', '未开始', None)[i % 3] for i in range(row_count)],
+    })
+    df.loc[3, ['sub_target', 'version_name']] = df.loc[2, ['sub_target', 'version_name']].tolist()
+    return df
+
+
+@pytest.fixture
+def mock_db():
+    db = AsyncMock()
+    result = Mock()
+    result.all.return_value = [(1, 'L2_000001'), (2, 'L2_000002')]
+    db.execute.return_value = result
+    return db
+
+
+class TestExcelValidationBenchmark:
+    """Validation of a 50k-row sheet must stay well within an import request budget."""
+
+    @pytest.mark.asyncio
+    async def test_validate_applications_50k(self, mock_db, capsys):
+        service = ExcelService()
+        df = _applications_frame(ROW_COUNT)
+
+        start_time = time.time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            errors = await service._validate_applications_data(mock_db, df)
+        elapsed = time.time() - start_time
+
+        with capsys.disabled():
+            print(f"\nValidate {ROW_COUNT} application rows: {elapsed:.2f}s, {len(errors)} errors")
+
+        # 50 missing L2 IDs and 100 out-of-range progress values
+        assert len(errors) == 150
+        assert errors[0] == {
+            'row': 2,
+            'column': service._get_column_name('l2_id', service.config.APPLICATION_FIELDS),
+            'message': '必填字段不能为空: l2_id',
+            'value': None
+        }
+        assert errors[1]['message'] == '进度百分比必须在0-100之间'
+        assert df.at[1, 'l2_id'] == 'L2_000001'
+        assert df.at[1, 'ak_supervision_acceptance_year'] == 2025
+        assert df.at[0, 'overall_transformation_target'] == '云原生'
+        assert df.at[2, 'overall_transformation_target'] == 'AK'
+        assert df.at[0, 'current_status'] == '全部完成'
+        assert df.at[3, 'current_status'] == '待启动'
+        assert df.at[1, 'app_tier'] == 2
+        assert elapsed < 10.0
+
+    @pytest.mark.asyncio
+    async def test_validate_subtasks_50k(self, mock_db, capsys):
+        service = ExcelService()
+        df = _subtasks_frame(ROW_COUNT)
+
+        start_time = time.time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            errors = await service._validate_subtasks_data(mock_db, df)
+        elapsed = time.time() - start_time
+
+        with capsys.disabled():
+            print(f"\nValidate {ROW_COUNT} subtask rows: {elapsed:.2f}s, {len(errors)} errors")
+
+        duplicate_rows = {error['row'] for error in errors}
+        assert duplicate_rows == {4, 5}
+        assert errors[0]['value'] == 'L2_000000-AK-v2'
+        # Row without an L2 ID is left untouched
+        assert df.at[0, 'task_status'] == 'dev_in_progress'
+        assert df.at[1, 'sub_target'] == '云原生'
+        assert df.at[2, 'sub_target'] == 'AK'
+        assert df.at[1, 'task_status'] == '子任务完成'
+        assert df.at[2, 'task_status'] == '未开始'
+        assert pd.isna(df.at[3, 'progress_percentage'])  # 阻塞 keeps its progress
+        assert df.at[1, 'progress_percentage'] == 100
+        assert df.at[1, 'is_blocked'] is False
+        assert df.at[4, 'is_blocked'] is True
+        assert df.at[1, 'resource_applied'] is False
+        assert df.at[1, 'planned_requirement_date'] == date(2025, 1, 1)
+        assert df.at[3, 'ops_requirement_submitted'] is None
+        assert df.at[1, 'ops_testing_status'] == '待检查'
+        assert elapsed < 10.0
@@ -0,0 +1,102 @@
+"""
+Unit tests for persisted in-app notifications
+"""
+
+import pytest
+from sqlalchemy import select
+
+from app.models.notification import Notification, NotificationUnreadCount
+from app.models.user import User
+from app.services.in_app_notification_service import InAppNotificationService
+from app.services.notification_service import NotificationService, NotificationType, NotificationPriority
+
+SQLITE_TABLES = [User.__table__, Notification.__table__, NotificationUnreadCount.__table__]
+
+
+@pytest.fixture
+def db(table_session):
+    return table_session
+
+
+class TestInAppNotifications:
+    """Stored notifications and unread counts stay in step."""
+
+    @pytest.mark.asyncio
+    async def test_delivery_stores_rows_and_counts_unread(self, db):
+        service = InAppNotificationService()
+
+        user_ids = await service.resolve_recipients(db, ["alice@example.com", "bob", "nobody@example.com"])
+        ids = await service.deliver(db, sorted(set(user_ids.values())), "Delay", "App is late", "delay_warning")
+        await service.deliver(db, [1], "Status", "Changed", "status_change", content={"entity": "app"})
+        await db.commit()
+
+        assert user_ids == {"alice@example.com": 1, "bob": 2}
+        assert len(ids) == 2
+        assert await service.get_unread_count(db, 1) == 2
+        assert await service.get_unread_count(db, 2) == 1
+        total, rows = await service.list_notifications(db, 1)
+        assert total == 2
+        assert [row.title for row in rows] == ["Status", "Delay"]
+        assert rows[0].content == {"entity": "app"}
+
+    @pytest.mark.asyncio
+    async def test_mark_read_updates_rows_and_counts(self, db):
+        service = InAppNotificationService()
+        ids = []
+        for i in range(3):
+            ids += await service.deliver(db, [1], f"Notice {i}", "text", "custom")
+
+        assert await service.mark_read(db, 1, [ids[0]]) == [ids[0]]
+        # Already read, or another user's: nothing changes
+        assert await service.mark_read(db, 1, [ids[0]]) == []
+        assert await service.mark_read(db, 2, [ids[1]]) == []
+        assert await service.get_unread_count(db, 1) == 2
+
+        assert sorted(await service.mark_all_read(db, 1)) == ids[1:]
+        assert await service.get_unread_count(db, 1) == 0
+        total, _ = await service.list_notifications(db, 1, is_read=False)
+        assert total == 0
+
+    @pytest.mark.asyncio
+    async def test_rebuild_unread_counts(self, db):
+        service = InAppNotificationService()
+        await service.deliver(db, [1, 2], "Notice", "text", "custom")
+        await db.execute(NotificationUnreadCount.__table__.update().values(unread_count=99))
+
+        assert await service.rebuild_unread_counts(db) == 2
+        assert await service.get_unread_count(db, 1) == 1
+
+    @pytest.mark.asyncio
+    async def test_unread_counts_upserted_in_user_order(self, db):
+        service = InAppNotificationService()
+        statements = []
+        execute = db.execute
+
+        async def recording_execute(statement, *args, **kwargs):
+            statements.append(statement)
+            return await execute(statement, *args, **kwargs)
+
+        db.execute = recording_execute
+        await service._increment_unread(db, {2: 1, 1: 3})
+
+        params = statements[0].compile().params
+        assert [params["user_id_m0"], params["user_id_m1"]] == [1, 2]
+        assert await service.get_unread_count(db, 1) == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_in_app_uses_one_insert(self, db):
+        notifications = [
+            {"type": NotificationType.DELAY_WARNING, "recipients": ["alice@example.com", "bob@example.com"],
+             "content": {"title": "Delay", "message": "late"}},
+            {"type": NotificationType.STATUS_CHANGE, "recipients": ["1"],
+             "content": {"title": "Status"}, "priority": NotificationPriority.HIGH},
+        ]
+
+        results = await NotificationService()._batch_send_in_app(db, notifications)
+
+        assert [len(result["notification_ids"]) for result in results] == [2, 1]
+        stored = (await db.execute(select(Notification).order_by(Notification.id))).scalars().all()
+        assert [(row.user_id, row.type, row.priority) for row in stored] == [
+            (1, "delay_warning", "medium"), (2, "delay_warning", "medium"), (1, "status_change", "high")
+        ]
+        assert await InAppNotificationService().get_unread_count(db, 1) == 2
@@ -25,6 +25,8 @@ class TestNotificationService:
         """Setup test environment."""
         self.notification_service = NotificationService()
         self.mock_db = AsyncMock()
+        # Query results are plain objects; recipient lookups find no users
+        self.mock_db.execute.return_value = MagicMock()
         
         # Create mock user
         self.mock_user = Mock(spec=User)
@@ -64,7 +66,7 @@ class TestNotificationService:
         subtask2.block_reason = "Waiting for dependency"
         subtask2.progress_percentage = 30
         
-        app.sub_tasks = [subtask1, subtask2]
+        app.subtasks = [subtask1, subtask2]
         return app
 
     @pytest.mark.asyncio
@@ -234,28 +236,6 @@ class TestNotificationService:
         assert "results" in result
         assert len(result["results"]) > 0
 
-    @pytest.mark.asyncio
-    async def test_check_and_send_scheduled_notifications(self):
-        """Test checking and sending scheduled notifications."""
-        # Mock application query for delay warnings
-        mock_result = Mock()
-        mock_result.scalars.return_value.all.return_value = [self.mock_application]
-        self.mock_db.execute.return_value = mock_result
-        
-        # Check scheduled notifications
-        result = await self.notification_service.check_and_send_scheduled_notifications(
-            db=self.mock_db
-        )
-        
-        # Verify result
-        assert "checked_at" in result
-        assert "scheduled_count" in result
-        assert "sent_count" in result
-        assert "failed_count" in result
-        assert result["scheduled_count"] >= 0
-        assert result["sent_count"] >= 0
-        assert result["failed_count"] >= 0
-
     def test_calculate_delay_severity(self):
         """Test delay severity calculation."""
         # Test different delay ranges
@@ -424,52 +404,6 @@ class TestNotificationService:
         assert key in grouped
         assert len(grouped[key]) == 2
 
-    @pytest.mark.asyncio
-    async def test_check_delay_warnings(self):
-        """Test checking for delay warnings."""
-        # Create delayed application
-        delayed_app = Mock(spec=Application)
-        delayed_app.planned_biz_online_date = date.today() - timedelta(days=7)
-        delayed_app.actual_biz_online_date = None
-        delayed_app.overall_status = ApplicationStatus.DEV_IN_PROGRESS
-        
-        # Mock query
-        mock_result = Mock()
-        mock_result.scalars.return_value.all.return_value = [delayed_app]
-        self.mock_db.execute.return_value = mock_result
-        
-        # Check for warnings
-        warnings = await self.notification_service._check_delay_warnings(self.mock_db)
-        
-        assert len(warnings) > 0
-        assert warnings[0]["type"] == NotificationType.DELAY_WARNING
-        assert warnings[0]["delay_days"] == 7
-
-    @pytest.mark.asyncio
-    async def test_check_milestone_notifications(self):
-        """Test checking for milestone notifications."""
-        # Create application with upcoming milestone
-        app_with_milestone = Mock(spec=Application)
-        app_with_milestone.planned_biz_online_date = date.today() + timedelta(days=5)
-        app_with_milestone.planned_tech_online_date = date.today() + timedelta(days=3)
-        app_with_milestone.planned_release_date = None
-        app_with_milestone.planned_requirement_date = None
-        
-        # Mock query
-        mock_result = Mock()
-        mock_result.scalars.return_value.all.return_value = [app_with_milestone]
-        self.mock_db.execute.return_value = mock_result
-        
-        # Check for milestones
-        notifications = await self.notification_service._check_milestone_notifications(
-            self.mock_db
-        )
-        
-        assert len(notifications) > 0
-        assert notifications[0]["type"] == NotificationType.MILESTONE_REACHED
-        assert "业务上线" in notifications[0]["milestones"]
-        assert "技术上线" in notifications[0]["milestones"]
-
     def test_should_send_periodic_report(self):
         """Test periodic report sending logic."""
         # Test Monday at 9 AM
@@ -547,6 +481,28 @@ class TestNotificationService:
         assert "webhook" in result["results"]
         assert result["results"]["webhook"]["url"] == rule_config["webhook_url"]
 
+    @pytest.mark.asyncio
+    async def test_batch_emails_are_queued_in_one_insert(self):
+        """Batch emails become outbox rows written with one multi-row insert."""
+        notifications = [
+            {
+                "type": NotificationType.DELAY_WARNING,
+                "channel": NotificationChannel.EMAIL,
+                "recipients": [f"user{i}@example.com"],
+                "subject": f"Notification {i}",
+                "content": {"message": f"Message {i}"}
+            }
+            for i in range(3)
+        ]
+
+        results = await self.notification_service._batch_send_emails(self.mock_db, notifications)
+
+        assert all(result["success"] and result["queued"] for result in results)
+        self.mock_db.execute.assert_awaited_once()
+        rows = self.mock_db.execute.await_args.args[1]
+        assert [row["payload"]["subject"] for row in rows] == ["Notification 0", "Notification 1", "Notification 2"]
+        assert {row["channel"] for row in rows} == {"email"}
+
     def test_batch_email_sending(self):
         """Test batch email sending efficiency."""
         # Create large batch of notifications
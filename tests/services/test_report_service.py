@@ -11,6 +11,7 @@ from app.services.report_service import ReportService, ReportType, ChartType
 from app.models.application import Application, ApplicationStatus, TransformationTarget
 from app.models.subtask import SubTask, SubTaskStatus
 from app.models.user import User
+from app.models.metric_snapshot import MetricRollup
 
 
 class TestReportService:
@@ -252,7 +253,22 @@ class TestReportService:
     @pytest.mark.asyncio
     async def test_generate_trend_analysis_report(self):
         """Test trend analysis report generation."""
-        # Generate report (uses simulated data)
+        # Monthly rollups of the supervision year
+        rollups = [
+            MetricRollup(
+                granularity="month", scope="year", scope_key="2024",
+                period_start=date(2024, month, 1), period_end=date(2024, month, 28), sample_count=28,
+                progress_avg=progress - 5, application_count=10, completed_count=completed,
+                active_count=5, delayed_count=2, delay_days=10, subtask_count=50,
+                completed_subtask_count=completed * 5, blocked_count=3,
+                progress=progress, completion_rate=completed * 10.0
+            )
+            for month, progress, completed in [(5, 40.0, 2), (6, 55.0, 4)]
+        ]
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = rollups
+        self.mock_db.execute.return_value = mock_result
+
         report = await self.report_service.generate_trend_analysis_report(
             db=self.mock_db,
             supervision_year=2024,
@@ -272,14 +288,15 @@ class TestReportService:
         trend_data = report["trend_data"]
         assert "progress" in trend_data
         assert "completion_rate" in trend_data
+        assert trend_data["progress"] == {"2024/05": 40.0, "2024/06": 55.0}
+        assert trend_data["completion_rate"] == {"2024/05": 20.0, "2024/06": 40.0}
+        self.mock_db.execute.assert_called_once()
 
         # Verify trend indicators
         indicators = report["trend_indicators"]
-        for metric in ["progress", "completion_rate"]:
-            if metric in indicators:
-                assert "current_value" in indicators[metric]
-                assert "previous_value" in indicators[metric]
-                assert "trend" in indicators[metric]
+        assert indicators["progress"]["current_value"] == 55.0
+        assert indicators["progress"]["previous_value"] == 40.0
+        assert indicators["progress"]["trend"] == "up"
 
     @pytest.mark.asyncio
     async def test_generate_custom_report(self):
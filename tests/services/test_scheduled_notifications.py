@@ -0,0 +1,98 @@
+"""
+Unit tests for the set-based scheduled notification scanner
+"""
+
+from datetime import date, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, func
+
+from app.models.application import Application, ApplicationStatus
+from app.models.notification import Notification, NotificationUnreadCount
+from app.models.notification_outbox import NotificationOutbox
+from app.models.scheduled_notification import ScheduledNotificationLedger
+from app.models.subtask import SubTask
+from app.models.user import User
+from app.services.notification_service import NotificationService
+
+SQLITE_TABLES = [
+    User.__table__, Application.__table__, SubTask.__table__, Notification.__table__,
+    NotificationUnreadCount.__table__, NotificationOutbox.__table__, ScheduledNotificationLedger.__table__,
+]
+
+
+def _app(app_id, **dates):
+    return Application(
+        id=app_id, l2_id=f"L2_{app_id:03d}", app_name=f"App {app_id}", dev_owner="alice",
+        dev_team="core", current_status=dates.pop("status", ApplicationStatus.DEV_IN_PROGRESS),
+        created_by=1, updated_by=1, **dates
+    )
+
+
+@pytest_asyncio.fixture
+async def db(table_session):
+    today = date.today()
+    table_session.add_all([
+        _app(1, planned_biz_online_date=today - timedelta(days=14)),
+        _app(2, planned_biz_online_date=today - timedelta(days=15)),
+        _app(3, planned_biz_online_date=today - timedelta(days=30), status=ApplicationStatus.COMPLETED),
+        _app(4, planned_tech_online_date=today + timedelta(days=3),
+             planned_release_date=today + timedelta(days=7),
+             planned_requirement_date=today + timedelta(days=8)),
+    ])
+    table_session.add_all([
+        SubTask(id=1, l2_id=1, version_name="v1", task_status="子任务完成", is_blocked=False,
+                created_by=1, updated_by=1),
+        SubTask(id=2, l2_id=1, version_name="v2", task_status="研发进行中", is_blocked=True,
+                created_by=1, updated_by=1),
+    ])
+    await table_session.commit()
+    return table_session
+
+
+class TestScheduledNotificationScanner:
+    """Thresholds and windows are evaluated in SQL and deduplicated in the ledger."""
+
+    @pytest.mark.asyncio
+    async def test_scan_returns_only_due_tuples(self, db):
+        today = date.today()
+
+        due = await NotificationService()._scan_due_notifications(db, today)
+
+        assert due == [
+            (1, "delay", 14, today - timedelta(days=14)),
+            (4, "release", 7, today + timedelta(days=7)),
+            (4, "tech_online", 7, today + timedelta(days=3)),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_second_run_sends_nothing(self, db):
+        service = NotificationService()
+
+        first = await service.check_and_send_scheduled_notifications(db)
+        await db.commit()
+        second = await service.check_and_send_scheduled_notifications(db)
+
+        # One delay warning and one milestone notification covering two milestones
+        assert (first["scheduled_count"], first["sent_count"], first["failed_count"]) == (2, 2, 0)
+        assert (second["scheduled_count"], second["sent_count"]) == (0, 0)
+        assert (await db.execute(select(func.count()).select_from(ScheduledNotificationLedger))).scalar() == 3
+        outbox = (await db.execute(select(NotificationOutbox).order_by(NotificationOutbox.id))).scalars().all()
+        assert [row.notification_type for row in outbox] == ["delay_warning", "milestone_reached"]
+        assert "技术上线" in outbox[1].payload["body"]
+        assert "50%" in outbox[0].payload["body"]
+        in_app = (await db.execute(select(Notification.type).where(Notification.user_id == 1))).scalars().all()
+        assert sorted(in_app) == ["delay_warning", "milestone_reached"]
+
+    @pytest.mark.asyncio
+    async def test_moved_date_is_notified_again(self, db):
+        service = NotificationService()
+        await service.check_and_send_scheduled_notifications(db)
+
+        app = await db.get(Application, 2)
+        app.planned_biz_online_date = date.today() - timedelta(days=7)
+        await db.flush()
+        result = await service.check_and_send_scheduled_notifications(db)
+
+        assert result["sent_count"] == 1
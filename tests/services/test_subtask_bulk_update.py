@@ -0,0 +1,139 @@
+"""
+Unit tests for set-based subtask bulk updates and the subtask unique key
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.core.exceptions import ValidationError
+from app.models.application import Application, ApplicationStatus
+from app.models.application_stats import ApplicationStats
+from app.models.audit_log import AuditLog
+from app.models.subtask import SubTask, SubTaskStatus
+from app.models.user import User
+from app.schemas.subtask import SubTaskBulkStatusUpdate, SubTaskBulkUpdate, SubTaskUpdate
+from app.services.subtask_service import SubTaskService
+
+SQLITE_TABLES = [
+    User.__table__, Application.__table__, SubTask.__table__, ApplicationStats.__table__, AuditLog.__table__
+]
+
+
+def _subtask(subtask_id, app_id, status, progress, **extra):
+    return SubTask(
+        id=subtask_id, l2_id=app_id, version_name=f"v{subtask_id}", task_status=status,
+        progress_percentage=progress, is_blocked=False, resource_applied=False,
+        created_by=1, updated_by=1, lock_version=1, **extra
+    )
+
+
+@pytest_asyncio.fixture
+async def db(table_session):
+    table_session.add_all([
+        Application(
+            id=app_id, l2_id=f"L2_{app_id:03d}", app_name=f"App {app_id}",
+            current_status=ApplicationStatus.NOT_STARTED, created_by=1, updated_by=1
+        )
+        for app_id in (1, 2)
+    ])
+    table_session.add_all([
+        _subtask(1, 1, SubTaskStatus.NOT_STARTED, 0),
+        _subtask(2, 1, SubTaskStatus.DEV_IN_PROGRESS, 45),
+        _subtask(3, 2, SubTaskStatus.NOT_STARTED, 0),
+        _subtask(4, 2, SubTaskStatus.NOT_STARTED, 0),
+    ])
+    await table_session.commit()
+    return table_session
+
+
+async def _subtask_rows(db):
+    result = await db.execute(
+        select(SubTask.id, SubTask.task_status, SubTask.progress_percentage, SubTask.updated_by)
+        .order_by(SubTask.id)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+class TestBulkUpdate:
+    """Bulk updates write subtasks, audit rows and application rollups in a few statements."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_status_update_sets_progress_in_sql(self, db):
+        count = await SubTaskService().bulk_update_status(
+            db, SubTaskBulkStatusUpdate(subtask_ids=[1, 2, 2, 99], new_status=SubTaskStatus.COMPLETED), 2
+        )
+
+        assert count == 2
+        assert await _subtask_rows(db) == [
+            (1, "子任务完成", 100, 2), (2, "子任务完成", 100, 2), (3, "未开始", 0, 1), (4, "未开始", 0, 1),
+        ]
+
+        audit = (await db.execute(select(AuditLog).order_by(AuditLog.record_id))).scalars().all()
+        assert [(row.record_id, row.user_id, row.operation) for row in audit] == [(1, 2, "UPDATE"), (2, 2, "UPDATE")]
+        assert audit[1].old_values == {"task_status": "研发进行中", "progress_percentage": 45}
+        assert audit[1].new_values == {"task_status": "子任务完成", "progress_percentage": 100}
+        assert audit[1].changed_fields == ["task_status", "progress_percentage"]
+
+        stats = await db.get(ApplicationStats, 1)
+        assert (stats.subtask_count, stats.completed_subtask_count) == (2, 2)
+        assert await db.get(ApplicationStats, 2) is None
+        application = await db.get(Application, 1)
+        await db.refresh(application)
+        assert application.current_status == ApplicationStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_blocked_status_keeps_progress(self, db):
+        await SubTaskService().bulk_update_status(
+            db, SubTaskBulkStatusUpdate(subtask_ids=[2, 3], new_status=SubTaskStatus.BLOCKED), 2
+        )
+
+        assert await _subtask_rows(db) == [
+            (1, "未开始", 0, 1), (2, "阻塞", 45, 2), (3, "阻塞", 0, 2), (4, "未开始", 0, 1),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_applies_fields(self, db):
+        count = await SubTaskService().bulk_update_subtasks(
+            db,
+            SubTaskBulkUpdate(
+                subtask_ids=[3, 4],
+                updates=SubTaskUpdate(task_status=SubTaskStatus.DEV_IN_PROGRESS, notes="批量")
+            ),
+            2
+        )
+
+        assert count == 2
+        assert await _subtask_rows(db) == [
+            (1, "未开始", 0, 1), (2, "研发进行中", 45, 1), (3, "研发进行中", 30, 2), (4, "研发进行中", 30, 2),
+        ]
+        notes = (await db.execute(select(SubTask.notes).where(SubTask.l2_id == 2))).scalars().all()
+        assert notes == ["批量", "批量"]
+        assert (await db.get(ApplicationStats, 2)).subtask_count == 2
+        assert await SubTaskService().bulk_update_status(
+            db, SubTaskBulkStatusUpdate(subtask_ids=[], new_status=SubTaskStatus.COMPLETED), 2
+        ) == 0
+
+
+class TestUniqueKey:
+    """Writes that would repeat an application's target and version are rejected, not failed."""
+
+    @pytest.mark.asyncio
+    async def test_clone_twice_into_same_application(self, db):
+        service = SubTaskService()
+        clone = await service.clone_subtask(db, 1, 2, created_by=2)
+
+        assert clone.version_name == "v1_clone"
+        with pytest.raises(ValidationError):
+            await service.clone_subtask(db, 1, 2, created_by=2)
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_to_same_version(self, db):
+        with pytest.raises(ValidationError):
+            await SubTaskService().bulk_update_subtasks(
+                db, SubTaskBulkUpdate(subtask_ids=[3, 4], updates=SubTaskUpdate(version_name="v3")), 2
+            )
+
+        assert await _subtask_rows(db) == [
+            (1, "未开始", 0, 1), (2, "研发进行中", 45, 1), (3, "未开始", 0, 1), (4, "未开始", 0, 1),
+        ]
@@ -0,0 +1,154 @@
+"""
+Unit tests for Trend service
+"""
+
+import pytest
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock
+
+from app.services.trend_service import (
+    TrendService, TrendScope, Granularity, build_snapshot_rows, period_start, shift_periods, iter_periods
+)
+
+
+def _row(**values):
+    """Result row double exposing attributes and _mapping."""
+    return SimpleNamespace(_mapping=values, **values)
+
+
+def _result(rows):
+    result = Mock()
+    result.all.return_value = rows
+    return result
+
+
+def _by_scope(rows):
+    return {(row["scope"], row["scope_key"]): row for row in rows}
+
+
+class TestSnapshotRows:
+    """Aggregation of application states into snapshot rows."""
+
+    def test_build_snapshot_rows(self):
+        apps = [
+            {"id": 1, "dev_team": "A", "ak_supervision_acceptance_year": 2025, "current_status": "全部完成",
+             "is_delayed": False, "delay_days": 0, "subtask_count": 4, "completed_subtask_count": 4,
+             "blocked_subtask_count": 0},
+            {"id": 2, "dev_team": "A", "ak_supervision_acceptance_year": 2025, "current_status": "研发进行中",
+             "is_delayed": True, "delay_days": 12, "subtask_count": 3, "completed_subtask_count": 1,
+             "blocked_subtask_count": 1},
+            {"id": 3, "dev_team": None, "ak_supervision_acceptance_year": None, "current_status": "待启动",
+             "is_delayed": False, "delay_days": 5, "subtask_count": None, "completed_subtask_count": None,
+             "blocked_subtask_count": None},
+        ]
+
+        rows = _by_scope(build_snapshot_rows(date(2025, 3, 1), apps))
+
+        assert set(rows) == {
+            ("overall", ""), ("team", "A"), ("team", "待分配"), ("year", "2025"),
+            ("application", "1"), ("application", "2"), ("application", "3"),
+        }
+        overall = rows[("overall", "")]
+        assert overall["snapshot_date"] == date(2025, 3, 1)
+        assert overall["application_count"] == 3
+        assert overall["completed_count"] == 1
+        assert overall["active_count"] == 1
+        assert overall["delayed_count"] == 1
+        # Delay days only count for delayed applications
+        assert overall["delay_days"] == 12
+        assert overall["blocked_count"] == 1
+        # Mean of 100, 33 and 0
+        assert overall["progress"] == 44.33
+        assert overall["completion_rate"] == 33.33
+        assert rows[("team", "A")]["progress"] == 66.5
+        assert rows[("application", "2")]["progress"] == 33
+
+
+class TestPeriods:
+    """Period arithmetic for rollups."""
+
+    def test_period_start(self):
+        day = date(2025, 8, 14)  # Thursday
+        assert period_start(day, Granularity.DAY) == day
+        assert period_start(day, Granularity.WEEK) == date(2025, 8, 11)
+        assert period_start(day, Granularity.MONTH) == date(2025, 8, 1)
+        assert period_start(day, Granularity.QUARTER) == date(2025, 7, 1)
+
+    def test_shift_periods(self):
+        assert shift_periods(date(2025, 1, 1), Granularity.MONTH, -5) == date(2024, 8, 1)
+        assert shift_periods(date(2025, 10, 1), Granularity.QUARTER, 1) == date(2026, 1, 1)
+        assert shift_periods(date(2025, 8, 11), Granularity.WEEK, -1) == date(2025, 8, 4)
+
+    def test_iter_periods(self):
+        assert list(iter_periods(date(2025, 1, 15), date(2025, 3, 1), Granularity.MONTH)) == [
+            date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1)
+        ]
+
+
+class TestBackfill:
+    """Replaying audit_logs backwards into daily snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_backfill_undoes_newer_changes(self):
+        service = TrendService()
+        service.ensure_partitions = AsyncMock()
+        service.refresh_rollups = AsyncMock(return_value=3)
+        written = []
+
+        async def upsert(db, rows):
+            written.extend(rows)
+            return len(rows)
+        service._upsert_snapshots = upsert
+
+        applications = [
+            _row(id=1, dev_team="A", ak_supervision_acceptance_year=2025, current_status="全部完成",
+                 is_delayed=False, delay_days=0),
+            _row(id=2, dev_team="A", ak_supervision_acceptance_year=2025, current_status="研发进行中",
+                 is_delayed=False, delay_days=0),
+        ]
+        subtasks = [
+            _row(id=10, l2_id=1, task_status="子任务完成", is_blocked=False),
+            _row(id=11, l2_id=2, task_status="研发进行中", is_blocked=False),
+        ]
+        # Newest first: app 2 inserted on 3/3, subtask 10 completed on 3/2
+        audit_page = [
+            _row(id=5, table_name="applications", record_id=2, operation="INSERT", old_values=None,
+                 created_at=datetime(2025, 3, 3, 9, tzinfo=timezone.utc)),
+            _row(id=4, table_name="sub_tasks", record_id=10, operation="UPDATE",
+                 old_values={"task_status": "研发进行中", "progress_percentage": 50},
+                 created_at=datetime(2025, 3, 2, 9, tzinfo=timezone.utc)),
+            _row(id=3, table_name="applications", record_id=1, operation="UPDATE",
+                 old_values={"current_status": "研发进行中"},
+                 created_at=datetime(2025, 3, 2, 8, tzinfo=timezone.utc)),
+        ]
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[_result(applications), _result(subtasks), _result(audit_page)])
+        db.commit = AsyncMock()
+
+        result = await service.backfill_from_audit(db, date(2025, 3, 1), date(2025, 3, 3))
+
+        assert result == {"days": 3, "rows": len(written), "replayed_changes": 3, "rollups": 3}
+        overall = {row["snapshot_date"]: row for row in written if row["scope"] == TrendScope.OVERALL}
+        assert overall[date(2025, 3, 3)]["application_count"] == 2
+        assert overall[date(2025, 3, 2)]["application_count"] == 1
+        assert overall[date(2025, 3, 2)]["progress"] == 100
+        assert overall[date(2025, 3, 2)]["completed_count"] == 1
+        # Before 3/2 the subtask was still in progress and the application not complete
+        assert overall[date(2025, 3, 1)]["progress"] == 0
+        assert overall[date(2025, 3, 1)]["completed_count"] == 0
+        db.commit.assert_awaited_once()
+
+    def test_undo_delete_restores_record(self):
+        service = TrendService()
+        subtasks = {}
+        log = SimpleNamespace(
+            table_name="sub_tasks", record_id=7, operation="DELETE",
+            old_values={"id": 7, "l2_id": 1, "task_status": "阻塞", "is_blocked": False, "module_name": "x"}
+        )
+
+        service._undo(log, {}, subtasks)
+
+        assert subtasks == {7: {"id": 7, "l2_id": 1, "task_status": "阻塞", "is_blocked": False}}
+        states = service._application_states({1: {"id": 1}}, subtasks)
+        assert states[0]["blocked_subtask_count"] == 1
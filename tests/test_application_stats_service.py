@@ -0,0 +1,119 @@
+"""
+Tests for the application_stats projection service
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from sqlalchemy.dialects import postgresql
+
+from app.models.application_stats import ApplicationStats
+from app.services.application_stats_service import ApplicationStatsService
+
+
+@pytest.fixture
+def stats_service():
+    return ApplicationStatsService()
+
+
+@pytest.fixture
+def counts():
+    return {
+        "subtask_count": 6,
+        "completed_subtask_count": 3,
+        "blocked_subtask_count": 1,
+        "not_started_subtask_count": 1,
+        "ak_subtask_count": 4,
+        "ak_completed_count": 2,
+        "ak_blocked_count": 1,
+        "ak_not_started_count": 0,
+        "cloud_native_subtask_count": 2,
+        "cloud_native_completed_count": 1,
+        "cloud_native_blocked_count": 0,
+        "cloud_native_not_started_count": 1,
+    }
+
+
+class TestBuildStatsRow:
+    """Test conversion of aggregated counts to projection rows."""
+
+    def test_build_stats_row(self, stats_service, counts):
+        row = stats_service.build_stats_row(42, counts)
+
+        assert row["application_id"] == 42
+        assert row["subtask_count"] == 6
+        assert row["blocked_subtask_count"] == 1
+        assert row["ak_in_progress_count"] == 1
+        assert row["ak_completion_percentage"] == 50.0
+        assert row["ak_status"] == "BLOCKED"
+        assert row["cloud_native_in_progress_count"] == 0
+        assert row["cloud_native_status"] == "IN_PROGRESS"
+
+    def test_build_stats_row_without_subtasks(self, stats_service):
+        row = stats_service.build_stats_row(1, {})
+
+        assert row["subtask_count"] == 0
+        assert row["ak_status"] == "NOT_STARTED"
+        assert row["cloud_native_status"] == "NOT_STARTED"
+
+    def test_row_columns_match_model(self, stats_service, counts):
+        row = stats_service.build_stats_row(1, counts)
+        model_columns = {column.name for column in ApplicationStats.__table__.columns}
+
+        assert set(row) == model_columns - {"updated_at"}
+
+
+class TestToDict:
+    """Test the API statistics payload built from projection rows."""
+
+    def test_missing_row_is_all_zeros(self, stats_service):
+        payload = stats_service.to_dict(None)
+
+        assert payload["subtask_count"] == 0
+        assert payload["completion_rate"] == 0.0
+        assert payload["progress_percentage"] == 0
+        assert payload["ak_status"] == "NOT_STARTED"
+
+    def test_round_trip(self, stats_service, counts):
+        stats = ApplicationStats(**stats_service.build_stats_row(1, counts))
+        payload = stats_service.to_dict(stats)
+
+        assert payload["completion_rate"] == 50.0
+        assert payload["progress_percentage"] == 50
+        assert payload["ak_status"] == "BLOCKED"
+        assert "application_id" not in payload
+
+
+class TestRefreshApplications:
+    """Test incremental refresh entry points."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_without_ids_skips_database(self, stats_service):
+        db = AsyncMock()
+
+        assert await stats_service.refresh_applications(db, [None]) == 0
+        db.execute.assert_not_called()
+        db.flush.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_refresh_flushes_and_upserts(self, stats_service, counts):
+        db = AsyncMock()
+        db.get_bind = Mock(return_value=Mock(dialect=Mock()))
+        db.get_bind.return_value.dialect.name = "postgresql"
+
+        row = Mock()
+        row.__getitem__ = Mock(return_value=7)
+        row._mapping = counts
+        result = Mock()
+        result.all.return_value = [row]
+        db.execute.return_value = result
+
+        written = await stats_service.refresh_applications(db, [7, 7])
+
+        assert written == 1
+        db.flush.assert_awaited_once()
+        # Row locks, one aggregate query and one upsert
+        assert db.execute.await_count == 3
+        lock = str(db.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert "ORDER BY applications.id" in lock and lock.endswith("FOR UPDATE")
+        upsert = str(db.execute.await_args_list[2].args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (application_id) DO UPDATE" in upsert
@@ -2,15 +2,28 @@
 Tests for audit service
 """
 
+import json
 import pytest
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
 from sqlalchemy.ext.asyncio import AsyncSession
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from app.services.audit_service import AuditService
 from app.models.audit_log import AuditLog, AuditOperation
 from app.models.user import User, UserRole
 from app.core.exceptions import NotFoundError, ValidationError
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def _export_row(log, user=None):
+    """A joined audit_logs/users row as returned by the export query."""
+    columns = {column.name: getattr(log, column.name) for column in AuditLog.__table__.c}
+    return SimpleNamespace(
+        **columns,
+        username=user.username if user else None,
+        user_full_name=user.full_name if user else None
+    )
 
 
 @pytest.fixture
@@ -207,8 +220,7 @@ class TestAuditService:
     async def test_get_user_activity(self, audit_service, sample_audit_log, sample_user):
         """Test getting user activity."""
         mock_db = AsyncMock(spec=AsyncSession)
-        sample_audit_log.user = sample_user
-        mock_db.execute.return_value.scalars.return_value.all.return_value = [sample_audit_log]
+        mock_db.execute.return_value = Mock(all=Mock(return_value=[_export_row(sample_audit_log, sample_user)]))
 
         activity = await audit_service.get_user_activity(
             db=mock_db,
@@ -343,8 +355,7 @@ class TestAuditService:
     async def test_export_audit_trail(self, audit_service, sample_audit_log, sample_user):
         """Test exporting audit trail."""
         mock_db = AsyncMock(spec=AsyncSession)
-        sample_audit_log.user = sample_user
-        mock_db.execute.return_value.scalars.return_value.all.return_value = [sample_audit_log]
+        mock_db.execute.return_value = Mock(all=Mock(return_value=[_export_row(sample_audit_log, sample_user)]))
 
         export_data = await audit_service.export_audit_trail(
             db=mock_db,
@@ -434,7 +445,6 @@ class TestAuditService:
             operation=AuditOperation.INSERT.value,
             created_at=datetime(2024, 1, 1, 10, 0, 0)
         )
-        log1.user = sample_user
 
         log2 = AuditLog(
             id=2,
@@ -443,10 +453,11 @@ class TestAuditService:
             operation=AuditOperation.UPDATE.value,
             created_at=datetime(2024, 1, 2, 11, 0, 0)
         )
-        log2.user = sample_user
 
         # Mock returns logs in chronological order (oldest first)
-        mock_db.execute.return_value.scalars.return_value.all.return_value = [log1, log2]
+        mock_db.execute.return_value = Mock(all=Mock(return_value=[
+            _export_row(log1, sample_user), _export_row(log2, sample_user)
+        ]))
 
         export_data = await audit_service.export_audit_trail(db=mock_db)
 
@@ -454,4 +465,218 @@ class TestAuditService:
         # Verify chronological order
         assert export_data[0]["timestamp"] < export_data[1]["timestamp"]
         assert export_data[0]["operation"] == "INSERT"
-        assert export_data[1]["operation"] == "UPDATE"
\ No newline at end of file
+        assert export_data[1]["operation"] == "UPDATE"
+
+class TestAuditPartitions:
+    """Test monthly partition maintenance and retention."""
+
+    def _db(self, estimates=None, default_rows=None, stranded=False):
+        """Mock session; default_rows=None means there is no audit_logs_default partition."""
+
+        async def execute(statement, params=None):
+            sql = str(statement)
+            if sql.startswith("SELECT relname"):
+                return Mock(all=Mock(return_value=list((estimates or {}).items())))
+            if sql.startswith("SELECT to_regclass"):
+                return Mock(scalar=Mock(return_value=default_rows is not None))
+            if sql.startswith("SELECT count"):
+                return Mock(scalar=Mock(return_value=default_rows))
+            if sql.startswith("SELECT EXISTS"):
+                return Mock(scalar=Mock(return_value=stranded))
+            return Mock(rowcount=default_rows if sql.startswith("DELETE FROM audit_logs_default") else 0)
+
+        db = Mock()
+        db.execute = AsyncMock(side_effect=execute)
+        db.commit = AsyncMock()
+        return db
+
+    def _partitions(self, *months):
+        partitions = []
+        for year, month in months:
+            start = date(year, month, 1)
+            end = date(year + month // 12, month % 12 + 1, 1)
+            partitions.append({"name": f"audit_logs_y{year}m{month:02d}", "start": start, "end": end})
+        return partitions
+
+    def _statements(self, db):
+        return [str(call.args[0]) for call in db.execute.await_args_list]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_drops_whole_expired_partitions(self, audit_service):
+        today = date.today()
+        old = today.year - 3
+        db = self._db({f"audit_logs_y{old}m01": 40, f"audit_logs_y{old}m02": 60}, default_rows=5)
+        partitions = self._partitions((old, 1), (old, 2), (today.year, today.month))
+
+        with patch.object(audit_service, "is_partitioned", AsyncMock(return_value=True)), \
+             patch.object(audit_service, "list_partitions", AsyncMock(return_value=partitions)):
+            removed = await audit_service.cleanup_old_logs(db, days_to_keep=365)
+
+        assert removed == 105
+        statements = self._statements(db)
+        assert [s for s in statements if s.startswith("ALTER TABLE")] == [
+            f'ALTER TABLE audit_logs DETACH PARTITION "audit_logs_y{old}m01"',
+            f'ALTER TABLE audit_logs DETACH PARTITION "audit_logs_y{old}m02"',
+        ]
+        # Partitions are never scanned to count them
+        assert not any(s.startswith("SELECT count") for s in statements)
+        # Only expired rows stranded in the default partition and the rollups of dropped months are deleted
+        assert [s.split(" WHERE")[0] for s in statements if s.startswith("DELETE")] == [
+            "DELETE FROM audit_logs_default", "DELETE FROM audit_hourly_rollups", "DELETE FROM audit_bulk_minutes"
+        ]
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_dry_run_only_counts(self, audit_service):
+        today = date.today()
+        db = self._db({f"audit_logs_y{today.year - 3}m01": 40}, default_rows=2)
+
+        with patch.object(audit_service, "is_partitioned", AsyncMock(return_value=True)), \
+             patch.object(audit_service, "list_partitions",
+                          AsyncMock(return_value=self._partitions((today.year - 3, 1)))):
+            removed = await audit_service.cleanup_old_logs(db, days_to_keep=365, dry_run=True)
+
+        assert removed == 42
+        assert all(s.startswith("SELECT") for s in self._statements(db))
+        db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_ensure_partitions_creates_missing_months(self, audit_service):
+        current = datetime.now(timezone.utc).date()
+        db = self._db()
+
+        with patch.object(audit_service, "is_partitioned", AsyncMock(return_value=True)), \
+             patch.object(audit_service, "list_partitions",
+                          AsyncMock(return_value=self._partitions((current.year, current.month)))):
+            created = await audit_service.ensure_partitions(db, months_ahead=2)
+
+        assert len(created) == 2
+        assert f"audit_logs_y{current.year}m{current.month:02d}" not in created
+        assert sum("PARTITION OF audit_logs" in s for s in self._statements(db)) == 2
+
+    @pytest.mark.asyncio
+    async def test_ensure_partitions_moves_rows_out_of_default_partition(self, audit_service):
+        db = self._db(default_rows=0, stranded=True)
+
+        with patch.object(audit_service, "is_partitioned", AsyncMock(return_value=True)), \
+             patch.object(audit_service, "list_partitions", AsyncMock(return_value=[])):
+            created = await audit_service.ensure_partitions(db, months_ahead=0)
+
+        statements = [s for s in self._statements(db) if not s.startswith("SELECT")]
+        assert [s.split(" FROM")[0].split(" PARTITION OF")[0] for s in statements] == [
+            "ALTER TABLE audit_logs DETACH PARTITION audit_logs_default",
+            f'CREATE TABLE "{created[0]}"',
+            f'INSERT INTO "{created[0]}" SELECT *',
+            "DELETE",
+            "ALTER TABLE audit_logs ATTACH PARTITION audit_logs_default DEFAULT",
+        ]
+
+    def test_date_filters_are_half_open_utc_ranges(self, audit_service):
+        start, end = audit_service._created_at_conditions(date(2025, 3, 1), date(2025, 3, 31))
+
+        assert start.right.value == datetime(2025, 3, 1, tzinfo=timezone.utc)
+        assert end.operator.__name__ == "lt"
+        assert end.right.value == datetime(2025, 4, 1, tzinfo=timezone.utc)
+
+
+class TestAuditExportStreaming:
+    """Test keyset-paged, resumable audit trail exports."""
+
+    def _log(self, log_id, hour):
+        return AuditLog(
+            id=log_id,
+            table_name="sub_tasks",
+            record_id=log_id,
+            operation=AuditOperation.UPDATE.value,
+            old_values={"task_status": "未开始"},
+            new_values={"task_status": "研发进行中"},
+            changed_fields=["task_status"],
+            user_id=1,
+            created_at=datetime(2024, 1, 15, hour, tzinfo=timezone.utc)
+        )
+
+    def _db(self, *pages):
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[Mock(all=Mock(return_value=page)) for page in pages])
+        db.commit = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_pages_continue_after_last_row(self, audit_service, sample_user, monkeypatch):
+        monkeypatch.setattr(AuditService, "EXPORT_PAGE_SIZE", 2)
+        logs = [self._log(i, 8 + i) for i in (1, 2, 3)]
+        db = self._db([_export_row(logs[0], sample_user), _export_row(logs[1], sample_user)], [_export_row(logs[2])])
+
+        pages = [page async for page in audit_service.iter_audit_trail(db, table_name="sub_tasks")]
+
+        assert [[record["id"] for record in page] for page in pages] == [[1, 2], [3]]
+        assert pages[0][0]["username"] == "testuser"
+        assert pages[1][0]["field_changes"] == {"task_status": {"before": "未开始", "after": "研发进行中"}}
+        # No transaction stays open between pages
+        assert db.commit.await_count == 2
+        first_sql, second_sql = (str(call.args[0]) for call in db.execute.await_args_list)
+        assert "LEFT OUTER JOIN users" in first_sql
+        assert "ORDER BY audit_logs.created_at ASC, audit_logs.id ASC" in first_sql
+        assert "(audit_logs.created_at, audit_logs.id) >" in second_sql
+        second_params = db.execute.await_args_list[1].args[0].compile().params
+        assert logs[1].created_at in second_params.values() and 2 in second_params.values()
+
+    @pytest.mark.asyncio
+    async def test_resume_from_record_cursor(self, audit_service):
+        log = self._log(7, 9)
+        db = self._db([])
+        cursor = encode_cursor(log.created_at, log.id)
+
+        assert decode_cursor(cursor, (datetime, int)) == (log.created_at, 7)
+        assert [page async for page in audit_service.iter_audit_trail(db, cursor=cursor)] == []
+        assert "(audit_logs.created_at, audit_logs.id) >" in str(db.execute.await_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_rejected(self, audit_service):
+        with pytest.raises(ValidationError):
+            [page async for page in audit_service.iter_audit_trail(Mock(), cursor="not-a-cursor")]
+
+    @pytest.mark.asyncio
+    async def test_csv_and_ndjson_streams_carry_cursors(self, audit_service, sample_user):
+        log = self._log(1, 10)
+
+        csv_chunks = [
+            chunk async for chunk in audit_service.stream_audit_trail_csv(self._db([_export_row(log, sample_user)]))
+        ]
+        ndjson_chunks = [
+            chunk async for chunk in audit_service.stream_audit_trail_ndjson(self._db([_export_row(log, sample_user)]))
+        ]
+
+        header, row = b"".join(csv_chunks).decode("utf-8-sig").splitlines()
+        assert header.split(",")[-1] == "cursor"
+        assert row.endswith(encode_cursor(log.created_at, 1))
+        [record] = [json.loads(line) for line in b"".join(ndjson_chunks).splitlines()]
+        assert (record["id"], record["username"], record["cursor"]) == (1, "testuser", encode_cursor(log.created_at, 1))
+
+
+class TestAuditCursorListing:
+    """Test keyset pagination of the audit log listing."""
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_continues_after_last_row(self, audit_service):
+        logs = [
+            AuditLog(id=i, table_name="sub_tasks", record_id=i, operation="INSERT",
+                     created_at=datetime(2024, 1, 15, i, tzinfo=timezone.utc))
+            for i in (3, 2, 1)
+        ]
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=logs)))),
+            Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=logs[2:])))),
+        ])
+
+        page, next_cursor, total = await audit_service.list_audit_logs_page(db, limit=2, table_name="sub_tasks")
+
+        assert [log.id for log in page] == [3, 2]
+        assert total is None
+        assert decode_cursor(next_cursor, (datetime, int)) == (logs[1].created_at, 2)
+
+        page, next_cursor, _ = await audit_service.list_audit_logs_page(db, limit=2, cursor=next_cursor)
+
+        assert ([log.id for log in page], next_cursor) == ([1], None)
+        assert "(audit_logs.created_at, audit_logs.id) <" in str(db.execute.await_args.args[0])
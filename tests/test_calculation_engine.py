@@ -5,7 +5,8 @@ Tests for calculation engine service
 import pytest
 from datetime import date, datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
+from sqlalchemy.dialects import postgresql
 
 from app.services.calculation_engine import CalculationEngine
 from app.models.application import Application, ApplicationStatus, TransformationTarget
@@ -87,6 +88,36 @@ def sample_subtasks():
     ]
 
 
+def _metrics_row(app_id, **overrides):
+    """Build an aggregate row as returned by CalculationEngine._recalculate_batch."""
+    row = {
+        "id": app_id,
+        "actual_biz_online_date": None,
+        "current_status": ApplicationStatus.NOT_STARTED.value,
+        "planned_requirement_date": None,
+        "planned_release_date": None,
+        "planned_tech_online_date": None,
+        "planned_biz_online_date": None,
+        "is_ak_completed": False,
+        "is_cloud_native_completed": False,
+        "is_delayed": False,
+        "delay_days": 0,
+        "subtask_count": None,
+        "completed_count": None,
+        "biz_online_count": None,
+        "ak_count": None,
+        "ak_completed_count": None,
+        "cloud_native_count": None,
+        "cloud_native_completed_count": None,
+        "max_planned_requirement_date": None,
+        "max_planned_release_date": None,
+        "max_planned_tech_online_date": None,
+        "max_planned_biz_online_date": None,
+    }
+    row.update(overrides)
+    return row
+
+
 class TestCalculationEngine:
 
     @pytest.mark.asyncio
@@ -144,33 +175,57 @@ class TestCalculationEngine:
         assert sample_application.is_cloud_native_completed == False
 
     @pytest.mark.asyncio
-    async def test_recalculate_all_applications(
-        self, calculation_engine, sample_application, sample_subtasks
-    ):
-        """Test recalculating all applications."""
+    async def test_recalculate_all_applications(self, calculation_engine):
+        """Test set-based recalculation of all applications."""
         mock_db = AsyncMock(spec=AsyncSession)
+        mock_db.get_bind = Mock(return_value=Mock(dialect=Mock()))
+        mock_db.get_bind.return_value.dialect.name = "postgresql"
+
+        count_result = Mock()
+        count_result.scalar.return_value = 2
+        ids_result = Mock()
+        ids_result.all.return_value = [(1,), (2,)]
+        rows_result = Mock()
+        rows_result.all.return_value = [
+            Mock(_mapping=_metrics_row(1, subtask_count=2, completed_count=2, ak_count=2, ak_completed_count=2)),
+            Mock(_mapping=_metrics_row(2)),
+        ]
+        update_result = Mock()
+        empty_result = Mock()
+        empty_result.all.return_value = []
+        mock_db.execute.side_effect = [count_result, ids_result, rows_result, update_result, empty_result]
+
+        progress = []
+        result = await calculation_engine.recalculate_all_applications(
+            mock_db, progress_callback=progress.append
+        )
 
-        # Multiple applications
-        app1 = sample_application
-        app1.subtasks = sample_subtasks
+        assert result == {"total_applications": 2, "updated_count": 1, "batches": 1}
+        assert progress[-1]["processed"] == 2
+        assert calculation_engine.recalculation_progress["status"] == "completed"
+        mock_db.commit.assert_called_once()
 
-        app2 = Application(
-            id=2,
-            l2_id="L2_TEST_002",
-            app_name="Test App 2",
-            supervision_year=2025,
-            transformation_target=TransformationTarget.CLOUD_NATIVE,
-            responsible_team="Team B",
-            subtasks=[]
-        )
+        update_sql = str(mock_db.execute.await_args_list[3].args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM (VALUES" in update_sql
 
-        mock_db.execute.return_value.scalars.return_value.all.return_value = [app1, app2]
+    @pytest.mark.asyncio
+    async def test_recalculate_applications_counts_existing_only(self, calculation_engine):
+        """IDs without an application row are not counted as recalculated."""
+        mock_db = AsyncMock(spec=AsyncSession)
+        mock_db.get_bind = Mock(return_value=Mock(dialect=Mock()))
+        mock_db.get_bind.return_value.dialect.name = "postgresql"
 
-        result = await calculation_engine.recalculate_all_applications(mock_db)
+        rows_result = Mock()
+        rows_result.all.return_value = [Mock(_mapping=_metrics_row(1))]
+        mock_db.execute.side_effect = [rows_result]
 
-        assert result["total_applications"] == 2
-        assert result["updated_count"] == 2
-        mock_db.commit.assert_called_once()
+        progress = []
+        result = await calculation_engine.recalculate_applications(
+            mock_db, [1, 404, 404], progress_callback=progress.append
+        )
+
+        assert result == {"total_applications": 1, "updated_count": 0, "batches": 1}
+        assert (progress[-1]["processed"], progress[-1]["found"]) == (2, 1)
 
     @pytest.mark.asyncio
     async def test_calculate_project_metrics(
@@ -394,4 +449,61 @@ class TestCalculationEngine:
         ])
 
         confidence = calculation_engine._calculate_confidence(subtasks, 0.2)
-        assert confidence == "medium"
\ No newline at end of file
+        assert confidence == "medium"
+
+
+class TestDeriveApplicationMetrics:
+    """Test metric derivation used by the set-based recalculation."""
+
+    def test_no_subtasks_keeps_status_and_dates(self, calculation_engine):
+        row = _metrics_row(
+            1,
+            current_status=ApplicationStatus.DEV_IN_PROGRESS.value,
+            planned_biz_online_date=date(2020, 1, 1),
+            is_delayed=True,
+            delay_days=10
+        )
+
+        derived = calculation_engine._derive_application_metrics(row, date(2025, 1, 1))
+
+        assert derived["current_status"] == ApplicationStatus.DEV_IN_PROGRESS.value
+        assert derived["planned_biz_online_date"] == date(2020, 1, 1)
+        assert derived["is_delayed"] is False
+        assert derived["delay_days"] == 0
+
+    def test_biz_online_status_and_latest_dates(self, calculation_engine):
+        row = _metrics_row(
+            1,
+            subtask_count=3,
+            completed_count=1,
+            biz_online_count=1,
+            cloud_native_count=2,
+            cloud_native_completed_count=1,
+            max_planned_biz_online_date=date(2025, 3, 1)
+        )
+
+        derived = calculation_engine._derive_application_metrics(row, date(2025, 3, 11))
+
+        assert derived["current_status"] == ApplicationStatus.BIZ_ONLINE.value
+        assert derived["planned_biz_online_date"] == date(2025, 3, 1)
+        assert derived["is_ak_completed"] is False
+        assert derived["is_delayed"] is True
+        assert derived["delay_days"] == 10
+
+    def test_ak_completion_falls_back_to_cloud_native(self, calculation_engine):
+        row = _metrics_row(
+            1,
+            subtask_count=2,
+            completed_count=2,
+            cloud_native_count=2,
+            cloud_native_completed_count=2,
+            max_planned_biz_online_date=date(2025, 3, 1),
+            actual_biz_online_date=date(2025, 3, 4)
+        )
+
+        derived = calculation_engine._derive_application_metrics(row, date(2025, 6, 1))
+
+        assert derived["current_status"] == ApplicationStatus.COMPLETED.value
+        assert derived["is_ak_completed"] is True
+        assert derived["is_cloud_native_completed"] is True
+        assert derived["delay_days"] == 3
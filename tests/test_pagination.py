@@ -0,0 +1,92 @@
+"""
+Tests for keyset pagination utilities
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+
+from app.core.exceptions import ValidationError
+from app.utils.pagination import count_rows, decode_cursor, encode_cursor, keyset_after, keyset_order
+
+
+metadata = MetaData()
+items = Table(
+    "items", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(20), nullable=True)
+)
+NAMES = ["b", None, "a", "b", None, "c", "a"]
+
+
+@pytest.fixture
+def connection():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.connect() as conn:
+        conn.execute(items.insert(), [{"id": i, "name": name} for i, name in enumerate(NAMES, 1)])
+        yield conn
+
+
+def _walk(conn, descending, page_size=2):
+    """Page through items by (name, id) and return the ids in order."""
+    ids, after = [], None
+    while True:
+        query = select(items).order_by(*keyset_order(items.c.name, items.c.id, descending)).limit(page_size)
+        if after:
+            query = query.where(keyset_after(items.c.name, items.c.id, descending, *after))
+        rows = conn.execute(query).all()
+        ids.extend(row.id for row in rows)
+        if len(rows) < page_size:
+            return ids
+        after = (rows[-1].name, rows[-1].id)
+
+
+class TestCursor:
+
+    def test_round_trip(self):
+        created_at = datetime(2024, 3, 1, 8, 30, tzinfo=timezone.utc)
+        cursor = encode_cursor(created_at, 42)
+
+        assert decode_cursor(cursor, (datetime, int)) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(1), encode_cursor("x", 1)])
+    def test_malformed_cursor_is_rejected(self, cursor):
+        with pytest.raises(ValidationError):
+            decode_cursor(cursor, (datetime, int))
+
+
+class TestKeyset:
+
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_pages_visit_every_row_once_in_order(self, connection, descending):
+        expected = [
+            row.id for row in connection.execute(
+                select(items).order_by(*keyset_order(items.c.name, items.c.id, descending))
+            )
+        ]
+
+        assert _walk(connection, descending) == expected
+        assert sorted(expected) == list(range(1, len(NAMES) + 1))
+
+    def test_nulls_sort_last_ascending(self, connection):
+        assert _walk(connection, descending=False)[-2:] == [2, 5]
+
+
+class TestCountRows:
+
+    @pytest.mark.asyncio
+    async def test_none_skips_the_count(self):
+        db = Mock(execute=AsyncMock())
+
+        assert await count_rows(db, select(items.c.id), "none") is None
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_estimate_falls_back_to_exact_count_off_postgresql(self):
+        db = Mock(execute=AsyncMock(return_value=Mock(scalar=Mock(return_value=7))))
+        db.get_bind.return_value.dialect.name = "sqlite"
+
+        assert await count_rows(db, select(items.c.id), "estimated") == 7
+        assert "count(*)" in str(db.execute.await_args.args[0])
@@ -5,7 +5,7 @@ Tests for subtask service
 import pytest
 from datetime import date, datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from app.services.subtask_service import SubTaskService
 from app.models.subtask import SubTask, SubTaskStatus
@@ -16,6 +16,7 @@ from app.schemas.subtask import (
     SubTaskBulkUpdate, SubTaskBulkStatusUpdate, SubTaskProgressUpdate
 )
 from app.core.exceptions import ValidationError
+from app.utils.pagination import encode_cursor
 
 
 @pytest.fixture
@@ -268,6 +269,34 @@ class TestSubTaskService:
         assert subtasks[0] == sample_subtask
         assert mock_db.execute.call_count == 2  # One for count, one for data
 
+    @pytest.mark.asyncio
+    async def test_list_subtasks_page_with_cursor(self, subtask_service):
+        """Test keyset pagination skips the count and continues after the cursor."""
+        sample_subtask = SubTask(id=4, l2_id=1, version_name="v1.0")
+        mock_db = AsyncMock(spec=AsyncSession)
+        mock_db.execute.return_value = Mock(scalars=Mock(return_value=Mock(all=Mock(return_value=[sample_subtask]))))
+        sort = SubTaskSort(sort_by="version_name", order="asc")
+        cursor = encode_cursor("version_name", "asc", "v1.0", 3)
+
+        subtasks, next_cursor, total = await subtask_service.list_subtasks_page(
+            db=mock_db, limit=10, sort=sort, cursor=cursor
+        )
+
+        assert subtasks == [sample_subtask]
+        assert (next_cursor, total) == (None, None)
+        assert mock_db.execute.call_count == 1
+        query = str(mock_db.execute.call_args[0][0])
+        assert "(sub_tasks.version_name, sub_tasks.id) >" in query
+        assert "sub_tasks.version_name IS NULL" in query
+
+    @pytest.mark.asyncio
+    async def test_list_subtasks_page_rejects_cursor_of_another_sort(self, subtask_service):
+        """Test a cursor cannot be reused with a different sort."""
+        cursor = encode_cursor("version_name", "asc", "v1.0", 3)
+
+        with pytest.raises(ValidationError):
+            await subtask_service.list_subtasks_page(db=AsyncMock(spec=AsyncSession), cursor=cursor)
+
     @pytest.mark.asyncio
     async def test_get_subtasks_by_application(self, subtask_service, sample_subtask):
         """Test getting subtasks by application."""
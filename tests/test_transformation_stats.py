@@ -0,0 +1,130 @@
+"""
+Tests for transformation statistics helpers
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from app.models.application import Application
+from app.models.subtask import SubTaskStatus
+from app.services.application_service import ApplicationService
+from app.services.transformation_stats import (
+    calculate_application_transformation_stats,
+    calculate_subtask_statistics,
+    summarize_target_counts,
+    transformation_stats_from_counts,
+)
+
+
+def _subtask(target, status, is_blocked=False):
+    subtask = Mock()
+    subtask.sub_target = target
+    subtask.task_status = status
+    subtask.is_blocked = is_blocked
+    return subtask
+
+
+@pytest.fixture
+def mixed_subtasks():
+    return [
+        _subtask("AK", SubTaskStatus.COMPLETED),
+        _subtask("AK", SubTaskStatus.COMPLETED, is_blocked=True),
+        _subtask("AK", SubTaskStatus.DEV_IN_PROGRESS, is_blocked=True),
+        _subtask("AK", SubTaskStatus.NOT_STARTED),
+        _subtask("AK", SubTaskStatus.PLANNED_OFFLINE),
+        _subtask("云原生", SubTaskStatus.BLOCKED),
+        _subtask("云原生", SubTaskStatus.TECH_ONLINE),
+        _subtask(None, SubTaskStatus.COMPLETED),
+    ]
+
+
+def _counts_for(subtasks):
+    """Aggregate counts the same way build_subtask_stats_subquery does."""
+    counts = {
+        "subtask_count": len(subtasks),
+        "completed_subtask_count": sum(1 for st in subtasks if st.task_status == SubTaskStatus.COMPLETED),
+    }
+    for target, prefix in (("AK", "ak"), ("云原生", "cloud_native")):
+        rows = [st for st in subtasks if st.sub_target == target]
+        completed = [st for st in rows if st.task_status == SubTaskStatus.COMPLETED]
+        blocked = [
+            st for st in rows
+            if st.task_status != SubTaskStatus.COMPLETED
+            and (st.is_blocked or st.task_status == SubTaskStatus.BLOCKED)
+        ]
+        not_started = [
+            st for st in rows
+            if st not in completed and st not in blocked and st.task_status == SubTaskStatus.NOT_STARTED
+        ]
+        counts[f"{prefix}_subtask_count"] = len(rows)
+        counts[f"{prefix}_completed_count"] = len(completed)
+        counts[f"{prefix}_blocked_count"] = len(blocked)
+        counts[f"{prefix}_not_started_count"] = len(not_started)
+    return counts
+
+
+class TestSummarizeTargetCounts:
+    """Test statistics built from aggregated counts."""
+
+    def test_empty_target(self):
+        result = summarize_target_counts(0, 0, 0, 0)
+        assert result["status"] == "NOT_STARTED"
+        assert result["completion_percentage"] == 0.0
+
+    def test_null_counts_treated_as_zero(self):
+        result = summarize_target_counts(None, None, None, None)
+        assert result["subtask_count"] == 0
+
+    def test_in_progress_is_remainder(self):
+        result = summarize_target_counts(10, 3, 1, 2)
+        assert result["in_progress_count"] == 4
+        assert result["status"] == "BLOCKED"
+        assert result["completion_percentage"] == 30.0
+
+    @pytest.mark.parametrize("target", ["AK", "云原生"])
+    def test_matches_in_memory_statistics(self, mixed_subtasks, target):
+        prefix = "ak" if target == "AK" else "cloud_native"
+        counts = _counts_for(mixed_subtasks)
+        result = summarize_target_counts(
+            counts[f"{prefix}_subtask_count"],
+            counts[f"{prefix}_completed_count"],
+            counts[f"{prefix}_blocked_count"],
+            counts[f"{prefix}_not_started_count"],
+        )
+        assert result == calculate_subtask_statistics(mixed_subtasks, target)
+
+
+class TestTransformationStatsFromCounts:
+    """Test the SQL-row to stats dictionary conversion."""
+
+    def test_matches_application_stats(self, mixed_subtasks):
+        counts = _counts_for(mixed_subtasks)
+        assert transformation_stats_from_counts(counts) == calculate_application_transformation_stats(mixed_subtasks)
+
+    def test_application_without_subtasks(self):
+        result = transformation_stats_from_counts({})
+        assert result == calculate_application_transformation_stats([])
+
+    def test_enrich_application_with_counts(self, mixed_subtasks):
+        app = Application(
+            id=7,
+            l2_id="L2_STATS_001",
+            app_name="Stats App",
+            created_by=1,
+            updated_by=1,
+            created_at=datetime(2024, 1, 1, 12, 0, 0),
+            updated_at=datetime(2024, 1, 2, 12, 0, 0),
+        )
+        counts = _counts_for(mixed_subtasks)
+
+        result = ApplicationService()._enrich_application_with_counts(app, counts)
+
+        assert result["id"] == 7
+        assert result["created_at"] == "2024-01-01T12:00:00"
+        assert result["subtask_count"] == 8
+        assert result["completed_subtask_count"] == 3
+        assert result["completion_rate"] == 37.5
+        assert result["progress_percentage"] == 37
+        assert result["ak_status"] == "BLOCKED"
+        assert result["cloud_native_status"] == "BLOCKED"
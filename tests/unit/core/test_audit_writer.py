@@ -0,0 +1,156 @@
+"""
+Unit tests for the batched audit writer
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core import audit_writer as audit_writer_module
+from app.core.audit_writer import PENDING_KEY, AuditWriter
+from app.core.config import settings
+from app.models.audit_log import AuditLog, AuditOperation
+from app.services.audit_service import AuditService
+
+
+def _row(record_id):
+    return {"table_name": "sub_tasks", "record_id": record_id, "operation": "UPDATE"}
+
+
+def _session_factory(session):
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=session)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return Mock(return_value=context)
+
+
+def _sqlite_session():
+    session = Mock()
+    session.get_bind.return_value.dialect.name = "sqlite"
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    return session
+
+
+class TestAuditWriter:
+    """Test batching, retries and backpressure."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_multi_row_batches(self, monkeypatch):
+        monkeypatch.setattr(settings, "AUDIT_BATCH_SIZE", 2)
+        session = _sqlite_session()
+        writer = AuditWriter(_session_factory(session))
+
+        writer.submit([_row(1), _row(2), _row(3)])
+        assert await writer.flush()
+
+        assert session.execute.await_count == 2
+        assert [len(call.args[1]) for call in session.execute.await_args_list] == [2, 1]
+        stats = writer.stats()
+        assert (stats["written"], stats["batches"], stats["queue_depth"], stats["high_water"]) == (3, 2, 0, 3)
+
+    @pytest.mark.asyncio
+    async def test_unreachable_database_keeps_rows_queued(self):
+        session = _sqlite_session()
+        session.execute.side_effect = OperationalError("INSERT", {}, Exception("connection refused"))
+        writer = AuditWriter(_session_factory(session))
+
+        writer.submit([_row(1), _row(2)])
+
+        assert not await writer.flush()
+        assert writer.queue_depth == 2
+        assert writer.stats()["failed_batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_row_does_not_block_the_batch(self):
+        session = _sqlite_session()
+        session.execute.side_effect = [TypeError("not JSON serializable"), None, TypeError("bad row")]
+        writer = AuditWriter(_session_factory(session))
+
+        writer.submit([_row(1), _row(2)])
+
+        assert await writer.flush()
+        assert (writer.written, writer.dropped, writer.queue_depth) == (1, 1, 0)
+
+    @pytest.mark.asyncio
+    async def test_full_queue_times_out_to_caller_write(self, monkeypatch):
+        monkeypatch.setattr(settings, "AUDIT_QUEUE_MAX_SIZE", 1)
+        monkeypatch.setattr(settings, "AUDIT_ENQUEUE_TIMEOUT", 0.01)
+        writer = AuditWriter()
+        writer.submit([_row(1)])
+
+        assert not await writer.wait_for_space()
+        assert writer.stats()["backpressure_waits"] == 1
+        assert writer.stats()["backpressure_fallbacks"] == 1
+
+    def test_rows_are_queued_only_on_commit(self, monkeypatch):
+        writer = AuditWriter()
+        monkeypatch.setattr(audit_writer_module, "audit_writer", writer)
+        session = Session(create_engine("sqlite://"))
+
+        session.execute(text("SELECT 1"))
+        session.info[PENDING_KEY] = [_row(1)]
+        session.rollback()
+        assert writer.queue_depth == 0
+
+        session.execute(text("SELECT 1"))
+        session.info[PENDING_KEY] = [_row(2)]
+        session.commit()
+        assert writer.queue_depth == 1
+        assert PENDING_KEY not in session.info
+
+
+class TestRecordAuditLog:
+    """Test AuditService.record_audit_log write modes."""
+
+    def _db(self, in_transaction=True):
+        db = Mock()
+        db.in_transaction.return_value = in_transaction
+        db.sync_session.info = {}
+        return db
+
+    @pytest.mark.asyncio
+    async def test_async_mode_defers_row_to_commit(self, monkeypatch):
+        writer = Mock(running=True, wait_for_space=AsyncMock(return_value=True))
+        monkeypatch.setattr("app.services.audit_service.audit_writer", writer)
+        monkeypatch.setattr(settings, "AUDIT_WRITE_MODE", "async")
+        db = self._db()
+
+        await AuditService().record_audit_log(
+            db, "sub_tasks", 5, AuditOperation.UPDATE,
+            old_values={"task_status": "未开始"}, new_values={"task_status": "研发进行中"}, user_id=1
+        )
+
+        db.add.assert_not_called()
+        writer.submit.assert_not_called()
+        [row] = db.sync_session.info[PENDING_KEY]
+        assert row["changed_fields"] == ["task_status"]
+        assert row["created_at"].tzinfo is not None
+
+    @pytest.mark.asyncio
+    async def test_transactional_write_joins_caller_transaction(self, monkeypatch):
+        writer = Mock(running=True, wait_for_space=AsyncMock(return_value=True))
+        monkeypatch.setattr("app.services.audit_service.audit_writer", writer)
+        db = self._db()
+
+        await AuditService().record_audit_log(
+            db, "applications", 3, AuditOperation.DELETE, old_values={"id": 3}, transactional=True
+        )
+
+        added = db.add.call_args[0][0]
+        assert isinstance(added, AuditLog)
+        assert (added.table_name, added.record_id, added.operation) == ("applications", 3, "DELETE")
+        db.commit.assert_not_called()
+        assert PENDING_KEY not in db.sync_session.info
+
+    @pytest.mark.asyncio
+    async def test_stopped_writer_falls_back_to_transactional(self, monkeypatch):
+        monkeypatch.setattr("app.services.audit_service.audit_writer", Mock(running=False))
+        monkeypatch.setattr(settings, "AUDIT_WRITE_MODE", "async")
+        db = self._db()
+
+        await AuditService().record_audit_log(db, "sub_tasks", 5, AuditOperation.INSERT, new_values={"id": 5})
+
+        db.add.assert_called_once()
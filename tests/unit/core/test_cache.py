@@ -0,0 +1,160 @@
+"""
+Unit tests for the response cache
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+from datetime import date
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.cache import ResponseCache, LocalCacheBackend, CacheTag, invalidates
+from app.core.config import settings
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    return ResponseCache()
+
+
+def _producer(value):
+    return AsyncMock(return_value=value)
+
+
+class TestResponseCache:
+    """Test ResponseCache on the in-process backend."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_cache(self, cache):
+        producer = _producer({"total": 3, "generated_at": date(2025, 1, 2)})
+
+        first = await cache.get_or_set("reports:test", {"dev_team": "A"}, producer)
+        second = await cache.get_or_set("reports:test", {"dev_team": "A"}, producer)
+
+        assert first == second == {"total": 3, "generated_at": "2025-01-02"}
+        producer.assert_awaited_once()
+        assert cache.stats() == {"backend": "local", "hits": 1, "misses": 1, "errors": 0, "hit_rate": 50.0}
+
+    @pytest.mark.asyncio
+    async def test_params_are_normalized(self, cache):
+        producer = _producer({"total": 1})
+
+        await cache.get_or_set("reports:test", {"a": 1, "b": None, "c": "x"}, producer)
+        await cache.get_or_set("reports:test", {"c": "x", "a": 1}, producer)
+        await cache.get_or_set("reports:test", {"a": 2, "c": "x"}, producer)
+
+        assert producer.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_only_drops_dependent_entries(self, cache):
+        project = _producer({"total": 1})
+        subtasks_only = _producer({"blocked": 2})
+
+        await cache.get_or_set("dashboard:stats", {}, project)
+        await cache.get_or_set("subtasks:summary", {}, subtasks_only, tags=[CacheTag.SUBTASKS])
+        await cache.invalidate(CacheTag.APPLICATIONS)
+        await cache.get_or_set("dashboard:stats", {}, project)
+        await cache.get_or_set("subtasks:summary", {}, subtasks_only, tags=[CacheTag.SUBTASKS])
+
+        assert project.await_count == 2
+        assert subtasks_only.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_computes(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+        producer = _producer({"total": 1})
+
+        await cache.get_or_set("reports:test", {}, producer)
+        await cache.get_or_set("reports:test", {}, producer)
+
+        assert producer.await_count == 2
+        assert cache.stats()["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_producer_errors_are_not_cached(self, cache):
+        producer = AsyncMock(side_effect=[ValueError("boom"), {"total": 1}])
+
+        with pytest.raises(ValueError):
+            await cache.get_or_set("reports:test", {}, producer)
+        assert await cache.get_or_set("reports:test", {}, producer) == {"total": 1}
+
+    @pytest.mark.asyncio
+    async def test_invalidates_decorator_bumps_tags_after_write(self, cache, monkeypatch):
+        monkeypatch.setattr("app.core.cache.response_cache", cache)
+        producer = _producer({"total": 1})
+
+        @invalidates(CacheTag.APPLICATIONS)
+        async def write():
+            return "written"
+
+        await cache.get_or_set("dashboard:stats", {}, producer)
+        assert await write() == "written"
+        await cache.get_or_set("dashboard:stats", {}, producer)
+
+        assert producer.await_count == 2
+
+
+class TestRedisFallback:
+    """Test switching between Redis and the in-process backend."""
+
+    @pytest.fixture
+    def redis_cache(self, cache):
+        cache.redis = AsyncMock()
+        cache.redis.name = "redis"
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_local(self, redis_cache):
+        redis_cache.redis.get_many.side_effect = RedisConnectionError("refused")
+        producer = _producer({"total": 1})
+
+        await redis_cache.get_or_set("reports:test", {}, producer)
+        await redis_cache.get_or_set("reports:test", {}, producer)
+
+        producer.assert_awaited_once()
+        # Redis is skipped for the retry window after the first failure
+        assert redis_cache.redis.get_many.await_count == 1
+        assert redis_cache.stats()["backend"] == "local"
+        assert redis_cache.stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tags_bumped_during_outage_are_replayed(self, redis_cache, monkeypatch):
+        redis_cache.redis.incr.side_effect = [RedisConnectionError("refused"), 1]
+        redis_cache.redis.get_many.return_value = [None, None]
+
+        await redis_cache.invalidate(CacheTag.SUBTASKS)
+        assert redis_cache.stats()["backend"] == "local"
+
+        monkeypatch.setattr(redis_cache, "_redis_retry_at", 0.0)
+        await redis_cache.get_or_set("reports:test", {}, _producer({"total": 1}))
+
+        assert redis_cache.redis.incr.await_args_list[-1].args == ("akcn:cache:tag:subtasks",)
+        assert redis_cache.stats()["backend"] == "redis"
+
+
+class TestLocalCacheBackend:
+    """Test the in-process backend."""
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        backend = LocalCacheBackend(max_entries=2, max_ttl=30)
+
+        await backend.set("a", "1", 60)
+        await backend.set("b", "2", 60)
+        await backend.get_many(["a"])
+        await backend.set("c", "3", 60)
+
+        assert await backend.get_many(["a", "b", "c"]) == ["1", None, "3"]
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_dropped(self, monkeypatch):
+        backend = LocalCacheBackend(max_entries=10, max_ttl=30)
+        now = 1000.0
+        monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now)
+
+        await backend.set("a", "1", 300)
+        now = 1031.0
+
+        # TTL is capped at max_ttl
+        assert await backend.get_many(["a"]) == [None]
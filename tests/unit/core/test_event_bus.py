@@ -0,0 +1,120 @@
+"""
+Unit tests for the change event bus
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.event_bus import EventBus, EventEntity, event_bus, publish_change
+from app.models.notification import Notification, NotificationUnreadCount
+from app.models.user import User
+from app.services.in_app_notification_service import InAppNotificationService
+
+
+SQLITE_TABLES = [User.__table__, Notification.__table__, NotificationUnreadCount.__table__]
+
+
+def _change(entity=EventEntity.SUBTASK, ids=(1,), **extra):
+    return {"entity": entity, "action": "updated", "ids": list(ids), **extra}
+
+
+@pytest.fixture
+def db(table_session):
+    return table_session
+
+
+class TestEventBus:
+    """Subscriptions get the events they asked for, and slow ones are dropped."""
+
+    @pytest.mark.asyncio
+    async def test_filters(self):
+        bus = EventBus()
+        everything = bus.subscribe(1)
+        one_app = bus.subscribe(2, entities={EventEntity.SUBTASK}, application_ids={7})
+
+        bus.dispatch(_change(application_ids=[7]))
+        bus.dispatch(_change(application_ids=[8]))
+        bus.dispatch(_change(EventEntity.APPLICATION, application_ids=[7]))
+        bus.dispatch(_change(EventEntity.NOTIFICATION, user_ids=[1]))
+
+        assert [(await one_app.get(0.1))["application_ids"]] == [[7]]
+        with pytest.raises(asyncio.TimeoutError):
+            await one_app.get(0.01)
+        received = [await everything.get(0.1) for _ in range(4)]
+        assert [change["entity"] for change in received] == ["subtask", "subtask", "application", "notification"]
+
+    @pytest.mark.asyncio
+    async def test_slow_client_is_dropped(self, monkeypatch):
+        monkeypatch.setattr(settings, "EVENT_STREAM_QUEUE_SIZE", 2)
+        bus = EventBus()
+        slow = bus.subscribe(1)
+        fast = bus.subscribe(2)
+
+        for i in range(3):
+            bus.dispatch(_change(ids=[i]))
+            await fast.get(0.1)
+
+        # The backlog is discarded; the client is told to resync
+        assert await slow.get(0.1) is None
+        assert bus.stats()["subscriptions"] == 1
+        assert bus.stats()["dropped_clients"] == 1
+        bus.dispatch(_change(ids=[3]))
+        assert (await fast.get(0.1))["ids"] == [3]
+
+    @pytest.mark.asyncio
+    async def test_background_publishes_are_tracked(self):
+        bus = EventBus()
+        bus._client = Mock(pipeline=Mock(side_effect=ValueError("broken client")))
+
+        bus.publish_nowait([_change()])
+        assert len(bus._publishing) == 1
+        await asyncio.gather(*bus._publishing, return_exceptions=True)
+        # Done callbacks run on the next loop iteration
+        await asyncio.sleep(0)
+
+        # The task is released once done and its failure is counted, not lost
+        assert not bus._publishing
+        assert bus.stats()["publish_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_events_are_published_on_commit_only(self, db):
+        subscription = event_bus.subscribe(1)
+        try:
+            await db.execute(text("SELECT 1"))
+            publish_change(db, EventEntity.ANNOUNCEMENT, "created", [5])
+            await db.rollback()
+
+            await db.execute(text("SELECT 1"))
+            publish_change(db, EventEntity.ANNOUNCEMENT, "created", [6])
+            await db.commit()
+
+            change = await subscription.get(0.1)
+            assert (change["entity"], change["action"], change["ids"]) == ("announcement", "created", [6])
+            with pytest.raises(asyncio.TimeoutError):
+                await subscription.get(0.01)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    @pytest.mark.asyncio
+    async def test_notifications_reach_only_their_recipients(self, db):
+        alice = event_bus.subscribe(1, entities={EventEntity.NOTIFICATION})
+        bob = event_bus.subscribe(2, entities={EventEntity.NOTIFICATION})
+        try:
+            service = InAppNotificationService()
+            alice_ids = await service.deliver(db, [1], "Delay", "late", "delay_warning")
+            await db.commit()
+            await service.mark_read(db, 1, alice_ids)
+            await db.commit()
+
+            created, read = await alice.get(0.1), await alice.get(0.1)
+            assert (created["action"], created["ids"]) == ("created", alice_ids)
+            assert (read["action"], read["ids"]) == ("read", alice_ids)
+            with pytest.raises(asyncio.TimeoutError):
+                await bob.get(0.01)
+        finally:
+            event_bus.unsubscribe(alice)
+            event_bus.unsubscribe(bob)
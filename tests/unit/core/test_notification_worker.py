@@ -0,0 +1,144 @@
+"""
+Unit tests for the notification outbox and its delivery worker
+"""
+
+import pytest
+import httpx
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.notification_transport import SMTPPool, WebhookClient, build_email_message
+from app.core.notification_worker import NotificationWorker, enqueue_notifications
+from app.models.notification_outbox import NotificationOutbox, OutboxStatus
+
+
+def _email(subject="Delay warning"):
+    return {
+        "channel": "email",
+        "notification_type": "delay_warning",
+        "payload": {"recipients": ["owner@example.com"], "subject": subject, "body": "<p>late</p>", "attachments": []},
+    }
+
+
+def _webhook(url="https://hooks.example.com/akcn"):
+    return {"channel": "webhook", "notification_type": "custom", "payload": {"url": url, "body": {"title": "hi"}}}
+
+
+def _webhook_client(status_code):
+    return WebhookClient(transport=httpx.MockTransport(lambda request: httpx.Response(status_code)))
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=[NotificationOutbox.__table__]))
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _enqueue(session_factory, rows):
+    async with session_factory() as session:
+        await enqueue_notifications(session, rows)
+        await session.commit()
+
+
+async def _outbox(session_factory):
+    async with session_factory() as session:
+        return (await session.execute(select(NotificationOutbox).order_by(NotificationOutbox.id))).scalars().all()
+
+
+class TestNotificationWorker:
+    """Claiming, delivery and retries of outbox rows."""
+
+    @pytest.mark.asyncio
+    async def test_delivers_committed_rows_by_channel(self, session_factory):
+        smtp = SMTPPool()
+        smtp.send = AsyncMock()
+        worker = NotificationWorker(session_factory, smtp=smtp, webhooks=_webhook_client(200))
+        await _enqueue(session_factory, [_email(), _email("Status change"), _webhook()])
+
+        assert await worker.deliver_due() == 3
+        assert await worker.deliver_due() == 0
+
+        rows = await _outbox(session_factory)
+        assert [row.status for row in rows] == [OutboxStatus.SENT.value] * 3
+        assert smtp.send.await_count == 2
+        assert smtp.send.await_args_list[1].args[0]["Subject"] == "Status change"
+        assert worker.stats()["sent"] == 3
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_back_off_and_permanent_ones_fail(self, session_factory, monkeypatch):
+        monkeypatch.setattr(settings, "NOTIFICATION_RETRY_BASE_SECONDS", 60)
+        await _enqueue(session_factory, [_webhook()])
+
+        worker = NotificationWorker(session_factory, webhooks=_webhook_client(503))
+        assert await worker.deliver_due() == 1
+        row = (await _outbox(session_factory))[0]
+        assert (row.status, row.attempts, row.last_error) == (OutboxStatus.PENDING.value, 1, "Webhook returned 503")
+        # Not due again until the backoff has passed
+        assert await worker.deliver_due() == 0
+
+        async with session_factory() as session:
+            row = await session.get(NotificationOutbox, row.id)
+            row.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+            await session.commit()
+
+        worker = NotificationWorker(session_factory, webhooks=_webhook_client(404))
+        assert await worker.deliver_due() == 1
+        row = (await _outbox(session_factory))[0]
+        assert (row.status, row.attempts) == (OutboxStatus.FAILED.value, 2)
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_claimed_again(self, session_factory):
+        await _enqueue(session_factory, [_webhook()])
+        async with session_factory() as session:
+            row = (await session.execute(select(NotificationOutbox))).scalar_one()
+            row.status = OutboxStatus.SENDING.value
+            row.attempts = 1
+            row.locked_until = datetime.now(timezone.utc) - timedelta(minutes=1)
+            await session.commit()
+
+        worker = NotificationWorker(session_factory, webhooks=_webhook_client(200))
+
+        assert await worker.deliver_due() == 1
+        row = (await _outbox(session_factory))[0]
+        assert (row.status, row.attempts) == (OutboxStatus.SENT.value, 2)
+
+
+class TestSMTPPool:
+    """Email delivery against a local SMTP server."""
+
+    @pytest.mark.asyncio
+    async def test_pool_reuses_connections(self, monkeypatch):
+        controller_module = pytest.importorskip("aiosmtpd.controller")
+        from aiosmtpd.handlers import Sink
+
+        class Recorder(Sink):
+            def __init__(self):
+                self.messages = []
+
+            async def handle_DATA(self, server, session, envelope):
+                self.messages.append(envelope)
+                return "250 OK"
+
+        handler = Recorder()
+        controller = controller_module.Controller(handler, hostname="127.0.0.1", port=8025)
+        controller.start()
+        monkeypatch.setattr(settings, "SMTP_TLS", False)
+        monkeypatch.setattr(settings, "SMTP_USER", "")
+        try:
+            pool = SMTPPool(host="127.0.0.1", port=8025, size=1)
+            for i in range(3):
+                await pool.send(build_email_message(_email(f"Message {i}")["payload"]))
+            await pool.close()
+        finally:
+            controller.stop()
+
+        assert len(handler.messages) == 3
+        assert handler.messages[0].rcpt_tos == ["owner@example.com"]
+        assert pool.connections_opened == 1
@@ -0,0 +1,38 @@
+"""
+Unit tests for session store selection
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core import session_store
+from app.core.config import settings
+
+
+@pytest.fixture
+def auto_store(monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_STORE", "auto")
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://localhost:6379/0")
+    monkeypatch.setattr(session_store, "_session_store", None)
+    monkeypatch.setattr(session_store, "_next_probe", 0.0)
+
+
+class TestSessionStoreSelection:
+    """SESSION_STORE=auto falls back to memory and moves to Redis once it answers."""
+
+    @pytest.mark.asyncio
+    async def test_auto_store_reprobes_redis(self, auto_store, monkeypatch):
+        ping = AsyncMock(side_effect=RedisConnectionError("down"))
+        with patch("redis.asyncio.Redis.ping", ping), patch("redis.asyncio.Redis.aclose", AsyncMock()):
+            assert (await session_store.get_session_store()).name == "memory"
+
+            # Within the probe interval the fallback is kept without another PING
+            assert (await session_store.get_session_store()).name == "memory"
+            assert ping.await_count == 1
+
+            monkeypatch.setattr(session_store, "_next_probe", 0.0)
+            ping.side_effect = None
+            assert (await session_store.get_session_store()).name == "redis"
+            assert ping.await_count == 2
@@ -0,0 +1,105 @@
+"""
+Unit tests for the authenticated user cache
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.user_cache import UserCache
+from app.models.user import User
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(settings, "USER_CACHE_ENABLED", True)
+    return UserCache()
+
+
+def _user(user_id=7, **overrides):
+    values = dict(id=user_id, username=f"user{user_id}", full_name="Test User",
+                  email=f"user{user_id}@test.com", role="editor", is_active=True)
+    values.update(overrides)
+    return User(**values)
+
+
+class TestUserCache:
+    """Test UserCache lookups and invalidation."""
+
+    def test_hit_returns_detached_copy(self, cache):
+        user = _user()
+        cache.put("7", user, cache.generation)
+
+        cached = cache.get("7")
+
+        assert cached is not user
+        assert (cached.id, cached.email, cached.role) == (7, "user7@test.com", "editor")
+        assert cache.stats()["hits"] == 1
+
+    def test_put_after_invalidation_is_dropped(self, cache):
+        generation = cache.generation
+        cache.discard([7])
+
+        cache.put("7", _user(), generation)
+
+        assert cache.get("7") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_every_key_of_the_user(self, cache):
+        cache.put("7", _user(), cache.generation)
+        cache.put("email:user7@test.com", _user(), cache.generation)
+        cache.put("8", _user(8), cache.generation)
+
+        await cache.invalidate(7)
+
+        assert cache.get("7") is None
+        assert cache.get("email:user7@test.com") is None
+        assert cache.get("8") is not None
+
+    def test_entries_expire_and_are_bounded(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "USER_CACHE_MAX_ENTRIES", 2)
+        now = 1000.0
+        monkeypatch.setattr("app.core.user_cache.time.monotonic", lambda: now)
+
+        for user_id in (1, 2, 3):
+            cache.put(str(user_id), _user(user_id), cache.generation)
+        assert cache.get("1") is None
+        assert cache.get("3") is not None
+
+        now += settings.USER_CACHE_TTL + 1
+        assert cache.get("3") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_publishes_to_other_workers(self, cache):
+        cache.redis_url = "redis://localhost:6379/0"
+        cache._redis = AsyncMock()
+
+        await cache.invalidate(7, 8)
+
+        cache._redis.publish.assert_awaited_once_with(UserCache.CHANNEL, json.dumps([7, 8]))
+
+
+class TestGetCurrentUserCache:
+    """get_current_user must only query the users table on a cache miss."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_requests_skip_the_database(self, cache):
+        db = AsyncMock()
+        result = Mock()
+        result.scalar_one_or_none.return_value = _user()
+        db.execute.return_value = result
+
+        with patch("app.api.deps.user_cache", cache), \
+                patch("app.api.deps.auth_service.verify_access_token",
+                      new_callable=AsyncMock, return_value={"sub": "7"}):
+            users = [await get_current_user(db=db, token="token") for _ in range(100)]
+
+            assert db.execute.await_count == 1
+            assert all(user.id == 7 for user in users)
+
+            await cache.invalidate(7)
+            await get_current_user(db=db, token="token")
+
+        assert db.execute.await_count == 2